@@ -1,6 +1,7 @@
 # Define which functions should be directly accessible when smooth is installed with pip.
-from .framework.run_smooth import run_smooth
-from .optimization.run_optimization import run_optimization
+from .framework.run_smooth import run_smooth, iter_smooth, resume_smooth
+from .framework.run_scenarios import run_scenarios
+from .optimization.run_optimization import run_optimization, resume_optimization
 from .framework.functions.load_results import load_results
 from .framework.functions.save_results import save_results
 from .framework.functions.print_results import print_smooth_results
@@ -8,7 +9,11 @@ from .framework.functions.plot_results import plot_smooth_results
 
 __all__ = [
     'run_smooth',
+    'iter_smooth',
+    'resume_smooth',
+    'run_scenarios',
     'run_optimization',
+    'resume_optimization',
     'load_results',
     'save_results',
     'print_smooth_results',
@@ -3,9 +3,11 @@ The generic component class is the mother class for all of the components. The p
 functions defined here are inherited by each of the specific components.
 """
 
+import warnings
 from oemof.solph import views
-from smooth.framework.functions.update_fitted_cost import update_financials, update_emissions
+from smooth.framework.functions.update_fitted_cost import CostCurves
 from smooth.framework.functions.update_annuities import update_annuities
+from smooth.framework.interval_series import new_interval_series
 
 
 class Component:
@@ -42,10 +44,16 @@ class Component:
     :type op_emissions: dict
     :param fix_emissions: fixed emission values
     :type fix_emissions: dict
+    :param cost_curves: compiled capex, opex and emission dicts, set in *check_validity*
+    :type cost_curves: :class:`~smooth.framework.functions.update_fitted_cost.CostCurves`
     :param fs_component_name: foreign state component name
     :type fs_component_name: str
     :param fs_attribute_name: foreign state attribute name
     :type fs_attribute_name: str
+    :param stateless: the component keeps no state from one time step to the next,
+        so the time steps can be solved in parallel (see *parallel_intervals*),
+        default is False
+    :type stateless: bool
     """
 
     def __init__(self):
@@ -67,8 +75,10 @@ class Component:
         self.dependency_flow_emissions = None
         self.op_emissions = dict()
         self.fix_emissions = dict()
+        self.cost_curves = None
         self.fs_component_name = None
         self.fs_attribute_name = None
+        self.stateless = False
 
     # ------------------- SET THE PARAMETERS FOR EACH COMPONENT -------------------
 
@@ -100,6 +110,37 @@ class Component:
                 "If variable emissions are defined, " \
                 "dependency_flow for emissions has to be defined as well."
 
+    def rename_legacy_flows(self, legacy_nodes):
+        """Renames the dependency flows of the costs and emissions that refer to former
+        oemof nodes of this component. Components that used to be modelled by several
+        nodes (e.g. *<name>_electric* and *<name>_thermal*) are now one node labelled
+        with the component name, so e.g. ('fuel_cell_chp_electric', 'bel') becomes
+        ('fuel_cell_chp', 'bel'). A warning is given for each renamed flow.
+
+        :param legacy_nodes: former labels of the nodes of this component
+        :type legacy_nodes: list of str
+        :raises ValueError: if a dependency flow is the input of a former node,
+            which only received a part of the input of the component
+        :return: None
+        """
+        for attribute in ['dependency_flow_costs', 'dependency_flow_emissions']:
+            flow = getattr(self, attribute)
+            if flow is None:
+                continue
+            flow_from, flow_to = flow
+            if flow_from in legacy_nodes:
+                new_flow = (self.name, flow_to)
+                warnings.warn(
+                    '{} {} of component "{}" is deprecated, use {} instead.'.format(
+                        attribute, tuple(flow), self.name, new_flow), FutureWarning)
+                setattr(self, attribute, new_flow)
+            elif flow_to in legacy_nodes:
+                raise ValueError(
+                    '{} {} of component "{}" is the input of a former node, which only '
+                    'received a part of the input. Use {} for the whole input and adapt '
+                    'the costs or emissions.'.format(
+                        attribute, tuple(flow), self.name, (flow_from, self.name)))
+
     # ------------------- UPDATE THE FLOWS FOR EACH COMPONENT -------------------
 
     def update_flows(self, results, comp_name=None):
@@ -128,10 +169,24 @@ class Component:
                 # Check if there already is an array to store the flow
                 # information, if not, create one.
                 if this_flow_name not in self.flows:
-                    self.flows[this_flow_name] = [None] * self.sim_params.n_intervals
+                    self.flows[this_flow_name] = self.new_series(this_flow_name)
                 # Saving this flow value to the results file
                 self.flows[this_flow_name][self.sim_params.i_interval] = this_df[i_result][0]
 
+    def new_series(self, key, fill_value=None):
+        """Creates an empty container for a flow, state or cost that is tracked for
+        each time step. Depending on the *result_retention* simulation parameter, this is
+        a list with one entry per interval or a container that only keeps aggregates
+        (see :mod:`smooth.framework.interval_series`).
+
+        :param key: flow tuple, state name or cost name of the tracked value
+        :type key: tuple or str
+        :param fill_value: initial value of each time step, defaults to None
+        :type fill_value: numerical, optional
+        :return: container that is indexed by the interval index
+        """
+        return new_interval_series(self.sim_params, self.name, key, fill_value)
+
     # ------------------- PREPARE CREATING THE OEMOF MODEL -------------------
 
     def prepare_simulation(self, components):
@@ -192,8 +247,8 @@ class Component:
             # If this function is not overwritten in the component, then costs
             # and art. costs are not part of the component and therefore
             # set to 0.
-            self.results['variable_costs'] = [0] * self.sim_params.n_intervals
-            self.results['art_costs'] = [0] * self.sim_params.n_intervals
+            self.results['variable_costs'] = self.new_series('variable_costs', 0)
+            self.results['art_costs'] = self.new_series('art_costs', 0)
 
         # Update the costs for this time step [EUR].
         if self.variable_costs is not None:
@@ -217,7 +272,7 @@ class Component:
         if 'variable_emissions' not in self.results:
             # If this function is not overwritten in the component, then
             # emissions are not part of the component and therefore set to 0.
-            self.results['variable_emissions'] = [0] * self.sim_params.n_intervals
+            self.results['variable_emissions'] = self.new_series('variable_emissions', 0)
 
         # Update the emissions for this time step [kg]. Before, verify if a
         # flow name is given as emission dependency.
@@ -289,13 +344,8 @@ class Component:
 
         :return: Results for the calculated emissions, financials and annuities
         """
-        # Compute the emissions due to installation and operation.
-        update_emissions(self, self.fix_emissions)
-        update_emissions(self, self.op_emissions)
-        # Compute the CAPEX and then the OPEX results.
-        update_financials(self, self.capex)
-        update_financials(self, self.opex)
-        # Calculate the annuities of the CAPEX and the variable costs; and of the emission values
+        # Calculate the annuities of the CAPEX, OPEX and the variable costs; and of the
+        # emission values
         update_annuities(self)
 
     def check_validity(self):
@@ -312,6 +362,8 @@ class Component:
                     'In component {} CAPEX or fix_emissions are given '
                     'but the life_time is either None or not greater than zero. '
                     'Please choose another life_time value!'.format(self.name))
+        # Compile the CAPEX, OPEX and emission dicts once.
+        self.cost_curves = CostCurves(self)
 
     def add_to_oemof_model(self, busses, model):
         """This function adds the specific component to the oemof energy system model
@@ -326,3 +378,27 @@ class Component:
          not overwritten in specific component definition.
         """
         raise NotImplementedError("add_to_oemof_model not implemented, can't build model")
+
+    def add_to_native_model(self, native_model):
+        """This function adds the specific component to the native linear program of
+        an interval (see :mod:`smooth.framework.native_model`). It is only defined for
+        components whose oemof representation is linear.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+
+        :raises NotImplementedError: NotImplementedError raised if the function is
+         not overwritten in specific component definition.
+        """
+        raise NotImplementedError("add_to_native_model not implemented for this component")
+
+    def get_flow_bounds(self):
+        """Get the bounds of the flows of the component into its busses over the whole
+        simulation, used to reject certainly infeasible models before they are simulated
+        (see :mod:`smooth.framework.functions.feasibility`).
+
+        :return: bounds by bus name, or None if the bounds are not known. In this case,
+            the busses of the component are not checked
+        :rtype: dict of :class:`~smooth.framework.functions.feasibility.FlowBounds` or None
+        """
+        return None
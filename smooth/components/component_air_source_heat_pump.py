@@ -61,6 +61,13 @@ class AirSourceHeatPump(Component):
     :type column_title: str or int
     :param path: path where the timeseries csv file can be located
     :type path: str
+    :param csv_interval_time: time between two rows of the csv file in minutes,
+        the timeseries is resampled if it differs from the interval time.
+        Default is None (one row per interval)
+    :type csv_interval_time: numerical
+    :param csv_resample_method: 'sum' or 'mean' when resampling the timeseries,
+        default is 'mean' (temperatures)
+    :type csv_resample_method: str
     :param temp_threshold_icing: temperature below which icing occurs [K]
     :type temp_threshold_icing: numerical
     :param temp_threshold_icing_C: converts to degrees C for oemof thermal function [C]
@@ -95,6 +102,7 @@ class AirSourceHeatPump(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'Heat_pump_default_name'
+        self.stateless = True
 
         self.bus_el = None
         self.bus_th = None
@@ -108,6 +116,8 @@ class AirSourceHeatPump(Component):
         self.csv_separator = ','
         self.column_title = 0
         self.path = os.path.dirname(__file__)
+        self.csv_interval_time = None
+        self.csv_resample_method = 'mean'
 
         # ------------------- PARAMETERS BASED ON OEMOF THERMAL EXAMPLE -------------------
         # Temperature below which icing occurs [K]
@@ -140,6 +150,11 @@ class AirSourceHeatPump(Component):
             # A csv file containing data for the ambient temperature is required [deg C]
             self.temp_low = func.read_data_file(
                 self.path, self.csv_filename, self.csv_separator, self.column_title)
+            if self.csv_interval_time is not None:
+                # resample the timeseries to the interval time of the simulation
+                self.temp_low = func.resample_data(
+                    self.temp_low, self.csv_interval_time, self.sim_params.interval_time,
+                    self.csv_resample_method)
             self.temp_low_series = self.temp_low[self.column_title]
             self.temp_low_series_C = pd.Series(self.temp_low_series - 273.15)
         else:
@@ -178,3 +193,17 @@ class AirSourceHeatPump(Component):
 
         model.add(air_source_heat_pump)
         return air_source_heat_pump
+
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the conversion of the heat pump to the native linear
+        program of the interval, like the oemof Transformer.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(self.bus_el, self.name, variable_costs=0)
+        native_model.add_flow(
+            self.name, self.bus_th, nominal_value=self.power_max, variable_costs=0)
+        native_model.add_conversion(
+            self.name, [self.bus_el], [self.bus_th],
+            {self.bus_th: self.cops[self.sim_params.i_interval]})
@@ -74,6 +74,7 @@ takes the energy losses during the (dis-)charging process into account:
 
 import oemof.solph as solph
 from .component import Component
+from smooth.framework.functions.feasibility import FlowBounds
 
 
 class Battery(Component):
@@ -252,6 +253,49 @@ class Battery(Component):
         model.add(battery)
         return battery
 
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the storage balance of the battery to the native linear
+        program of the interval, like the oemof Generic Storage.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(
+            self.bus_in_and_out, self.name,
+            nominal_value=self.p_in_max, variable_costs=self.current_vac[0])
+        native_model.add_flow(
+            self.name, self.bus_in_and_out,
+            nominal_value=self.p_out_max, variable_costs=self.current_vac[1])
+        native_model.add_storage(
+            self.name, self.bus_in_and_out, self.bus_in_and_out,
+            nominal_storage_capacity=self.battery_capacity,
+            initial_storage_level=self.soc,
+            min_storage_level=self.soc_min,
+            loss_rate=self.loss_rate,
+            inflow_conversion_factor=self.efficiency_charge,
+            outflow_conversion_factor=self.efficiency_discharge)
+
+    def get_flow_bounds(self):
+        """Gets the bounds of the flow out of the battery (discharging minus charging).
+        Over the simulation, at most the initially stored energy above the minimal state
+        of charge can be discharged and at most the free capacity can be charged.
+        These energy limits are left out if they do not hold because of losses or
+        efficiencies above one.
+
+        :return: flow bounds at the battery bus
+        :rtype: dict
+        """
+        energy_min = None
+        energy_max = None
+        if self.efficiency_charge <= 1 and self.efficiency_discharge <= 1:
+            energy_max = (self.soc_init - self.soc_min) * self.battery_capacity \
+                * self.efficiency_discharge
+            if self.loss_rate == 0 and self.efficiency_charge > 0:
+                energy_min = -(1 - self.soc_init) * self.battery_capacity \
+                    / self.efficiency_charge
+        return {self.bus_in_and_out: FlowBounds(
+            -self.p_in_max, self.p_out_max, energy_min, energy_max)}
+
     def update_states(self, results):
         """Updates the states of the battery component for each time step
 
@@ -267,7 +311,7 @@ class Battery(Component):
             if i_result[1] == "storage_content":
                 if "soc" not in self.states:
                     # Initialize a.n array that tracks the state SoC
-                    self.states["soc"] = [None] * self.sim_params.n_intervals
+                    self.states["soc"] = self.new_series("soc")
                 # Check if this result is the state of charge.
                 self.soc = df_storage[i_result][0] / self.battery_capacity
                 self.states["soc"][self.sim_params.i_interval] = self.soc
@@ -86,6 +86,7 @@ class BiogasConverter(Component):
 
         # ------------- PARAMETERS -----------------
         self.name = 'Biogas_converter_default_name'
+        self.stateless = True
         self.bg_in = None
         self.bg_out = None
         self.ch4_share = 0.757
@@ -128,3 +129,15 @@ class BiogasConverter(Component):
         )
         model.add(biogas_converter)
         return biogas_converter
+
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the conversion of the biogas converter to the native linear
+        program of the interval, like the oemof Transformer.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(self.bg_in, self.name)
+        native_model.add_flow(self.name, self.bg_out)
+        native_model.add_conversion(
+            self.name, [self.bg_in], [self.bg_out], {self.bg_out: self.conv})
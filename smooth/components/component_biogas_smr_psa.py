@@ -133,6 +133,7 @@ class BiogasSmrPsa(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'Biogas_SMR_PSA_default_name'
+        self.stateless = True
         self.bus_bg = None
         self.bus_el = None
         self.bus_h2 = None
@@ -222,6 +222,24 @@ class CompressorH2(Component):
         model.add(compressor)
         return compressor
 
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the conversion of the compressor to the native linear
+        program of the interval, like the oemof Transformer.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(
+            self.bus_h2_in, self.name,
+            nominal_value=self.m_flow_max * self.sim_params.interval_time / 60)
+        native_model.add_flow(self.bus_el, self.name)
+        native_model.add_flow(self.name, self.bus_h2_out)
+        native_model.add_conversion(
+            self.name, [self.bus_h2_in, self.bus_el], [self.bus_h2_out], {
+                self.bus_h2_in: 1,
+                self.bus_el: self.spec_compression_energy,
+                self.bus_h2_out: 1})
+
     def prepare_simulation(self, components):
         """Prepares the simulation by calculating the specific compression energy
 
@@ -283,7 +301,7 @@ class CompressorH2(Component):
 
         # If the states dict of this object wasn't created yet, it's done here.
         if 'specific_compression_work' not in self.states:
-            self.states['specific_compression_work'] = [None] * self.sim_params.n_intervals
+            self.states['specific_compression_work'] = self.new_series('specific_compression_work')
 
         self.states['specific_compression_work'][self.sim_params.i_interval] \
             = self.spec_compression_energy
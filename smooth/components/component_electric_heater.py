@@ -57,6 +57,7 @@ class ElectricHeater(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'Electric_heater_default_name'
+        self.stateless = True
 
         # Busses
         self.bus_th = None
@@ -93,3 +94,15 @@ class ElectricHeater(Component):
 
         model.add(electric_heater)
         return electric_heater
+
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the conversion of the electric heater to the native linear
+        program of the interval, like the oemof Transformer.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(self.bus_el, self.name)
+        native_model.add_flow(self.name, self.bus_th, nominal_value=self.power_max)
+        native_model.add_conversion(
+            self.name, [self.bus_el], [self.bus_th], {self.bus_th: self.efficiency})
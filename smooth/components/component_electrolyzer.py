@@ -94,6 +94,7 @@ voltage are calculated, see inside the component for the necessary functions.
 """
 
 import oemof.solph as solph
+from smooth.framework.functions.piecewise import PiecewiseTransformer
 from .component import Component
 import math
 import numpy as np
@@ -119,6 +120,10 @@ class Electrolyzer (Component):
     :type temp_init: numerical
     :param life_time: life time of the component [a]
     :type life_time: numerical
+    :param pw_repn: representation of the piecewise linear curve, 'CC', 'DCC', 'DLOG', 'LOG'
+        or 'MC', or 'LP' or 'auto' for a linear program
+        (see :mod:`smooth.framework.functions.piecewise`). Defaults to 'CC'
+    :type pw_repn: str
     :param fitting_value_exchange_current_density: fitting parameter
         exchange current density [A/cm²]
     :type fitting_value_exchange_current_density: numerical
@@ -172,6 +177,8 @@ class Electrolyzer (Component):
         self.temp_init = 273.15 + 25
         # Life time [a].
         self.life_time = 20
+        # Representation of the piecewise linear curve.
+        self.pw_repn = 'CC'
 
         # ------------------- PARAMETERS (SPECIFIC) -------------------
         # The fitting parameter exchange current density [A/cm²].
@@ -267,7 +274,7 @@ class Electrolyzer (Component):
         self.update_nonlinear_behaviour()
 
         # Create the non-linear oemof component.
-        electrolyzer = solph.custom.PiecewiseLinearTransformer(
+        electrolyzer = PiecewiseTransformer(
             label=self.name,
             inputs={busses[self.bus_el]: solph.Flow(
                 nominal_value=self.energy_max,
@@ -275,7 +282,7 @@ class Electrolyzer (Component):
             outputs={busses[self.bus_h2]: solph.Flow()},
             in_breakpoints=self.supporting_points['energy'],
             conversion_function=self.conversion_fun_ely,
-            pw_repn='CC')
+            pw_repn=self.pw_repn)
 
         model.add(electrolyzer)
         return electrolyzer
@@ -569,9 +576,9 @@ class Electrolyzer (Component):
         """
         # If the states dict of this object wasn't created yet, it's done here.
         if 'temperature' not in self.states:
-            self.states['temperature'] = [None] * self.sim_params.n_intervals
+            self.states['temperature'] = self.new_series('temperature')
         if 'water_consumption' not in self.states:
-            self.states['water_consumption'] = [None] * self.sim_params.n_intervals
+            self.states['water_consumption'] = self.new_series('water_consumption')
 
         # Get the flows of the electrolyzer for this time step.
         data_electrolyzer = solph.views.node(results, self.name)
@@ -579,7 +586,7 @@ class Electrolyzer (Component):
 
         # Get the hydrogen produced this time step [kg].
         for i_result in df_electrolyzer:
-            if i_result[0][0] == self.name and i_result[1] == 'flow':
+            if i_result[0] == (self.name, self.bus_h2) and i_result[1] == 'flow':
                 # Case: This is the flow from the electrolyzer to the hydrogen
                 # bus, therefor the produced H2 [kg].
                 this_h2_produced = df_electrolyzer[i_result][0]
@@ -155,13 +155,11 @@ The latent heat is neglected since the mass of :math:`H_{2O}` vapor
 
 Piecewise Linear Transformer
 ----------------------------
-Currently, the piecewise linear transformer component in oemof can only
-represent a one-to-one transformation with a singular input and a singular
-output. Thus, in order to represent the non-linear behaviour of the alkaline
-electrolyser in the energy system, two oemof components are created for the
-hydrogen and thermal outputs individually, with a constraint that the electric
-input flows into each component must always be equal. In this way, the individual
-oemof components behave as one component.
+The non-linear behaviour of the alkaline electrolyser is represented by a single
+multi-output piecewise linear transformer with the electric input and the hydrogen
+and thermal outputs (see :mod:`smooth.framework.functions.piecewise`). Both outputs
+are interpolated with the same weights of the breakpoints, so the operating point
+is chosen only once for both outputs.
 
 References
 ----------
@@ -174,8 +172,8 @@ electrolyser: Experimental study and mathematical modeling, Int. J. Hydrogen Ene
 """
 
 import oemof.solph as solph
+from smooth.framework.functions.piecewise import MultiOutputPiecewiseTransformer
 from .component_electrolyzer import Electrolyzer
-import pyomo.environ as po
 
 
 class ElectrolyzerWasteHeat(Electrolyzer):
@@ -213,12 +211,9 @@ class ElectrolyzerWasteHeat(Electrolyzer):
     :param area_separator: overall surface area exposed by the gas separators and the
         pipe communicating them [m^2]
     :type area_separator: numerical
-    :param model_h2: model created with regards to the hydrogen produced by the
-        electrolyser
-    :type model_h2: oemof model
-    :param model_th: model created with regards to the thermal energy produced by
-        the electrolyser
-    :type model_th: oemof model
+    :param model: oemof component of the electrolyser producing hydrogen and thermal
+        energy
+    :type model: :class:`~smooth.framework.functions.piecewise.MultiOutputPiecewiseTransformer`
 
      """
 
@@ -237,6 +232,8 @@ class ElectrolyzerWasteHeat(Electrolyzer):
 
         # ------------------- UPDATE PARAMETER DEFAULT VALUES -------------------
         self.set_parameters(param_bus_th)
+        # Flows of the former thermal node.
+        self.rename_legacy_flows([self.name + '_thermal'])
         # Interval time [min].
         self.interval_time = self.sim_params.interval_time
         # Calculate the max. energy the electrolyzer can use in one time step [Wh].
@@ -274,25 +271,8 @@ class ElectrolyzerWasteHeat(Electrolyzer):
         # Dieguez et al)
         self.area_separator = 2.38 * self.area_stack
 
-        # Save the two models to set constraints later.
-        self.model_h2 = None
-        self.model_th = None
-
-    def conversion_fun_ely(self, ely_energy):
-        """Gives out the hydrogen mass values for the electric energy values at the
-        breakpoints
-
-        :param ely_energy: electric energy values at the breakpoints
-        :type ely_energy: numerical
-        :return: The according hydrogen production value [kg]
-        """
-        # Create a function that will give out the mass values for the electric energy
-        # values at the breakpoints.
-
-        # Check the index of this ely_energy entry.
-        this_index = self.supporting_points["energy_halved"].index(ely_energy)
-        # Return the according hydrogen production value [kg].
-        return self.supporting_points["h2_produced"][this_index]
+        # Save the oemof component.
+        self.model = None
 
     def conversion_fun_thermal(self, ely_energy):
         """Gives out the thermal energy values for the electric energy values at the
@@ -305,59 +285,48 @@ class ElectrolyzerWasteHeat(Electrolyzer):
         # Create a function that will give out the thermal energy values for the electric
         # energy values at the breakpoints.
         # Check the index of this ely_energy entry.
-        this_index = self.supporting_points["energy_halved"].index(ely_energy)
-        # Return the according hydrogen production value [kg].
+        this_index = self.supporting_points["energy"].index(ely_energy)
+        # Return the according thermal energy value [Wh].
         return self.supporting_points["thermal_energy"][this_index]
 
     def add_to_oemof_model(self, busses, model):
-        """Creates two separate oemof Piecewise Linear Transformer components for the hydrogen
-        and thermal production of the electrolyser from information given in the
-        ElectrolyserWasteHeat class, to be used in the oemof model
+        """Creates a multi-output piecewise linear transformer for the hydrogen and thermal
+        production of the electrolyser from information given in the ElectrolyserWasteHeat
+        class, to be used in the oemof model
 
         :param busses: virtual buses used in the energy system
         :type busses: dict
         :param model: oemof model containing the hydrogen production and thermal energy
             production of the electrolyser
         :type model: model
-        :return: the oemof electrolyzer and electrolyzer thermal components
+        :return: the oemof electrolyzer component
         """
         # Get the non-linear behaviour.
         self.update_nonlinear_behaviour()
 
-        # First create the hydrogen producing oemof component
-        electrolyzer = solph.custom.PiecewiseLinearTransformer(
+        electrolyzer = MultiOutputPiecewiseTransformer(
             label=self.name,
             inputs={
                 busses[self.bus_el]: solph.Flow(
-                    nominal_value=self.energy_max / 2, variable_costs=0
+                    nominal_value=self.energy_max, variable_costs=0
                 )
             },
-            outputs={busses[self.bus_h2]: solph.Flow()},
-            in_breakpoints=self.supporting_points["energy_halved"],
-            conversion_function=self.conversion_fun_ely,
-            pw_repn="CC",
-        )
-
-        # Then create the thermal oemof component.
-        electrolyzer_thermal = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + "_thermal",
-            inputs={
-                busses[self.bus_el]: solph.Flow(
-                    nominal_value=self.energy_max / 2, variable_costs=0
-                )
+            outputs={
+                busses[self.bus_h2]: solph.Flow(),
+                busses[self.bus_th]: solph.Flow(),
             },
-            outputs={busses[self.bus_th]: solph.Flow()},
-            in_breakpoints=self.supporting_points["energy_halved"],
-            conversion_function=self.conversion_fun_thermal,
-            pw_repn="CC",
+            in_breakpoints=self.supporting_points["energy"],
+            conversion_functions={
+                busses[self.bus_h2]: self.conversion_fun_ely,
+                busses[self.bus_th]: self.conversion_fun_thermal,
+            },
+            pw_repn=self.pw_repn,
         )
 
-        # Add the two components to the model.
-        model.add(electrolyzer, electrolyzer_thermal)
+        model.add(electrolyzer)
 
-        self.model_h2 = electrolyzer
-        self.model_th = electrolyzer_thermal
-        return (electrolyzer, electrolyzer_thermal)
+        self.model = electrolyzer
+        return electrolyzer
 
     def update_nonlinear_behaviour(self):
         """Updates the nonlinear behaviour of the electrolyser in terms of hydrogen and
@@ -394,9 +363,6 @@ class ElectrolyzerWasteHeat(Electrolyzer):
         self.supporting_points["h2_produced"] = bp_ely_h2
         self.supporting_points["energy"] = bp_ely_energy
         self.supporting_points["thermal_energy"] = bp_ely_thermal
-        self.supporting_points["energy_halved"] = [
-            this_bp / 2 for this_bp in bp_ely_energy
-        ]
 
     def get_waste_heat(self, energy_used, h2_produced, new_ely_temp):
         """Approximates waste heat production based on calculations of internal heat
@@ -464,50 +430,3 @@ class ElectrolyzerWasteHeat(Electrolyzer):
         # latent heat is neglected since mass_H2O_vapor is neglected
         latent_heat = 0
         return [sensible_heat, latent_heat]
-
-    def update_constraints(self, busses, model_to_solve):
-        """Set a constraint so that the electric inflow of the hydrogen producing and the
-        thermal part are always the same (which is necessary while the piecewise linear
-        transformer cannot have two outputs yet and therefore the two parts need to be
-        separate components).
-
-        :param busses: virtual buses used in the energy system
-        :type busses: dict
-        :param model_to_solve: oemof model that will be solved
-        :type model_to_solve: model
-        """
-
-        def electrolyzer_ratio_rule(model, t):
-            """Ensures that the flows going into the electrolyzer hydrogen production
-            component and those going into the electrolyser thermal energy production
-            component are equal.
-
-            :param model: oemof model containing the hydrogen production and thermal
-                energy production of the electrolyser
-            :type model: model
-            :param t: ?
-            :return: expression = 0
-            """
-            expr = 0
-            expr += model.flow[busses[self.bus_el], self.model_th, t]
-            expr += -model.flow[busses[self.bus_el], self.model_h2, t]
-            return expr == 0
-
-        setattr(model_to_solve,
-                'electrolyzer_flow_ratio_fix_{}'.format(self.name.replace(' ', '')),
-                po.Constraint(model_to_solve.TIMESTEPS, rule=electrolyzer_ratio_rule)
-                )
-
-    def update_flows(self, results):
-        """Updates the flows of the electrolyser waste heat components for each time
-        step.
-
-        :param results: oemof results for the given time step
-        :type results: object
-        :return: updated flow values for each flow in the 'flows' dict
-        """
-        # Check if the component has an attribute 'flows', if not, create it as an empty dict.
-        Electrolyzer.update_flows(self, results)
-        Electrolyzer.update_flows(
-            self, results, self.name + "_thermal"
-        )
@@ -27,6 +27,7 @@ import os
 import oemof.solph as solph
 from smooth.components.component import Component
 import smooth.framework.functions.functions as func
+from smooth.framework.functions.feasibility import FlowBounds
 
 
 class EnergySourceFromCsv (Component):
@@ -43,6 +44,13 @@ class EnergySourceFromCsv (Component):
     :type column_title: str or int
     :param path: path where the timeseries csv file can be located
     :type path: str
+    :param csv_interval_time: time between two rows of the csv file in minutes,
+        the timeseries is resampled if it differs from the interval time.
+        Default is None (one row per interval)
+    :type csv_interval_time: numerical
+    :param csv_resample_method: 'sum' or 'mean' when resampling the timeseries,
+        default is 'sum' (energies per timestep)
+    :type csv_resample_method: str
     :param bus_out: virtual bus that leaves the energy source component (e.g. the electricity bus)
     :type bus_out: str
     :param set_parameters(params): updates parameter default values (see generic Component class)
@@ -59,11 +67,14 @@ class EnergySourceFromCsv (Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'General_energy_source'
+        self.stateless = True
         self.nominal_value = 1
         self.csv_filename = None
         self.csv_separator = ','
         self.column_title = 0
         self.path = os.path.dirname(__file__)
+        self.csv_interval_time = None
+        self.csv_resample_method = 'sum'
         self.bus_out = None
 
         # ------------------- UPDATE PARAMETER DEFAULT VALUES -------------------
@@ -72,6 +83,11 @@ class EnergySourceFromCsv (Component):
         # ------------------- READ CSV FILES -------------------
         self.data = func.read_data_file(self.path, self.csv_filename,
                                         self.csv_separator, self.column_title)
+        if self.csv_interval_time is not None:
+            # resample the timeseries to the interval time of the simulation
+            self.data = func.resample_data(
+                self.data, self.csv_interval_time, self.sim_params.interval_time,
+                self.csv_resample_method)
 
     def add_to_oemof_model(self, busses, model):
         """Creates an oemof Source component from the information given in the
@@ -91,3 +107,24 @@ class EnergySourceFromCsv (Component):
 
         model.add(energy_source_from_csv)
         return energy_source_from_csv
+
+    def add_to_native_model(self, native_model):
+        """Adds the fixed flow of the source to the native linear program of the
+        interval, like the oemof Source.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(
+            self.name, self.bus_out,
+            nominal_value=self.nominal_value,
+            fix=self.data.iloc[self.sim_params.i_interval, 0])
+
+    def get_flow_bounds(self):
+        """Gets the fixed output of all intervals from the time series.
+
+        :return: flow bounds at the output bus
+        :rtype: dict
+        """
+        flow = self.data.iloc[:self.sim_params.n_intervals, 0].to_numpy() * self.nominal_value
+        return {self.bus_out: FlowBounds(flow, flow)}
@@ -15,7 +15,7 @@ Concept
 *******
 The fuel cell CHP has a hydrogen bus input along with an electrical bus and
 thermal bus output. The behaviour of the fuel cell CHP component is non-linear,
-which is demonstrated through the use of oemof's Piecewise Linear Transformer
+which is demonstrated through the use of a piecewise linear transformer
 component.
 
 .. figure:: /images/fuel_cell_chp.png
@@ -81,13 +81,12 @@ energy produced at each break point is calculated:
 
 Piecewise Linear Transformer
 ----------------------------
-Currently, the piecewise linear transformer component in oemof can only
-represent a one-to-one transformation with a singular input and a singular
-output. Thus, in order to represent the non-linear fuel cell CHP in the
-energy system, two oemof components are created for the electrical and
-thermal outputs individually, with a constraint that the hydrogen input flows
-into each component must always be equal. In this way, the individual oemof
-components behave as one component.
+The fuel cell CHP is represented by a single multi-output piecewise linear
+transformer with the hydrogen input and the electrical and thermal outputs
+(see :mod:`smooth.framework.functions.piecewise`). The breakpoints of the
+electrical and thermal curves are merged, and both outputs are interpolated
+with the same weights of the breakpoints, so the operating point is chosen
+only once for both outputs.
 
 References
 ----------
@@ -97,7 +96,9 @@ review, International journal of hydrogen energy.
 
 from smooth.components.component import Component
 import oemof.solph as solph
-import pyomo.environ as po
+import numpy as np
+from smooth.framework.functions.piecewise import (
+    MultiOutputPiecewiseTransformer, merge_breakpoints)
 
 
 class FuelCellChp(Component):
@@ -114,6 +115,10 @@ class FuelCellChp(Component):
     :type power_max: numerical
     :param life_time: lifetime of the component [a]
     :type life_time: numerical
+    :param pw_repn: representation of the piecewise linear curves, 'CC', 'DCC' or 'LP'
+        or 'auto' for a linear program
+        (see :mod:`smooth.framework.functions.piecewise`). Defaults to 'CC'
+    :type pw_repn: str
     :param set_parameters(params): updates parameter default values (see generic Component class)
     :type set_parameters(params): function
     :param heating_value_h2: heating value of hydrogen [kWh/kg]
@@ -138,14 +143,8 @@ class FuelCellChp(Component):
     :type bp_energy_el: list
     :param bp_energy_th: absolute thermal energy values over the load points [Wh]
     :type bp_energy_th: list
-    :param bp_h2_consumed_el_half: half the amount of hydrogen that is consumed [kg]
-    :type bp_h2_consumed_el_half: list
-    :param bp_h2_consumed_th_half: half the amount of hydrogen that is consumed [kg]
-    :type bp_h2_consumed_th_half: list
-    :param model_el: electric model to set constraints later
-    :type model_el: model
-    :param model_th: thermal model to set constraints later
-    :type model_th: model
+    :param model: oemof component of the fuel cell CHP
+    :type model: :class:`~smooth.framework.functions.piecewise.MultiOutputPiecewiseTransformer`
     """
 
     def __init__(self, params):
@@ -157,6 +156,7 @@ class FuelCellChp(Component):
         # ------------------- PARAMETERS -------------------
         # PARAMETERS TO CHANGE BY THE USER
         self.name = 'Fuel cell CHP default name'
+        self.stateless = True
         # Busses (H2 in, electrical out, thermal out).
         self.bus_h2 = None
         self.bus_el = None
@@ -165,8 +165,12 @@ class FuelCellChp(Component):
         self.power_max = 1000
         # Lifetime of the component [a]
         self.life_time = 15
+        # Representation of the piecewise linear curves.
+        self.pw_repn = 'CC'
         # Update the input parameters by the user.
         self.set_parameters(params)
+        # Flows of the former electric and thermal nodes.
+        self.rename_legacy_flows([self.name + '_electric', self.name + '_thermal'])
         # INTERNAL PARAMETERS
         # Heating value of hydrogen [kWh/kg].
         self.heating_value_h2 = 33.33
@@ -210,17 +214,8 @@ class FuelCellChp(Component):
                 self.bp_h2_consumed_th[i_bp] * \
                 self.bp_eff_th[i_bp] * self.heating_value_h2 * 1000
             self.bp_energy_th.append(this_energy_th)
-        # While we will create two oemof components, one for thermal energy and
-        # one for electrical energy, and make a constraint that both inflows of
-        # hydrogen have to be the same, each component will get only half the
-        # amount of hydrogen. Therefore we need to make a list of hydrogen
-        # consumed that is halfed [kg]
-        self.bp_h2_consumed_el_half = [
-            this_bp / 2 for this_bp in self.bp_h2_consumed_el]
-        self.bp_h2_consumed_th_half = [this_bp / 2 for this_bp in self.bp_h2_consumed_th]
-        # Save the two models to set constraints later.
-        self.model_el = None
-        self.model_th = None
+        # Save the oemof component.
+        self.model = None
 
     def get_el_energy_by_h2(self, h2_consumption):
         """Gets the electrical energy produced by the according hydrogen consumption value.
@@ -228,9 +223,8 @@ class FuelCellChp(Component):
         :param h2_consumption: hydrogen consumption value [kg]
         :return: according electrical energy value [Wh]
         """
-        # Check the index of this load point.
-        this_index = self.bp_h2_consumed_el_half.index(h2_consumption)
-        return self.bp_energy_el[this_index]
+        # Interpolate between the load points.
+        return np.interp(h2_consumption, self.bp_h2_consumed_el, self.bp_energy_el)
 
     def get_th_energy_by_h2(self, h2_consumption):
         """Gets the thermal energy produced by the according hydrogen consumption value.
@@ -238,96 +232,34 @@ class FuelCellChp(Component):
         :param h2_consumption: hydrogen consumption value [kg]
         :return: according thermal energy value [Wh]
         """
-        # Check the index of this load point.
-        this_index = self.bp_h2_consumed_th_half.index(h2_consumption)
-        return self.bp_energy_th[this_index]
+        # Interpolate between the load points.
+        return np.interp(h2_consumption, self.bp_h2_consumed_th, self.bp_energy_th)
 
     def add_to_oemof_model(self, busses, model):
-        """Creates two separate oemof Piecewise Linear Transformer components for the
-        electrical and thermal production of the fuel cell CHP from information given
-        in the FuelCellCHP class, to be used in the oemof model
+        """Creates a multi-output piecewise linear transformer for the electrical and
+        thermal production of the fuel cell CHP from information given in the
+        FuelCellCHP class, to be used in the oemof model
 
         :param busses: virtual buses used in the energy system
         :type busses: dict
         :param model: oemof model containing the electrical energy production and
             thermal energy production of the fuel cell CHP
         :type model: model
-        :return: tuple of electric and thermal oemof components
+        :return: oemof component
         """
-        # The CHP has to be modelled as two components, while the piecewise linear
-        # transformer does not accept 2 outputs yet.
-
-        flow_electric = solph.Flow(
-            nominal_value=self.bp_h2_consumed_el_half[-1],
-            variable_costs=0)
-        flow_thermal = solph.Flow(nominal_value=self.bp_h2_consumed_el_half[-1])
-
-        # First create the electrical oemof component.
-        fuel_cell_chp_electric = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_electric',
-            inputs={busses[self.bus_h2]: flow_electric},
-            outputs={busses[self.bus_el]: solph.Flow()},
-            in_breakpoints=self.bp_h2_consumed_el_half,
-            conversion_function=self.get_el_energy_by_h2,
-            pw_repn='CC')
-
-        # Then create the thermal oemof component.
-        fuel_cell_chp_thermal = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_thermal',
-            inputs={busses[self.bus_h2]: flow_thermal},
-            outputs={busses[self.bus_th]: solph.Flow()},
-            in_breakpoints=self.bp_h2_consumed_th_half,
-            conversion_function=self.get_th_energy_by_h2,
-            pw_repn='CC')
-
-        # Add the two components to the model.
-        model.add(fuel_cell_chp_electric, fuel_cell_chp_thermal)
-
-        self.model_el = fuel_cell_chp_electric
-        self.model_th = fuel_cell_chp_thermal
-        return (fuel_cell_chp_electric, fuel_cell_chp_thermal)
-
-    def update_constraints(self, busses, model_to_solve):
-        """Set a constraint so that the hydrogen inflow of the electrical and
-        the thermal part are always the same (which is necessary while the
-        piecewise linear transformer cannot have two outputs yet and
-        therefore the two parts need to be separate components).
-
-        :param busses: virtual buses used in the energy system
-        :type busses: dict
-        :param model_to_solve: The oemof model that will be solved
-        :type model_to_solve: model
-        """
-
-        def chp_ratio_rule(model, t):
-            """Ensures that the flows going into the fuel cell CHP electricity production
-            component and those going into the fuel cell CHP thermal energy production
-            component are equal.
-
-            :param model: The oemof model containing the electrical energy production and
-                thermal energy production of the fuel cell
-            :type model: model
-            :param t: ?
-            :return: expression = 0
-            """
-            # Inverter flow
-            expr = 0
-            expr += model.flow[busses[self.bus_h2], self.model_th, t]
-            expr += - model.flow[busses[self.bus_h2], self.model_el, t]
-            return (expr == 0)
-
-        setattr(model_to_solve,
-                'chp_flow_ratio_fix_{}'.format(self.name.replace(' ', '')),
-                po.Constraint(model_to_solve.TIMESTEPS, rule=chp_ratio_rule)
-                )
-
-    def update_flows(self, results):
-        """Updates the flows of the fuel cell CHP components for each time step.
-
-        :param results: The oemof results for the given time step
-        :type results: object
-        :return: updated flow values for each flow in the 'flows' dict
-        """
-        # Check if the component has an attribute 'flows', if not, create it as an empty dict.
-        Component.update_flows(self, results, self.name + '_electric')
-        Component.update_flows(self, results, self.name + '_thermal')
+        fuel_cell_chp = MultiOutputPiecewiseTransformer(
+            label=self.name,
+            inputs={busses[self.bus_h2]: solph.Flow(
+                nominal_value=self.bp_h2_consumed_el[-1],
+                variable_costs=0)},
+            outputs={busses[self.bus_el]: solph.Flow(), busses[self.bus_th]: solph.Flow()},
+            in_breakpoints=merge_breakpoints(self.bp_h2_consumed_el, self.bp_h2_consumed_th),
+            conversion_functions={
+                busses[self.bus_el]: self.get_el_energy_by_h2,
+                busses[self.bus_th]: self.get_th_energy_by_h2},
+            pw_repn=self.pw_repn)
+
+        model.add(fuel_cell_chp)
+
+        self.model = fuel_cell_chp
+        return fuel_cell_chp
@@ -104,10 +104,10 @@ energy produced at each break point is calculated:
 
 Piecewise Linear Transformer
 ----------------------------
-As stated in the fuel cell CHP component, two seperate oemof components
-for the electrical and thermal production of the biogas CHP must be created,
-but they still behave as one component by setting a constraint that the
-biogas input flows into the two components are always equal.
+As stated in the fuel cell CHP component, the biogas CHP is represented by a
+single multi-output piecewise linear transformer with the biogas input and the
+electrical and thermal outputs, which are interpolated with the same weights of
+the merged breakpoints.
 
 References
 ----------
@@ -117,7 +117,9 @@ References
 
 from smooth.components.component import Component
 import oemof.solph as solph
-import pyomo.environ as po
+import numpy as np
+from smooth.framework.functions.piecewise import (
+    MultiOutputPiecewiseTransformer, merge_breakpoints)
 
 
 class GasEngineChpBiogas(Component):
@@ -136,6 +138,10 @@ class GasEngineChpBiogas(Component):
     :type ch4_share: numerical
     :param co2_share: proportion of carbon dioxide in biogas [-]
     :type co2_share: numerical
+    :param pw_repn: representation of the piecewise linear curves, 'CC', 'DCC' or 'LP'
+        or 'auto' for a linear program
+        (see :mod:`smooth.framework.functions.piecewise`). Defaults to 'CC'
+    :type pw_repn: str
     :param set_parameters(params): updates parameter default values (see generic Component class)
     :type set_parameters(params): function
     :param heating_value_ch4: heating value of methane [kWh/kg]
@@ -167,14 +173,8 @@ class GasEngineChpBiogas(Component):
     :type bp_energy_el: list
     :param bp_energy_th: absolute thermal energy values over the load points [Wh]
     :type bp_energy_th: list
-    :param bp_bg_consumed_el_half: half the amount of biogas that is consumed [kg]
-    :type bp_bg_consumed_el_half: list
-    :param bp_bg_consumed_th_half: half the amount of biogas that is consumed [kg]
-    :type bp_bg_consumed_th_half: list
-    :param model_el: electric model to set constraints later
-    :type model_el: model
-    :param model_th: thermal model to set constraints later
-    :type model_th: model
+    :param model: oemof component of the biogas CHP
+    :type model: :class:`~smooth.framework.functions.piecewise.MultiOutputPiecewiseTransformer`
     """
 
     def __init__(self, params):
@@ -186,6 +186,7 @@ class GasEngineChpBiogas(Component):
         # ------------------- PARAMETERS -------------------
         # PARAMETERS TO CHANGE BY THE USER
         self.name = 'Gas Engine CHP Biogas default name'
+        self.stateless = True
 
         # Busses (biogas in, electrical out, thermal out).
         self.bus_bg = None
@@ -199,8 +200,13 @@ class GasEngineChpBiogas(Component):
         self.ch4_share = 0.5
         self.co2_share = 0.5
 
+        # Representation of the piecewise linear curves.
+        self.pw_repn = 'CC'
+
         # Update the input parameters by the user.
         self.set_parameters(params)
+        # Flows of the former electric and thermal nodes.
+        self.rename_legacy_flows([self.name + '_electric', self.name + '_thermal'])
 
         if self.ch4_share + self.co2_share != 1:
             raise ValueError("addition of all shares must be 1")
@@ -270,19 +276,8 @@ class GasEngineChpBiogas(Component):
                 self.bp_eff_th[i_bp] * self.heating_value_bg * 1000
             self.bp_energy_th.append(this_energy_th)
 
-        # While we will create two oemof components, one for thermal energy and
-        # one for electrical energy, and make a constraint that both inflows of
-        # hydrogen have to be the same, each component will get only half the
-        # amount of hydrogen. Therefore we need to make a list of hydrogen
-        # consumed that is halfed [kg]
-        self.bp_bg_consumed_el_half = [
-            this_bp / 2 for this_bp in self.bp_bg_consumed_el]
-        self.bp_bg_consumed_th_half = [
-            this_bp / 2 for this_bp in self.bp_bg_consumed_th]
-
-        # Save the two models to set constraints later.
-        self.model_el = None
-        self.model_th = None
+        # Save the oemof component.
+        self.model = None
 
     def get_electrical_energy_by_bg(self, bg_consumption):
         """Gets the electrical energy produced by the according biogas production value.
@@ -290,9 +285,8 @@ class GasEngineChpBiogas(Component):
         :param bg_consumption: biogas production value [kg]
         :return: according electrical energy value [Wh]
         """
-        # Check the index of this load point.
-        this_index = self.bp_bg_consumed_el_half.index(bg_consumption)
-        return self.bp_energy_el[this_index]
+        # Interpolate between the load points.
+        return np.interp(bg_consumption, self.bp_bg_consumed_el, self.bp_energy_el)
 
     def get_thermal_energy_by_bg(self, bg_consumption):
         """Gets the thermal energy produced by the according biogas production value.
@@ -300,97 +294,34 @@ class GasEngineChpBiogas(Component):
         :param bg_consumption: biogas production value [kg]
         :return: according thermal energy value [Wh]
         """
-        # Check the index of this load point.
-        this_index = self.bp_bg_consumed_th_half.index(bg_consumption)
-        return self.bp_energy_th[this_index]
+        # Interpolate between the load points.
+        return np.interp(bg_consumption, self.bp_bg_consumed_th, self.bp_energy_th)
 
     def add_to_oemof_model(self, busses, model):
-        """Creates two separate oemof Piecewise Linear Transformer components for the
-        electrical and thermal production of the biogas CHP from information given
-        in the GasEngineChpBiogas class, to be used in the oemof model
+        """Creates a multi-output piecewise linear transformer for the electrical and
+        thermal production of the biogas CHP from information given in the
+        GasEngineChpBiogas class, to be used in the oemof model
 
         :param busses: virtual buses used in the energy system
         :type busses: dict
         :param model: oemof model containing the electrical energy production and
             thermal energy production of the biogas CHP
         :type model: model
-        :return: tuple of electric and biogas oemof components
-        """
-        # Create the non-linear oemof component. The CHP has to be modelled as
-        # two components, while the piecewise linear transformer does not
-        # accept 2 outputs yet.
-        # TODO: adjust once the piecewise linear transformer allows 2 outputs
-
-        flow_electric = solph.Flow(
-            nominal_value=self.bp_bg_consumed_el_half[-1],
-            variable_costs=0)
-        flow_thermal = solph.Flow(nominal_value=self.bp_bg_consumed_el_half[-1])
-
-        # First create the electrical oemof component.
-        gas_engine_chp_biogas_electric = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_electric',
-            inputs={busses[self.bus_bg]: flow_electric},
-            outputs={busses[self.bus_el]: solph.Flow()},
-            in_breakpoints=self.bp_bg_consumed_el_half,
-            conversion_function=self.get_electrical_energy_by_bg,
-            pw_repn='CC')
-
-        # Then create the thermal oemof component.
-        gas_engine_chp_biogas_thermal = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_thermal',
-            inputs={busses[self.bus_bg]: flow_thermal},
-            outputs={busses[self.bus_th]: solph.Flow()},
-            in_breakpoints=self.bp_bg_consumed_th_half,
-            conversion_function=self.get_thermal_energy_by_bg,
-            pw_repn='CC')
-
-        # Add the two components to the model.
-        model.add(gas_engine_chp_biogas_electric, gas_engine_chp_biogas_thermal)
-
-        self.model_el = gas_engine_chp_biogas_electric
-        self.model_th = gas_engine_chp_biogas_thermal
-        return (gas_engine_chp_biogas_electric, gas_engine_chp_biogas_thermal)
-
-    def update_constraints(self, busses, model_to_solve):
-        """Set a constraint so that the biogas inflow of the electrical and
-        the thermal part are always the same (which is necessary while the
-        piecewise linear transformer cannot have two outputs yet and
-        therefore the two parts need to be separate components).
-
-        :param busses:
-        :param model_to_solve: The oemof model that will be solved
-        :type model_to_solve: model
-        """
-        def chp_ratio_rule_methane(model, t):
-            """Ensures that the flows going into the biogas CHP electricity production
-            component and those going into the biogas CHP thermal energy production
-            component are equal.
-
-            :param model: The oemof model containing the electrical energy production and
-                thermal energy production of the electrolyser
-            :type model: model
-            :param t: ?
-            :return: expression = 0
-            """
-            # Inverter flow
-            expr = 0
-            expr += model.flow[busses[self.bus_bg], self.model_th, t]
-            # force discharge to zero when grid available
-            expr += - model.flow[busses[self.bus_bg], self.model_el, t]
-            return (expr == 0)
-
-        setattr(model_to_solve,
-                'chp_flow_ratio_fix_methane_{}'.format(self.name.replace(' ', '')),
-                po.Constraint(model_to_solve.TIMESTEPS, rule=chp_ratio_rule_methane)
-                )
-
-    def update_flows(self, results):
-        """Updates the flows of the biogas CHP components for each time step.
-
-        :param results: The oemof results for the given time step
-        :type results: object
-        :return: updated flow values for each flow in the 'flows' dict
+        :return: oemof component
         """
-        # Check if the component has an attribute 'flows', if not, create it as an empty dict.
-        Component.update_flows(self, results, self.name + '_electric')
-        Component.update_flows(self, results, self.name + '_thermal')
+        gas_engine_chp_biogas = MultiOutputPiecewiseTransformer(
+            label=self.name,
+            inputs={busses[self.bus_bg]: solph.Flow(
+                nominal_value=self.bp_bg_consumed_el[-1],
+                variable_costs=0)},
+            outputs={busses[self.bus_el]: solph.Flow(), busses[self.bus_th]: solph.Flow()},
+            in_breakpoints=merge_breakpoints(self.bp_bg_consumed_el, self.bp_bg_consumed_th),
+            conversion_functions={
+                busses[self.bus_el]: self.get_electrical_energy_by_bg,
+                busses[self.bus_th]: self.get_thermal_energy_by_bg},
+            pw_repn=self.pw_repn)
+
+        model.add(gas_engine_chp_biogas)
+
+        self.model = gas_engine_chp_biogas
+        return gas_engine_chp_biogas
@@ -50,6 +50,7 @@ class Gate(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'Gate_default_name'
+        self.stateless = True
         self.max_input = 1e6
         # Busses
         self.bus_in = None
@@ -82,3 +83,17 @@ class Gate(Component):
 
         model.add(gate)
         return gate
+
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the conversion of the gate to the native linear
+        program of the interval, like the oemof Transformer.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(
+            self.bus_in, self.name,
+            nominal_value=self.max_input, variable_costs=self.artificial_costs)
+        native_model.add_flow(self.name, self.bus_out)
+        native_model.add_conversion(
+            self.name, [self.bus_in], [self.bus_out], {self.bus_out: self.efficiency})
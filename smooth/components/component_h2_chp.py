@@ -17,8 +17,8 @@ Concept
 *******
 The H2 CHP component has a hydrogen bus input and electrical and thermal
 bus outputs. Similarly to the fuel cell CHP component, the behaviour of
-the H2 CHP is non-linear and represented by oemof's Piecewise Linear
-Transformer component.
+the H2 CHP is non-linear and represented by a single multi-output piecewise
+linear transformer component.
 
 .. figure:: /images/fuel_cell_chp.png
     :width: 60 %
@@ -37,7 +37,9 @@ For more detailed information, visit :ref:`Fuel Cell CHP`
 
 from smooth.components.component import Component
 import oemof.solph as solph
-import pyomo.environ as po
+import numpy as np
+from smooth.framework.functions.piecewise import (
+    MultiOutputPiecewiseTransformer, merge_breakpoints)
 
 
 class H2Chp(Component):
@@ -53,6 +55,7 @@ class H2Chp(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'H2 CHP default name'
+        self.stateless = True
 
         # Busses (H2 in, electrical out, thermal out).
         self.bus_h2 = None
@@ -62,8 +65,13 @@ class H2Chp(Component):
         # Max. electrical output power [W].
         self.power_max = None
 
+        # Representation of the piecewise linear curves.
+        self.pw_repn = 'CC'
+
         # Update the input parameters by the user.
         self.set_parameters(params)
+        # Flows of the former electric and thermal nodes.
+        self.rename_legacy_flows([self.name + '_electric', self.name + '_thermal'])
 
         # INTERNAL PARAMETERS
         # Heating value of hydrogen [kWh/kg].
@@ -149,94 +157,41 @@ class H2Chp(Component):
                 self.bp_eff_thermal[i_bp] * self.heating_value * 1000
             self.bp_energy_thermal.append(this_energy_thermal)
 
-        # While we will create two oemof components, one for thermal energy and
-        # one for electrical energy, and make a constraint that both inflows of
-        # hydrogen have to be the same, each component will get only half the
-        # amount of hydrogen. Therefore we need to make a list of hydrogen
-        # consumed that is halfed [kg]
-        self.bp_h2_consumed_electric_half = [
-            this_bp / 2 for this_bp in self.bp_h2_consumed_electric]
-        self.bp_h2_consumed_thermal_half = [this_bp / 2 for this_bp in self.bp_h2_consumed_thermal]
-
-        # Save the two models to set constraints later.
-        self.model_el = None
-        self.model_th = None
+        # Save the oemof component.
+        self.model = None
 
     def get_electrical_energy_by_h2(self, h2_consumption):
-        # Check the index of this load point.
-        this_index = self.bp_h2_consumed_electric_half.index(h2_consumption)
-        # Return the according hydrogen production value [kg].
-        return self.bp_energy_electric[this_index]
+        # Interpolate between the load points [Wh].
+        return np.interp(h2_consumption, self.bp_h2_consumed_electric, self.bp_energy_electric)
 
     def get_thermal_energy_by_h2(self, h2_consumption):
-        # Check the index of this load point.
-        this_index = self.bp_h2_consumed_thermal_half.index(h2_consumption)
-        # Return the according hydrogen production value [kg].
-        return self.bp_energy_thermal[this_index]
+        # Interpolate between the load points [Wh].
+        return np.interp(h2_consumption, self.bp_h2_consumed_thermal, self.bp_energy_thermal)
 
     def add_to_oemof_model(self, busses, model):
-        """Creates a non-linear oemof Transformer component to be used in the oemof model
-
-        The CHP has to be modelled as two components
-        because the piecewise linear transformer does not accept 2 outputs yet.
+        """Creates a multi-output piecewise linear transformer component to be used
+        in the oemof model
 
         :param busses: virtual buses used in the energy system
         :type busses: dict
         :param model: current oemof model
         :type model: oemof model
-        :return: tuple of electric and thermal oemof components
+        :return: oemof component
         """
-
-        flow_electric = solph.Flow(
-            nominal_value=self.bp_h2_consumed_electric_half[-1],
-            variable_costs=0)
-        flow_thermal = solph.Flow(nominal_value=self.bp_h2_consumed_electric_half[-1])
-
-        # First create the electrical oemof component.
-        h2_chp_electric = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_electric',
-            inputs={busses[self.bus_h2]: flow_electric},
-            outputs={busses[self.bus_el]: solph.Flow()},
-            in_breakpoints=self.bp_h2_consumed_electric_half,
-            conversion_function=self.get_electrical_energy_by_h2,
-            pw_repn='CC')
-
-        # Then create the thermal oemof component.
-        h2_chp_thermal = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_thermal',
-            inputs={busses[self.bus_h2]: flow_thermal},
-            outputs={busses[self.bus_th]: solph.Flow()},
-            in_breakpoints=self.bp_h2_consumed_thermal_half,
-            conversion_function=self.get_thermal_energy_by_h2,
-            pw_repn='CC')
-
-        # Add the two components to the model.
-        model.add(h2_chp_electric, h2_chp_thermal)
-
-        self.model_el = h2_chp_electric
-        self.model_th = h2_chp_thermal
-
-        return (h2_chp_electric, h2_chp_thermal)
-
-    def update_constraints(self, busses, model_to_solve):
-        # Set a constraint so that the hydrogen inflow of the electrical and
-        # the thermal part are always the same (which is necessary while the
-        # piecewise linear transformer cannot have two outputs yet and
-        # therefore the two parts need to be separate components).
-        def chp_ratio_rule(model, t):
-            # Inverter flow
-            expr = 0
-            expr += model.flow[busses[self.bus_h2], self.model_th, t]
-            # force discharge to zero when grid available
-            expr += - model.flow[busses[self.bus_h2], self.model_el, t]
-            return (expr == 0)
-
-        setattr(model_to_solve,
-                'chp_flow_ratio_fix_{}'.format(self.name.replace(' ', '')),
-                po.Constraint(model_to_solve.TIMESTEPS, rule=chp_ratio_rule)
-                )
-
-    def update_flows(self, results):
-        # Check if the component has an attribute 'flows', if not, create it as an empty dict.
-        Component.update_flows(self, results, self.name + '_electric')
-        Component.update_flows(self, results, self.name + '_thermal')
+        h2_chp = MultiOutputPiecewiseTransformer(
+            label=self.name,
+            inputs={busses[self.bus_h2]: solph.Flow(
+                nominal_value=self.bp_h2_consumed_electric[-1],
+                variable_costs=0)},
+            outputs={busses[self.bus_el]: solph.Flow(), busses[self.bus_th]: solph.Flow()},
+            in_breakpoints=merge_breakpoints(
+                self.bp_h2_consumed_electric, self.bp_h2_consumed_thermal),
+            conversion_functions={
+                busses[self.bus_el]: self.get_electrical_energy_by_h2,
+                busses[self.bus_th]: self.get_thermal_energy_by_h2},
+            pw_repn=self.pw_repn)
+
+        model.add(h2_chp)
+
+        self.model = h2_chp
+        return h2_chp
@@ -62,6 +62,13 @@ class H2RefuelCoolingSystem(Component):
     :type column_title: str or int
     :param path: path where the timeseries csv file can be located
     :type path: str
+    :param csv_interval_time: time between two rows of the csv file in minutes,
+        the timeseries is resampled if it differs from the interval time.
+        Default is None (one row per interval)
+    :type csv_interval_time: numerical
+    :param csv_resample_method: 'sum' or 'mean' when resampling the timeseries,
+        default is 'sum' (hydrogen demand per timestep)
+    :type csv_resample_method: str
     :param cool_spec_energy: energy required to cool the refuelling station [kJ/kg]
     :type cool_spec_energy: numerical
     :param standby_energy: required standby energy [kJ/h]
@@ -86,12 +93,15 @@ class H2RefuelCoolingSystem(Component):
         Component.__init__(self)
         # ------------------- PARAMETERS -------------------
         self.name = 'H2_refuel_default_name'
+        self.stateless = True
         self.bus_el = None
         self.nominal_value = 1
         self.csv_filename = None
         self.csv_separator = ','
         self.column_title = 0
         self.path = os.path.dirname(__file__)
+        self.csv_interval_time = None
+        self.csv_resample_method = 'sum'
         self.cool_spec_energy = 730
         self.standby_energy = 8100
         self.life_time = 20
@@ -103,6 +113,11 @@ class H2RefuelCoolingSystem(Component):
         # ------------------- READ CSV FILES -------------------
         self.data = func.read_data_file(self.path, self.csv_filename,
                                         self.csv_separator, self.column_title)
+        if self.csv_interval_time is not None:
+            # resample the timeseries to the interval time of the simulation
+            self.data = func.resample_data(
+                self.data, self.csv_interval_time, self.sim_params.interval_time,
+                self.csv_resample_method)
 
         self.electrical_energy = \
             (self.data * self.cool_spec_energy + self.standby_energy) / 3.6
@@ -69,8 +69,10 @@ energy produced at each break point is calculated:
 
 Piecewise Linear Transformer
 ----------------------------
-The PEM electrolyzer component uses oemof's Piecewise Linear Tansformer
-component in a similar fashion to the fuel cell CHP and the biogas CHP.
+The PEM electrolyzer component uses a single multi-output piecewise linear
+transformer with the electrical input and the hydrogen and waste heat outputs
+in a similar fashion to the fuel cell CHP and the biogas CHP. The electrical
+input is limited to the load range covered by both efficiency curves.
 For more detail on the usage, visit the Fuel Cell CHP or Gas Engine
 CHP Biogas components.
 
@@ -82,8 +84,10 @@ Series: Earth and Environmental Science.
 """
 
 import oemof.solph as solph
+import numpy as np
+from smooth.framework.functions.piecewise import (
+    MultiOutputPiecewiseTransformer, merge_breakpoints)
 from .component import Component
-import pyomo.environ as po
 
 
 class PemElectrolyzer(Component):
@@ -100,6 +104,10 @@ class PemElectrolyzer(Component):
     :type power_max: numerical
     :param life_time: life time of the component [a]
     :type life_time: str
+    :param pw_repn: representation of the piecewise linear curves, 'CC', 'DCC' or 'LP'
+        or 'auto' for a linear program
+        (see :mod:`smooth.framework.functions.piecewise`). Defaults to 'CC'
+    :type pw_repn: str
     :param set_parameters(params): updates parameter default values
         (see generic Component class)
     :type set_parameters(params): function
@@ -123,16 +131,8 @@ class PemElectrolyzer(Component):
     :type bp_h2_production: list
     :param bp_waste_heat_energy: absolute waste heat energy values over the load points [Wh]
     :type bp_h2_production: list
-    :param bp_elec_consumed_h2_prod_half: half the amount of electricity that is
-        consumed [Wh]
-    :type bp_elec_consumed_h2_prod_half: list
-    :param bp_elec_consumed_waste_heat_half: half the amount of electricity that is
-        consumed [Wh]
-    :type bp_elec_consumed_h2_prod_half: list
-    :param model_h2: hydrogen production model to set constraints later
-    :type model_h2: model
-    :param model_th: waste heat model to set constraints later
-    :type model_th: model
+    :param model: oemof component of the PEM electrolyzer
+    :type model: :class:`~smooth.framework.functions.piecewise.MultiOutputPiecewiseTransformer`
     """
 
     def __init__(self, params):
@@ -143,6 +143,7 @@ class PemElectrolyzer(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'PEM_electrolyzer_default_name'
+        self.stateless = True
         self.bus_el = None
         self.bus_h2 = None
         self.bus_th = None
@@ -150,11 +151,15 @@ class PemElectrolyzer(Component):
         self.power_max = 6000000
         # Life time [a].
         self.life_time = 10
+        # Representation of the piecewise linear curves.
+        self.pw_repn = 'CC'
 
         # ToDo: check if pressure/temperature of electrolyzer should be included
 
         # Update the input parameters by the user.
         self.set_parameters(params)
+        # Flows of the former hydrogen and waste heat nodes.
+        self.rename_legacy_flows([self.name + '_h2_prod', self.name + '_waste_heat'])
 
         # INTERNAL PARAMETERS
         # Heating value of hydrogen [kWh/kg].
@@ -205,22 +210,8 @@ class PemElectrolyzer(Component):
                 * self.bp_eff_waste_heat[i_bp]
             self.bp_waste_heat_energy.append(this_waste_heat_energy)
 
-        # While we will create two oemof components, one for the e
-        # lectrolyzer producing hydrogen and one for the
-        # electrolyzer producing waste heat energy,
-        # and make a constraint that both inflows of electricity have to be
-        # the same, each component will get only half the amount of electricity.
-        # Therefore we need to make a list of
-        # electricity consumed that is halfed [Wh]
-        self.bp_elec_consumed_h2_prod_half = [this_bp / 2
-                                              for this_bp in self.bp_elec_consumed_h2_prod]
-        self.bp_elec_consumed_waste_heat_half = [this_bp / 2
-                                                 for this_bp in self.bp_elec_consumed_waste_heat]
-
-        # Save the two models to set constraints later
-        # (h2 for hydrogen production and th for waste heat energy).
-        self.model_h2 = None
-        self.model_th = None
+        # Save the oemof component.
+        self.model = None
 
     def get_h2_production_by_electricity(self, electricity_consumption):
         """Gets the hydrogen produced by the according electricity consumption
@@ -229,9 +220,9 @@ class PemElectrolyzer(Component):
         :param electricity_consumption: electrcity consumption value [Wh]
         :return: according hydrogen production value [kg]
         """
-        # Check the index of this load point.
-        this_index = self.bp_elec_consumed_h2_prod_half.index(electricity_consumption)
-        return self.bp_h2_production[this_index]
+        # Interpolate between the load points.
+        return np.interp(
+            electricity_consumption, self.bp_elec_consumed_h2_prod, self.bp_h2_production)
 
     def get_waste_heat_energy_by_electricity(self, electricity_consumption):
         """Gets the waste heat produced by the according electricity consumption
@@ -240,97 +231,36 @@ class PemElectrolyzer(Component):
         :param electricity_consumption: electrcity consumption value [Wh]
         :return: according waste heat value [Wh]
         """
-        # Check the index of this load point.
-        this_index = self.bp_elec_consumed_waste_heat_half.index(electricity_consumption)
-        # Return the according waste heat energy value [Wh]
-        return self.bp_waste_heat_energy[this_index]
+        # Interpolate between the load points [Wh].
+        return np.interp(electricity_consumption, self.bp_elec_consumed_waste_heat,
+                         self.bp_waste_heat_energy)
 
     def add_to_oemof_model(self, busses, model):
-        """Creates two separate oemof Piecewise Linear Transformer components for the
-        hydrogen and waste heat production of the PEM electrolyzer from information
-        given in the PEMElectrolyzer class, to be used in the oemof model
+        """Creates a multi-output piecewise linear transformer for the hydrogen and
+        waste heat production of the PEM electrolyzer from information given in the
+        PEMElectrolyzer class, to be used in the oemof model
 
         :param busses: virtual buses used in the energy system
         :type busses: dict
         :param model: oemof model containing the hydrogen production and
             waste heat production of the PEM electrolyzer
         :type model: model
-        :return: tuple of H2 and waste heat oemof components
+        :return: oemof component
         """
-        # The PEM electrolyzer has to be modelled as two components, while the
-        # piecewise linear transformer does not accept 2 outputs yet.
-
-        flow_h2 = solph.Flow(
-            nominal_value=self.bp_elec_consumed_h2_prod_half[-1],
-            variable_costs=0)
-        flow_waste_heat = solph.Flow(nominal_value=self.bp_elec_consumed_waste_heat_half[-1])
-
-        # First create the main PEM electrolyzer oemof component.
-        pem_electrolyzer_h2_prod = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_h2_prod',
-            inputs={busses[self.bus_el]: flow_h2},
-            outputs={busses[self.bus_h2]: solph.Flow()},
-            in_breakpoints=self.bp_elec_consumed_h2_prod_half,
-            conversion_function=self.get_h2_production_by_electricity,
-            pw_repn='CC')
-
-        # Then create the waste heat PEM electrolyzer oemof component.
-        pem_electrolyzer_waste_heat = solph.custom.PiecewiseLinearTransformer(
-            label=self.name + '_waste_heat',
-            inputs={busses[self.bus_el]: flow_waste_heat},
-            outputs={busses[self.bus_th]: solph.Flow()},
-            in_breakpoints=self.bp_elec_consumed_waste_heat_half,
-            conversion_function=self.get_waste_heat_energy_by_electricity,
-            pw_repn='CC')
-
-        # Add the two components to the model
-        model.add(pem_electrolyzer_h2_prod, pem_electrolyzer_waste_heat)
-
-        self.model_h2 = pem_electrolyzer_h2_prod
-        self.model_th = pem_electrolyzer_waste_heat
-
-        return (pem_electrolyzer_h2_prod, pem_electrolyzer_waste_heat)
-
-    def update_constraints(self, busses, model_to_solve):
-        """Set a constraint so that the electricity inflow of the hydrogen and
-        the waste heat part are always the same (which is necessary while the
-        piecewise linear transformer cannot have two outputs yet and
-        therefore the two parts need to be separate components).
-
-        :param busses:
-        :param model_to_solve:
-        :return:
-        """
-
-        def electrolyzer_ratio_rule(model, t):
-            """Ensures that the flows going into the PEM electrolyzer hydrogen production
-            component and those going into the PEM electrolyzer waste heat production
-            component are equal.
-
-            :param model: The oemof model containing the hydrogen production and waste
-                heat production of the electrolyzer
-            :type model: model
-            :param t: ?
-            :return: expression = 0
-            """
-            # Inverter flow
-            expr = 0
-            expr += model.flow[busses[self.bus_el], self.model_th, t]
-            expr += - model.flow[busses[self.bus_el], self.model_h2, t]
-            return (expr == 0)
-
-        setattr(model_to_solve,
-                'electrolyzer_flow_ratio_fix_{}'.format(self.name.replace(' ', '')),
-                po.Constraint(model_to_solve.TIMESTEPS, rule=electrolyzer_ratio_rule)
-                )
-
-    def update_flows(self, results):
-        """Updates the flows of the electrolyzer components for each time step.
-
-        ::param results: The oemof results for the given time step
-        :type results: object
-        :return: updated flow values for each flow in the 'flows' dict
-        """
-        # Check if the component has an attribute 'flows', if not, create it as an empty dict.
-        Component.update_flows(self, results, self.name + '_h2_prod')
-        Component.update_flows(self, results, self.name + '_waste_heat')
+        pem_electrolyzer = MultiOutputPiecewiseTransformer(
+            label=self.name,
+            inputs={busses[self.bus_el]: solph.Flow(
+                nominal_value=self.bp_elec_consumed_h2_prod[-1],
+                variable_costs=0)},
+            outputs={busses[self.bus_h2]: solph.Flow(), busses[self.bus_th]: solph.Flow()},
+            in_breakpoints=merge_breakpoints(
+                self.bp_elec_consumed_h2_prod, self.bp_elec_consumed_waste_heat),
+            conversion_functions={
+                busses[self.bus_h2]: self.get_h2_production_by_electricity,
+                busses[self.bus_th]: self.get_waste_heat_energy_by_electricity},
+            pw_repn=self.pw_repn)
+
+        model.add(pem_electrolyzer)
+
+        self.model = pem_electrolyzer
+        return pem_electrolyzer
@@ -63,6 +63,7 @@ class PowerConverter(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = "power converter default name"
+        self.stateless = True
         # Define the AC electric bus the converter is connected to
         self.bus_input = None
         # Define the DC electric bus the converter is connected to
@@ -96,3 +97,16 @@ class PowerConverter(Component):
 
         model.add(power_converter)
         return power_converter
+
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the conversion of the power converter to the native linear
+        program of the interval, like the oemof Transformer.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(self.bus_input, self.name)
+        native_model.add_flow(self.name, self.bus_output, nominal_value=self.output_power_max)
+        native_model.add_conversion(
+            self.name, [self.bus_input], [self.bus_output],
+            {self.bus_output: self.efficiency})
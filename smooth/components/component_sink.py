@@ -16,8 +16,10 @@ maximum input per time step are defined by the user. The default value is set
 to very high to represent a limitless capacity.
 """
 
+import numpy as np
 import oemof.solph as solph
 from .component import Component
+from smooth.framework.functions.feasibility import FlowBounds
 
 
 class Sink(Component):
@@ -46,6 +48,7 @@ class Sink(Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'Grid_default_name'
+        self.stateless = True
         self.input_max = 800000000
         self.bus_in = None
 
@@ -74,3 +77,23 @@ class Sink(Component):
 
         model.add(sink)
         return sink
+
+    def add_to_native_model(self, native_model):
+        """Adds the flow of the sink to the native linear program of the interval,
+        like the oemof Sink.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(
+            self.bus_in, self.name,
+            nominal_value=self.input_max, variable_costs=self.commodity_costs)
+
+    def get_flow_bounds(self):
+        """Gets the bounds of the flow into the sink, between zero and the maximum input.
+
+        :return: flow bounds at the input bus
+        :rtype: dict
+        """
+        input_max = np.inf if self.input_max is None else self.input_max
+        return {self.bus_in: FlowBounds(-input_max, 0)}
@@ -277,6 +277,25 @@ class StorageH2 (Component):
         model.add(storage)
         return storage
 
+    def add_to_native_model(self, native_model):
+        """Adds the flows and the storage balance of the storage to the native linear
+        program of the interval, like the oemof Generic Storage.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(
+            self.bus_in, self.name,
+            nominal_value=self.delta_max, variable_costs=self.current_vac[0])
+        native_model.add_flow(
+            self.name, self.bus_out,
+            nominal_value=self.delta_max, variable_costs=self.current_vac[1])
+        native_model.add_storage(
+            self.name, self.bus_in, self.bus_out,
+            nominal_storage_capacity=self.storage_capacity,
+            initial_storage_level=self.storage_level / self.storage_capacity,
+            min_storage_level=self.storage_level_min / self.storage_capacity)
+
     def update_states(self, results):
         """Updates the states of the storage component for each time step
 
@@ -292,8 +311,8 @@ class StorageH2 (Component):
             if i_result[1] == 'storage_content':
                 if 'storage_level' not in self.states:
                     # Initialize an array that tracks the state stored mass.
-                    self.states['storage_level'] = [None] * self.sim_params.n_intervals
-                    self.states['pressure'] = [None] * self.sim_params.n_intervals
+                    self.states['storage_level'] = self.new_series('storage_level')
+                    self.states['pressure'] = self.new_series('pressure')
                 # Check if this result is the storage capacity.
                 self.storage_level = df_storage[i_result][0]
                 self.states['storage_level'][self.sim_params.i_interval] = self.storage_level
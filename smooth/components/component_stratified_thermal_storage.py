@@ -69,6 +69,13 @@ class StratifiedThermalStorage (Component):
     :type column_title: str or int
     :param path: path where the timeseries csv file can be located
     :type path: str
+    :param csv_interval_time: time between two rows of the csv file in minutes,
+        the timeseries is resampled if it differs from the interval time.
+        Default is None (one row per interval)
+    :type csv_interval_time: numerical
+    :param csv_resample_method: 'sum' or 'mean' when resampling the timeseries,
+        default is 'mean' (temperatures)
+    :type csv_resample_method: str
     :param density: density of the storage medium [kg/m3]
     :type density: numerical
     :param heat_capacity: heat capacity of the storage medium [J/(kg*K)]
@@ -148,6 +155,8 @@ class StratifiedThermalStorage (Component):
         self.csv_separator = ','
         self.column_title = 0
         self.path = os.path.dirname(__file__)
+        self.csv_interval_time = None
+        self.csv_resample_method = 'mean'
 
         # ------------------- PARAMETERS TAKEN FROM OEMOF THERMAL EXAMPLE FILE -------------------
         self.density = 971.78
@@ -183,6 +192,11 @@ class StratifiedThermalStorage (Component):
             # The environment temperature timeseries [K}
             self.temp_env = func.read_data_file(
                 self.path, self.csv_filename, self.csv_separator, self.column_title)
+            if self.csv_interval_time is not None:
+                # resample the timeseries to the interval time of the simulation
+                self.temp_env = func.resample_data(
+                    self.temp_env, self.csv_interval_time, self.sim_params.interval_time,
+                    self.csv_resample_method)
             self.temp_env = self.temp_env[self.column_title].values.tolist()
             self.temp_env = [temp + 273.15 for temp in self.temp_env]
 
@@ -280,7 +294,7 @@ class StratifiedThermalStorage (Component):
             if i_result[1] == 'capacity':
                 if 'storage_level' not in self.states:
                     # Initialize an array that tracks the state stored mass.
-                    self.states['storage_level'] = [None] * self.sim_params.n_intervals
+                    self.states['storage_level'] = self.new_series('storage_level')
                 # Check if this result is the storage capacity.
                 self.storage_level = df_storage[i_result][0]
                 self.states['storage_level'][self.sim_params.i_interval] = self.storage_level
@@ -32,7 +32,9 @@ the storage does not entirely run out.
 """
 
 import oemof.solph as solph
+import numpy as np
 from .component import Component
+from smooth.framework.functions.feasibility import FlowBounds
 
 
 class Supply (Component):
@@ -67,6 +69,7 @@ class Supply (Component):
 
         # ------------------- PARAMETERS -------------------
         self.name = 'Grid_default_name'
+        self.stateless = True
         self.output_max = 8000000
         self.bus_out = None
 
@@ -128,3 +131,23 @@ class Supply (Component):
 
         model.add(from_grid)
         return from_grid
+
+    def add_to_native_model(self, native_model):
+        """Adds the flow of the supply to the native linear program of the interval,
+        like the oemof Source.
+
+        :param native_model: current native model
+        :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+        """
+        native_model.add_flow(
+            self.name, self.bus_out,
+            nominal_value=self.output_max, variable_costs=self.current_ac)
+
+    def get_flow_bounds(self):
+        """Gets the bounds of the supplied flow, between zero and the maximum output.
+
+        :return: flow bounds at the output bus
+        :rtype: dict
+        """
+        output_max = np.inf if self.output_max is None else self.output_max
+        return {self.bus_out: FlowBounds(0, output_max)}
@@ -81,10 +81,10 @@ class TrailerGate(Component):
         if 'variable_costs' not in self.results:
             # If this function is not overwritten in the component, then costs and art. costs are
             # not part of the component and therefore set to 0.
-            self.results['variable_costs'] = [0] * self.sim_params.n_intervals
-            self.results['art_costs'] = [0] * self.sim_params.n_intervals
+            self.results['variable_costs'] = self.new_series('variable_costs', 0)
+            self.results['art_costs'] = self.new_series('art_costs', 0)
             # A list is created for the flow switch values
-            self.flow_switch = [0] * self.sim_params.n_intervals
+            self.flow_switch = self.new_series('flow_switch', 0)
 
         if self.variable_costs is not None:
             this_dependency_value = self.flows[self.dependency_flow_costs][
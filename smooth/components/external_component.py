@@ -15,15 +15,14 @@ a basis for what all external components must have.
 Concept
 *******
 The costs (CAPEX and OPEX) and emissions of the external component are first calculated
-(see the :func:`~smooth.framework.functions.update_fitted_cost.update_financials` and
-:func:`~smooth.framework.functions.update_fitted_cost.update_emissions` functions), and
+(see the :class:`~smooth.framework.functions.update_fitted_cost.CostCurves` class), and
 then the annuities are calculated using the
 :func:`~smooth.framework.functions.update_annuities.update_external_annuities` function.
 It should be noted that these costs are not considered in the optimization results as
 they are evaluated seperately.
 """
 
-from smooth.framework.functions.update_fitted_cost import update_financials, update_emissions
+from smooth.framework.functions.update_fitted_cost import CostCurves
 from smooth.framework.functions.update_annuities import update_external_annuities
 
 
@@ -47,6 +46,8 @@ class ExternalComponent:
     :type op_emissions: dict
     :param fix_emissions: fixed emission values
     :type fix_emissions: dict
+    :param cost_curves: compiled capex, opex and emission dicts, set in *check_validity*
+    :type cost_curves: :class:`~smooth.framework.functions.update_fitted_cost.CostCurves`
     """
 
     def __init__(self):
@@ -60,6 +61,7 @@ class ExternalComponent:
         self.opex = dict()
         self.op_emissions = dict()
         self.fix_emissions = dict()
+        self.cost_curves = None
 
     def set_parameters(self, params):
         """Sets the parameters that have been defined by the user (in the model definition) in
@@ -86,13 +88,7 @@ class ExternalComponent:
 
         :return: Results for the calculated emissions, financials and annuities
         """
-        # Compute the CAPEX and then the OPEX results.
-        update_financials(self, self.capex)
-        update_financials(self, self.opex)
-        # Compute the emissions due to installation and operation.
-        update_emissions(self, self.fix_emissions)
-        update_emissions(self, self.op_emissions)
-        # Calculate the annuities of the CAPEX
+        # Calculate the annuities of the CAPEX and OPEX; and of the emission values
         update_external_annuities(self)
 
     def check_validity(self):
@@ -109,3 +105,5 @@ class ExternalComponent:
                                  ' but the life_time is either None or '
                                  'not greater than zero. Please choose another'
                                  ' life_time value!'.format(self.name))
+        # Compile the CAPEX, OPEX and emission dicts once.
+        self.cost_curves = CostCurves(self)
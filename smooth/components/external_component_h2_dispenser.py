@@ -62,6 +62,13 @@ class H2Dispenser(ExternalComponent):
     :type column_title: str or int
     :param path: path where the timeseries csv file can be located
     :type path: str
+    :param csv_interval_time: time between two rows of the csv file in minutes,
+        the timeseries is resampled if it differs from the interval time.
+        Default is None (one row per interval)
+    :type csv_interval_time: numerical
+    :param csv_resample_method: 'sum' or 'mean' when resampling the timeseries,
+        default is 'sum' (hydrogen demand per timestep)
+    :type csv_resample_method: str
     :param set_parameters(params): updates parameter default values
         (see generic Component class)
     :type set_parameters(params): function
@@ -99,6 +106,8 @@ class H2Dispenser(ExternalComponent):
         self.csv_separator = ','
         self.column_title = 0
         self.path = os.path.dirname(__file__)
+        self.csv_interval_time = None
+        self.csv_resample_method = 'sum'
 
         # ------------------- UPDATE PARAMETER DEFAULT VALUES -------------------
         self.set_parameters(params)
@@ -107,6 +116,11 @@ class H2Dispenser(ExternalComponent):
         # The demand csv file is read
         self.data = func.read_data_file(self.path, self.csv_filename,
                                         self.csv_separator, self.column_title)
+        if self.csv_interval_time is not None:
+            # resample the timeseries to the interval time of the simulation
+            self.data = func.resample_data(
+                self.data, self.csv_interval_time, self.sim_params.interval_time,
+                self.csv_resample_method)
 
         # ------------------- CALCULATED PARAMETERS -------------------
         self.max_hourly_h2_demand = self.data.values.max()
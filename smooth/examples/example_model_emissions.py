@@ -133,7 +133,7 @@ components.append({
     'bus_th': 'bth',
     'power_max': 500e3,
     'variable_emissions': 0.778,
-    'dependency_flow_emissions': ('fuel_cell_chp_electric', 'bel'),
+    'dependency_flow_emissions': ('fuel_cell_chp', 'bel'),
     'life_time': 20,
     'fix_emissions': {
         'key': ['free', 'spec'],
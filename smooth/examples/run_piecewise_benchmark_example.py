@@ -0,0 +1,70 @@
+"""
+This example compares the representations of the piecewise linear curves of the
+electrolyzers and CHPs (see :mod:`smooth.framework.functions.piecewise`).
+
+* The emissions example model (electrolyzer and fuel cell CHP) and the trailer example
+  model (three electrolyzers) are simulated for the first two days with the *pw_repn*
+  parameter of all components with piecewise linear curves set to each representation.
+  'auto' uses a linear program for concave curves and 'CC' otherwise. The fuel cell
+  CHP has several outputs, which only support 'CC', 'DCC' and 'LP'.
+
+* The duration of each simulation and the deviation of the total annuity from
+  the default representation 'CC' are printed.
+
+* The linear program is faster, but the electrolyzers of the emissions example are
+  used to get rid of excess electricity without producing hydrogen, so its results
+  differ (see :mod:`smooth.framework.functions.piecewise`). The representations with
+  binary variables describe the same curve, but the solver may return another optimal
+  solution of an interval, which changes the states for the following intervals.
+"""
+
+import copy
+import time
+
+from smooth.examples.example_model_emissions import mymodel as emissions_model
+from smooth.examples.example_model_trailer import mymodel as trailer_model
+
+from smooth import run_smooth
+
+PIECEWISE_COMPONENTS = [
+    'electrolyzer', 'electrolyzer_waste_heat', 'pem_electrolyzer',
+    'fuel_cell_chp', 'h2_chp', 'gas_engine_chp_biogas']
+
+
+def benchmark_pw_repn(model, pw_repn, n_intervals=48):
+    """Simulate a model with the given piecewise representation for all components
+    with piecewise linear curves.
+
+    :param model: smooth model
+    :type model: dict
+    :param pw_repn: piecewise representation
+    :type pw_repn: string
+    :param n_intervals: number of intervals to simulate. Defaults to 48
+    :type n_intervals: int, optional
+    :return: duration of the simulation in seconds and total annuity of all components
+    :rtype: tuple of floats
+    """
+    model = copy.deepcopy(model)
+    components = model['components']
+    if isinstance(components, dict):
+        components = components.values()
+    for component in components:
+        if component['component'] in PIECEWISE_COMPONENTS:
+            component['pw_repn'] = pw_repn
+    model['sim_params'].update({'n_intervals': n_intervals, 'print_progress': False})
+    start = time.time()
+    components, status = run_smooth(model)
+    duration = time.time() - start
+    return duration, sum(c.results['annuity_total'] for c in components)
+
+
+if __name__ == '__main__':
+    for name, model in [('emissions', emissions_model), ('trailer', trailer_model)]:
+        results = {}
+        for pw_repn in ['CC', 'auto', 'DCC']:
+            duration, annuity = benchmark_pw_repn(model, pw_repn)
+            results[pw_repn] = annuity
+            print('{} example, {}: {:.2f} s, total annuity {:.2f} '
+                  '(relative deviation from CC {:.2e})'.format(
+                      name, pw_repn, duration, annuity,
+                      (annuity - results['CC']) / results['CC']))
@@ -0,0 +1,46 @@
+"""
+This example compares the solvers available for a simulation in SMOOTH.
+
+* The electrical components example only consists of linear components, so with the
+  *solver* simulation parameter set to 'highs', each interval is solved in-process
+  by :func:`~smooth.framework.functions.lp_solver.solve_with_highs` instead of
+  calling the CBC executable.
+
+* Both simulations are timed and the difference of the total annuities is printed.
+"""
+
+import copy
+import time
+
+from smooth.examples.example_model_electrical_components import mymodel
+
+from smooth import run_smooth
+
+
+def benchmark_solver(model, solver):
+    """Simulate a model with the given solver.
+
+    :param model: smooth model
+    :type model: dict
+    :param solver: solver simulation parameter
+    :type solver: string
+    :return: duration of the simulation in seconds and total annuity of all components
+    :rtype: tuple of floats
+    """
+    model = copy.deepcopy(model)
+    model['sim_params'].update({'solver': solver, 'print_progress': False})
+    start = time.time()
+    components, status = run_smooth(model)
+    duration = time.time() - start
+    return duration, sum(c.results['annuity_total'] for c in components)
+
+
+if __name__ == '__main__':
+    n_intervals = mymodel['sim_params']['n_intervals']
+    results = {}
+    for solver in ['cbc', 'highs']:
+        duration, annuity = benchmark_solver(mymodel, solver)
+        results[solver] = annuity
+        print('{}: {:.2f} s ({:.1f} ms per interval), total annuity {:.2f}'.format(
+            solver, duration, 1000 * duration / n_intervals, annuity))
+    print('Difference of total annuity: {:.2e}'.format(results['highs'] - results['cbc']))
@@ -0,0 +1,162 @@
+"""Lockstep simulation of several smooth models.
+
+The individuals of an optimization usually share the same topology and time series
+and only differ in some parameters like sizes. :func:`run_smooth_batch` simulates
+a batch of such models in lockstep: for each interval, one oemof energy system is
+built that contains an independent copy of the components and busses of every model.
+The resulting block-diagonal (M)ILP is solved once and the results are handed back
+to the components of each model. This saves the overhead of building and solving
+one small model per interval and model.
+
+Example::
+
+    for components, status in run_smooth_batch([model_a, model_b]):
+        ...
+
+All models have to simulate the same time steps (*start_date*, *n_intervals* and
+*interval_time*). The results are the same as with :func:`~smooth.framework.run_smooth.run_smooth`,
+except for models with several optimal solutions, where the solver may return another one.
+If a single model is infeasible, the whole batch fails.
+
+.. note::
+    No lp file is written, and checkpoints and *parallel_intervals* are not used
+    in batch mode.
+"""
+
+import oemof.solph as solph
+
+from smooth.framework.simulation_parameters import SimulationParameters as sp
+from smooth.framework.exceptions import SolverNonOptimalError
+from smooth.framework.functions.functions import create_component_obj, convert_legacy_model
+from smooth.framework.functions.lp_solver import solve_model
+
+
+def get_batch_label(label, i_model):
+    """Get the unique oemof label of a node of a model in a batch.
+
+    :param label: label of the node in the model
+    :type label: string
+    :param i_model: index of the model in the batch
+    :type i_model: integer
+    :return: label with the index of the model as prefix
+    :rtype: string
+    """
+    return '{}/{}'.format(i_model, label)
+
+
+def get_model_results(results, nodes, i_model):
+    """Get the oemof results of one model of a batch, keyed by the label strings
+    used in the model (without the prefix of the batch).
+
+    :param results: oemof results of the batch
+    :type results: dict
+    :param nodes: ids of the oemof nodes of this model
+    :type nodes: set of integers
+    :param i_model: index of the model in the batch
+    :type i_model: integer
+    :return: oemof results of this model
+    :rtype: dict
+    """
+    prefix = get_batch_label('', i_model)
+    return {
+        tuple(None if node is None else str(node)[len(prefix):] for node in key): value
+        for key, value in results.items() if id(key[0]) in nodes}
+
+
+def run_smooth_batch(models):
+    """Simulate several smooth models in lockstep, with one oemof model per interval.
+
+    :param models: smooth models with the same time steps
+    :type models: list of dictionaries
+    :return: results of all components and oemof status of each model
+    :rtype: list of tuples of components and string
+    :raises: *SolverNonOptimalError* if oemof result is not ok and not optimal,
+        *ValueError* if the models do not simulate the same time steps
+    """
+    # ------------------- INITIALIZATION -------------------
+    all_sim_params = []
+    all_components = []
+    models = [convert_legacy_model(model) for model in models]
+    for model in models:
+        sim_params = sp(model['sim_params'])
+        all_sim_params.append(sim_params)
+        all_components.append(create_component_obj(model, sim_params))
+
+    if not models:
+        return []
+    date_time_index = all_sim_params[0].date_time_index
+    for sim_params in all_sim_params[1:]:
+        if not date_time_index.equals(sim_params.date_time_index):
+            raise ValueError('All models of a batch need the same time steps')
+
+    # ------------------- SIMULATION -------------------
+    status = None
+    for i_interval in range(all_sim_params[0].n_intervals):
+        if all_sim_params[0].print_progress:
+            print('Simulating interval {}/{}'.format(
+                i_interval + 1, all_sim_params[0].n_intervals))
+        for sim_params in all_sim_params:
+            sim_params.i_interval = i_interval
+
+        this_time_index = date_time_index[i_interval: (i_interval + 1)]
+        oemof_model = solph.EnergySystem(
+            timeindex=this_time_index, freq='{}min'.format(all_sim_params[0].interval_time))
+
+        # Add a copy of the busses and components of each model. The oemof labels have to
+        # be unique, so they get the index of the model as prefix. The nodes of each model
+        # are remembered to hand the results back to the right components.
+        all_busses = []
+        all_nodes = []
+        for i_model, (model, components) in enumerate(zip(models, all_components)):
+            n_nodes = len(oemof_model.entities)
+            busses = {}
+            for i_bus in model['busses']:
+                busses[i_bus] = solph.Bus(label=get_batch_label(i_bus, i_model))
+                oemof_model.add(busses[i_bus])
+            for this_comp in components:
+                this_comp.prepare_simulation(components)
+                name = this_comp.name
+                this_comp.name = get_batch_label(name, i_model)
+                try:
+                    this_comp.add_to_oemof_model(busses, oemof_model)
+                finally:
+                    this_comp.name = name
+            all_busses.append(busses)
+            all_nodes.append(set(id(node) for node in oemof_model.entities[n_nodes:]))
+
+        model_to_solve = solph.Model(oemof_model)
+
+        for i_model, (busses, components) in enumerate(zip(all_busses, all_components)):
+            for this_comp in components:
+                # Extra constraints are attributes of the oemof model named
+                # after the component, so the name has to be unique within the batch.
+                name = this_comp.name
+                this_comp.name = get_batch_label(name, i_model)
+                try:
+                    this_comp.update_constraints(busses, model_to_solve)
+                finally:
+                    this_comp.name = name
+
+        status, termination_condition = solve_model(model_to_solve, all_sim_params[0].solver)
+
+        # ------------------- CHECK IF SOLVING WAS SUCCESSFUL -------------------
+        if status != "ok" and termination_condition != "optimal":
+            raise SolverNonOptimalError('solver status: ' + status +
+                                        " / termination condition: " + termination_condition)
+
+        # ------------------- HANDLE RESULTS -------------------
+        results = solph.processing.results(model_to_solve)
+        for i_model, (nodes, components) in enumerate(zip(all_nodes, all_components)):
+            model_results = get_model_results(results, nodes, i_model)
+            for this_comp in components:
+                this_comp.update_flows(model_results)
+                this_comp.update_states(model_results)
+                this_comp.update_var_costs()
+                this_comp.update_var_emissions()
+
+    # Calculate the annuity for each component.
+    for components in all_components:
+        for this_comp in components:
+            this_comp.generate_results()
+
+    return [(components, status) for components in all_components]
@@ -0,0 +1,78 @@
+import os
+import pickle
+import pandas as pd
+from oemof.network.network import Node
+
+
+def get_component_state(component):
+    """Get all attributes of a component that can change during the simulation.
+
+    Input data (pandas objects), the simulation parameters and oemof objects
+    are skipped, as they are recreated from the model when resuming.
+
+    :param component: object of this component
+    :type component: :class:`~smooth.components.component.Component`
+    :return: attribute names and values of this component
+    :rtype: dict
+    """
+    return {
+        name: value for name, value in component.__dict__.items()
+        if name != 'sim_params' and not isinstance(value, (pd.DataFrame, pd.Series, Node))
+    }
+
+
+def save_checkpoint(file_name, components, sim_params):
+    """Save the states and accumulated results of all components after the current interval.
+
+    The file is written to a temporary file first and then renamed, so an
+    interruption while writing does not corrupt an existing checkpoint.
+
+    :param file_name: path of the checkpoint file
+    :type file_name: string
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param sim_params: simulation parameters, *i_interval* is the last finished interval
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    """
+    checkpoint = {
+        'i_interval': sim_params.i_interval,
+        'start_date': sim_params.start_date,
+        'n_intervals': sim_params.n_intervals,
+        'interval_time': sim_params.interval_time,
+        'components': {
+            this_comp.name: get_component_state(this_comp) for this_comp in components},
+    }
+    tmp_file_name = file_name + '.tmp'
+    with open(tmp_file_name, 'wb') as checkpoint_file:
+        pickle.dump(checkpoint, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file_name, file_name)
+
+
+def load_checkpoint(file_name, components, sim_params):
+    """Restore the states and accumulated results of all components from a checkpoint.
+
+    :param file_name: path of the checkpoint file
+    :type file_name: string
+    :param components: newly created components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param sim_params: simulation parameters of the simulation to be resumed
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :return: index of the last interval saved in the checkpoint
+    :rtype: integer
+    :raises ValueError: if the checkpoint does not match the model
+    """
+    with open(file_name, 'rb') as checkpoint_file:
+        checkpoint = pickle.load(checkpoint_file)
+
+    for param in ['start_date', 'n_intervals', 'interval_time']:
+        if checkpoint[param] != getattr(sim_params, param):
+            raise ValueError(
+                'The simulation parameter "{}" of the checkpoint ({}) does not match the model ({})'
+                .format(param, checkpoint[param], getattr(sim_params, param)))
+    if checkpoint['components'].keys() != {this_comp.name for this_comp in components}:
+        raise ValueError('The components of the checkpoint do not match the model')
+
+    for this_comp in components:
+        this_comp.__dict__.update(checkpoint['components'][this_comp.name])
+
+    return checkpoint['i_interval']
@@ -1,3 +1,18 @@
+"""Debug information for intervals in which the solver was not successful.
+
+With the *show_debug_flag* simulation parameter set, :func:`~smooth.framework.run_smooth`
+keeps a :class:`DebugSnapshot` of the last successful intervals in a
+:class:`DebugSnapshots` ring buffer: the labels and bounds of all flows and storages
+and the values of all variables as compact arrays, taken from the results that are
+computed anyway. The debug dataframe (see :func:`get_df_debug`) is only built from
+the latest snapshot if an interval fails, right before the
+:class:`~smooth.framework.exceptions.SolverNonOptimalError` is raised.
+"""
+
+from collections import deque
+
+import numpy as np
+import oemof.solph as solph
 import pandas as pd
 from smooth.framework.functions.plot_results import plot_smooth_results
 
@@ -24,7 +39,7 @@ def get_df_debug(df_results, results_dict, new_df_results):
     operation_vals = [
         [
             k,
-            x['scalars']['fixed'],
+            x['scalars'].get('fixed'),
             x['scalars']['min'] * x['scalars']['nominal_value'],
             x['scalars']['max'] * x['scalars']['nominal_value'],
         ] if 'nominal_value' in x['scalars'] else
@@ -83,3 +98,126 @@ def show_debug(df_debug, components):
     print("Saved to debugDataframe.csv")
 
     plot_smooth_results(components)
+
+
+class DebugSnapshot:
+    """Compact copy of the bounds and the solution of a successfully solved interval.
+
+    :param model_to_solve: solved oemof model of the interval
+    :type model_to_solve: :class:`oemof.solph.Model`
+    :param results: oemof results of the interval
+    :type results: dict
+    :var bound_keys: oemof tuple of labels of each flow with a nominal value and
+        of each storage
+    :type bound_keys: list of tuples
+    :var fixed: 1 if the flow is fixed, 0 if not and NaN for storages
+    :type fixed: numpy array
+    :var lower: absolute lower bound of each flow or storage level
+    :type lower: numpy array
+    :var upper: absolute upper bound of each flow or storage level
+    :type upper: numpy array
+    :var value_keys: oemof tuple of labels and variable name of each value
+    :type value_keys: list of tuples
+    :var values: values of the variables in the last time step of the interval
+    :type values: numpy array
+    """
+
+    def __init__(self, model_to_solve, results):
+        self.bound_keys = []
+        bounds = []
+        for (source, target), flow in model_to_solve.flows.items():
+            if flow.nominal_value is None:
+                continue
+            self.bound_keys.append((str(source), str(target)))
+            # oemof reads the sequences by time step like this
+            fix = flow.fix[0] if len(flow.fix) else None
+            if fix is not None and not pd.isnull(fix):
+                fix *= flow.nominal_value
+                bounds.append([1, fix, fix])
+            else:
+                bounds.append([0, flow.min[0] * flow.nominal_value,
+                               flow.max[0] * flow.nominal_value])
+        for node in model_to_solve.es.nodes:
+            capacity = getattr(node, 'nominal_storage_capacity', None)
+            if capacity is None:
+                continue
+            self.bound_keys.append((str(node),))
+            bounds.append([np.nan, node.min_storage_level[0] * capacity,
+                           node.max_storage_level[0] * capacity])
+        self.fixed, self.lower, self.upper = np.array(bounds, dtype=float).reshape(-1, 3).T
+
+        self.value_keys = []
+        values = []
+        for key, data in results.items():
+            oemof_tuple = tuple(str(node) for node in key if node is not None)
+            for variable_name, sequence in data['sequences'].items():
+                self.value_keys.append((oemof_tuple, variable_name))
+                values.append(sequence.values[-1])
+        self.values = np.array(values, dtype=float)
+
+    def get_results_dict(self):
+        """Get the bounds in the format of *oemof.processing.parameter_as_dict*,
+        with absolute values.
+
+        :return: scalars of each flow and storage, keyed by labels
+        :rtype: dict
+        """
+        results_dict = {}
+        for key, fixed, lower, upper in zip(self.bound_keys, self.fixed, self.lower, self.upper):
+            if len(key) == 2:
+                scalars = {'fixed': bool(fixed), 'min': lower, 'max': upper, 'nominal_value': 1}
+            else:
+                key = (key[0], None)
+                scalars = {'min_storage_level': lower, 'max_storage_level': upper,
+                           'nominal_storage_capacity': 1}
+            results_dict[key] = {'scalars': scalars}
+        return results_dict
+
+    def get_df_results(self):
+        """Get the values in the format of *oemof.processing.create_dataframe*.
+
+        :return: value, variable name and oemof tuple of each variable
+        :rtype: pandas dataframe
+        """
+        return pd.DataFrame({
+            'value': self.values,
+            'variable_name': [variable_name for _, variable_name in self.value_keys],
+            'oemof_tuple': [oemof_tuple for oemof_tuple, _ in self.value_keys]})
+
+
+class DebugSnapshots:
+    """Ring buffer of the snapshots of the last successfully solved intervals.
+
+    :param size: number of snapshots to keep. Defaults to 1
+    :type size: integer, optional
+    """
+
+    def __init__(self, size=1):
+        self.snapshots = deque(maxlen=size)
+
+    def add(self, model_to_solve, results):
+        """Add a snapshot of a successfully solved interval,
+        replacing the oldest one if the buffer is full.
+
+        :param model_to_solve: solved oemof model of the interval
+        :type model_to_solve: :class:`oemof.solph.Model`
+        :param results: oemof results of the interval
+        :type results: dict
+        """
+        self.snapshots.append(DebugSnapshot(model_to_solve, results))
+
+    def get_df_debug(self, model_to_solve):
+        """Build the debug dataframe of a failed interval from the latest snapshot.
+
+        :param model_to_solve: oemof model of the failed interval
+        :type model_to_solve: :class:`oemof.solph.Model`
+        :return: debug dataframe, see :func:`get_df_debug`
+        :rtype: pandas dataframe
+        :raises TypeError: if no interval was solved successfully yet
+        """
+        if not self.snapshots:
+            raise TypeError
+        snapshot = self.snapshots[-1]
+        return get_df_debug(
+            snapshot.get_df_results(), snapshot.get_results_dict(),
+            solph.processing.create_dataframe(model_to_solve))
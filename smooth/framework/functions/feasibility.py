@@ -0,0 +1,149 @@
+"""Static check if a model can be feasible, before it is simulated.
+
+Some configurations can never be simulated successfully, e.g. if a fixed demand
+exceeds the maximum output of all suppliers plus the energy stored in a battery.
+The solver only notices this in the interval where it happens, which may be late in the
+simulation. :func:`check_feasibility` compares the bounds of the flows into and out of
+each bus over the whole horizon without solving any model:
+
+* in each interval, the sum of the minimum net flows into a bus must not be positive
+  and the sum of the maximum net flows must not be negative,
+* the same holds for the energy summed up from the first interval to each interval.
+  For storages, this sum is limited by their stored energy and free capacity.
+
+Components describe their flows with :meth:`~smooth.components.component.Component.get_flow_bounds`.
+A bus connected to a component that does not (e.g. a converter) is not checked,
+so a model rejected by the check is certainly infeasible, but a model that passes
+may still be infeasible.
+"""
+
+import numpy as np
+
+# relative tolerance of the comparisons
+TOLERANCE = 1e-6
+
+
+class FlowBounds:
+    """Bounds of the net flow of a component into a bus, positive if flowing into the bus.
+
+    :param flow_min: minimum flow in each interval (array) or in all intervals (number)
+    :type flow_min: number or numpy array
+    :param flow_max: maximum flow in each interval (array) or in all intervals (number)
+    :type flow_max: number or numpy array
+    :param energy_min: minimum energy put into the bus from the start of the simulation,
+        e.g. the free capacity of a storage (negative). Defaults to None (no limit)
+    :type energy_min: number, optional
+    :param energy_max: maximum energy put into the bus from the start of the simulation,
+        e.g. the stored energy of a storage. Defaults to None (no limit)
+    :type energy_max: number, optional
+    """
+
+    def __init__(self, flow_min, flow_max, energy_min=None, energy_max=None):
+        self.flow_min = flow_min
+        self.flow_max = flow_max
+        self.energy_min = energy_min
+        self.energy_max = energy_max
+
+
+def get_connected_busses(component, busses):
+    """Get the busses a component is connected to, from its attributes with bus names.
+
+    :param component: component of the model
+    :type component: :class:`~smooth.components.component.Component`
+    :param busses: names of all busses of the model
+    :type busses: list of strings
+    :return: names of the connected busses
+    :rtype: set
+    """
+    connected = set()
+    for value in vars(component).values():
+        if isinstance(value, str) and value in busses:
+            connected.add(value)
+        elif isinstance(value, (list, tuple)):
+            connected.update(v for v in value if isinstance(v, str) and v in busses)
+    return connected
+
+
+def get_bound_series(bounds, n_intervals, hours):
+    """Get the flow and energy bounds of a component in each interval.
+
+    :param bounds: flow bounds of the component at one bus
+    :type bounds: :class:`FlowBounds`
+    :param n_intervals: number of intervals of the simulation
+    :type n_intervals: int
+    :param hours: duration of an interval [h]
+    :type hours: float
+    :return: minimum and maximum flow, minimum and maximum energy since the start,
+        and the magnitude of the finite flow bounds (scale of the tolerance)
+    :rtype: numpy array with 5 rows
+    """
+    series = np.empty((5, n_intervals))
+    for row, value in enumerate([bounds.flow_min, bounds.flow_max]):
+        value = np.nan_to_num(
+            np.asarray(value, dtype=float), nan=0, posinf=np.inf, neginf=-np.inf)
+        series[row] = np.broadcast_to(value, n_intervals)
+    series[2:4] = np.cumsum(series[0:2], axis=1) * hours
+    if bounds.energy_min is not None:
+        series[2] = np.maximum(series[2], bounds.energy_min)
+    if bounds.energy_max is not None:
+        series[3] = np.minimum(series[3], bounds.energy_max)
+    finite = np.isfinite(series[0:2])
+    series[4] = np.sum(np.abs(series[0:2], where=finite, out=np.zeros_like(series[0:2])), axis=0)
+    return series
+
+
+def check_feasibility(components, busses):
+    """Check if the flow bounds of the components can be balanced at every bus.
+
+    :param components: components of the model, before the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param busses: names of all busses of the model
+    :type busses: list of strings
+    :return: reason why the model is certainly infeasible, None if it may be feasible
+    :rtype: string or None
+    """
+    if not components:
+        return None
+    sim_params = components[0].sim_params
+    n_intervals = sim_params.n_intervals
+    hours = sim_params.interval_time / 60
+
+    bounds_by_bus = {bus: [] for bus in busses}
+    unchecked = set()
+    for this_comp in components:
+        try:
+            bounds = this_comp.get_flow_bounds()
+            if bounds is not None:
+                bounds = {
+                    bus: get_bound_series(bus_bounds, n_intervals, hours)
+                    for bus, bus_bounds in bounds.items()}
+        except Exception:
+            # e.g. a time series shorter than the simulation: reported by the simulation
+            bounds = None
+        if bounds is None:
+            unchecked.update(get_connected_busses(this_comp, busses))
+            continue
+        for bus, bus_bounds in bounds.items():
+            bounds_by_bus.setdefault(bus, []).append(bus_bounds)
+
+    for bus, all_bounds in bounds_by_bus.items():
+        if bus in unchecked or not all_bounds:
+            continue
+        flow_min, flow_max, energy_min, energy_max, scale = np.sum(all_bounds, axis=0)
+        tolerance = TOLERANCE * scale
+        energy_tolerance = np.cumsum(tolerance) * hours
+        for name, values, limit in [
+                ('flow', flow_min, tolerance), ('energy', energy_min, energy_tolerance)]:
+            i_interval = np.flatnonzero(values > limit)
+            if i_interval.size:
+                return 'Bus {}: minimum {} into the bus is positive ({:.6g}) in interval {}. ' \
+                    'The bus receives more than it can pass on.'.format(
+                        bus, name, values[i_interval[0]], i_interval[0] + 1)
+        for name, values, limit in [
+                ('flow', flow_max, tolerance), ('energy', energy_max, energy_tolerance)]:
+            i_interval = np.flatnonzero(values < -limit)
+            if i_interval.size:
+                return 'Bus {}: maximum {} into the bus is negative ({:.6g}) in interval {}. ' \
+                    'The demand exceeds what can be supplied.'.format(
+                        bus, name, values[i_interval[0]], i_interval[0] + 1)
+    return None
@@ -1,7 +1,10 @@
 import os
 import importlib
+import numpy as np
 import pandas as pd
 import re
+from smooth.framework.functions.shared_time_series import \
+    get_shared_time_series, record_time_series
 
 
 def read_data_file(path, filename, csv_separator, column_title):
@@ -19,11 +22,58 @@ def read_data_file(path, filename, csv_separator, column_title):
     :rtype: pandas dataframe
     """
     file_path = os.path.join(path, filename)
-    # create specific string for chosen data type
-    data = pd.read_csv(file_path, sep=csv_separator, usecols=[column_title], encoding='latin-1')
+    # time series may already be loaded into shared memory by the parent process
+    data = get_shared_time_series(file_path, csv_separator, column_title)
+    if data is None:
+        # create specific string for chosen data type
+        data = pd.read_csv(
+            file_path, sep=csv_separator, usecols=[column_title], encoding='latin-1')
+        record_time_series(file_path, csv_separator, column_title, data)
     return data
 
 
+def resample_data(data, data_interval_time, interval_time, method='mean'):
+    """Resample a time series to the interval time of the simulation.
+
+    The values are treated as constant within each row of the data.
+    With method 'mean' (e.g. powers or temperatures), each new value is the time weighted
+    mean over the new interval. With method 'sum' (e.g. energies or masses per time step),
+    each new value is the amount within the new interval, so the total is preserved.
+    Rows at the end that do not fill a whole new interval are dropped.
+
+    :param data: column of data, one row per *data_interval_time*
+    :type data: pandas dataframe
+    :param data_interval_time: length of one row of the data in minutes.
+        None if the data already has one row per interval
+    :type data_interval_time: number or None
+    :param interval_time: length of one time step of the simulation in minutes
+    :type interval_time: number
+    :param method: 'mean' or 'sum'. Defaults to 'mean'
+    :type method: string
+    :return: resampled column of data, one row per *interval_time*
+    :rtype: pandas dataframe
+    :raises ValueError: on unknown method
+    """
+    if method not in ['mean', 'sum']:
+        raise ValueError('Resample method "{}" not recognized. Please choose "mean" or "sum".'
+                         .format(method))
+    if data_interval_time is None or data_interval_time == interval_time:
+        return data
+
+    values = data.iloc[:, 0].values.astype(float)
+    # Integral of the data over time at the borders of the data rows and the new intervals.
+    data_borders = np.arange(len(values) + 1) * data_interval_time
+    integral = np.concatenate(([0], np.cumsum(values * data_interval_time)))
+    n_intervals = int(len(values) * data_interval_time // interval_time)
+    new_borders = np.arange(n_intervals + 1) * interval_time
+    amount = np.diff(np.interp(new_borders, data_borders, integral))
+    if method == 'mean':
+        new_values = amount / interval_time
+    else:
+        new_values = amount / data_interval_time
+    return pd.DataFrame({data.columns[0]: new_values})
+
+
 def get_date_time_index(start_date, n_intervals, step_size):
     """Function defining the parameters for perfect/myopic foresight.
 
@@ -70,8 +120,27 @@ def get_sim_time_span(n_interval, step_size):
     return n_interval * step_size
 
 
+def convert_legacy_model(model):
+    """Get a model with its components as dictionary. Legacy models (version < 0.2.0)
+    define their components as a list with an extra field *name* for each component.
+    The given model is not changed.
+
+    :param model: smooth model
+    :type model: dictionary
+    :return: the model itself or a shallow copy with the components as dictionary
+    :rtype: dictionary
+    """
+    if not isinstance(model['components'], list):
+        return model
+    components = {}
+    for this_comp in model['components']:
+        this_comp = dict(this_comp)
+        components[this_comp.pop('name')] = this_comp
+    return dict(model, components=components)
+
+
 def create_component_obj(model, sim_params):
-    """Create components from model.
+    """Create components from model. The parameters of the model are not changed.
 
     :param model: smooth model
     :type model: dictionary
@@ -84,9 +153,8 @@ def create_component_obj(model, sim_params):
     components = []
     for name, this_comp in model['components'].items():
         # Add simulation parameters to the components so they can be used
-        this_comp['sim_params'] = sim_params
-        # assign unique name
-        this_comp['name'] = name
+        # and assign unique name (on a copy, the model may be used by several simulations)
+        this_comp = dict(this_comp, sim_params=sim_params, name=name)
         # load the component class.
         this_comp_type = this_comp['component']
         # Component type should consist of lower case letters, numbers and underscores
@@ -245,47 +313,3 @@ def extract_flow_per_bus(smooth_result, name_label_dict):
         )
 
     return busses_to_plot
-
-
-def choose_valid_dict(component, var_dict):
-    """Function to select a valid dict (capex / fix_emissions) depending on the value
-    of an attribute of the specific component.
-
-    # todo: check opex and op_emissions
-
-    :param component: object of this component
-    :type component: class:`~smooth.components.component.Component`
-    :param var_dict: dict object (capex/fix_emissions) of this component
-    :type var_dict: dict
-    :return: Valid dictionary (capex/fix_emissions) for the actual value
-        of the depending parameter of the component
-    """
-
-    low_thresholds = [d['low_threshold'] for d in var_dict['var_dicts']]
-    high_thresholds = [d['high_threshold'] for d in var_dict['var_dicts']]
-    for i in range(len(low_thresholds)):
-        assert low_thresholds[i] < high_thresholds[i],\
-            'The threshold range of a variable_dict (capex or emissions) for component \''\
-            + component.name + '\' is either zero or negative.'
-        if i < len(low_thresholds) - 1:
-            assert low_thresholds[i] <= low_thresholds[i + 1], \
-                'A variable_dict (capex or emissions) of component \'' \
-                + component.name + '\' is not defined with thresholds in ascending order.'
-            assert high_thresholds[i] <= low_thresholds[i + 1], \
-                'A variable_dict (capex or emissions) of component \'' \
-                + component.name + '\' has an overlap in its threshold definition.'
-
-    success = False
-    for i in range(len(var_dict['var_dicts'])):
-        if (getattr(component, var_dict['var_dict_dependency'])
-            >= var_dict['var_dicts'][i]['low_threshold']) & \
-            (getattr(component, var_dict['var_dict_dependency'])
-             < var_dict['var_dicts'][i]['high_threshold']):
-            var_dict = var_dict['var_dicts'][i]
-            success = True
-            break
-    assert success, \
-        'No suitable capex / fix_emissions found for component ' + component.name + ' with ' + \
-        var_dict['var_dict_dependency'] + ' = ' \
-        + str(getattr(component, var_dict['var_dict_dependency']))
-    return var_dict
@@ -0,0 +1,221 @@
+"""Solve the oemof model of an interval.
+
+By default, each interval is solved by the `cbc` executable, called by Pyomo.
+This needs a separate installation of CBC and costs starting a new process per interval.
+With the *solver* simulation parameter set to 'highs', models without integer
+variables (no piecewise linear or nonconvex components) are solved in the same process:
+the linear program is assembled as sparse matrices and solved with
+*scipy.optimize.linprog* (method 'highs'). The solution is written back to the
+variables of the model, so the results are processed just like those of CBC.
+Mixed-integer models are still solved by CBC.
+
+Pyomo keeps the temporary files of a CBC call (lp file, solution file) on one stack per
+process and deletes the topmost entry when the solver returns, which may belong to a call
+of another thread. So that several simulations can run in threads of the same process,
+the lp file is written by smooth and solved with explicit file names in a temporary
+directory per call (see :func:`solve_with_cbc`). CBC is called without signal handlers
+from other threads, as these can only be set by the main thread
+(see :func:`prepare_solver_threads`).
+"""
+
+import os
+import tempfile
+import threading
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+from pyomo.core import Var, Constraint, Objective, SOSConstraint, minimize, value
+from pyomo.opt import SolverFactory
+from pyomo.repn import generate_standard_repn
+
+SOLVERS = ['cbc', 'highs']
+
+
+def prepare_solver_threads():
+    """Prepare solver calls from threads other than the main thread.
+    Must be called by the main thread: when the first CBC solver is created, Pyomo runs
+    CBC to check its version and sets signal handlers for this.
+    """
+    SolverFactory('cbc')
+
+
+def is_linear_program(model_to_solve):
+    """Check if a model can be solved without integer variables.
+
+    :param model_to_solve: oemof model that will be solved
+    :type model_to_solve: :class:`oemof.solph.Model`
+    :return: True if all variables are continuous and there are no SOS constraints
+    :rtype: boolean
+    """
+    if any(True for _ in model_to_solve.component_data_objects(SOSConstraint, active=True)):
+        return False
+    return all(var.is_continuous() for var in model_to_solve.component_data_objects(Var))
+
+
+def get_lp_matrices(model_to_solve):
+    """Assemble the linear program of a model as sparse matrices.
+
+    The model is described as: minimize *c \\* x + c0* subject to *A_ub \\* x <= b_ub*,
+    *A_eq \\* x = b_eq* and the bounds of *x*. Fixed variables are treated as constants.
+
+    :param model_to_solve: oemof model without integer variables
+    :type model_to_solve: :class:`oemof.solph.Model`
+    :return: dictionary with the variables, *c*, *c0*, *A_ub*, *b_ub*, *A_eq*, *b_eq*
+        and *bounds*
+    :rtype: dict
+    :raises ValueError: if an expression is not linear
+    """
+    variables = [var for var in model_to_solve.component_data_objects(Var) if not var.fixed]
+    var_index = {id(var): i for i, var in enumerate(variables)}
+
+    def get_repn(expr, name):
+        repn = generate_standard_repn(expr, compute_values=True)
+        if not repn.is_linear():
+            raise ValueError('Expression of {} is not linear'.format(name))
+        columns = [var_index[id(var)] for var in repn.linear_vars]
+        return columns, list(repn.linear_coefs), repn.constant
+
+    # Objective: minimize (oemof models always minimize).
+    objectives = list(model_to_solve.component_data_objects(Objective, active=True))
+    c = np.zeros(len(variables))
+    c0 = 0
+    for objective in objectives:
+        sign = 1 if objective.sense == minimize else -1
+        columns, coefs, constant = get_repn(objective.expr, objective.name)
+        np.add.at(c, columns, sign * np.array(coefs, dtype=float))
+        c0 += sign * constant
+
+    # Constraints: lower <= body <= upper, split into rows of A_eq and A_ub.
+    rows = {'eq': ([], [], [], []), 'ub': ([], [], [], [])}
+    for constraint in model_to_solve.component_data_objects(Constraint, active=True):
+        columns, coefs, constant = get_repn(constraint.body, constraint.name)
+        lower = constraint.lower
+        upper = constraint.upper
+        bounds = []
+        if constraint.equality:
+            bounds.append(('eq', 1, lower))
+        else:
+            if upper is not None:
+                bounds.append(('ub', 1, upper))
+            if lower is not None:
+                bounds.append(('ub', -1, lower))
+        for kind, sign, bound in bounds:
+            data, row_index, col_index, rhs = rows[kind]
+            row_index += [len(rhs)] * len(columns)
+            col_index += columns
+            data += [sign * coef for coef in coefs]
+            rhs.append(sign * (value(bound) - constant))
+
+    matrices = {'variables': variables, 'c': c, 'c0': c0}
+    for kind in ['eq', 'ub']:
+        data, row_index, col_index, rhs = rows[kind]
+        matrices['A_' + kind] = coo_matrix(
+            (data, (row_index, col_index)), shape=(len(rhs), len(variables))).tocsr()
+        matrices['b_' + kind] = np.array(rhs, dtype=float)
+    matrices['bounds'] = [(var.lb, var.ub) for var in variables]
+    return matrices
+
+
+def get_linprog_status(result):
+    """Translate the status of *scipy.optimize.linprog* to the solver status and
+    termination condition of Pyomo.
+
+    :param result: result of *scipy.optimize.linprog*
+    :type result: :class:`scipy.optimize.OptimizeResult`
+    :return: solver status and termination condition
+    :rtype: tuple of strings
+    """
+    if result.status == 0:
+        return 'ok', 'optimal'
+    if result.status == 2:
+        return 'warning', 'infeasible'
+    if result.status == 3:
+        return 'warning', 'unbounded'
+    return 'error', 'other'
+
+
+def solve_with_highs(model_to_solve):
+    """Solve a linear oemof model in-process with the HiGHS solver of SciPy.
+    The values of the solution are written to the variables of the model.
+
+    :param model_to_solve: oemof model without integer variables
+    :type model_to_solve: :class:`oemof.solph.Model`
+    :return: solver status and termination condition (like Pyomo)
+    :rtype: tuple of strings
+    """
+    matrices = get_lp_matrices(model_to_solve)
+    variables = matrices['variables']
+    result = linprog(
+        matrices['c'],
+        A_ub=matrices['A_ub'] if matrices['A_ub'].shape[0] else None,
+        b_ub=matrices['b_ub'] if matrices['A_ub'].shape[0] else None,
+        A_eq=matrices['A_eq'] if matrices['A_eq'].shape[0] else None,
+        b_eq=matrices['b_eq'] if matrices['A_eq'].shape[0] else None,
+        bounds=matrices['bounds'] if variables else None,
+        method='highs')
+
+    status = get_linprog_status(result)
+    if status != ('ok', 'optimal'):
+        return status
+
+    for var, (lower, upper), var_value in zip(variables, matrices['bounds'], result.x):
+        # HiGHS may violate the bounds by its tolerance, which Pyomo does not accept.
+        if lower is not None:
+            var_value = max(var_value, lower)
+        if upper is not None:
+            var_value = min(var_value, upper)
+        var.value = var_value
+    return 'ok', 'optimal'
+
+
+def solve_model(model_to_solve, solver='cbc'):
+    """Solve the oemof model of an interval.
+
+    :param model_to_solve: oemof model that will be solved
+    :type model_to_solve: :class:`oemof.solph.Model`
+    :param solver: 'cbc' or 'highs' (in-process for linear models, else CBC).
+        Defaults to 'cbc'
+    :type solver: string, optional
+    :return: solver status and termination condition
+    :rtype: tuple of strings
+    :raises ValueError: on unknown solver
+    """
+    if solver not in SOLVERS:
+        raise ValueError('Solver "{}" not recognized. Please choose one of {}.'
+                         .format(solver, SOLVERS))
+
+    if solver == 'highs' and is_linear_program(model_to_solve):
+        return solve_with_highs(model_to_solve)
+
+    return solve_with_cbc(model_to_solve)
+
+
+def solve_with_cbc(model_to_solve):
+    """Solve an oemof model with the CBC executable.
+    The lp file, solution file and log file of the call are written to a new temporary
+    directory, which is removed afterwards. As no file is created by Pyomo's tempfile
+    manager, calls from several threads do not touch each other's files and CBC runs
+    concurrently.
+
+    :param model_to_solve: oemof model that will be solved
+    :type model_to_solve: :class:`oemof.solph.Model`
+    :return: solver status and termination condition
+    :rtype: tuple of strings
+    """
+    solve_kwargs = {'tee': False}
+    if threading.current_thread() is not threading.main_thread():
+        # signal handlers can only be set by the main thread
+        solve_kwargs['use_signal_handling'] = False
+    with tempfile.TemporaryDirectory(prefix='smooth_cbc_') as tmp_dir:
+        lp_file_name, symbol_map_id = model_to_solve.write(
+            os.path.join(tmp_dir, 'model.lp'), io_options={'symbolic_solver_labels': False})
+        # CBC writes the solution next to the lp file.
+        solver_results = SolverFactory('cbc').solve(
+            lp_file_name, logfile=os.path.join(tmp_dir, 'cbc.log'), **solve_kwargs)
+    # Load the solution like Pyomo does when solving the model itself.
+    solver_results._smap_id = symbol_map_id
+    model_to_solve.solutions.load_from(solver_results)
+    model_to_solve.es.results = solver_results
+    model_to_solve.solver_results = solver_results
+    return (str(solver_results["Solver"][0]["Status"]),
+            str(solver_results["Solver"][0]["Termination condition"]))
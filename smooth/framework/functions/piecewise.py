@@ -0,0 +1,408 @@
+"""Piecewise linear transformers with a representation chosen per component.
+
+The electrolyzers and CHP components describe their conversion by a curve
+through supporting points (breakpoints). oemof's *PiecewiseLinearTransformer*
+models this curve with the 'CC' representation of Pyomo's *Piecewise*, which adds
+binary variables to every interval. In addition, all of its nodes in a model have
+to use the same representation.
+
+These components create a :class:`PiecewiseTransformer` instead. Its representation
+is set by the *pw_repn* parameter of the component:
+
+- 'CC' (default), 'DCC', 'DLOG', 'LOG' or 'MC': the representations of Pyomo's
+  *Piecewise* with binary variables. 'LOG' and 'DLOG' need 2^n + 1 breakpoints.
+  The representations with SOS constraints are not available, as the CBC interface
+  of Pyomo does not support them.
+- 'LP': the output is bounded by the line through each segment of the curve::
+
+    output <= value_i + slope_i * (input - breakpoint_i)
+
+  This is a pure linear program, so no branching is needed, and it can be solved
+  in-process by the 'highs' solver. It needs a concave curve (the efficiency does not
+  increase with the load, equivalent to a convex input curve of the output).
+  The solution is only on the curve if producing less output from the same input is
+  never better for the optimization. This is not the case if the component can be
+  used to get rid of its input, e.g. excess electricity that otherwise has costs.
+- 'auto': 'LP' for concave curves and 'CC' for all others.
+
+Components with several outputs of the same input (the CHPs and electrolyzers with
+waste heat) create one :class:`MultiOutputPiecewiseTransformer`. All of its outputs
+are interpolated with the same weights of the breakpoints, so the binary variables are
+only needed once per node. Its representation is 'CC', 'DCC', 'LP' (all curves
+concave) or 'auto' (see :data:`MULTI_OUTPUT_PW_REPNS`). With 'LP', each output is
+bounded by its curve on its own, so an output that can be discarded for free
+(e.g. heat) may be below its curve.
+
+The example run_piecewise_benchmark_example compares the solve time and results of
+the representations for the shipped example models.
+"""
+
+import oemof.solph as solph
+from oemof.network import network as on
+from pyomo.core.base.block import SimpleBlock
+from pyomo.environ import (
+    Binary, BuildAction, Constraint, NonNegativeReals, Piecewise, Set, Var)
+
+PW_REPNS = ['auto', 'LP', 'CC', 'DCC', 'DLOG', 'LOG', 'MC']
+MULTI_OUTPUT_PW_REPNS = ['auto', 'LP', 'CC', 'DCC']
+
+
+def get_slopes(points, values):
+    """Get the slopes of the segments of a piecewise linear curve.
+
+    :param points: breakpoints (increasing)
+    :type points: list of numerical
+    :param values: values of the curve at the breakpoints
+    :type values: list of numerical
+    :return: slope of each segment
+    :rtype: list of floats
+    """
+    return [(values[i + 1] - values[i]) / (points[i + 1] - points[i])
+            for i in range(len(points) - 1)]
+
+
+def is_concave(points, values, rel_tol=1e-9):
+    """Check if a piecewise linear curve is concave (non-increasing slopes).
+
+    :param points: breakpoints (increasing)
+    :type points: list of numerical
+    :param values: values of the curve at the breakpoints
+    :type values: list of numerical
+    :param rel_tol: tolerance relative to the largest slope. Defaults to 1e-9
+    :type rel_tol: numerical, optional
+    :return: True if the curve is concave, False if not or if it has steps
+    :rtype: boolean
+    """
+    if any(point_1 >= point_2 for point_1, point_2 in zip(points, points[1:])):
+        return False
+    slopes = get_slopes(points, values)
+    tol = rel_tol * max([abs(slope) for slope in slopes] + [1])
+    return all(slope_2 <= slope_1 + tol for slope_1, slope_2 in zip(slopes, slopes[1:]))
+
+
+def get_pw_repn(pw_repn, points, values):
+    """Get the representation to use for a piecewise linear curve.
+
+    :param pw_repn: chosen representation (see :data:`PW_REPNS`)
+    :type pw_repn: string
+    :param points: breakpoints (increasing)
+    :type points: list of numerical
+    :param values: values of the curve at the breakpoints
+    :type values: list of numerical
+    :return: 'LP' or the representation of Pyomo's *Piecewise*
+    :rtype: string
+    :raises ValueError: if the representation is unknown, if 'LP' is chosen
+        for a curve that is not concave or if 'LOG' or 'DLOG' is chosen for a number
+        of breakpoints that is not 2^n + 1
+    """
+    if pw_repn not in PW_REPNS:
+        raise ValueError('Piecewise representation "{}" not recognized. Please choose one '
+                         'of {}.'.format(pw_repn, PW_REPNS))
+    concave = is_concave(points, values)
+    if pw_repn == 'auto':
+        return 'LP' if concave else 'CC'
+    if pw_repn == 'LP' and not concave:
+        raise ValueError('The piecewise representation "LP" needs a concave curve')
+    n_segments = len(points) - 1
+    if pw_repn in ['LOG', 'DLOG'] and (n_segments < 1 or n_segments & (n_segments - 1)):
+        raise ValueError('The piecewise representation "{}" needs 2^n + 1 breakpoints, '
+                         'not {}'.format(pw_repn, len(points)))
+    return pw_repn
+
+
+def merge_breakpoints(*breakpoints):
+    """Merge the breakpoints of several curves over the same input.
+
+    :param breakpoints: breakpoints (increasing) of each curve
+    :type breakpoints: lists of numerical
+    :return: all breakpoints within the range covered by every curve, including its limits
+    :rtype: list of numerical
+    """
+    lower = max(min(points) for points in breakpoints)
+    upper = min(max(points) for points in breakpoints)
+    return sorted({lower, upper} | {
+        point for points in breakpoints for point in points if lower <= point <= upper})
+
+
+class PiecewiseTransformer(solph.custom.PiecewiseLinearTransformer):
+    """Transformer with one input and one output and a piecewise linear conversion
+    function, like :class:`oemof.solph.custom.PiecewiseLinearTransformer`, but with
+    the representation *pw_repn* chosen per node (see :data:`PW_REPNS`).
+    Defaults to 'CC'.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('pw_repn', 'CC')
+        super().__init__(*args, **kwargs)
+        values = [self.conversion_function(point) for point in self.in_breakpoints]
+        self.pw_repn = get_pw_repn(self.pw_repn, self.in_breakpoints, values)
+
+    def constraint_group(self):
+        return PiecewiseTransformerBlock
+
+
+class PiecewiseTransformerBlock(SimpleBlock):
+    """Block for the relation of the input and output of all nodes of type
+    :class:`PiecewiseTransformer`. The nodes with the representation 'LP' get one
+    constraint per segment and time step, the nodes of each other representation
+    share one Pyomo *Piecewise*.
+    """
+
+    CONSTRAINT_GROUP = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def _create(self, group=None):
+        if group is None:
+            return None
+
+        m = self.parent_block()
+
+        self.PIECEWISETRANSFORMERS = Set(initialize=[n for n in group])
+
+        def get_inflow_bounds(model, n, t):
+            return min(n.in_breakpoints), max(n.in_breakpoints)
+
+        def get_outflow_bounds(model, n, t):
+            return (n.conversion_function(min(n.in_breakpoints)),
+                    n.conversion_function(max(n.in_breakpoints)))
+
+        self.inflow = Var(self.PIECEWISETRANSFORMERS, m.TIMESTEPS, bounds=get_inflow_bounds)
+        self.outflow = Var(self.PIECEWISETRANSFORMERS, m.TIMESTEPS, bounds=get_outflow_bounds)
+
+        def _in_equation(block, n, t):
+            return self.inflow[n, t] == m.flow[list(n.inputs.keys())[0], n, t]
+
+        self.equate_in = Constraint(
+            self.PIECEWISETRANSFORMERS, m.TIMESTEPS, rule=_in_equation)
+
+        def _out_equation(block, n, t):
+            return self.outflow[n, t] == m.flow[n, list(n.outputs.keys())[0], t]
+
+        self.equate_out = Constraint(
+            self.PIECEWISETRANSFORMERS, m.TIMESTEPS, rule=_out_equation)
+
+        # Concave curves: the output is bounded by the line through each segment.
+        self.SEGMENTS = Set(dimen=2, initialize=[
+            (n, i) for n in group if n.pw_repn == 'LP'
+            for i in range(len(n.in_breakpoints) - 1)])
+
+        def _segment_rule(block, n, i, t):
+            points = n.in_breakpoints[i:i + 2]
+            values = [n.conversion_function(point) for point in points]
+            slope = get_slopes(points, values)[0]
+            return self.outflow[n, t] <= values[0] + slope * (self.inflow[n, t] - points[0])
+
+        self.segment = Constraint(self.SEGMENTS, m.TIMESTEPS, rule=_segment_rule)
+
+        # Other curves: one Pyomo Piecewise per representation.
+        self.breakpoints = {}
+
+        def build_breakpoints(block, n):
+            for t in m.TIMESTEPS:
+                self.breakpoints[(n, t)] = n.in_breakpoints
+
+        self.breakpoint_build = BuildAction(self.PIECEWISETRANSFORMERS, rule=build_breakpoints)
+
+        def _conversion_function(block, n, t, x):
+            return n.conversion_function(x)
+
+        for pw_repn in sorted(set(n.pw_repn for n in group) - {'LP'}):
+            nodes = Set(initialize=[n for n in group if n.pw_repn == pw_repn])
+            self.add_component('PIECEWISETRANSFORMERS_' + pw_repn, nodes)
+            self.add_component('piecewise_' + pw_repn, Piecewise(
+                nodes, m.TIMESTEPS, self.outflow, self.inflow,
+                pw_repn=pw_repn, pw_constr_type='EQ',
+                pw_pts=self.breakpoints, f_rule=_conversion_function))
+
+
+class MultiOutputPiecewiseTransformer(on.Transformer):
+    """Transformer with one input and several outputs, each with a piecewise linear
+    conversion function of the input over the same breakpoints. The input and all
+    outputs are a convex combination of their values at the breakpoints with shared
+    weights, so the outputs are on their curves for the same input.
+
+    :param in_breakpoints: breakpoints of the input (increasing)
+    :type in_breakpoints: list of numerical
+    :param conversion_functions: output bus and function of the input giving the output
+        at the breakpoints
+    :type conversion_functions: dict
+    :param pw_repn: representation (see :data:`MULTI_OUTPUT_PW_REPNS`). 'auto' is 'LP'
+        if all curves are concave and 'CC' otherwise. Defaults to 'CC'
+    :type pw_repn: string, optional
+    :raises ValueError: if the node does not have one input and an output for each
+        conversion function, if the largest breakpoint is smaller than the nominal value
+        of the input or if the representation is not supported for these curves
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.in_breakpoints = list(kwargs.get('in_breakpoints'))
+        self.conversion_functions = kwargs.get('conversion_functions')
+        pw_repn = kwargs.get('pw_repn', 'CC')
+
+        if len(self.inputs) != 1 or set(self.outputs) != set(self.conversion_functions):
+            raise ValueError('Component "{}" needs one input and an output for each '
+                             'conversion function'.format(self.label))
+        nominal_value = list(self.inputs.values())[0].nominal_value
+        if nominal_value is not None and max(self.in_breakpoints) < nominal_value:
+            raise ValueError('Largest in_breakpoint of component "{}" must be larger or '
+                             'equal nominal value'.format(self.label))
+        if pw_repn not in MULTI_OUTPUT_PW_REPNS:
+            raise ValueError('Piecewise representation "{}" not supported for several '
+                             'outputs. Please choose one of {}.'.format(
+                                 pw_repn, MULTI_OUTPUT_PW_REPNS))
+
+        # values of each output at the breakpoints
+        self.out_values = {
+            bus: [function(point) for point in self.in_breakpoints]
+            for bus, function in self.conversion_functions.items()}
+        pw_repns = {get_pw_repn(pw_repn, self.in_breakpoints, values)
+                    for values in self.out_values.values()}
+        # a single curve that is not concave makes 'auto' use binary variables for all
+        self.pw_repn = pw_repns.pop() if len(pw_repns) == 1 else 'CC'
+
+    def constraint_group(self):
+        return MultiOutputPiecewiseTransformerBlock
+
+
+class MultiOutputPiecewiseTransformerBlock(SimpleBlock):
+    """Block for the relation of the input and outputs of all nodes of type
+    :class:`MultiOutputPiecewiseTransformer`.
+
+    For 'CC' and 'DCC' nodes, one binary variable per segment and time step
+    (*segment_active_<s>*) selects the active segment. With 'CC', there is one weight per
+    breakpoint (*weight_<k>*), which can only be positive next to the active segment.
+    With 'DCC', there are two weights per segment (*weight_<s>_<j>*), which add up to its
+    binary variable. The input and outputs are the sums of their values at the breakpoints
+    times the weights. The variables are indexed by node and time step like the other
+    variables of the nodes, so they are part of the results of the nodes.
+    For 'LP' nodes, each output is bounded by the line through each segment of its curve
+    and the input is bounded by the breakpoints.
+    """
+
+    CONSTRAINT_GROUP = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def _create(self, group=None):
+        if group is None:
+            return None
+
+        m = self.parent_block()
+
+        def get_inflow(n, t):
+            return m.flow[list(n.inputs.keys())[0], n, t]
+
+        def get_n_segments(n):
+            return len(n.in_breakpoints) - 1
+
+        self.MULTIOUTPUTPIECEWISETRANSFORMERS = Set(initialize=[n for n in group])
+
+        self.OUTPUTS = Set(dimen=2, initialize=[(n, o) for n in group for o in n.outputs])
+
+        # Binary variables of the active segment and weights of the breakpoints.
+        mip_nodes = [n for n in group if n.pw_repn != 'LP']
+
+        self.MIP_NODES = Set(initialize=mip_nodes)
+
+        n_max = max([get_n_segments(n) for n in mip_nodes] + [0])
+        for s in range(n_max):
+            self.add_component('segment_active_{}'.format(s), Var(
+                [n for n in mip_nodes if s < get_n_segments(n)], m.TIMESTEPS, within=Binary))
+            self.add_component('weight_{}'.format(s + 1), Var(
+                [n for n in mip_nodes if n.pw_repn == 'CC' and s < get_n_segments(n)],
+                m.TIMESTEPS, within=NonNegativeReals))
+            for j in range(2):
+                self.add_component('weight_{}_{}'.format(s, j), Var(
+                    [n for n in mip_nodes if n.pw_repn == 'DCC' and s < get_n_segments(n)],
+                    m.TIMESTEPS, within=NonNegativeReals))
+        self.weight_0 = Var(
+            [n for n in mip_nodes if n.pw_repn == 'CC'], m.TIMESTEPS, within=NonNegativeReals)
+
+        def segment_active(n, s, t):
+            return getattr(self, 'segment_active_{}'.format(s))[n, t]
+
+        def weighted_sum(n, t, values):
+            if n.pw_repn == 'CC':
+                return sum(getattr(self, 'weight_{}'.format(k))[n, t] * values[k]
+                           for k in range(len(values)))
+            return sum(getattr(self, 'weight_{}_{}'.format(s, j))[n, t] * values[s + j]
+                       for s in range(get_n_segments(n)) for j in range(2))
+
+        def _one_segment_rule(block, n, t):
+            return sum(segment_active(n, s, t) for s in range(get_n_segments(n))) == 1
+
+        self.one_segment = Constraint(self.MIP_NODES, m.TIMESTEPS, rule=_one_segment_rule)
+
+        def _weights_rule(block, n, t):
+            if n.pw_repn != 'CC':
+                return Constraint.Skip
+            return sum(getattr(self, 'weight_{}'.format(k))[n, t]
+                       for k in range(len(n.in_breakpoints))) == 1
+
+        self.weights = Constraint(self.MIP_NODES, m.TIMESTEPS, rule=_weights_rule)
+
+        self.BREAKPOINTS = Set(dimen=2, initialize=[
+            (n, k) for n in mip_nodes for k in range(len(n.in_breakpoints))])
+
+        def _adjacent_rule(block, n, k, t):
+            # CC: a breakpoint can only have weight if one of its segments is active
+            if n.pw_repn != 'CC':
+                return Constraint.Skip
+            return getattr(self, 'weight_{}'.format(k))[n, t] <= sum(
+                segment_active(n, s, t) for s in [k - 1, k] if 0 <= s < get_n_segments(n))
+
+        self.adjacent = Constraint(self.BREAKPOINTS, m.TIMESTEPS, rule=_adjacent_rule)
+
+        self.SEGMENTS = Set(dimen=2, initialize=[
+            (n, s) for n in mip_nodes for s in range(get_n_segments(n))])
+
+        def _segment_weights_rule(block, n, s, t):
+            # DCC: the weights of the active segment add up to one, all others are zero
+            if n.pw_repn != 'DCC':
+                return Constraint.Skip
+            return (getattr(self, 'weight_{}_0'.format(s))[n, t]
+                    + getattr(self, 'weight_{}_1'.format(s))[n, t]
+                    == segment_active(n, s, t))
+
+        self.segment_weights = Constraint(
+            self.SEGMENTS, m.TIMESTEPS, rule=_segment_weights_rule)
+
+        def _weighted_inflow_rule(block, n, t):
+            return get_inflow(n, t) == weighted_sum(n, t, n.in_breakpoints)
+
+        self.weighted_inflow = Constraint(
+            self.MIP_NODES, m.TIMESTEPS, rule=_weighted_inflow_rule)
+
+        def _weighted_outflow_rule(block, n, o, t):
+            if n.pw_repn == 'LP':
+                return Constraint.Skip
+            return m.flow[n, o, t] == weighted_sum(n, t, n.out_values[o])
+
+        self.weighted_outflow = Constraint(
+            self.OUTPUTS, m.TIMESTEPS, rule=_weighted_outflow_rule)
+
+        # Concave curves: each output is bounded by the line through each segment.
+        def _lp_inflow_rule(block, n, t):
+            if n.pw_repn != 'LP':
+                return Constraint.Skip
+            return min(n.in_breakpoints), get_inflow(n, t), max(n.in_breakpoints)
+
+        self.lp_inflow = Constraint(
+            self.MULTIOUTPUTPIECEWISETRANSFORMERS, m.TIMESTEPS, rule=_lp_inflow_rule)
+
+        self.LP_SEGMENTS = Set(dimen=3, initialize=[
+            (n, o, s) for n in group if n.pw_repn == 'LP'
+            for o in n.outputs for s in range(get_n_segments(n))])
+
+        def _lp_segment_rule(block, n, o, s, t):
+            points = n.in_breakpoints[s:s + 2]
+            values = n.out_values[o][s:s + 2]
+            slope = get_slopes(points, values)[0]
+            return m.flow[n, o, t] <= values[0] + slope * (get_inflow(n, t) - points[0])
+
+        self.lp_segment = Constraint(self.LP_SEGMENTS, m.TIMESTEPS, rule=_lp_segment_rule)
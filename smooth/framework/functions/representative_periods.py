@@ -0,0 +1,182 @@
+"""Aggregation of the input time series to representative periods.
+
+For sizing studies, simulating a whole year is often not necessary. Instead, the
+simulated horizon can be split into periods (e.g. days) which are clustered
+into a few typical periods: :func:`aggregate_model` returns a model that only simulates
+the representative periods. All CSV-backed components are clustered together, so
+each representative period is a real period of the original time series with
+consistent values for all components::
+
+    model = aggregate_model(model, n_periods=12, period_length=24)
+    components, status = run_smooth(model)
+
+The representative periods are simulated one after the other in chronological order,
+so the states of storages are passed on from one period to the next.
+The *interval_weights* simulation parameter holds the number of original periods
+each representative period stands for. They are used by
+:func:`~smooth.framework.functions.update_annuities.update_annuities` to extrapolate
+the variable costs and emissions, so the annuities approximate those of the full
+simulation. Therefore, the costs have to be kept for every interval
+(*result_retention* 'full').
+"""
+
+import copy
+import os
+import tempfile
+import numpy as np
+
+from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.functions.functions import \
+    convert_legacy_model, create_component_obj, read_data_file, resample_data
+
+
+def get_model_time_series(model):
+    """Get the time series of all CSV-backed components of a model,
+    resampled to the interval time of the simulation.
+
+    :param model: smooth model
+    :type model: dict
+    :return: component object and column of data for each CSV-backed component name
+    :rtype: dict
+    """
+    model = copy.deepcopy(model)
+    sim_params = SimulationParameters(model['sim_params'])
+    time_series = {}
+    for component in create_component_obj(model, sim_params):
+        if getattr(component, 'csv_filename', None) is None:
+            continue
+        data = read_data_file(
+            component.path, component.csv_filename,
+            component.csv_separator, component.column_title)
+        data = resample_data(
+            data, getattr(component, 'csv_interval_time', None), sim_params.interval_time,
+            getattr(component, 'csv_resample_method', 'mean'))
+        time_series[component.name] = (component, data.iloc[:sim_params.n_intervals, 0])
+    return time_series
+
+
+def cluster_periods(features, n_periods, seed=0, max_iter=100):
+    """Cluster periods with k-means and pick the period closest
+    to each cluster center (medoid) as representative.
+
+    :param features: one row per period
+    :type features: numpy array
+    :param n_periods: number of representative periods
+    :type n_periods: int
+    :param seed: seed of the random initialization. Defaults to 0
+    :type seed: int, optional
+    :param max_iter: maximum number of k-means iterations. Defaults to 100
+    :type max_iter: int, optional
+    :return: indices of the representative periods (sorted) and number of periods
+        each of them represents
+    :rtype: tuple of numpy arrays
+    """
+    n_periods = min(n_periods, len(features))
+    rng = np.random.RandomState(seed)
+    # k-means++ initialization
+    centers = [features[rng.randint(len(features))]]
+    for _ in range(1, n_periods):
+        dist = np.min([np.sum((features - c) ** 2, axis=1) for c in centers], axis=0)
+        if dist.sum() == 0:
+            centers.append(features[rng.randint(len(features))])
+        else:
+            centers.append(features[rng.choice(len(features), p=dist / dist.sum())])
+    centers = np.array(centers)
+
+    labels = None
+    for _ in range(max_iter):
+        dist = np.sum((features[:, None, :] - centers[None, :, :]) ** 2, axis=2)
+        new_labels = np.argmin(dist, axis=1)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        for i_cluster in range(n_periods):
+            if np.any(labels == i_cluster):
+                centers[i_cluster] = features[labels == i_cluster].mean(axis=0)
+
+    representatives = []
+    weights = []
+    for i_cluster in range(n_periods):
+        members = np.flatnonzero(labels == i_cluster)
+        if len(members) == 0:
+            continue
+        dist = np.sum((features[members] - centers[i_cluster]) ** 2, axis=1)
+        representatives.append(members[np.argmin(dist)])
+        weights.append(len(members))
+
+    order = np.argsort(representatives)
+    return np.array(representatives)[order], np.array(weights)[order]
+
+
+def aggregate_model(model, n_periods, period_length=24, directory=None, seed=0):
+    """Create a model that only simulates representative periods.
+
+    The time series of the simulated horizon (*n_intervals*) are split into periods of
+    *period_length* intervals. Intervals left over at the end are not used for
+    the clustering, but are accounted for in the weights. The representative periods
+    of all CSV-backed components are written to new CSV files in *directory*.
+
+    :param model: smooth model
+    :type model: dict
+    :param n_periods: number of representative periods
+    :type n_periods: int
+    :param period_length: number of intervals per period. Defaults to 24 (days for
+        hourly intervals)
+    :type period_length: int, optional
+    :param directory: directory of the new CSV files.
+        Defaults to None (new temporary directory)
+    :type directory: string, optional
+    :param seed: seed of the clustering. Defaults to 0
+    :type seed: int, optional
+    :return: model with representative time series and *interval_weights*
+    :rtype: dict
+    :raises ValueError: if there is no complete period or a time series is too short
+    """
+    model = convert_legacy_model(model)
+
+    sim_params = SimulationParameters(model['sim_params'])
+    n_full_periods = sim_params.n_intervals // period_length
+    if n_full_periods == 0:
+        raise ValueError('The simulation has less than one period ({} intervals)'
+                         .format(period_length))
+
+    time_series = get_model_time_series(model)
+    # Features: normalized values of all time series of each period.
+    features = [np.zeros((n_full_periods, 0))]
+    for name, (_, column) in time_series.items():
+        values = column.values.astype(float)
+        if len(values) < n_full_periods * period_length:
+            raise ValueError('Time series of component "{}" is shorter than the simulation'
+                             .format(name))
+        values = values[:n_full_periods * period_length]
+        value_range = values.max() - values.min()
+        values = (values - values.min()) / (value_range if value_range > 0 else 1)
+        features.append(values.reshape(n_full_periods, period_length))
+    representatives, weights = cluster_periods(np.hstack(features), n_periods, seed)
+    # Account for intervals that are not part of a complete period.
+    weights = weights * sim_params.n_intervals / (n_full_periods * period_length)
+    intervals = np.concatenate(
+        [np.arange(p * period_length, (p + 1) * period_length) for p in representatives])
+
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix='smooth_periods_')
+    os.makedirs(directory, exist_ok=True)
+
+    aggregated_model = copy.deepcopy(model)
+    for name, (component, column) in time_series.items():
+        csv_filename = '{}.csv'.format(name)
+        column.iloc[intervals].to_csv(
+            os.path.join(directory, csv_filename),
+            sep=component.csv_separator, index=False, header=True, encoding='latin-1')
+        aggregated_model['components'][name].update({
+            'path': directory,
+            'csv_filename': csv_filename,
+            'column_title': column.name,
+            'csv_interval_time': None,
+        })
+
+    aggregated_model['sim_params'].update({
+        'n_intervals': len(intervals),
+        'interval_weights': np.repeat(weights, period_length).tolist(),
+    })
+    return aggregated_model
@@ -0,0 +1,160 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+def get_result_columns(components):
+    """Convert the per interval results of all components to columns.
+
+    Only series that are fully kept (lists, see *result_retention*) are converted.
+    Missing values (None) are stored as NaN.
+
+    :param components: result from run_smooth
+    :type components: list of :class:`~smooth.components.component.Component`
+    :return: column names as (component, kind, name) and values of each column
+    :rtype: tuple of list of tuples and list of numpy arrays
+    """
+    names = []
+    columns = []
+    for this_comp in components:
+        all_series = [
+            ('flows', '{}->{}'.format(*flow_name), series)
+            for flow_name, series in getattr(this_comp, 'flows', {}).items()]
+        all_series += [
+            ('states', state_name, series) for state_name, series in this_comp.states.items()]
+        all_series += [
+            ('results', result_name, series) for result_name, series in this_comp.results.items()]
+        for kind, name, series in all_series:
+            if not isinstance(series, list):
+                # Only aggregates are kept or this is a scalar result.
+                continue
+            names.append((this_comp.name, kind, name))
+            columns.append(np.array([np.nan if v is None else v for v in series], dtype=float))
+
+    return names, columns
+
+
+class ResultStore:
+    """Columnar store for smooth results on disk.
+
+    Each entry holds the per interval results of one smooth run (e.g. one
+    individual of the genetic algorithm or one scenario) as a two-dimensional
+    array with one column per flow, state and cost, saved as a compressed numpy file
+    in *directory*. Entries are addressed by an arbitrary string key.
+
+    :param directory: directory of the store. Created if it does not exist
+    :type directory: string
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_file_name(self, key):
+        """Get the file of an entry.
+
+        :param key: key of the entry
+        :type key: string
+        :return: path of the file of this entry
+        :rtype: string
+        """
+        file_hash = hashlib.sha1(str(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, file_hash + '.npz')
+
+    def write(self, key, components):
+        """Write the results of a smooth run to the store.
+
+        :param key: key of the entry
+        :type key: string
+        :param components: result from run_smooth
+        :type components: list of :class:`~smooth.components.component.Component`
+        """
+        names, columns = get_result_columns(components)
+        n_rows = max([len(column) for column in columns], default=0)
+        values = np.full((n_rows, len(columns)), np.nan)
+        for i_column, column in enumerate(columns):
+            values[:len(column), i_column] = column
+        if components:
+            index = components[0].sim_params.date_time_index[:n_rows].values
+        else:
+            index = np.array([], dtype='datetime64[ns]')
+        # Write to a temporary file first, so readers never see incomplete entries.
+        file_name = self.get_file_name(key)
+        tmp_file_name = file_name + '.tmp.npz'
+        np.savez_compressed(
+            tmp_file_name,
+            key=np.array(str(key)),
+            names=np.array(names, dtype=str).reshape(-1, 3),
+            index=index,
+            values=values)
+        os.replace(tmp_file_name, file_name)
+
+    def read(self, key):
+        """Read the results of a smooth run from the store.
+
+        :param key: key of the entry
+        :type key: string
+        :return: results with the time steps as index and
+            (component, kind, name) as columns
+        :rtype: pandas DataFrame
+        :raises KeyError: if there is no entry with this key
+        """
+        file_name = self.get_file_name(key)
+        if not os.path.exists(file_name):
+            raise KeyError(key)
+        with np.load(file_name) as entry:
+            columns = pd.MultiIndex.from_tuples(
+                [tuple(name) for name in entry['names']], names=['component', 'kind', 'name'])
+            return pd.DataFrame(
+                entry['values'], index=pd.DatetimeIndex(entry['index']), columns=columns)
+
+    def keys(self):
+        """Get the keys of all entries in the store.
+
+        :return: keys of all entries
+        :rtype: list of strings
+        """
+        keys = []
+        for file_name in sorted(os.listdir(self.directory)):
+            if file_name.endswith('.npz') and not file_name.endswith('.tmp.npz'):
+                with np.load(os.path.join(self.directory, file_name)) as entry:
+                    keys.append(str(entry['key']))
+        return keys
+
+    def remove(self, key):
+        """Remove an entry from the store (if it exists).
+
+        :param key: key of the entry
+        :type key: string
+        """
+        file_name = self.get_file_name(key)
+        if os.path.exists(file_name):
+            os.remove(file_name)
+
+    def move(self, key, store):
+        """Move an entry to another store (if it exists).
+
+        :param key: key of the entry
+        :type key: string
+        :param store: store the entry is moved to
+        :type store: :class:`ResultStore`
+        """
+        file_name = self.get_file_name(key)
+        if os.path.exists(file_name):
+            os.replace(file_name, store.get_file_name(key))
+
+    def retain(self, keys):
+        """Remove all entries whose key is not in *keys*.
+        The entries are selected by their file names, without reading them.
+
+        :param keys: keys of the entries that are kept
+        :type keys: iterable of strings
+        """
+        keep = {os.path.basename(self.get_file_name(key)) for key in keys}
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.npz') and file_name not in keep:
+                os.remove(os.path.join(self.directory, file_name))
+
+    def __contains__(self, key):
+        return os.path.exists(self.get_file_name(key))
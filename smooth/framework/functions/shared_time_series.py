@@ -0,0 +1,173 @@
+"""Time series that are shared between processes.
+
+During an optimization, every evaluation creates the components from the model again,
+so each worker process would read and keep its own copy of every CSV input.
+Instead, the time series can be loaded once by the parent process and put into
+shared memory blocks (:class:`SharedTimeSeries`). Worker processes attach to these
+blocks when they start (:func:`attach_shared_time_series`), and
+:func:`~smooth.framework.functions.functions.read_data_file` then returns a
+read-only view of the shared data instead of parsing the file again.
+
+Shared memory needs Python 3.8 or newer. With older versions, every process reads
+the files itself, just like without sharing.
+"""
+
+import contextlib
+import os
+import numpy as np
+import pandas as pd
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+# time series available in this process:
+# key -> (shared memory block, numpy array, column name)
+attached_time_series = {}
+# SharedTimeSeries currently recording the files read (see SharedTimeSeries.recording)
+active_recorder = None
+
+
+def get_time_series_key(file_path, csv_separator, column_title):
+    """Get the key of a time series.
+
+    :param file_path: path of the csv file
+    :type file_path: string
+    :param csv_separator: separator of csv data
+    :type csv_separator: character
+    :param column_title: title or index of data column
+    :type column_title: string or integer
+    :return: key of the time series
+    :rtype: tuple
+    """
+    return os.path.abspath(file_path), csv_separator, column_title
+
+
+def get_shared_time_series(file_path, csv_separator, column_title):
+    """Get a time series from shared memory.
+
+    :param file_path: path of the csv file
+    :type file_path: string
+    :param csv_separator: separator of csv data
+    :type csv_separator: character
+    :param column_title: title or index of data column
+    :type column_title: string or integer
+    :return: column of data (read-only view of the shared memory)
+        or None if this time series is not shared
+    :rtype: pandas dataframe or None
+    """
+    key = get_time_series_key(file_path, csv_separator, column_title)
+    if key not in attached_time_series:
+        return None
+    array, column_name = attached_time_series[key][1:]
+    return pd.DataFrame(array.reshape(-1, 1), columns=[column_name], copy=False)
+
+
+def record_time_series(file_path, csv_separator, column_title, data):
+    """Add a time series that has just been read to the active :class:`SharedTimeSeries`.
+    Does nothing if there is no recording.
+
+    :param file_path: path of the csv file
+    :type file_path: string
+    :param csv_separator: separator of csv data
+    :type csv_separator: character
+    :param column_title: title or index of data column
+    :type column_title: string or integer
+    :param data: column of data from csv file
+    :type data: pandas dataframe
+    """
+    if active_recorder is not None:
+        active_recorder.add(file_path, csv_separator, column_title, data.iloc[:, 0])
+
+
+def attach_shared_time_series(descriptors):
+    """Attach to the shared memory blocks created by the parent process.
+    Used as initializer of the worker processes.
+
+    :param descriptors: descriptors of the shared time series, see
+        :attr:`SharedTimeSeries.descriptors`
+    :type descriptors: dict
+    """
+    for key, (name, shape, dtype, column_name) in descriptors.items():
+        if key in attached_time_series:
+            # already available (e.g. inherited from parent process)
+            continue
+        block = shared_memory.SharedMemory(name=name)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        attached_time_series[key] = (block, array, column_name)
+
+
+class SharedTimeSeries:
+    """Time series in shared memory, owned by the parent process.
+
+    :var descriptors: name, shape and dtype of the shared memory block and column name
+        of each time series, needed by the worker processes to attach to them
+    :type descriptors: dict
+    """
+
+    def __init__(self):
+        self.descriptors = {}
+
+    @staticmethod
+    def is_available():
+        """Check if shared memory is supported (Python 3.8 or newer).
+
+        :return: True if time series can be shared
+        :rtype: boolean
+        """
+        return shared_memory is not None
+
+    def add(self, file_path, csv_separator, column_title, column):
+        """Put a time series into shared memory.
+        Non-numerical columns and time series that are already shared are skipped.
+
+        :param file_path: path of the csv file
+        :type file_path: string
+        :param csv_separator: separator of csv data
+        :type csv_separator: character
+        :param column_title: title or index of data column
+        :type column_title: string or integer
+        :param column: data of the time series
+        :type column: pandas series
+        """
+        values = column.values
+        key = get_time_series_key(file_path, csv_separator, column_title)
+        if not self.is_available() or key in self.descriptors or values.dtype.kind not in 'biuf':
+            return
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        array = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+        array[:] = values
+        array.flags.writeable = False
+        attached_time_series[key] = (block, array, column.name)
+        self.descriptors[key] = (block.name, values.shape, values.dtype.str, column.name)
+
+    @contextlib.contextmanager
+    def recording(self):
+        """Context in which every file read with
+        :func:`~smooth.framework.functions.functions.read_data_file` is put into shared memory,
+        e.g. while the components of a model are created::
+
+            shared = SharedTimeSeries()
+            with shared.recording():
+                create_component_obj(model, sim_params)
+        """
+        global active_recorder
+        active_recorder = self
+        try:
+            yield self
+        finally:
+            active_recorder = None
+
+    def close(self):
+        """Release and remove all shared memory blocks of this object."""
+        for key in self.descriptors:
+            block, array, _ = attached_time_series.pop(key)
+            del array
+            try:
+                block.close()
+            except BufferError:
+                # data is still referenced, memory is freed once the references are gone
+                pass
+            block.unlink()
+        self.descriptors = {}
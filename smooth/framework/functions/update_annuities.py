@@ -1,4 +1,5 @@
-from smooth.framework.functions.functions import choose_valid_dict
+from smooth.framework.functions.update_fitted_cost import CostCurves
+from smooth.framework.interval_series import get_series_total
 
 
 def update_annuities(component):
@@ -10,32 +11,9 @@ def update_annuities(component):
     :type component: :class:`~smooth.components.component.Component`
     """
 
-    # First calculate the annuities for the CAPEX in EUR/a.
-    # If there are no CAPEX (dict is empty), the annuity is 0 EUR/a,
-    # otherwise it is a product of capex and capital recovery factor [-].
-    capex_annuity = calc_annuity(component, component.capex)
-    # Check if OPEX were calculated, if so they are directly in annuity format.
-    if not component.opex:
-        opex = 0
-    else:
-        # Check if 'variable' opex are beeing used, if so decide which opex is valid
-        if component.opex['key'] == 'variable':
-            component.opex = choose_valid_dict(component, component.opex)
-        opex = component.opex['cost']
-
-    # Calculate the annual emissions for the installation in kg/a.
-    # If the emissions are not given (dict is empty), the annual emissions are 0 kg/a,
-    # otherwise it is a fraction of fix_emissions divided by the component's life-time in years.
-    fix_emissions_annual = calc_annual_emissions(component, component.fix_emissions)
-    # Check if operational emissions were calculated, if so they are directly in annual format.
-    if not component.op_emissions:
-        op_emissions = 0
-    else:
-        # Check if 'variable' op_emissions are being used, if so decide which
-        # op_emissions are valid
-        if component.op_emissions['key'] == 'variable':
-            component.op_emissions = choose_valid_dict(component, component.op_emissions)
-        op_emissions = component.op_emissions['cost']
+    # Annuities of the CAPEX and OPEX [EUR/a] and the annual fix and operational
+    # emissions [kg/a].
+    fix_annuities = get_fix_annuities(component)
 
     # Then calculate the annuity of the variable costs. This is only needed if
     # the simulation did not take a whole year. In case it was a different time
@@ -44,48 +22,83 @@ def update_annuities(component):
     # simulation time.
 
     # Calculate the ratio of simulation time to one year (sim_time_span is in minutes) [-].
-    time_ratio = component.sim_params.sim_time_span / (365 * 24 * 60)
+    # With representative periods, each interval stands for *weight* intervals.
+    weights = component.sim_params.interval_weights
+    time_span = component.sim_params.sim_time_span if weights is None \
+        else sum(weights) * component.sim_params.interval_time
+    time_ratio = time_span / (365 * 24 * 60)
     # Get the total amount of variable costs [EUR].
-    variable_cost_tot = sum(component.results['variable_costs'])
+    variable_cost_tot = get_series_total(component.results['variable_costs'], weights)
     # Get the annuity of the variable cost [EUR/a].
     variable_cost_annuity = variable_cost_tot / time_ratio
 
     # Get the total amount of variable emissions [kg].
-    variable_emissions_tot = sum(component.results['variable_emissions'])
+    variable_emissions_tot = get_series_total(component.results['variable_emissions'], weights)
     # Get the annual emissions out of the variable emissions [kg/a].
     variable_emissions_annual = variable_emissions_tot / time_ratio
 
     # Save the cost results.
-    component.results['annuity_capex'] = capex_annuity
-    component.results['annuity_opex'] = opex
+    component.results['annuity_capex'] = fix_annuities['annuity_capex']
+    component.results['annuity_opex'] = fix_annuities['annuity_opex']
     component.results['annuity_variable_costs'] = variable_cost_annuity
-    component.results['annuity_total'] = capex_annuity + opex + variable_cost_annuity
+    component.results['annuity_total'] = fix_annuities['annuity_capex'] + \
+        fix_annuities['annuity_opex'] + variable_cost_annuity
 
-    component.results['annual_fix_emissions'] = fix_emissions_annual
-    component.results['annual_op_emissions'] = op_emissions
+    component.results['annual_fix_emissions'] = fix_annuities['annual_fix_emissions']
+    component.results['annual_op_emissions'] = fix_annuities['annual_op_emissions']
     component.results['annual_variable_emissions'] = variable_emissions_annual
-    component.results['annual_total_emissions'] = fix_emissions_annual + \
-        op_emissions + variable_emissions_annual
+    component.results['annual_total_emissions'] = fix_annuities['annual_fix_emissions'] + \
+        fix_annuities['annual_op_emissions'] + variable_emissions_annual
+
+
+def get_fix_annuities(component, **values):
+    """Compute the annuities of the CAPEX and OPEX and the annual fix and operational
+    emissions of a component.
 
+    The CAPEX, OPEX and emission dicts are compiled into cost curves once per component
+    (see :class:`~smooth.framework.functions.update_fitted_cost.CostCurves`). Component
+    attributes the costs depend on can be given as scalars or NumPy arrays, e.g. to
+    compute the annuities of a range of sizes in one call::
 
-def calc_annuity(component, target):
+        get_fix_annuities(component, power_max=np.linspace(10e3, 100e3, 10))
+
+    :param component: object of this component
+    :type component: :class:`~smooth.components.component.Component`
+    :param values: values of component attributes to use instead
+    :return: *annuity_capex*, *annuity_opex* [EUR/a], *annual_fix_emissions* and
+        *annual_op_emissions* [kg/a]
+    :rtype: dict
+    """
+    if component.cost_curves is None:
+        component.cost_curves = CostCurves(component)
+    costs = component.cost_curves.evaluate(component, **values)
+    # OPEX and operational emissions are already given per year.
+    return {
+        'annuity_capex': calc_annuity(component, costs['capex']),
+        'annuity_opex': 0 if costs['opex'] is None else costs['opex'],
+        'annual_fix_emissions': calc_annual_emissions(component, costs['fix_emissions']),
+        'annual_op_emissions': 0 if costs['op_emissions'] is None else costs['op_emissions'],
+    }
+
+
+def calc_annuity(component, cost):
     """Calculate annuity
 
     :param component: object of this component
     :type component: :class:`~smooth.components.component.Component`
-    :param target: dictionary with *cost* key, e.g. component.capex
-    :type target: dict
-    :return: annuity of target [EUR/a]
-    :rtype: number
+    :param cost: costs, e.g. the CAPEX, or None if not given
+    :type cost: number or numpy.ndarray
+    :return: annuity of the costs [EUR/a]
+    :rtype: number or numpy.ndarray
     """
 
-    # When the target dict is empty, the annuity is zero, otherwise it has to be calculated.
-    if not target:
-        # There are no target entries, so the annuity is 0 in [target]/a.
-        target_annuity = 0
+    # When there are no costs, the annuity is zero, otherwise it has to be calculated.
+    if cost is None:
+        # There are no costs, so the annuity is 0 EUR/a.
+        annuity = 0
     elif component.life_time == 0:
         # no lifetime in component: no annuity (avoid div0)
-        target_annuity = 0
+        annuity = 0
     else:
         # Interest rate [-].
         interest_rate = component.sim_params.interest_rate
@@ -93,41 +106,35 @@ def calc_annuity(component, target):
         cap_nominator = interest_rate * (1 + interest_rate) ** component.life_time
         cap_denominator = ((1 + interest_rate) ** component.life_time) - 1
         capital_recovery_factor = cap_nominator / cap_denominator
-        # Calculate the annuity of the target in [target]/a.
-
-        # Check if 'variable' capex are being used, if so decide which capex is valid
-        if target['key'] == 'variable':
-            target = choose_valid_dict(component, target)
-        target_annuity = target['cost'] * capital_recovery_factor
+        # Calculate the annuity of the costs in EUR/a.
+        annuity = cost * capital_recovery_factor
 
-    return target_annuity
+    return annuity
 
 
-def calc_annual_emissions(component, target):
+def calc_annual_emissions(component, emissions):
     """Calculate annual emissions.
 
     :param component: object of this component
     :type component: :class:`~smooth.components.component.Component`
-    :param target: dictionary with *cost* key, e.g. component.fix_emissions
-    :type target: dict
-    :return: annual emissions of target [kg/a]
-    :rtype: number
+    :param emissions: emissions, e.g. the fix emissions, or None if not given
+    :type emissions: number or numpy.ndarray
+    :return: annual emissions [kg/a]
+    :rtype: number or numpy.ndarray
     """
-    # When the target dict is empty, the annuity is zero, otherwise it has to be calculated.
-    if not target:
-        # There are no target entries, so the annuity is 0 in [target]/a.
-        target_annuity = 0
+    # When there are no emissions, the annual emissions are zero, otherwise they have to be
+    # calculated.
+    if emissions is None:
+        # There are no emissions, so the annual emissions are 0 kg/a.
+        annual_emissions = 0
     elif component.life_time == 0:
         # no lifetime in component: no annuity (avoid div0)
-        target_annuity = 0
+        annual_emissions = 0
     else:
+        # Calculate the annual emissions in kg/a.
+        annual_emissions = emissions / component.life_time
 
-        if target['key'] == 'variable':
-            target = choose_valid_dict(component, target)
-        # Calculate the annuity of the target in [target]/a.
-        target_annuity = target['cost'] / component.life_time
-
-    return target_annuity
+    return annual_emissions
 
 
 def update_external_annuities(component):
@@ -141,31 +148,17 @@ def update_external_annuities(component):
 
     # TODO: MAYBE CHANGE THE NAME?
 
-    # First calculate the annuities for the CAPEX in EUR/a.
-    # If there are no CAPEX (dict is empty), the annuity is 0 EUR/a,
-    # otherwise it is a product of capex and capital recovery factor [-].
-    capex_annuity = calc_annuity(component, component.capex)
-    # Check if OPEX were calculated, if so they are directly in annuity format.
-    if not component.opex:
-        opex = 0
-    else:
-        opex = component.opex['cost']
-
-        # Save the cost results.
-    component.results['annuity_capex'] = capex_annuity
-    component.results['annuity_opex'] = opex
-    component.results['annuity_total'] = capex_annuity + opex
-
-    # Calculate the annual emissions for the installation in kg/a.
-    # If the emissions are not given (dict is empty), the annual emissions are 0 kg/a,
-    # otherwise it is a fraction of fix_emissions divided by the component's life-time in years.
-    fix_emissions_annual = calc_annual_emissions(component, component.fix_emissions)
-    # Check if operational emissions were calculated, if so they are directly in annual format.
-    if not component.op_emissions:
-        op_emissions = 0
-    else:
-        op_emissions = component.op_emissions['cost']
+    # Annuities of the CAPEX and OPEX [EUR/a] and the annual fix and operational
+    # emissions [kg/a].
+    fix_annuities = get_fix_annuities(component)
 
-    component.results['annual_fix_emissions'] = fix_emissions_annual
-    component.results['annual_op_emissions'] = op_emissions
-    component.results['annual_total_emissions'] = fix_emissions_annual + op_emissions
+    # Save the cost results.
+    component.results['annuity_capex'] = fix_annuities['annuity_capex']
+    component.results['annuity_opex'] = fix_annuities['annuity_opex']
+    component.results['annuity_total'] = \
+        fix_annuities['annuity_capex'] + fix_annuities['annuity_opex']
+
+    component.results['annual_fix_emissions'] = fix_annuities['annual_fix_emissions']
+    component.results['annual_op_emissions'] = fix_annuities['annual_op_emissions']
+    component.results['annual_total_emissions'] = \
+        fix_annuities['annual_fix_emissions'] + fix_annuities['annual_op_emissions']
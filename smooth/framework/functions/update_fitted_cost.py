@@ -1,170 +1,284 @@
-import math
-from smooth.framework.functions.functions import choose_valid_dict
+"""
+The "CAPEX", "OPEX", "fix_emissions" and "op_emissions" dicts of a component are compiled
+once into cost curves (see :class:`CostCurves`). A cost curve is a callable that evaluates
+the costs for the component attributes it depends on. These attributes can be scalars or
+NumPy arrays, so that the costs of a whole range of sizes are computed in one call
+(see :func:`~smooth.framework.functions.update_annuities.get_fix_annuities`). The dicts
+of the model definition are not modified.
 
+The fitting method is chosen by the "key" of the dict:
 
-def update_financials(component, financials):
-    """ Calculate "OPEX" or "CAPEX" for this component.
+* "fix"      --> already the fix value (given as "cost"), nothing has to be done
+* "spec"     --> cost value needs to be multiplied with the dependant value
+* "exp"      --> exponential cost fitting
+* "poly"     --> polynomial cost fitting
+* "free"     --> polynomial cost fitting with free choosable exponents
 
-    This function is calculating a fix "CAPEX" and "OPEX" value for components
-    where "CAPEX" and "OPEX" are dependant on certain values. The following list
-    shows possible fitting methods. The fitting method is chosen by the "CAPEX"
-    and "OPEX" key:
+If multiple keys are defined, the calculations are done sequentially in order.
 
-    * "fix"      --> already the fix value, nothing has to be done
-    * "spec"     --> cost value needs to be multiplied with the dependant value
-    * "exp"      --> exponential cost fitting
-    * "poly"     --> polynomial cost fitting
-    * "free"     --> polynomial cost fitting with free choosable exponents
+* "variable" --> definition of multiple "CAPEX" or "OPEX" structures:
+  If the cost structure changes over the size of a specific value of the component, for
+  example because of the effects of economics of scale, the special key "variable" can
+  be used to define multiple "CAPEX" or "OPEX" dicts for different ranges of this value
+  (see :class:`VariableCostCurve`).
+"""
 
-    If multiple keys are defined, the calculations are done sequentially in order.
+import bisect
+import numpy as np
 
-     * "variable" --> definition of multiple "CAPEX" or "OPEX" structures:
-    If the cost structure changes over the size of a specific value of the component, for example
-    because of the effects of economics of scale, the special key "variable" can be used to define
-    multiple "CAPEX" or "OPEX" dicts for different ranges of this value
-
-    :param component: object of this component
-    :type component: :class:`~smooth.components.component.Component`
-    :param financials: financial object of this component
-    :type financials: capex or opex dict
-    """
-
-    # Check if this financial dictionary is empty. If so, nothing has to be calculated.
-    if not financials:
-        return
-
-    # Check if 'variable' capex are beeing used, if so decide which capex is valid
-    if financials['key'] == 'variable':
-        financials = choose_valid_dict(component, financials)
-
-    # If the keys are not given as a list, they are transformed to one so they can be iterated.
-    if type(financials['key']) is not list:
-        financials['key'] = [financials['key']]
-        financials['fitting_value'] = [financials['fitting_value']]
-        financials['dependant_value'] = [financials['dependant_value']]
-
-    # Loop through each CAPEX or OPEX key.
-    for this_index in range(len(financials['key'])):
-        # Get the dependant value (either given as a component value
-        # or if dependant value key at this_index is cost 'capex' get the
-        # previously calculated cost value).
-        dependant_value = get_dependant_value(component, financials, this_index, 'capex')
-        # Update cost
-        update_cost(component, financials, this_index, dependant_value, 'CAPEX/OPEX')
+FITTING_KEYS = ['fix', 'spec', 'exp', 'poly', 'free']
 
 
-def update_emissions(component, emissions):
-    """ Calculate fixed and operational emissions for this component.
+def compile_cost_curve(fitting_dict, component_name, name):
+    """Compile a CAPEX, OPEX or emission dict of a component.
 
-    This function is calculating a fix and operational value for components
-    where "fix_emissions" or "op_emissions" are dependant on certain values.
-    The following list shows possible fitting methods. The fitting method is
-    chosen by the "key" value given in the "emissions" dictionary:
-
-    * "fix"      --> already the fix value, nothing has to be done
-    * "spec"     --> cost value needs to be multiplied with the dependant value
-    * "exp"      --> exponential cost fitting
-    * "poly"     --> polynomial cost fitting
-    * "free"     --> polynomial cost fitting with free choosable exponents
-
-    If multiple keys are defined, the calculations are done sequentially in order.
-
-     * "variable" --> definition of multiple "fix_emissions" or "op_emissions" structures:
-    If the emission structure changes over the size of a specific value of the component, for
-    example because of the effects of economics of scale, the special key "variable" can be used to
-    define multiple "fix_emissions" or "op_emissions" dicts for different ranges of this value
-
-    :param component: object of this component
-    :type component:  component: :class:`~smooth.components.component.Component`
-    :param emissions: emission object of this component
-    :type emissions: fix_emissions or op_emissions dict
+    :param fitting_dict: usually financial or emission dict of the component
+    :type fitting_dict: dict
+    :param component_name: name of the component, used in error messages
+    :type component_name: str
+    :param name: human readable representation of the dict, e.g. "CAPEX/OPEX" or "Emissions"
+    :type name: str
+    :return: cost curve or None if the dict is empty
+    :rtype: :class:`CostCurve`, :class:`VariableCostCurve` or None
     """
+    # If the dictionary is empty, nothing has to be calculated.
+    if not fitting_dict:
+        return None
+    if fitting_dict['key'] == 'variable':
+        return VariableCostCurve(fitting_dict, component_name, name)
+    return CostCurve(fitting_dict, component_name, name)
 
-    # Check if this emission dictionary is empty. If so, nothing has to be calculated.
-    if not emissions:
-        return
 
-    # Check if 'variable' capex are beeing used, if so decide which capex is valid
-    if emissions['key'] == 'variable':
-        emissions = choose_valid_dict(component, emissions)
+class CostCurve:
+    """Compiled cost function of a CAPEX, OPEX or emission dict.
 
-    # If the keys are not given as a list, they are transformed to one so they can be iterated.
-    if type(emissions['key']) is not list:
-        emissions['key'] = [emissions['key']]
-        emissions['fitting_value'] = [emissions['fitting_value']]
-        emissions['dependant_value'] = [emissions['dependant_value']]
+    Each key of the dict is stored as a term (key, fitting values, dependant value).
+    Calling the curve with the values of the dependant attributes evaluates the terms
+    in order, each one with the cost of the previous terms.
 
-    # Loop through each key.
-    for this_index in range(len(emissions['key'])):
-        # Get the dependant value (either given as a component value
-        # or if dependant value key at this_index is cost 'fix_emissions' get
-        # the previously calculated cost value).
-        dependant_value = get_dependant_value(component, emissions, this_index, 'fix_emissions')
-        # Update cost
-        update_cost(component, emissions, this_index, dependant_value, 'Emissions')
+    :param fitting_dict: usually financial or emission dict of the component
+    :type fitting_dict: dict
+    :param component_name: name of the component, used in error messages
+    :type component_name: str
+    :param name: human readable representation of the dict, e.g. "CAPEX/OPEX" or "Emissions"
+    :type name: str
+    :raises ValueError: on unknown fitting key or an odd number of "free" fitting values
+    """
 
+    def __init__(self, fitting_dict, component_name, name):
+        keys = fitting_dict['key']
+        fitting_values = fitting_dict['fitting_value']
+        dependant_values = fitting_dict['dependant_value']
+        # If the keys are not given as a list, they are transformed to one so they can be
+        # iterated.
+        if type(keys) is not list:
+            keys = [keys]
+            fitting_values = [fitting_values]
+            dependant_values = [dependant_values]
+
+        terms = []
+        for key, fitting_value, dependant_value in zip(keys, fitting_values, dependant_values):
+            if key not in FITTING_KEYS:
+                raise ValueError(
+                    '{} key "{}" not recognized. Please choose a valid key.'.format(name, key))
+            if key == 'fix':
+                # Fixed costs do not have to be processed further.
+                continue
+            if key == 'exp' and len(fitting_value) == 2:
+                # If only two fitting values are given, it is assumed that the constant
+                # value is 0.
+                fitting_value = [0, *fitting_value]
+            if key == 'free' and len(fitting_value) % 2 != 0:
+                # The number of fitting values needs to be even, otherwise throw an error.
+                raise ValueError(
+                    'In component {}, the number of fitting values is {}, but it needs to be '
+                    'even!'.format(component_name, len(fitting_value)))
+            if isinstance(fitting_value, list):
+                fitting_value = tuple(fitting_value)
+            terms.append((key, fitting_value, dependant_value))
+
+        self.terms = tuple(terms)
+        # Cost of the "fix" key, used as start value of the following terms.
+        self.cost = fitting_dict.get('cost')
+        # Names of the dependant values, in order of first use.
+        self.dependencies = tuple(dict.fromkeys(term[2] for term in self.terms))
+
+    def __call__(self, values):
+        """Evaluate the cost curve.
+
+        :param values: value of each dependant value (see *dependencies*), scalars or
+            NumPy arrays
+        :type values: dict
+        :return: costs
+        :rtype: number or numpy.ndarray
+        """
+        cost = self.cost
+        for key, fitting_value, dependant_value in self.terms:
+            cost = FITTING_FUNCTIONS[key](fitting_value, values[dependant_value], cost)
+        return cost
+
+
+class VariableCostCurve:
+    """Compiled "variable" CAPEX, OPEX or emission dict.
+
+    The cost curve of each dict in *var_dicts* is valid in its range of the
+    *var_dict_dependency* attribute of the component::
+
+        low_threshold <= value(var_dict_dependency) < high_threshold
+
+    The thresholds are checked once when compiling. The valid curve of a value is found
+    by bisecting the low thresholds.
+
+    :param fitting_dict: dict with the keys *var_dict_dependency* and *var_dicts*
+    :type fitting_dict: dict
+    :param component_name: name of the component, used in error messages
+    :type component_name: str
+    :param name: human readable representation of the dict, e.g. "CAPEX/OPEX" or "Emissions"
+    :type name: str
+    """
 
-def update_cost(component, fitting_dict, index, dependant_value, name):
-    """Update cost of component.
+    def __init__(self, fitting_dict, component_name, name):
+        self.component_name = component_name
+        self.dependency = fitting_dict['var_dict_dependency']
+        var_dicts = fitting_dict['var_dicts']
+        low_thresholds = [d['low_threshold'] for d in var_dicts]
+        high_thresholds = [d['high_threshold'] for d in var_dicts]
+        for i in range(len(low_thresholds)):
+            assert low_thresholds[i] < high_thresholds[i],\
+                'The threshold range of a variable_dict (capex or emissions) for component \''\
+                + component_name + '\' is either zero or negative.'
+            if i < len(low_thresholds) - 1:
+                assert low_thresholds[i] <= low_thresholds[i + 1], \
+                    'A variable_dict (capex or emissions) of component \'' \
+                    + component_name + '\' is not defined with thresholds in ascending order.'
+                assert high_thresholds[i] <= low_thresholds[i + 1], \
+                    'A variable_dict (capex or emissions) of component \'' \
+                    + component_name + '\' has an overlap in its threshold definition.'
+
+        self.low_thresholds = tuple(low_thresholds)
+        self.high_thresholds = tuple(high_thresholds)
+        self.curves = tuple(CostCurve(d, component_name, name) for d in var_dicts)
+        self.dependencies = tuple(dict.fromkeys(
+            [self.dependency] + [dep for curve in self.curves for dep in curve.dependencies]))
+
+    def get_segment(self, value):
+        """Get the index of the valid cost curve.
+
+        :param value: value of the *var_dict_dependency* attribute
+        :type value: number or numpy.ndarray
+        :return: index of the valid curve in *curves*
+        :rtype: int or numpy.ndarray of ints
+        """
+        if np.ndim(value) == 0:
+            segment = bisect.bisect_right(self.low_thresholds, value) - 1
+            is_valid = segment >= 0 and value < self.high_thresholds[segment]
+        else:
+            segment = np.searchsorted(self.low_thresholds, value, side='right') - 1
+            is_valid = np.all(
+                (segment >= 0) & (value < np.take(self.high_thresholds, segment)))
+        assert is_valid, \
+            'No suitable capex / fix_emissions found for component ' + self.component_name \
+            + ' with ' + self.dependency + ' = ' + str(value)
+        return segment
+
+    def __call__(self, values):
+        """Evaluate the valid cost curve of each value of the dependency.
+
+        :param values: value of each dependant value (see *dependencies*), scalars or
+            NumPy arrays
+        :type values: dict
+        :return: costs
+        :rtype: number or numpy.ndarray
+        """
+        segment = self.get_segment(values[self.dependency])
+        if np.ndim(segment) == 0:
+            return self.curves[segment](values)
+        cost = np.nan
+        for i_segment in np.unique(segment):
+            cost = np.where(segment == i_segment, self.curves[i_segment](values), cost)
+        return cost
+
+
+class CostCurves:
+    """Compiled cost curves of a component.
+
+    The attributes *capex*, *opex*, *fix_emissions* and *op_emissions* are the compiled
+    dicts of the component (None if the dict is empty).
 
     :param component: object of this component
     :type component: :class:`~smooth.components.component.Component`
-    :param fitting_dict: usually financial or emission object of this component
-    :type fitting_dict: dict
-    :param index: current position in fitting_dict
-    :type index: integer
-    :param dependant_value: dependent attribute value of object
-    :type dependant_value: number
-    :param name: human readable representation of attribute to be updated,
-        e.g. "CAPEX/OPEX" or "emissions"
-    :type name: string
-    :raises ValueError: on unknown fitting key
     """
-    this_key = fitting_dict['key'][index]
-    if this_key == 'fix':
-        # Fixed costs do not have to be processed further.
-        pass
-    elif this_key == 'spec':
-        fitting_dict['cost'] = get_spec(component, fitting_dict, index, dependant_value)
-    elif this_key == 'exp':
-        fitting_dict['cost'] = get_exp(component, fitting_dict, index, dependant_value)
-    elif this_key == 'poly':
-        fitting_dict['cost'] = get_poly(component, fitting_dict, index, dependant_value)
-    elif this_key == 'free':
-        fitting_dict['cost'] = get_free(component, fitting_dict, index, dependant_value)
-    else:
-        raise ValueError(
-            '{} key "{}" not recognized. Please choose a valid key.'.format(name, this_key))
-
-
-def get_spec(component, fitting_dict, index, dependant_value):
+
+    # Compiled dicts in order of evaluation and the dependant value that stands for
+    # the costs of another dict.
+    TARGETS = [
+        ('capex', 'CAPEX/OPEX', None),
+        ('opex', 'CAPEX/OPEX', 'capex'),
+        ('fix_emissions', 'Emissions', None),
+        ('op_emissions', 'Emissions', 'fix_emissions'),
+    ]
+
+    def __init__(self, component):
+        for target, name, _ in self.TARGETS:
+            setattr(self, target, compile_cost_curve(
+                getattr(component, target), component.name, name))
+
+    def evaluate(self, component, **values):
+        """Compute the CAPEX, OPEX, fix and operational emissions.
+
+        The dependant values are the attributes of the component, unless they are given
+        as keyword arguments. "capex" as dependant value of the OPEX and "fix_emissions"
+        as dependant value of the operational emissions are the costs computed before.
+
+        :param component: object of this component
+        :type component: :class:`~smooth.components.component.Component`
+        :param values: values of component attributes to use instead, scalars or
+            array-likes
+        :return: costs of each target, None if the dict is empty
+        :rtype: dict
+        """
+        costs = {}
+        for target, _, previous_target in self.TARGETS:
+            curve = getattr(self, target)
+            if curve is None:
+                costs[target] = None
+                continue
+            curve_values = {}
+            for dependency in curve.dependencies:
+                if dependency == previous_target:
+                    value = costs[previous_target]
+                elif dependency in values:
+                    value = values[dependency]
+                    if np.ndim(value) > 0:
+                        value = np.asarray(value, dtype=float)
+                else:
+                    value = getattr(component, dependency, None)
+                curve_values[dependency] = value
+            costs[target] = curve(curve_values)
+        return costs
+
+
+def get_spec(fitting_value, dependant_value, cost):
     """Case: The fitting value is multiplied with the dependant value to get the costs.
 
-    :param component: object of this component
-    :type component: :class:`~smooth.components.component.Component`
-    :param fitting_dict: usually financial or emission object of this component
-    :type fitting_dict: dict
-    :param index: current position in fitting_dict
-    :type index: integer
+    :param fitting_value: fitting value, or 'cost' to use the current cost
+    :type fitting_value: number or str
     :param dependant_value: dependent attribute value of object
-    :type dependant_value: number
+    :type dependant_value: number or numpy.ndarray
+    :param cost: costs of the previous keys
+    :type cost: number or numpy.ndarray
     :return: calculated costs using a fitting value
-    :rtype: number
+    :rtype: number or numpy.ndarray
     """
 
     # Get the fitting value, which is the current cost if "cost" is chosen.
-    if fitting_dict['fitting_value'][index] == 'cost':
-        fitting_value = fitting_dict['cost']
-    else:
-        fitting_value = fitting_dict['fitting_value'][index]
+    if isinstance(fitting_value, str) and fitting_value == 'cost':
+        fitting_value = cost
     # Calculate the costs.
-    cost = dependant_value * fitting_value
+    return dependant_value * fitting_value
 
-    # Return the costs.
-    return cost
 
-
-def get_exp(component, fitting_dict, index, dependant_value):
+def get_exp(fitting_value, dependant_value, cost):
     """Case: An exponential fitting of the cost function is wanted.
 
     Here 3 variables are used in the following order::
@@ -175,32 +289,20 @@ def get_exp(component, fitting_dict, index, dependant_value):
         # for 3 fitting parameters
         fv_1 + fv_2*exp(fv_3*Parameter)
 
-    :param component: object of this component
-    :type component: :class:`~smooth.components.component.Component`
-    :param fitting_dict: usually financial or emission object of this component
-    :type fitting_dict: dict
-    :param index: current position in fitting_dict
-    :type index: integer
+    :param fitting_value: fitting values (the constant value is already added when compiling)
+    :type fitting_value: tuple
     :param dependant_value: dependent attribute value of object
-    :type dependant_value: number
+    :type dependant_value: number or numpy.ndarray
+    :param cost: costs of the previous keys (not used)
+    :type cost: number or numpy.ndarray
     :return: calculated costs using exponential fitting
-    :rtype: number
+    :rtype: number or numpy.ndarray
     """
+    fv = fitting_value
+    return fv[0] + fv[1] * np.exp(fv[2] * dependant_value)
 
-    # Get the fitting values.
-    fv = fitting_dict['fitting_value'][index]
 
-    if len(fv) == 2:
-        # If only two fitting values are given, it is assumed that the constant value is 0.
-        fv = [0, *fv]
-    # Calculate the costs.
-    cost = fv[0] + fv[1] * math.exp(fv[2] * dependant_value)
-
-    # Return the costs.
-    return cost
-
-
-def get_poly(component, fitting_dict, index, dependant_value):
+def get_poly(fitting_value, dependant_value, cost):
     """Case: A polynomial fitting of the cost function is wanted.
 
     In this case, an arbitrary number of fitting parameters can be given.
@@ -212,106 +314,55 @@ def get_poly(component, fitting_dict, index, dependant_value):
 
     It is possible to use the polynomial function to add different cost equations together.
     This is achieved because the result of the initial equation used
-    (which can be any of the cost functions) is stored as the 'cost' variable, which can
-    then be used in a following polynomial function but now as a new free variable.
+    (which can be any of the cost functions) is passed as *cost*, which can
+    then be used in a following polynomial function but now as a new free variable ('cost').
     See the example_model_costs example for an applied case.
 
-    :param component: object of this component
-    :type component: :class:`~smooth.components.component.Component`
-    :param fitting_dict: usually financial or emission object of this component
-    :type fitting_dict: dict
-    :param index: current position in fitting_dict
-    :type index: integer
+    :param fitting_value: fitting values, 'cost' is replaced by the current cost
+    :type fitting_value: tuple
     :param dependant_value: dependent attribute value of object
-    :type dependant_value: number
+    :type dependant_value: number or numpy.ndarray
+    :param cost: costs of the previous keys
+    :type cost: number or numpy.ndarray
     :return: calculated costs using polynomial fitting
-    :rtype: number
+    :rtype: number or numpy.ndarray
     """
+    new_cost = 0
+    for i_fv, fv in enumerate(fitting_value):
+        if isinstance(fv, str) and fv == 'cost':
+            fv = cost
+        new_cost = new_cost + fv * dependant_value ** i_fv
+    return new_cost
 
-    # Get the fitting values.
-    fv = fitting_dict['fitting_value'][index]
-    # Get the number of fitting values [-].
-    n_fv = len(fv)
-
-    # In a loop, calculate the costs.
-    cost = 0
-    for i_fv in range(n_fv):
-        if fv[i_fv] == 'cost':
-            fv[i_fv] = fitting_dict['cost']
-        cost += fv[i_fv] * dependant_value ** i_fv
 
-    # Return the costs.
-    return cost
-
-
-def get_free(component, fitting_dict, index, dependant_value):
+def get_free(fitting_value, dependant_value, cost):
     """Case: A "free" fitting of the cost function is wanted.
 
-    In this case, an arbitrary number of fitting parameters can be given.
+    In this case, an arbitrary (even) number of fitting parameters can be given.
     They will be used in the following order: fv_1, fv_2, fv_3, ... fv_n.
 
     Function::
 
         fv_1*dependant_value^fv_2 + fv_3*dependant_value^fv_4 + ... fv_(n-1)*dependant_value^fv_n
 
-    :param component: object of this component
-    :type component: :class:`~smooth.components.component.Component`
-    :param fitting_dict: usually financial or emission object of this component
-    :type fitting_dict: dict
-    :param index: current position in fitting_dict
-    :type index: integer
+    :param fitting_value: fitting values
+    :type fitting_value: tuple
     :param dependant_value: dependent attribute value of object
-    :type dependant_value: number
+    :type dependant_value: number or numpy.ndarray
+    :param cost: costs of the previous keys (not used)
+    :type cost: number or numpy.ndarray
     :return: calculated costs using "free" fitting
-    :rtype: number
-    :raises ValueError: if number of fitting values is odd
-    """
-
-    # Get the fitting values.
-    fv = fitting_dict['fitting_value'][index]
-    # Get the number of fitting values [-].
-    n_fv = len(fv)
-
-    # The number of fitting values needs to be even, otherwise throw an error.
-    if n_fv % 2 != 0:
-        raise ValueError(
-            'In component {}, the number of fitting values is {}, but it needs to be even!'
-            .format(component['name'], n_fv))
-
-    # Cost value
-    cost = 0
-    for i in range(int(n_fv/2)):
-        cost += fv[i*2] * dependant_value**fv[i*2 + 1]
-
-    # Return the costs.
-    return cost
-
-
-def get_dependant_value(component, fitting_dict, index, fixedCost):
-    """Get an attribute of the component as the dependant value.
-
-    :param component: object of this component
-    :type component: :class:`~smooth.components.component.Component`
-    :param fitting_dict: usually financial or emission object of this component
-    :type fitting_dict: dict
-    :param index: current position in fitting_dict
-    :type index: integer
-    :param fixedCost: key of fixed type in fitting_dict
-    :type fixedCost: string
-    :return: calculated costs using exponential fitting
-    :rtype: number or None
+    :rtype: number or numpy.ndarray
     """
-
-    if fitting_dict['key'][index] != 'fix':
-        dependant_value = getattr(component, fitting_dict['dependant_value'][index], None)
-    else:
-        dependant_value = None
-
-    if fitting_dict['dependant_value'][index] == fixedCost:
-        # If the capex are chosen as the dependant value, the capex costs are meant.
-        # Check if 'variable' capex are beeing used, if so decide which capex is valid
-        if dependant_value['key'] == 'variable':
-            dependant_value = choose_valid_dict(component, dependant_value)
-        dependant_value = dependant_value['cost']
-
-    return dependant_value
+    new_cost = 0
+    for i in range(len(fitting_value) // 2):
+        new_cost = new_cost + fitting_value[i*2] * dependant_value ** fitting_value[i*2 + 1]
+    return new_cost
+
+
+FITTING_FUNCTIONS = {
+    'spec': get_spec,
+    'exp': get_exp,
+    'poly': get_poly,
+    'free': get_free,
+}
@@ -0,0 +1,189 @@
+"""Containers for values that are tracked for each time step of a simulation.
+
+By default, every flow, state and cost of a component is stored as a list with one
+entry per interval. For long simulations with a fine resolution or for the many
+evaluations of an optimization, this history is often not needed. Therefore,
+the *result_retention* simulation parameter decides how the values are kept:
+
+* "full": a list with one value per interval (default)
+* "selected": only the series given in *retained_series* are kept as full lists,
+  all others as :class:`RunningSeries`
+* "aggregates": all series are kept as :class:`RunningSeries`, which only keep
+  the value of the most recent interval and running aggregates in constant memory
+* "downsampled": all series are kept as :class:`DownsampledSeries`, which keep
+  the mean of every *downsample_factor* consecutive intervals
+
+Each entry of *retained_series* is either a component name (all series of this
+component are kept) or a tuple of component name and key, where the key is the
+flow tuple, the state name or the cost name (e.g. "variable_costs")::
+
+    'retained_series': ['battery', ('grid', ('grid', 'bel')), ('h2_storage', 'pressure')]
+
+The totals used for the annuities are exact for all retention policies.
+"""
+
+RESULT_RETENTION_POLICIES = ['full', 'selected', 'aggregates', 'downsampled']
+
+
+class RunningSeries:
+    """Constant memory replacement for the per interval lists of a component.
+
+    Values are written and read by interval index just like a list. Only the value
+    of the most recent interval is kept, together with the sum, minimum and maximum
+    of all values written so far (None values are skipped).
+
+    :param fill_value: value returned for intervals that have not been written yet
+    :type fill_value: numerical or None
+    :var i_interval: index of the most recently written interval (None if empty)
+    :var value: value of the most recently written interval
+    :var total: sum of all values written
+    :var min: minimum of all values written (None if empty)
+    :var max: maximum of all values written (None if empty)
+    :var n_values: number of values written
+    """
+
+    def __init__(self, fill_value=None):
+        self.fill_value = fill_value
+        self.i_interval = None
+        self.value = fill_value
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.n_values = 0
+
+    def __setitem__(self, i_interval, value):
+        if i_interval == self.i_interval and self.value is not None:
+            # The value of this interval is overwritten, so it is removed from the sum.
+            self.total -= self.value
+            self.n_values -= 1
+        self.i_interval = i_interval
+        self.value = value
+        if value is not None:
+            self.total += value
+            self.n_values += 1
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def __getitem__(self, i_interval):
+        if i_interval == self.i_interval or (i_interval == -1 and self.i_interval is not None):
+            return self.value
+        if self.i_interval is not None and i_interval < self.i_interval:
+            raise IndexError(
+                'The value of interval {} is not kept (result_retention)'.format(i_interval))
+        return self.fill_value
+
+    def __iter__(self):
+        # Only the retained value can be iterated over.
+        return iter([] if self.i_interval is None else [self.value])
+
+    def __len__(self):
+        return 0 if self.i_interval is None else 1
+
+    def __repr__(self):
+        return 'RunningSeries(i_interval={}, value={}, total={})'.format(
+            self.i_interval, self.value, self.total)
+
+
+class DownsampledSeries(RunningSeries):
+    """Per interval container that keeps the mean of every *factor* consecutive intervals
+    in addition to the running aggregates of :class:`RunningSeries`.
+
+    Iterating over this container yields the block means (None for blocks without values).
+
+    :param factor: number of intervals combined into one value
+    :type factor: integer
+    :param fill_value: value returned for intervals that have not been written yet
+    :type fill_value: numerical or None
+    :var block_sums: sum of the values of each block
+    :var block_counts: number of values of each block
+    """
+
+    def __init__(self, factor, fill_value=None):
+        RunningSeries.__init__(self, fill_value)
+        self.factor = factor
+        self.block_sums = []
+        self.block_counts = []
+
+    def __setitem__(self, i_interval, value):
+        block = i_interval // self.factor
+        if len(self.block_sums) <= block:
+            n_new_blocks = block + 1 - len(self.block_sums)
+            self.block_sums.extend([0] * n_new_blocks)
+            self.block_counts.extend([0] * n_new_blocks)
+        if i_interval == self.i_interval and self.value is not None:
+            # The value of this interval is overwritten, so it is removed from the block.
+            self.block_sums[block] -= self.value
+            self.block_counts[block] -= 1
+        RunningSeries.__setitem__(self, i_interval, value)
+        if value is not None:
+            self.block_sums[block] += value
+            self.block_counts[block] += 1
+
+    def __iter__(self):
+        return iter([
+            block_sum / block_count if block_count else None
+            for block_sum, block_count in zip(self.block_sums, self.block_counts)])
+
+    def __len__(self):
+        return len(self.block_sums)
+
+    def __repr__(self):
+        return 'DownsampledSeries(factor={}, n_blocks={}, total={})'.format(
+            self.factor, len(self.block_sums), self.total)
+
+
+def new_interval_series(sim_params, comp_name, key, fill_value=None):
+    """Create an empty container for a value that is tracked for each time step,
+    according to the *result_retention* simulation parameter.
+
+    :param sim_params: simulation parameters
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :param comp_name: name of the component the value belongs to
+    :type comp_name: string
+    :param key: flow tuple, state name or cost name of the value
+    :type key: tuple or string
+    :param fill_value: initial value of each time step
+    :type fill_value: numerical or None
+    :return: list with one entry per interval, :class:`RunningSeries`
+        or :class:`DownsampledSeries`
+    :raises ValueError: on unknown result retention policy
+    """
+    retention = sim_params.result_retention
+    if retention == 'selected':
+        retained_series = sim_params.retained_series or []
+        if comp_name in retained_series or (comp_name, key) in retained_series:
+            retention = 'full'
+        else:
+            retention = 'aggregates'
+
+    if retention == 'full':
+        return [fill_value] * sim_params.n_intervals
+    elif retention == 'aggregates':
+        return RunningSeries(fill_value)
+    elif retention == 'downsampled':
+        return DownsampledSeries(sim_params.downsample_factor, fill_value)
+    else:
+        raise ValueError(
+            'Result retention "{}" not recognized. Please choose one of {}.'
+            .format(retention, RESULT_RETENTION_POLICIES))
+
+
+def get_series_total(series, weights=None):
+    """Sum of all values of a per interval container.
+
+    :param series: container created by :func:`new_interval_series`
+    :type series: list or :class:`RunningSeries`
+    :param weights: weight of each interval (e.g. number of occurrences
+        of a representative period). Defaults to None (all weights are 1)
+    :type weights: list, optional
+    :return: (weighted) sum of all values
+    :rtype: numerical
+    :raises ValueError: if weights are given but the values are not kept
+    """
+    if isinstance(series, RunningSeries):
+        if weights is not None:
+            raise ValueError('Interval weights need all values (result_retention "full")')
+        return series.total
+    if weights is not None:
+        return sum(value * weight for value, weight in zip(series, weights))
+    return sum(series)
@@ -0,0 +1,109 @@
+"""Components of a model that is simulated many times with few changed attributes.
+
+Each evaluation of the genetic algorithm creates all components of the model again:
+the component modules are imported, the names are checked and every constructor
+reads its input files and prepares its data, even though most components are the same
+for all individuals. A :class:`ModelTemplate` creates the components of a model once.
+Its :meth:`~ModelTemplate.clone` method returns new components for a simulation:
+
+* components with changed attributes are created again from their parameters,
+* all other components are deep copies of the initialised template components.
+  Their numpy arrays and pandas objects (e.g. the time series read from csv files)
+  are not copied, but shared with the template, as the components do not change them.
+
+Each clone has its own copy of the simulation parameters, so the simulations do not
+influence each other. The templates of a worker process are kept in
+:data:`model_templates` (see :func:`set_model_templates`).
+"""
+
+import copy
+import numpy as np
+import pandas as pd
+
+from smooth.framework.functions.functions import create_component_obj, convert_legacy_model
+from smooth.framework.simulation_parameters import SimulationParameters
+
+# types of component attributes that are shared by the template and its clones
+SHARED_TYPES = (np.ndarray, pd.DataFrame, pd.Series, pd.Index)
+
+# model templates of this process: key -> ModelTemplate
+model_templates = {}
+
+
+class ModelTemplate:
+    """Initialised components of a smooth model.
+
+    :param model: smooth model
+    :type model: dict
+    :param sim_params: simulation parameters that replace those of the model
+    :type sim_params: dict, optional
+    :var component_params: parameters of each component by name
+    :type component_params: dict
+    :var sim_params: simulation parameters of the template components
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :var components: template components
+    :type components: list of :class:`~smooth.components.component.Component`
+    :var shared_data: attributes of the template components shared with the clones
+    :type shared_data: list
+    """
+
+    def __init__(self, model, sim_params=None):
+        # legacy: components may be list. Convert to dict.
+        model = copy.deepcopy(convert_legacy_model(model))
+        if sim_params is not None:
+            model['sim_params'] = dict(model['sim_params'], **sim_params)
+        self.component_params = model['components']
+        self.sim_params = SimulationParameters(model['sim_params'])
+        self.components = create_component_obj(model, self.sim_params)
+        self.shared_data = [
+            value for this_comp in self.components for value in vars(this_comp).values()
+            if isinstance(value, SHARED_TYPES)]
+
+    def clone(self, changes=None, removed=()):
+        """Get components for a new simulation of the model.
+
+        :param changes: changed attribute values by component name and attribute name
+        :type changes: dict of dicts, optional
+        :param removed: names of components that are left out
+        :type removed: collection of strings, optional
+        :return: components in the order of the model
+        :rtype: list of :class:`~smooth.components.component.Component`
+        """
+        changes = changes or {}
+        sim_params = copy.copy(self.sim_params)
+        # objects that are not copied: the simulation parameters are replaced by the
+        # copy of this clone, the data is shared with the template
+        memo = {id(self.sim_params): sim_params}
+        memo.update((id(data), data) for data in self.shared_data)
+        components = []
+        for this_comp in self.components:
+            if this_comp.name in removed:
+                continue
+            if this_comp.name in changes:
+                params = dict(self.component_params[this_comp.name], **changes[this_comp.name])
+                components += create_component_obj(
+                    {'components': {this_comp.name: params}}, sim_params)
+            else:
+                components.append(copy.deepcopy(this_comp, memo))
+        return components
+
+
+def set_model_templates(templates):
+    """Set the model templates of this process, e.g. when a worker process starts.
+
+    :param templates: model templates by key
+    :type templates: dict
+    """
+    model_templates.clear()
+    model_templates.update(templates)
+
+
+def get_model_template(key):
+    """Get a model template of this process.
+
+    :param key: key of the model template
+    :type key: hashable
+    :return: model template or None if there is no template with this key
+    :rtype: :class:`ModelTemplate` or None
+    """
+    return model_templates.get(key)
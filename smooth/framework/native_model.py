@@ -0,0 +1,296 @@
+"""Linear program of an interval built without oemof and Pyomo.
+
+For small models, building the oemof and Pyomo model of each interval takes most
+of the simulation time. With the *native_model* simulation parameter set, the linear
+program of each interval is built directly as a sparse matrix instead, if all
+components of the model implement
+:func:`~smooth.components.component.Component.add_to_native_model`. This is the case for
+components that are represented by linear oemof sources, sinks, transformers and
+storages: Supply, Sink, EnergySourceFromCsv, EnergyDemandFromCsv, Battery, StorageH2,
+PowerConverter, Gate, CompressorH2, ElectricHeater, AirSourceHeatPump and BiogasConverter.
+Other models are simulated with oemof as usual.
+
+The components add their flows, conversions and storages to a :class:`NativeModel` in
+every interval, just like they add their oemof nodes to the oemof model.
+The structure of the linear program is built in the first interval. In the following
+intervals, only the bounds, costs, coefficients and right hand sides are updated in place.
+The linear program is solved in-process with *scipy.optimize.linprog* (method 'highs').
+The results are returned in the same format as the oemof results, so the components
+update their flows and states just like with oemof.
+
+The variables and constraints are the same as those of the oemof model:
+
+- flow from *source* to *target* with the bounds given by *nominal_value* (or *fix*) \
+    and the costs *variable_costs* (multiplied by the time increment in hours)
+- bus balance: sum of all inflows equals sum of all outflows of each bus
+- conversion: flow(input, node) * factor(output) = flow(node, output) * factor(input) \
+    for all inputs and outputs of a transformer
+- storage balance (dt: time increment in hours): content = initial content * (1 - loss_rate)^dt \
+    + dt * (inflow * inflow_conversion_factor - outflow / outflow_conversion_factor)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
+
+from smooth.components.component import Component
+from smooth.framework.functions.lp_solver import get_linprog_status
+
+
+def supports_native_model(components):
+    """Check if all components can be added to a :class:`NativeModel`.
+
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :return: True if all components implement *add_to_native_model*
+    :rtype: boolean
+    """
+    return all(
+        type(this_comp).add_to_native_model is not Component.add_to_native_model
+        for this_comp in components)
+
+
+class NativeModel:
+    """Linear program of an interval with equality constraints, kept between intervals.
+
+    Variables (columns) and constraints (rows) are addressed by keys. Adding a variable,
+    constraint or coefficient with a key that already exists updates its values.
+
+    :param busses: labels of the busses
+    :type busses: list of strings
+    :param interval_time: length of one time step in minutes
+    :type interval_time: numerical
+    :var columns: key and index of each variable. Keys of flows are (source, target),
+        other variables are keyed by (node, variable name)
+    :type columns: dict
+    :var flows: keys of the flow variables
+    :type flows: set
+    :var rows: key and index of each constraint. Bus balances are keyed by the bus label
+    :type rows: dict
+    """
+
+    def __init__(self, busses, interval_time):
+        self.timeincrement = interval_time / 60
+        self.columns = {}
+        self.flows = set()
+        self.rows = {}
+        self.lower = []
+        self.upper = []
+        self.costs = []
+        self.rhs = []
+        self.coefficients = {}
+        # sparse matrix and position of each coefficient in its data, built on first solve
+        self.matrix = None
+        self.positions = None
+        for bus in busses:
+            self.add_constraint(bus, {}, 0)
+
+    def add_variable(self, key, lower=0, upper=None, costs=0):
+        """Add or update a variable.
+
+        :param key: key of the variable
+        :type key: tuple
+        :param lower: lower bound. Defaults to 0
+        :type lower: numerical, optional
+        :param upper: upper bound. Defaults to None (unbounded)
+        :type upper: numerical, optional
+        :param costs: costs per unit in the objective. Defaults to 0
+        :type costs: numerical, optional
+        :return: index of the variable
+        :rtype: integer
+        """
+        lower = -np.inf if lower is None else float(lower)
+        upper = np.inf if upper is None else float(upper)
+        if key not in self.columns:
+            self.columns[key] = len(self.columns)
+            self.lower.append(lower)
+            self.upper.append(upper)
+            self.costs.append(float(costs))
+        else:
+            column = self.columns[key]
+            self.lower[column] = lower
+            self.upper[column] = upper
+            self.costs[column] = float(costs)
+        return self.columns[key]
+
+    def add_constraint(self, key, coefficients, rhs):
+        """Add or update an equality constraint.
+
+        :param key: key of the constraint
+        :type key: hashable
+        :param coefficients: index of variable and coefficient
+        :type coefficients: dict
+        :param rhs: right hand side
+        :type rhs: numerical
+        :return: index of the constraint
+        :rtype: integer
+        """
+        if key not in self.rows:
+            self.rows[key] = len(self.rows)
+            self.rhs.append(float(rhs))
+        else:
+            self.rhs[self.rows[key]] = float(rhs)
+        row = self.rows[key]
+        for column, value in coefficients.items():
+            self.set_coefficient(row, column, value)
+        return row
+
+    def set_coefficient(self, row, column, value):
+        """Set a coefficient of the constraint matrix.
+        Coefficients that are not part of the matrix yet make it be rebuilt before solving.
+
+        :param row: index of the constraint
+        :type row: integer
+        :param column: index of the variable
+        :type column: integer
+        :param value: coefficient
+        :type value: numerical
+        """
+        self.coefficients[row, column] = float(value)
+        if self.matrix is not None:
+            position = self.positions.get((row, column))
+            if position is None:
+                self.matrix = None
+            else:
+                self.matrix.data[position] = value
+
+    def add_flow(self, source, target, nominal_value=None, variable_costs=0, fix=None):
+        """Add or update a flow between a bus and a node, like a :class:`oemof.solph.Flow`.
+
+        :param source: label of the source node or bus
+        :type source: string
+        :param target: label of the target node or bus
+        :type target: string
+        :param nominal_value: upper bound of the flow. Defaults to None (unbounded)
+        :type nominal_value: numerical, optional
+        :param variable_costs: costs per unit of the flow. Defaults to 0
+        :type variable_costs: numerical, optional
+        :param fix: fix the flow to this share of the nominal value. Defaults to None
+        :type fix: numerical, optional
+        :return: index of the flow variable
+        :rtype: integer
+        """
+        lower = 0
+        upper = nominal_value
+        if fix is not None:
+            lower = upper = float(fix) * nominal_value
+        column = self.add_variable(
+            (source, target), lower, upper, (variable_costs or 0) * self.timeincrement)
+        self.flows.add((source, target))
+        # bus balance: inflows - outflows = 0
+        if target in self.rows:
+            self.set_coefficient(self.rows[target], column, 1)
+        if source in self.rows:
+            self.set_coefficient(self.rows[source], column, -1)
+        return column
+
+    def add_conversion(self, label, inputs, outputs, conversion_factors=None):
+        """Add or update the conversion constraints of a transformer, like a
+        :class:`oemof.solph.Transformer`. The flows have to be added before.
+
+        :param label: label of the transformer
+        :type label: string
+        :param inputs: labels of the input busses
+        :type inputs: list of strings
+        :param outputs: labels of the output busses
+        :type outputs: list of strings
+        :param conversion_factors: bus label and conversion factor. Defaults to 1
+        :type conversion_factors: dict, optional
+        """
+        conversion_factors = conversion_factors or {}
+        for bus_in in inputs:
+            for bus_out in outputs:
+                self.add_constraint(('conversion', label, bus_in, bus_out), {
+                    self.columns[bus_in, label]: conversion_factors.get(bus_out, 1),
+                    self.columns[label, bus_out]: -conversion_factors.get(bus_in, 1),
+                }, 0)
+
+    def add_storage(
+            self, label, bus_in, bus_out, nominal_storage_capacity, initial_storage_level,
+            min_storage_level=0, max_storage_level=1, loss_rate=0,
+            inflow_conversion_factor=1, outflow_conversion_factor=1):
+        """Add or update the content and balance of a storage, like an unbalanced
+        :class:`oemof.solph.components.GenericStorage`. The flows have to be added before.
+
+        :param label: label of the storage
+        :type label: string
+        :param bus_in: label of the input bus
+        :type bus_in: string
+        :param bus_out: label of the output bus
+        :type bus_out: string
+        :param nominal_storage_capacity: capacity of the storage
+        :type nominal_storage_capacity: numerical
+        :param initial_storage_level: content at the start of the interval,
+            relative to the capacity
+        :type initial_storage_level: numerical
+        :param min_storage_level: minimum relative content. Defaults to 0
+        :type min_storage_level: numerical, optional
+        :param max_storage_level: maximum relative content. Defaults to 1
+        :type max_storage_level: numerical, optional
+        :param loss_rate: relative loss per hour. Defaults to 0
+        :type loss_rate: numerical, optional
+        :param inflow_conversion_factor: efficiency of charging. Defaults to 1
+        :type inflow_conversion_factor: numerical, optional
+        :param outflow_conversion_factor: efficiency of discharging. Defaults to 1
+        :type outflow_conversion_factor: numerical, optional
+        """
+        content = self.add_variable(
+            (label, 'storage_content'),
+            nominal_storage_capacity * min_storage_level,
+            nominal_storage_capacity * max_storage_level)
+        initial_content = initial_storage_level * nominal_storage_capacity
+        self.add_constraint(('storage_balance', label), {
+            content: 1,
+            self.columns[bus_in, label]: -inflow_conversion_factor * self.timeincrement,
+            self.columns[label, bus_out]: self.timeincrement / outflow_conversion_factor,
+        }, initial_content * (1 - loss_rate) ** self.timeincrement)
+
+    def build_matrix(self):
+        """Build the sparse constraint matrix from the coefficients."""
+        keys = sorted(self.coefficients)
+        indptr = np.zeros(len(self.rows) + 1, dtype=int)
+        for row, _ in keys:
+            indptr[row + 1] += 1
+        self.matrix = csr_matrix(
+            ([self.coefficients[key] for key in keys],
+             [column for _, column in keys],
+             np.cumsum(indptr)),
+            shape=(len(self.rows), len(self.columns)))
+        self.positions = {key: position for position, key in enumerate(keys)}
+
+    def solve(self):
+        """Solve the linear program with the HiGHS solver of SciPy.
+
+        :return: solver status and termination condition (like Pyomo)
+        :rtype: tuple of strings
+        """
+        if self.matrix is None or self.matrix.shape != (len(self.rows), len(self.columns)):
+            self.build_matrix()
+        result = linprog(
+            self.costs, A_eq=self.matrix, b_eq=self.rhs,
+            bounds=np.column_stack([self.lower, self.upper]), method='highs')
+        self.values = result.x
+        return get_linprog_status(result)
+
+    def get_results(self, time_index):
+        """Get the solution in the format of the oemof results (with labels as keys).
+
+        :param time_index: time index of this interval
+        :type time_index: pandas DatetimeIndex
+        :return: flows keyed by (source, target), other variables by (node, None),
+            each with *sequences* and *scalars*
+        :rtype: dict
+        """
+        results = {}
+        for (node, name), column in self.columns.items():
+            if (node, name) in self.flows:
+                key, name = (node, name), 'flow'
+            else:
+                key = (node, None)
+            if key not in results:
+                results[key] = {
+                    'sequences': pd.DataFrame(index=time_index),
+                    'scalars': pd.Series(dtype=float)}
+            results[key]['sequences'][name] = [self.values[column]]
+        return results
@@ -0,0 +1,246 @@
+"""Simulate several smooth models (scenarios) at once.
+
+Process pool
+------------
+:func:`run_scenarios` simulates a list or dictionary of models, e.g. the same site with
+the weather of different years or with different tariffs, in a pool of *n_core* worker
+processes. The models can be created from one base model and the overrides of each
+scenario with :func:`create_scenarios`.
+
+* The workers are started once and simulate one scenario after the other.
+* The time series of all scenarios are loaded once into shared memory
+  (see :mod:`smooth.framework.functions.shared_time_series`), so each CSV file is only
+  read once, however many scenarios use it.
+* With *timeout*, a scenario is stopped after the first interval that ends later than
+  *timeout* seconds after its start. The timeout is only checked between two intervals:
+  an interval that does not finish (e.g. a solver that does not terminate) is not
+  interrupted, so the scenario may run much longer than *timeout*.
+* The progress is printed whenever a scenario is finished.
+* With *result_store*, the per interval results of each scenario are written by the
+  worker to a :class:`~smooth.framework.functions.result_store.ResultStore`,
+  with the scenario name as key. Otherwise, the components are sent back.
+
+Example::
+
+    models = create_scenarios(mymodel, {
+        'year_2019': {'components': {'pv': {'csv_filename': 'pv_2019.csv'}}},
+        'year_2020': {'components': {'pv': {'csv_filename': 'pv_2020.csv'}}},
+    })
+    summary = run_scenarios(models, n_core=4, result_store='scenario_results')
+    pv_2019 = ResultStore('scenario_results').read('year_2019')
+
+Threads
+-------
+Most of the time of a simulation is spent in the CBC solver, which runs as a separate
+process. Python does not block other threads while waiting for it, so several
+simulations can share one process: :func:`run_scenarios_in_threads` runs each model in
+a thread of a thread pool. Compared to a pool of processes, smooth and its dependencies
+are only imported once and the components need no pickling.
+
+:func:`~smooth.framework.run_smooth.run_smooth` is re-entrant: it does not change the
+given model, writes no shared files and each CBC call uses its own temporary files
+(see :mod:`smooth.framework.functions.lp_solver`).
+Models solved in-process (*solver* 'highs' or *native_model*) hold the interpreter
+while solving and do not profit from threads.
+
+.. note::
+    If an interval fails and *show_debug_flag* is set, the results are plotted with
+    matplotlib, which should only be used by one thread. Set *show_debug_flag* to False
+    in the simulation parameters of the scenarios.
+"""
+
+import copy
+import multiprocessing as mp
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smooth.framework.functions.functions import create_component_obj, convert_legacy_model
+from smooth.framework.functions.lp_solver import prepare_solver_threads
+from smooth.framework.functions.result_store import ResultStore
+from smooth.framework.functions.shared_time_series import \
+    SharedTimeSeries, attach_shared_time_series
+from smooth.framework.run_smooth import run_smooth, iter_smooth
+from smooth.framework.simulation_parameters import SimulationParameters
+
+
+def run_scenarios_in_threads(models, n_threads=None):
+    """Simulate several models concurrently in threads of this process.
+
+    :param models: smooth models
+    :type models: list of dictionaries
+    :param n_threads: number of threads. Defaults to None
+        (default of *concurrent.futures.ThreadPoolExecutor*)
+    :type n_threads: int, optional
+    :return: results of all components and oemof status of each model
+    :rtype: list of tuples of components and string
+    :raises: the first error of a simulation, after all simulations are finished
+    """
+    prepare_solver_threads()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        futures = [executor.submit(run_smooth, model) for model in models]
+    return [future.result() for future in futures]
+
+
+def create_scenarios(base_model, overrides):
+    """Create the models of several scenarios from one base model.
+
+    :param base_model: smooth model all scenarios are based on
+    :type base_model: dict
+    :param overrides: changes of each scenario by scenario name. The changes have the
+        structure of the model, e.g. {'components': {'pv': {'nominal_value': 10}}}.
+        Dictionaries are updated, all other values are replaced
+    :type overrides: dict
+    :return: models by scenario name
+    :rtype: dict
+    """
+    return {
+        name: apply_overrides(copy.deepcopy(convert_legacy_model(base_model)), changes)
+        for name, changes in overrides.items()}
+
+
+def apply_overrides(model, overrides):
+    """Recursively update a (copied) model with the changes of a scenario.
+
+    :param model: smooth model or part of it
+    :type model: dict
+    :param overrides: changes with the structure of the model
+    :type overrides: dict
+    :return: updated model
+    :rtype: dict
+    """
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(model.get(key), dict):
+            apply_overrides(model[key], value)
+        else:
+            model[key] = copy.deepcopy(value)
+    return model
+
+
+def run_scenario(name, model, result_store=None, timeout=None):
+    """Simulate one scenario in a worker process.
+
+    :param name: name of the scenario
+    :type name: string
+    :param model: smooth model of the scenario
+    :type model: dict
+    :param result_store: directory of the result store the results are written to.
+        Defaults to None (return the components)
+    :type result_store: string, optional
+    :param timeout: maximum duration of the simulation in seconds. Only checked after each
+        interval, a running interval is not interrupted. Defaults to None (no limit)
+    :type timeout: number, optional
+    :return: name and summary of the scenario with the keys *status* (oemof status),
+        *error* (message of a failed simulation), *duration* in seconds
+        and *components* (without result store)
+    :rtype: tuple of string and dict
+    """
+    start = time.time()
+    summary = {'status': None, 'error': None}
+    try:
+        simulation = iter_smooth(model)
+        while True:
+            try:
+                next(simulation)
+            except StopIteration as finished:
+                components, summary['status'] = finished.value
+                break
+            if timeout is not None and time.time() - start > timeout:
+                simulation.close()
+                raise TimeoutError('Timeout of {} s exceeded'.format(timeout))
+        if result_store is None:
+            summary['components'] = components
+        else:
+            ResultStore(result_store).write(name, components)
+    except Exception as e:
+        summary['error'] = '{}: {}'.format(type(e).__name__, e)
+    summary['duration'] = time.time() - start
+    return name, summary
+
+
+def load_time_series(models):
+    """Load the time series read by the components of all models into shared memory.
+    Files used by several models are read once.
+
+    :param models: smooth models
+    :type models: list of dicts
+    :return: shared time series, to be closed when the workers are finished
+    :rtype: :class:`~smooth.framework.functions.shared_time_series.SharedTimeSeries`
+    """
+    time_series = SharedTimeSeries()
+    if not time_series.is_available():
+        return time_series
+    with time_series.recording():
+        for model in models:
+            try:
+                model = convert_legacy_model(model)
+                create_component_obj(model, SimulationParameters(model['sim_params']))
+            except Exception:
+                # the error is reported again by the simulation of this scenario
+                pass
+    return time_series
+
+
+def run_scenarios(
+        models, n_core=None, result_store=None, timeout=None,
+        print_progress=True, share_time_series=True):
+    """Simulate several models in a pool of worker processes.
+
+    :param models: smooth models, as list or by scenario name
+        (see :func:`create_scenarios`). The scenarios of a list are named by their index
+    :type models: list or dict
+    :param n_core: number of worker processes. Defaults to None (all cores)
+    :type n_core: int or 'max', optional
+    :param result_store: directory of a result store the per interval results of each
+        scenario are written to. Defaults to None (the components are returned)
+    :type result_store: string, optional
+    :param timeout: maximum duration of each scenario in seconds. Only checked after each
+        interval, a running interval is not interrupted (see :func:`run_scenario`).
+        Defaults to None (no limit)
+    :type timeout: number, optional
+    :param print_progress: print each finished scenario. Defaults to True
+    :type print_progress: boolean, optional
+    :param share_time_series: load the time series of all models once into shared memory.
+        Defaults to True
+    :type share_time_series: boolean, optional
+    :return: summary of each scenario by name, see :func:`run_scenario`.
+        Failed scenarios have an *error* and no results
+    :rtype: dict
+    """
+    if isinstance(models, list):
+        models = {str(i_model): model for i_model, model in enumerate(models)}
+    if n_core is None or n_core == 'max':
+        n_core = mp.cpu_count()
+
+    time_series = load_time_series(models.values()) if share_time_series else SharedTimeSeries()
+    summaries = {}
+
+    def set_summary(result):
+        name, summary = result
+        summaries[name] = summary
+        if print_progress:
+            print('Scenario {}/{} ({}) finished after {:.1f} s: {}'.format(
+                len(summaries), len(models), name, summary['duration'],
+                summary['error'] or summary['status']))
+
+    try:
+        with mp.Pool(
+                processes=n_core,
+                initializer=attach_shared_time_series,
+                initargs=(time_series.descriptors,)) as pool:
+            tasks = [
+                pool.apply_async(
+                    run_scenario, (name, model, result_store, timeout), callback=set_summary)
+                for name, model in models.items()]
+            for name, task in zip(models, tasks):
+                try:
+                    task.get()
+                except Exception as e:
+                    # the scenario could not be sent to or from the worker
+                    set_summary((name, {
+                        'status': None, 'error': '{}: {}'.format(type(e).__name__, e),
+                        'duration': float('nan')}))
+    finally:
+        time_series.close()
+
+    # keep the order of the models
+    return {name: summaries[name] for name in models}
@@ -79,6 +79,22 @@ The first item returned is a list of all components, each updated with
 
 \\* a list with a value for each time step
 
+Streaming results
+-----------------
+For long simulations, :func:`iter_smooth` can be used instead of :func:`run_smooth`.
+It is a generator that yields a compact record with the flows, states, costs and
+solver status of each interval as soon as this interval is solved. When called with
+*keep_history=False*, the components only keep the most recent value and running
+sums of their flows, states and costs, so the memory used stays constant
+regardless of the number of intervals. The annuities are computed from the running sums.
+The same applies to :func:`run_smooth` if the *result_retention* simulation parameter
+is set (see :mod:`smooth.framework.interval_series`).
+
+Example::
+
+    for record in iter_smooth(model, keep_history=False):
+        print(record['date_time'], record['costs']['grid']['variable_costs'])
+
 **************
 Implementation
 **************
@@ -98,7 +114,9 @@ Initialization
 --------------
 There is not much to see here. Mainly, component instances get created from the
 model description. For legacy models (version < 0.2.0), the component list is
-converted to a dictionary. No oemof model is built here.
+converted to a dictionary. No oemof model is built here. Components that were
+created beforehand (e.g. cloned from a :class:`~smooth.framework.model_template.ModelTemplate`)
+can be passed to :func:`run_smooth` instead.
 
 Simulation
 ----------
@@ -110,9 +128,12 @@ solved and evaluated:
 #. create buses
 #. update components and add them to the oemof model
 #. update bus constraints
-#. write lp file in current directory
-#. call solver for model
-#. check returned status for non#.optimal solution
+#. write the lp file of the first interval to *lp_file*, if set in the simulation parameters
+#. call solver for model (CBC, or HiGHS in-process for linear models if *solver* is 'highs', \
+    see :mod:`smooth.framework.functions.lp_solver`)
+#. check returned status for non-optimal solution (with *show_debug_flag*, the debug \
+    information is built from a compact snapshot of the last successful interval, \
+    see :mod:`smooth.framework.functions.debug`)
 #. handle results for each component
 
     #. update flows
@@ -120,108 +141,272 @@ solved and evaluated:
     #. update costs
     #. update emissions
 
+#. collect the results of this interval (yielded by :func:`iter_smooth`)
+
+Native model
+------------
+If *native_model* is set in the simulation parameters and all components support it,
+the oemof model is not built. Instead, the components add their flows, conversions and
+storages directly to a sparse linear program that is kept and updated from one
+interval to the next and solved in-process (see :mod:`smooth.framework.native_model`).
+No lp file is written in this case.
+
+Checkpoints
+-----------
+If *checkpoint_interval* is set in the simulation parameters, the states and accumulated
+results of all components are saved to *checkpoint_file* every *checkpoint_interval*
+intervals. If the simulation is interrupted, :func:`resume_smooth` recreates the components
+from the model, restores them from the checkpoint and continues with the next interval.
+
+Parallel intervals
+------------------
+If no component keeps a state from one interval to the next (all components declare
+*stateless* and no component depends on a foreign state), the intervals are independent of
+each other. With *parallel_intervals* set in the simulation parameters, they are then split
+into consecutive chunks that are solved by a pool of worker processes, each with a copy of
+the components. The records of the intervals are merged back into the components in order,
+so the results are the same as for a sequential simulation. Models with states are always
+simulated sequentially.
+
 Post-processing
 ---------------
 After all time steps have been computed, call the *generate_results* function of each component.
 Finally, return the updated components and the last oemof status.
 """
 
+import copy
+import multiprocessing as mp
 import oemof.solph as solph
 
 from smooth.framework.simulation_parameters import SimulationParameters as sp
-from smooth.framework.functions.debug import get_df_debug, show_debug
+from smooth.framework.functions.debug import DebugSnapshots, show_debug
 from smooth.framework.exceptions import SolverNonOptimalError
-from smooth.framework.functions.functions import create_component_obj
+from smooth.framework.functions.functions import create_component_obj, convert_legacy_model
+from smooth.framework.functions.checkpoint import save_checkpoint, load_checkpoint
+from smooth.framework.functions.lp_solver import solve_model
+from smooth.framework.native_model import NativeModel, supports_native_model
 
 
-def run_smooth(model):
+def run_smooth(model, components=None):
     """Runs the smooth simulation framework
 
     :param model: smooth model object containing parameters for components, simulation and busses
     :type model: dictionary
+    :param components: components created for this simulation, e.g. cloned from a
+        :class:`~smooth.framework.model_template.ModelTemplate`.
+        Defaults to None (create the components from the model)
+    :type components: list of :class:`~smooth.components.component.Component`, optional
     :return: results of all components and oemof status
     :rtype: tuple of components and string
     :raises: *SolverNonOptimalError* if oemof result is not ok and not optimal
     """
+    return finish_simulation(iter_smooth(model, components=components))
+
+
+def resume_smooth(model):
+    """Continues a smooth simulation from the checkpoint file given in the simulation
+    parameters (see *checkpoint_interval* and *checkpoint_file*).
+
+    The results are identical to the ones of an uninterrupted :func:`run_smooth`.
+
+    :param model: the same smooth model that was used for the interrupted simulation
+    :type model: dictionary
+    :return: results of all components and oemof status
+    :rtype: tuple of components and string
+    :raises: *SolverNonOptimalError* if oemof result is not ok and not optimal,
+        *ValueError* if the checkpoint does not match the model
+    """
+    return finish_simulation(iter_smooth(model, resume=True))
+
+
+def finish_simulation(simulation):
+    """Simulate all remaining intervals of a simulation started with :func:`iter_smooth`.
+
+    :param simulation: generator returned by :func:`iter_smooth`
+    :type simulation: generator
+    :return: results of all components and oemof status
+    :rtype: tuple of components and string
+    """
+    # The per interval records are not needed here, as the results are kept in the components.
+    while True:
+        try:
+            next(simulation)
+        except StopIteration as finished:
+            return finished.value
+
+
+def get_running_results(components):
+    """Get the annuities of a running simulation, e.g. from :func:`iter_smooth`, as if the
+    remaining intervals had no variable costs and emissions. If these are not negative,
+    the annuities are lower bounds of the final ones.
+
+    The components are copied shallowly and only their *results* are replaced,
+    so the simulation is not changed.
+
+    :param components: components of the running simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :return: components with the annuities of the intervals simulated so far
+    :rtype: list of :class:`~smooth.components.component.Component`
+    """
+    running_components = [copy.copy(this_comp) for this_comp in components]
+    for this_comp in running_components:
+        this_comp.results = dict(this_comp.results)
+        this_comp.generate_results()
+    return running_components
+
+
+def iter_smooth(model, keep_history=None, resume=False, components=None):
+    """Runs the smooth simulation framework interval by interval.
+
+    After each interval has been solved, a record with the results of this interval
+    is yielded. When all intervals are simulated, the results of each component are
+    generated and the generator returns the same tuple as :func:`run_smooth`
+    (as value of the *StopIteration* exception).
+
+    Each record is a dictionary with the keys
+
+    - i_interval: index of the interval
+    - date_time: time stamp of the interval
+    - status: oemof solver status
+    - termination_condition: oemof solver termination condition
+    - flows: flow values of this interval. Key is the component name, entry is \
+        a dictionary with the flow tuple (from, to) as key
+    - states: state values of this interval, grouped by component name
+    - costs: *variable_costs*, *art_costs* and *variable_emissions* of this interval, \
+        grouped by component name
+
+    :param model: smooth model object containing parameters for components, simulation and busses
+    :type model: dictionary
+    :param keep_history: Decide if the components keep the values of all time steps.
+        If False, only the most recent value and running aggregates are kept, so
+        the memory used does not grow with the number of intervals (result_retention
+        'aggregates'). Defaults to the *result_retention* simulation parameter
+    :type keep_history: boolean, optional
+    :param resume: continue the simulation from the checkpoint file given in the
+        simulation parameters. Defaults to False
+    :type resume: boolean, optional
+    :param components: components created for this simulation, sharing one object of
+        simulation parameters. Defaults to None (create the components from the model)
+    :type components: list of :class:`~smooth.components.component.Component`, optional
+    :return: generator of per interval records
+    :raises: *SolverNonOptimalError* if oemof result is not ok and not optimal
+    """
 
     # ------------------- INITIALIZATION -------------------
-    # legacy: components may be list. Convert to dict.
-    if isinstance(model["components"], list):
-        names = [c.pop("name") for c in model["components"]]
-        model.update({'components': dict(zip(names, model["components"]))})
+    # legacy: components may be list. Convert to dict (without changing the given model).
+    model = convert_legacy_model(model)
 
     # GET SIMULATION PARAMETERS
     # Create an object with the simulation parameters.
-    sim_params = sp(model['sim_params'])
+    # Components created beforehand bring their own simulation parameters.
+    if components:
+        sim_params = components[0].sim_params
+    else:
+        sim_params = sp(model['sim_params'])
+    if keep_history is not None:
+        sim_params.result_retention = 'full' if keep_history else 'aggregates'
 
     # CREATE COMPONENT OBJECTS
-    components = create_component_obj(model, sim_params)
+    if components is None:
+        components = create_component_obj(model, sim_params)
 
-    # There are no results yet.
-    df_results = None
-    results_dict = None
+    # Restore the states and results of all finished intervals from the checkpoint.
+    first_interval = 0
+    if resume:
+        first_interval = load_checkpoint(sim_params.checkpoint_file, components, sim_params) + 1
 
     # ------------------- SIMULATION -------------------
-    for i_interval in range(sim_params.n_intervals):
-        # Save the interval index of this run to the sim_params to make it usable later on.
-        sim_params.i_interval = i_interval
-        if sim_params.print_progress:
-            print('Simulating interval {}/{}'.format(i_interval+1, sim_params.n_intervals))
+    parallel = sim_params.parallel_intervals and is_stateless(components)
+    if parallel:
+        interval_records = solve_intervals_parallel(
+            model, components, sim_params, first_interval)
+    else:
+        interval_records = solve_intervals(
+            model, components, sim_params, first_interval, sim_params.n_intervals)
+
+    status = None
+    for record in interval_records:
+        if parallel:
+            # The interval was solved by a worker process: update the components.
+            apply_interval_record(components, sim_params, record)
+        status = record['status']
+
+        # Save a checkpoint every checkpoint_interval intervals.
+        if sim_params.checkpoint_interval and \
+                (record['i_interval'] + 1) % sim_params.checkpoint_interval == 0:
+            save_checkpoint(sim_params.checkpoint_file, components, sim_params)
+
+        yield record
 
-        # Initialize the oemof energy system for this time step.
-        this_time_index = sim_params.date_time_index[i_interval: (i_interval + 1)]
-        oemof_model = solph.EnergySystem(timeindex=this_time_index,
-                                         freq='{}min'.format(sim_params.interval_time))
+    # Calculate the annuity for each component.
+    for this_comp in components:
+        this_comp.generate_results()
 
-        # ------------------- CREATE THE OEMOF MODEL FOR THIS INTERVAL -------------------
-        # Create all busses and save them to a dict for later use in the components.
-        busses = {}
+    return components, status
 
-        for i_bus in model['busses']:
-            # Create this bus and append it to the "busses" dict.
-            busses[i_bus] = solph.Bus(label=i_bus)
-            # Add the bus to the simulation model.
-            oemof_model.add(busses[i_bus])
 
-        # Prepare the simulation.
-        for this_comp in components:
-            # Execute the prepare simulation step (if this component has one).
-            this_comp.prepare_simulation(components)
-            # add oemof representation of this component to model
-            this_comp.add_to_oemof_model(busses, oemof_model)
+def solve_intervals(model, components, sim_params, first_interval, last_interval):
+    """Solve the intervals from *first_interval* up to (excluding) *last_interval*
+    one after the other and update the components after each interval.
 
-        # ------------------- RUN THE SIMULATION -------------------
-        # Do the simulation for this time step.
-        model_to_solve = solph.Model(oemof_model)
-
-        for this_comp in components:
-            this_comp.update_constraints(busses, model_to_solve)
+    :param model: smooth model
+    :type model: dictionary
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param sim_params: simulation parameters
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :param first_interval: index of the first interval to solve
+    :type first_interval: integer
+    :param last_interval: index after the last interval to solve
+    :type last_interval: integer
+    :return: generator of per interval records, see :func:`iter_smooth`
+    :raises: *SolverNonOptimalError* if oemof result is not ok and not optimal
+    """
+    # Compact snapshot of the last successful interval, to show debug information
+    # if an interval fails.
+    debug_snapshots = DebugSnapshots()
 
-        if i_interval == 0:
-            # Save the set of linear equations for the first interval.
-            model_to_solve.write('./oemof_model.lp', io_options={'symbolic_solver_labels': True})
+    # The native model is kept for all intervals, so it is only updated in each interval.
+    native_model = None
+    if sim_params.native_model and supports_native_model(components):
+        native_model = NativeModel(model['busses'], sim_params.interval_time)
 
-        oemof_results = model_to_solve.solve(solver='cbc', solve_kwargs={'tee': False})
+    for i_interval in range(first_interval, last_interval):
+        # Save the interval index of this run to the sim_params to make it usable later on.
+        sim_params.i_interval = i_interval
+        if sim_params.print_progress:
+            print('Simulating interval {}/{}'.format(i_interval+1, sim_params.n_intervals))
 
-        # ------------------- CHECK IF SOLVING WAS SUCCESSFUL -------------------
-        # If the status and temination condition is not ok/optimal, get and
-        # print the current flows and status
-        status = oemof_results["Solver"][0]["Status"]
-        termination_condition = oemof_results["Solver"][0]["Termination condition"]
-        if status != "ok" and termination_condition != "optimal":
+        this_time_index = sim_params.date_time_index[i_interval: (i_interval + 1)]
+        if native_model is not None:
+            # Build and solve the linear program of this time step without oemof.
+            results, status, termination_condition = solve_native_interval(
+                native_model, components, this_time_index)
+        else:
+            # Create the oemof model for this time step.
+            model_to_solve = build_oemof_model(model, components, sim_params, this_time_index)
+
+            if i_interval == 0 and sim_params.lp_file is not None:
+                # Save the set of linear equations for the first interval.
+                write_lp_file(model_to_solve, sim_params.lp_file)
+
+            status, termination_condition = solve_model(model_to_solve, sim_params.solver)
+
+            # ------------------- CHECK IF SOLVING WAS SUCCESSFUL -------------------
+            # If the status and temination condition is not ok/optimal, get and
+            # print the current flows and status
+            if status != "ok" and termination_condition != "optimal":
+                if sim_params.show_debug_flag and debug_snapshots.snapshots:
+                    # debug info needs a successfully solved interval to compare against
+                    show_debug(debug_snapshots.get_df_debug(model_to_solve), components)
+                raise SolverNonOptimalError('solver status: ' + status +
+                                            " / termination condition: " + termination_condition)
+
+            # ------------------- HANDLE RESULTS -------------------
+            # Get the results of this oemof run.
+            results = solph.processing.results(model_to_solve)
             if sim_params.show_debug_flag:
-                new_df_results = solph.processing.create_dataframe(model_to_solve)
-                df_debug = get_df_debug(df_results, results_dict, new_df_results)
-                show_debug(df_debug, components)
-            raise SolverNonOptimalError('solver status: ' + status +
-                                        " / termination condition: " + termination_condition)
-
-        # ------------------- HANDLE RESULTS -------------------
-        # Get the results of this oemof run.
-        results = solph.processing.results(model_to_solve)
-        if sim_params.show_debug_flag:
-            results_dict = solph.processing.parameter_as_dict(model_to_solve)
-            df_results = solph.processing.create_dataframe(model_to_solve)
+                debug_snapshots.add(model_to_solve, results)
 
         # Loop through every component and call the result handling functions
         for this_comp in components:
@@ -234,8 +419,217 @@ def run_smooth(model):
             # Update the costs and artificial costs.
             this_comp.update_var_emissions()
 
-    # Calculate the annuity for each component.
+        yield get_interval_record(components, sim_params, status, termination_condition)
+
+
+def build_oemof_model(model, components, sim_params, time_index):
+    """Create the oemof model of one interval from the busses and components.
+
+    :param model: smooth model
+    :type model: dictionary
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param sim_params: simulation parameters
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :param time_index: time index of the interval
+    :type time_index: pandas.DatetimeIndex
+    :return: oemof model of this interval, ready to be solved
+    :rtype: :class:`oemof.solph.Model`
+    """
+    # Initialize the oemof energy system for this time step.
+    oemof_model = solph.EnergySystem(timeindex=time_index,
+                                     freq='{}min'.format(sim_params.interval_time))
+
+    # ------------------- CREATE THE OEMOF MODEL FOR THIS INTERVAL -------------------
+    # Create all busses and save them to a dict for later use in the components.
+    busses = {}
+
+    for i_bus in model['busses']:
+        # Create this bus and append it to the "busses" dict.
+        busses[i_bus] = solph.Bus(label=i_bus)
+        # Add the bus to the simulation model.
+        oemof_model.add(busses[i_bus])
+
+    # Prepare the simulation.
     for this_comp in components:
-        this_comp.generate_results()
+        # Execute the prepare simulation step (if this component has one).
+        this_comp.prepare_simulation(components)
+        # add oemof representation of this component to model
+        this_comp.add_to_oemof_model(busses, oemof_model)
 
-    return components, status
+    # Create the solph model of this time step.
+    model_to_solve = solph.Model(oemof_model)
+
+    for this_comp in components:
+        this_comp.update_constraints(busses, model_to_solve)
+
+    return model_to_solve
+
+
+def write_lp_file(model_to_solve, file_name):
+    """Write the linear program of an oemof model to a file.
+
+    :param model_to_solve: oemof model
+    :type model_to_solve: :class:`oemof.solph.Model`
+    :param file_name: path of the lp file
+    :type file_name: string
+    """
+    model_to_solve.write(file_name, io_options={'symbolic_solver_labels': True})
+
+
+def solve_native_interval(native_model, components, time_index):
+    """Add all components to the native model and solve it for the current interval
+    (see :mod:`smooth.framework.native_model`).
+
+    :param native_model: native model of the simulation
+    :type native_model: :class:`~smooth.framework.native_model.NativeModel`
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param time_index: time index of the current interval
+    :type time_index: pandas DatetimeIndex
+    :return: results in the format of the oemof results, solver status
+        and termination condition
+    :rtype: tuple
+    :raises: *SolverNonOptimalError* if the result is not ok and not optimal
+    """
+    for this_comp in components:
+        this_comp.prepare_simulation(components)
+        this_comp.add_to_native_model(native_model)
+
+    status, termination_condition = native_model.solve()
+    if status != "ok" and termination_condition != "optimal":
+        raise SolverNonOptimalError('solver status: ' + status +
+                                    " / termination condition: " + termination_condition)
+    return native_model.get_results(time_index), status, termination_condition
+
+
+def is_stateless(components):
+    """Check if the intervals of a simulation are independent of each other.
+
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :return: True if no component keeps a state from one interval to the next
+        and no component depends on a foreign state
+    :rtype: boolean
+    """
+    return all(
+        this_comp.stateless and this_comp.fs_component_name is None
+        for this_comp in components)
+
+
+def solve_interval_chunk(model, components, first_interval, last_interval):
+    """Solve a chunk of intervals in a worker process.
+    The components are copies of the components of the simulation,
+    so they have to be stateless.
+
+    :param model: smooth model
+    :type model: dictionary
+    :param components: components of the simulation, sharing one object of
+        simulation parameters
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param first_interval: index of the first interval to solve
+    :type first_interval: integer
+    :param last_interval: index after the last interval to solve
+    :type last_interval: integer
+    :return: records of the solved intervals, see :func:`iter_smooth`
+    :rtype: list of dicts
+    """
+    sim_params = components[0].sim_params
+    sim_params.parallel_intervals = None
+    sim_params.checkpoint_interval = None
+    # Only the values of the current interval are needed for the records.
+    sim_params.result_retention = 'aggregates'
+    return list(solve_intervals(model, components, sim_params, first_interval, last_interval))
+
+
+def solve_intervals_parallel(model, components, sim_params, first_interval):
+    """Solve the intervals starting at *first_interval* in consecutive chunks with a pool
+    of *parallel_intervals* worker processes. Each worker gets a copy of the components.
+
+    :param model: smooth model
+    :type model: dictionary
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param sim_params: simulation parameters
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :param first_interval: index of the first interval to solve
+    :type first_interval: integer
+    :return: generator of per interval records in order, see :func:`iter_smooth`
+    :raises: *SolverNonOptimalError* if oemof result is not ok and not optimal
+    """
+    n_processes = sim_params.parallel_intervals
+    if n_processes is True or n_processes == 'max':
+        n_processes = mp.cpu_count()
+    chunk_size = -(-(sim_params.n_intervals - first_interval) // n_processes)
+    with mp.Pool(processes=n_processes) as pool:
+        chunks = [
+            pool.apply_async(
+                solve_interval_chunk,
+                (model, components, start, min(start + chunk_size, sim_params.n_intervals)))
+            for start in range(first_interval, sim_params.n_intervals, chunk_size)]
+        for chunk in chunks:
+            for record in chunk.get():
+                yield record
+
+
+def apply_interval_record(components, sim_params, record):
+    """Write the flows, states and costs of an interval record into the components.
+
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param sim_params: simulation parameters, *i_interval* is set to the interval of the record
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :param record: record of one interval, see :func:`iter_smooth`
+    :type record: dict
+    """
+    i_interval = record['i_interval']
+    sim_params.i_interval = i_interval
+    for this_comp in components:
+        if not hasattr(this_comp, 'flows'):
+            this_comp.flows = {}
+        for kind, container, fill_value in [
+                ('flows', this_comp.flows, None),
+                ('states', this_comp.states, None),
+                ('costs', this_comp.results, 0)]:
+            for key, value in record[kind][this_comp.name].items():
+                if key not in container:
+                    container[key] = this_comp.new_series(key, fill_value)
+                container[key][i_interval] = value
+
+
+def get_interval_record(components, sim_params, status, termination_condition):
+    """Collect the flows, states and costs of all components for the current interval.
+
+    :param components: components of the simulation
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param sim_params: simulation parameters, *i_interval* is the current interval
+    :type sim_params: :class:`~smooth.framework.simulation_parameters.SimulationParameters`
+    :param status: oemof solver status of this interval
+    :type status: string
+    :param termination_condition: oemof solver termination condition of this interval
+    :type termination_condition: string
+    :return: record of this interval, see :func:`iter_smooth`
+    :rtype: dict
+    """
+    i_interval = sim_params.i_interval
+    record = {
+        'i_interval': i_interval,
+        'date_time': sim_params.date_time_index[i_interval],
+        'status': status,
+        'termination_condition': termination_condition,
+        'flows': {},
+        'states': {},
+        'costs': {},
+    }
+    for this_comp in components:
+        record['flows'][this_comp.name] = {
+            flow_name: flow[i_interval]
+            for flow_name, flow in getattr(this_comp, 'flows', {}).items()}
+        record['states'][this_comp.name] = {
+            state_name: state[i_interval] for state_name, state in this_comp.states.items()}
+        record['costs'][this_comp.name] = {
+            cost_name: this_comp.results[cost_name][i_interval]
+            for cost_name in ['variable_costs', 'art_costs', 'variable_emissions']
+            if cost_name in this_comp.results}
+
+    return record
@@ -1,4 +1,6 @@
 import smooth.framework.functions.functions as func
+from smooth.framework.interval_series import RESULT_RETENTION_POLICIES
+from smooth.framework.functions.lp_solver import SOLVERS
 
 
 class SimulationParameters:
@@ -17,6 +19,43 @@ class SimulationParameters:
     :param show_debug_flag: Decide if last result values should be shown
         in case solver was not successful. Defaults to True
     :type show_debug_flag: boolean
+    :param result_retention: Decide how the flows, states and costs of every time step
+        are kept in the components: 'full', 'selected', 'aggregates' or 'downsampled'
+        (see :mod:`smooth.framework.interval_series`). Defaults to 'full'
+    :type result_retention: string
+    :param retained_series: series that are fully kept if result_retention is 'selected'.
+        Entries are component names or tuples of component name and flow/state/cost name.
+        Defaults to None
+    :type retained_series: list
+    :param downsample_factor: number of intervals combined into one value
+        if result_retention is 'downsampled'. Defaults to 24
+    :type downsample_factor: integer
+    :param checkpoint_interval: Save the states and accumulated results of all components
+        to *checkpoint_file* every this many intervals, so an interrupted simulation can be
+        continued with :func:`~smooth.framework.run_smooth.resume_smooth`.
+        Defaults to None (no checkpoints)
+    :type checkpoint_interval: integer
+    :param checkpoint_file: path of the checkpoint file. Defaults to 'smooth_checkpoint.pickle'
+    :type checkpoint_file: string
+    :param interval_weights: weight of each time step when computing the annual costs and
+        emissions, e.g. the number of occurrences of a representative period
+        (see :mod:`smooth.framework.functions.representative_periods`).
+        Defaults to None (all weights are 1)
+    :type interval_weights: list
+    :param parallel_intervals: number of processes that solve the intervals in parallel
+        (or 'max' to use all cores) if no component keeps a state from one interval
+        to the next (see :mod:`smooth.framework.run_smooth`). Defaults to None (sequential)
+    :type parallel_intervals: integer or string
+    :param solver: 'cbc' or 'highs' to solve linear models in-process with SciPy
+        (see :mod:`smooth.framework.functions.lp_solver`). Defaults to 'cbc'
+    :type solver: string
+    :param native_model: Decide if the linear program of each interval is built without
+        oemof if all components support it (see :mod:`smooth.framework.native_model`).
+        Defaults to False
+    :type native_model: boolean
+    :param lp_file: path of a file the linear program of the first interval is written to,
+        e.g. to inspect the model. Defaults to None (no file)
+    :type lp_file: string
     :var date_time_index: pandas date range of all time periods to be evaluated
     :var sim_time_span: length of simulation time range in minutes
     """
@@ -29,10 +68,30 @@ class SimulationParameters:
         self.interest_rate = 0.03
         self.print_progress = False
         self.show_debug_flag = True
+        self.result_retention = 'full'
+        self.retained_series = None
+        self.downsample_factor = 24
+        self.checkpoint_interval = None
+        self.checkpoint_file = 'smooth_checkpoint.pickle'
+        self.interval_weights = None
+        self.parallel_intervals = None
+        self.solver = 'cbc'
+        self.native_model = False
+        self.lp_file = None
 
         # ------------------- UPDATE PARAMETER DEFAULT VALUES -------------------
         self.set_parameters(params)
 
+        if self.result_retention not in RESULT_RETENTION_POLICIES:
+            raise ValueError(
+                'Result retention "{}" not recognized. Please choose one of {}.'
+                .format(self.result_retention, RESULT_RETENTION_POLICIES))
+
+        if self.solver not in SOLVERS:
+            raise ValueError(
+                'Solver "{}" not recognized. Please choose one of {}.'
+                .format(self.solver, SOLVERS))
+
         # Date time index.
         self.date_time_index = func.get_date_time_index(
             self.start_date, self.n_intervals, self.interval_time)
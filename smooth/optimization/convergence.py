@@ -0,0 +1,124 @@
+"""Convergence of the pareto front of the genetic algorithm.
+
+After each generation, the optimization records the hypervolume of the pareto front,
+the individuals on the front and the elapsed time in `progress`. The hypervolume is
+the area dominated by the front, bounded by a reference point that is worse than all
+individuals in both objectives. It grows as the front improves or gets wider, so its
+change shows if the optimization still makes progress. By default, the reference point
+is set beyond the worst fitness of the first generation (see :func:`get_reference_point`).
+If a later front reaches beyond it, it is moved and the hypervolume of all previous
+generations is computed again, so the recorded values can always be compared.
+
+:func:`check_convergence` compares the last *window* generations of the progress:
+
+* *hypervolume_tolerance*: the hypervolume changed by less than this fraction,
+* *front_stability*: the individuals on the front did not change,
+* *min_new_front*: less than this number of new individuals entered the front.
+"""
+
+import numpy as np
+
+
+def hypervolume(fitness, reference):
+    """Get the hypervolume of the fitness of two objectives (both maximized).
+
+    :param fitness: fitness of the individuals, e.g. of the pareto front
+    :type fitness: list of tuples
+    :param reference: reference point, worse than the individuals in both objectives.
+        Individuals that are not better in both objectives do not contribute
+    :type reference: tuple
+    :return: area dominated by the individuals and bounded by the reference point
+    :rtype: float
+    """
+    volume = 0.0
+    bound = reference[1]
+    # sweep from the best first objective to the worst
+    for f0, f1 in sorted(fitness, key=lambda f: (-f[0], -f[1])):
+        if f0 > reference[0] and f1 > bound:
+            volume += (f0 - reference[0]) * (f1 - bound)
+            bound = f1
+    return volume
+
+
+def get_reference_point(fitness, reference=None, margin=0.1):
+    """Get a reference point of the hypervolume that is worse than all fitness values.
+
+    :param fitness: fitness of the individuals
+    :type fitness: list of tuples
+    :param reference: current reference point, kept if it is worse than all fitness values.
+        Defaults to None (new reference point)
+    :type reference: tuple, optional
+    :param margin: distance of a new reference point to the worst fitness,
+        relative to the spread of the fitness. Defaults to 0.1
+    :type margin: float, optional
+    :return: reference point
+    :rtype: tuple
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    worst = fitness.min(axis=0)
+    if reference is not None and np.all(np.asarray(reference) < worst):
+        return reference
+    spread = fitness.max(axis=0) - worst
+    spread = np.where(spread > 0, spread, np.maximum(np.abs(worst), 1))
+    new_reference = worst - margin * spread
+    if reference is not None:
+        new_reference = np.minimum(new_reference, reference)
+    return tuple(new_reference.tolist())
+
+
+def get_new_front(progress, window):
+    """Get the individuals that entered the pareto front in the last generations.
+
+    :param progress: progress of each generation, with the key *front*
+        (string representations of the individuals on the pareto front)
+    :type progress: list of dicts
+    :param window: number of generations
+    :type window: int
+    :return: string representations of the new individuals on the front
+    :rtype: set
+    """
+    if len(progress) <= window:
+        return set(progress[-1]['front'])
+    return set(progress[-1]['front']) - set(progress[-window - 1]['front'])
+
+
+def check_convergence(
+        progress, window, hypervolume_tolerance=None, front_stability=False,
+        min_new_front=None):
+    """Check if the pareto front stopped improving in the last *window* generations.
+
+    :param progress: progress of each generation, with the keys *hypervolume* and *front*
+    :type progress: list of dicts
+    :param window: number of generations that are compared
+    :type window: int
+    :param hypervolume_tolerance: relative change of the hypervolume below which
+        the front is converged. Defaults to None (not checked)
+    :type hypervolume_tolerance: float, optional
+    :param front_stability: the front is converged if it has the same individuals.
+        Defaults to False
+    :type front_stability: boolean, optional
+    :param min_new_front: number of new individuals on the front below which the front
+        is converged. Defaults to None (not checked)
+    :type min_new_front: int, optional
+    :return: reason why the front is converged, None if it is not converged
+        or there are not more than *window* generations
+    :rtype: string or None
+    """
+    if len(progress) <= window:
+        return None
+    hv_now = progress[-1]['hypervolume']
+    hv_before = progress[-window - 1]['hypervolume']
+    if hypervolume_tolerance is not None \
+            and abs(hv_now - hv_before) <= hypervolume_tolerance * abs(hv_now):
+        return 'hypervolume changed by less than {} in {} generations ({:.6g} -> {:.6g})'.format(
+            hypervolume_tolerance, window, hv_before, hv_now)
+    if front_stability and all(
+            set(record['front']) == set(progress[-1]['front'])
+            for record in progress[-window - 1:]):
+        return 'pareto front unchanged in {} generations'.format(window)
+    if min_new_front is not None:
+        n_new = len(get_new_front(progress, window))
+        if n_new < min_new_front:
+            return '{} new individuals on the pareto front in {} generations'.format(
+                n_new, window)
+    return None
@@ -0,0 +1,127 @@
+"""Reuse of the dispatch of the genetic algorithm for genes that only affect the costs.
+
+Some varied component attributes, e.g. the *life_time*, only enter the cost curves
+and annuities computed after the simulation (see
+:func:`~smooth.framework.functions.update_annuities.update_annuities`), but not the
+oemof models solved in each interval. Individuals that only differ in such cost-only
+genes have the same dispatch, so it is sufficient to simulate one of them and to
+compute the annuities of the others from its flows and states.
+
+An attribute variation can be declared as cost-only (*cost_only* of
+:class:`~smooth.optimization.run_optimization.AttributeVariation`). Otherwise it is
+detected by comparing the linear program of the first interval (the solver input)
+for two values of the attribute. This does not detect attributes that only influence
+later intervals through the states of a component, such attributes should be declared
+with *cost_only* set to False.
+"""
+
+import copy
+import os
+import tempfile
+
+from smooth.framework.functions.functions import create_component_obj
+from smooth.framework.run_smooth import build_oemof_model
+from smooth.framework.simulation_parameters import SimulationParameters
+
+
+def get_solver_input(model):
+    """Build the oemof model of the first interval and return its linear program.
+
+    :param model: smooth model
+    :type model: dict
+    :return: linear program in LP format with symbolic labels
+    :rtype: string
+    """
+    model = copy.deepcopy(model)
+    sim_params = SimulationParameters(model['sim_params'])
+    sim_params.i_interval = 0
+    components = create_component_obj(model, sim_params)
+    model_to_solve = build_oemof_model(
+        model, components, sim_params, sim_params.date_time_index[0:1])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        lp_file_name = os.path.join(tmp_dir, 'oemof_model.lp')
+        model_to_solve.write(lp_file_name, io_options={'symbolic_solver_labels': True})
+        with open(lp_file_name) as lp_file:
+            return lp_file.read()
+
+
+def is_cost_only(model, attribute_variation):
+    """Detect if an attribute variation only affects the costs and not the dispatch.
+
+    The linear programs of the first interval are compared for two values of the
+    attribute (minimum and maximum, or the middle of the range if the minimum is zero).
+
+    :param model: smooth model
+    :type model: dict
+    :param attribute_variation: attribute variation to check
+    :type attribute_variation: :class:`~smooth.optimization.run_optimization.AttributeVariation`
+    :return: True if the solver input is the same for both values. False if it differs
+        or the models can not be built
+    :rtype: boolean
+    """
+    av = attribute_variation
+    if av.val_min == av.val_max:
+        return True
+    val_min = av.val_min if av.val_min != 0 else (av.val_min + av.val_max) / 2
+    solver_inputs = []
+    for value in [val_min, av.val_max]:
+        try:
+            this_model = copy.deepcopy(model)
+            this_model['components'][av.comp_name][av.comp_attribute] = value
+            solver_inputs.append(get_solver_input(this_model))
+        except Exception as e:
+            print('{} - {}: dispatch not reused ({})'.format(
+                av.comp_name, av.comp_attribute, str(e)))
+            return False
+    return solver_inputs[0] == solver_inputs[1]
+
+
+def get_dispatch_key(individual, attribute_variation, ignore_zero=False):
+    """Get the genes of an individual that affect the dispatch.
+    Cost-only genes are replaced by None, unless the component is removed
+    because of *ignore_zero*.
+
+    :param individual: individual of the genetic algorithm
+    :type individual: :class:`~smooth.optimization.run_optimization.Individual`
+    :param attribute_variation: attribute variations
+    :type attribute_variation: list of
+        :class:`~smooth.optimization.run_optimization.AttributeVariation`
+    :param ignore_zero: ignore components with an attribute value of zero
+    :type ignore_zero: boolean
+    :return: dispatch-relevant gene values
+    :rtype: tuple
+    """
+    return tuple(
+        None if av.cost_only and not (ignore_zero and value == 0) else value
+        for value, av in zip(individual, attribute_variation))
+
+
+def apply_cost_genes(smooth_result, individual, attribute_variation):
+    """Compute the results of an individual from the dispatch of another individual
+    that only differs in cost-only genes.
+
+    The components are copied shallowly, only their *results* are replaced,
+    so the flows and states are shared with *smooth_result*.
+
+    :param smooth_result: result from run_smooth with the same dispatch
+    :type smooth_result: list of :class:`~smooth.components.component.Component`
+    :param individual: individual with the cost-only gene values
+    :type individual: :class:`~smooth.optimization.run_optimization.Individual`
+    :param attribute_variation: attribute variations
+    :type attribute_variation: list of
+        :class:`~smooth.optimization.run_optimization.AttributeVariation`
+    :return: components with the annuities of the individual
+    :rtype: list of :class:`~smooth.components.component.Component`
+    """
+    components = [copy.copy(this_comp) for this_comp in smooth_result]
+    components_by_name = {this_comp.name: this_comp for this_comp in components}
+    for value, av in zip(individual, attribute_variation):
+        # the component may have been removed because of ignore_zero
+        if av.cost_only and av.comp_name in components_by_name:
+            setattr(components_by_name[av.comp_name], av.comp_attribute, value)
+    for this_comp in components:
+        this_comp.results = dict(this_comp.results)
+        # compile the cost curves again and compute the annuities
+        this_comp.check_validity()
+        this_comp.generate_results()
+    return components
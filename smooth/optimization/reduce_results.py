@@ -0,0 +1,120 @@
+"""Reduction of smooth results to compact values inside the worker processes
+of the genetic algorithm.
+
+Instead of sending the complete result of `run_smooth` back to the main process
+(*SAVE_ALL_SMOOTH_RESULTS*), a dictionary of *reducers* can be given to the optimization.
+Each reducer is executed on the smooth result of an individual in the worker process,
+and only the reduced values are saved in the *reduced_result* member of the individual.
+
+A reducer is either a function that takes the result from `run_smooth`
+(like the objective functions) or a declarative specification::
+
+    reducers = {
+        # callable
+        'h2_produced': lambda x: sum(x[2].flows[('ely', 'bh2')]),
+        # sum of a flow over all time steps
+        'grid_energy': {'component': 'grid', 'flow': ('grid', 'bel'), 'reduce': 'sum'},
+        # maximum of a state
+        'max_pressure': {'component': 'h2_storage', 'state': 'pressure', 'reduce': 'max'},
+        # whole series of variable costs as numpy array
+        'grid_costs': {'component': 'grid', 'result': 'variable_costs', 'reduce': 'series'},
+        # scalar result
+        'grid_annuity': {'component': 'grid', 'result': 'annuity_total'},
+    }
+
+Possible reductions are 'sum', 'mean', 'min', 'max' and 'series'. The first four
+also work if only aggregates are kept (see *result_retention*), 'series' returns the
+block means for downsampled results.
+"""
+
+import numpy as np
+from smooth.framework.interval_series import RunningSeries, DownsampledSeries
+
+REDUCTIONS = ['sum', 'mean', 'min', 'max', 'series']
+
+
+def reduce_series(series, reduction):
+    """Reduce a per interval container to a numpy value.
+
+    :param series: container of a flow, state or cost
+    :type series: list, :class:`~smooth.framework.interval_series.RunningSeries`
+        or :class:`~smooth.framework.interval_series.DownsampledSeries`
+    :param reduction: one of 'sum', 'mean', 'min', 'max', 'series'
+    :type reduction: string
+    :return: reduced value
+    :rtype: numpy scalar or array
+    :raises ValueError: on unknown reduction or if the series is not kept
+    """
+    if reduction not in REDUCTIONS:
+        raise ValueError('Reduction "{}" not recognized. Please choose one of {}.'
+                         .format(reduction, REDUCTIONS))
+
+    if isinstance(series, RunningSeries):
+        if reduction == 'series':
+            if not isinstance(series, DownsampledSeries):
+                raise ValueError('The series is not kept (result_retention is "aggregates")')
+            return np.array([np.nan if v is None else v for v in series], dtype=float)
+        if reduction == 'sum':
+            return np.float64(series.total)
+        if reduction == 'mean':
+            return np.float64(series.total / series.n_values if series.n_values else np.nan)
+        value = series.min if reduction == 'min' else series.max
+        return np.float64(np.nan if value is None else value)
+
+    values = np.array([np.nan if v is None else v for v in series], dtype=float)
+    if reduction == 'series':
+        return values
+    if reduction == 'sum':
+        return np.nansum(values)
+    if reduction == 'mean':
+        return np.nanmean(values)
+    if reduction == 'min':
+        return np.nanmin(values)
+    return np.nanmax(values)
+
+
+def apply_reducer(smooth_result, reducer):
+    """Apply one reducer to a smooth result.
+
+    :param smooth_result: result from run_smooth
+    :type smooth_result: list of :class:`~smooth.components.component.Component`
+    :param reducer: function taking the smooth result or declarative specification
+    :type reducer: callable or dict
+    :return: reduced value
+    :rtype: numpy scalar or array
+    :raises ValueError: if the specification is not valid
+    """
+    if callable(reducer):
+        return np.asarray(reducer(smooth_result))
+
+    components = [c for c in smooth_result if c.name == reducer.get('component')]
+    if not components:
+        raise ValueError('Component "{}" of reducer not found'.format(reducer.get('component')))
+    component = components[0]
+
+    if 'flow' in reducer:
+        series = component.flows[tuple(reducer['flow'])]
+    elif 'state' in reducer:
+        series = component.states[reducer['state']]
+    elif 'result' in reducer:
+        series = component.results[reducer['result']]
+        if 'reduce' not in reducer:
+            # scalar result like annuity_total
+            return np.float64(series)
+    else:
+        raise ValueError('Reducer needs one of "flow", "state" or "result": {}'.format(reducer))
+
+    return reduce_series(series, reducer.get('reduce', 'sum'))
+
+
+def reduce_smooth_result(smooth_result, reducers):
+    """Apply all reducers to a smooth result.
+
+    :param smooth_result: result from run_smooth
+    :type smooth_result: list of :class:`~smooth.components.component.Component`
+    :param reducers: name and reducer (function or specification)
+    :type reducers: dict
+    :return: name and reduced value of each reducer
+    :rtype: dict
+    """
+    return {name: apply_reducer(smooth_result, reducer) for name, reducer in reducers.items()}
@@ -40,6 +40,129 @@ member of each individual contains the value returned by run_smooth.
     Using SAVE_ALL_SMOOTH_RESULTS and writing the result
     to a file will generally lead to a large file size.
 
+Reducing results in the workers
+-------------------------------
+Instead of the complete smooth result, compact values can be computed inside the
+worker processes with *reducers* (see :mod:`smooth.optimization.reduce_results`).
+They are saved in the `reduced_result` member of each individual.
+If the full results of the pareto-optimal individuals are needed, set *result_store*
+to a directory: each worker writes its full result to the staging subdirectory of this
+:class:`~smooth.framework.functions.result_store.ResultStore`. After each generation,
+the entries of the individuals on the pareto front are moved to the store and all other
+entries are removed, so the store only contains the results of the pareto front.
+The key of an entry is the string representation of the individual (its gene values).
+
+Usually, the objectives only need the annuities and annual emissions of the components.
+Setting *result_retention* to 'aggregates' (or 'selected' together with *retained_series*)
+makes each smooth run keep only running sums of its flows, states and costs
+(see :mod:`smooth.framework.interval_series`), which reduces the memory of each evaluation
+and the size of the smooth results sent back from the worker processes.
+
+Shared time series
+------------------
+Each evaluation creates the components from the model again. To avoid that every
+worker process parses and keeps its own copy of the CSV inputs, all time series of the
+model are loaded once at the start of the optimization and put into shared memory
+(see :mod:`smooth.framework.functions.shared_time_series`). The worker processes use
+these buffers without copying them. This needs Python 3.8 or newer and can be disabled
+with *share_time_series*.
+
+Multi-fidelity evaluation
+-------------------------
+Most children are clearly dominated, yet each one is simulated for the full horizon.
+With *fidelity_schedule*, new individuals are first evaluated with cheaper
+simulation parameters, e.g. a shorter horizon::
+
+    'fidelity_schedule': [{'n_intervals': 24 * 7 * 4}]
+
+The annuities are extrapolated to a whole year (see *time_ratio* in
+:func:`~smooth.framework.functions.update_annuities.update_annuities`).
+After each fidelity level, only individuals that are not clearly dominated are
+evaluated at the next level and finally with the full model. An individual is clearly
+dominated if another individual is better in all objectives by more than *fidelity_margin*
+(relative). The other individuals keep their cheap fitness in `low_fidelity_fitness`
+and are removed from the population.
+
+Batch evaluation
+----------------
+All individuals share the topology and time series of the model. With *batch_size* set,
+each worker process simulates that many individuals in lockstep: per interval, one
+oemof model containing a copy of the energy system of each individual is built and solved
+(see :mod:`smooth.framework.batch_smooth`). This saves the overhead of building and solving
+many small models, especially when only few cores are available. If the simulation of a
+batch fails, its individuals are evaluated one by one.
+
+Dispatch reuse
+--------------
+Genes that only affect the costs, e.g. the *life_time* of a component, do not change
+the dispatch of the simulation. With *reuse_dispatch* set, individuals that only differ in
+such genes are simulated once, and the annuities of the others are computed from this
+dispatch (see :mod:`smooth.optimization.dispatch_reuse`). The cost-only genes are declared
+with *cost_only* of :class:`AttributeVariation` or detected when the optimization starts.
+With *dispatch_cache_size*, the dispatch of previous generations is reused as well.
+Dispatch reuse can not be combined with batch evaluation or pruning.
+
+Component reuse
+---------------
+The components of the model are created once per fidelity level when it is first
+evaluated. The worker processes clone these components for each individual and only
+create the components with genes again (see :mod:`smooth.framework.model_template`).
+Set *reuse_components* to False to create all components for each evaluation.
+
+Pruning
+-------
+With *pruning_interval*, each child of the genetic algorithm is checked every
+*pruning_interval* intervals: if the fitness computed from the costs and emissions so far
+is already dominated by the current pareto front, the child can not enter the front and
+its evaluation is stopped (see :func:`run_smooth_pruned`). Its fitness remains None and
+the bound is kept in *pruned_fitness* of :class:`Individual`. This requires that the
+variable costs and emissions are not negative (no revenues) and objectives that get worse
+with increasing annuities, like the default ones. Batches are always evaluated completely.
+
+Feasibility pre-check
+---------------------
+Before the individuals are simulated, their components (cloned from the model template)
+are checked for configurations that can certainly not be simulated, e.g. a fixed demand
+that exceeds the maximum output of all suppliers and the energy stored in a battery
+(see :mod:`smooth.framework.functions.feasibility`). Such individuals are not simulated,
+their fitness remains None and the reason is kept in *infeasible* of :class:`Individual`.
+Set *feasibility_check* to False to simulate all individuals. The check is skipped
+without model template (*reuse_components*).
+
+Surrogate model
+---------------
+With *surrogate* set, a Gaussian process is trained on all evaluated individuals
+and predicts the fitness of the new children of each generation. Only the
+*surrogate_budget* most promising or uncertain children are evaluated with smooth
+(see :mod:`smooth.optimization.surrogate`).
+
+Stopping criteria
+-----------------
+The optimization runs at most *n_generation* generations. After each generation, the
+hypervolume of the pareto front and the number of new individuals on the front are
+printed and kept in `progress` (see :mod:`smooth.optimization.convergence`).
+The optimization stops early if one of the enabled criteria holds for the last
+*convergence_window* generations:
+
+* *hypervolume_tolerance*: the hypervolume changed by less than this fraction,
+* *front_stability*: the pareto front did not change,
+* *min_new_front*: less than this number of new individuals entered the pareto front.
+
+With *time_budget*, no new generation is started after this number of seconds.
+The gradient ascent of *post_processing* is still done.
+
+Checkpoints
+-----------
+With *checkpoint_file*, the complete state of the optimization is saved every
+*checkpoint_interval* generations and after each step of the gradient ascent:
+the population, the evaluated individuals, the generation counter, the current pareto
+front, the state of the random number generator and the optimization parameters
+(without the model). The individuals are saved without their smooth results, so use
+*result_store* to keep the full results. An interrupted optimization is continued with
+:func:`resume_optimization`, which gives the same result as an uninterrupted run::
+
+    result = resume_optimization('ga_checkpoint.pickle', mymodel)
+
 **************
 Implementation
 **************
@@ -180,6 +303,7 @@ This blocks the process, so no new data is received, but user events are still p
 """
 
 import multiprocessing as mp
+import time
 from tkinter import TclError     # plotting window closed
 import random
 import matplotlib.pyplot as plt  # only needed when plot_progress is set
@@ -187,8 +311,27 @@ import os                        # delete old result files
 from datetime import datetime    # get timestamp for filename
 import pickle                    # pickle intermediate results
 import dill                      # dump objective functions
-
-from smooth import run_smooth
+import copy
+from collections import OrderedDict
+import numpy as np
+
+from smooth import run_smooth, iter_smooth
+from smooth.framework.batch_smooth import run_smooth_batch
+from smooth.framework.functions.functions import create_component_obj, convert_legacy_model
+from smooth.framework.functions.feasibility import check_feasibility
+from smooth.framework.functions.result_store import ResultStore
+from smooth.framework.functions.shared_time_series import \
+    SharedTimeSeries, attach_shared_time_series
+from smooth.framework.model_template import \
+    ModelTemplate, get_model_template, set_model_templates
+from smooth.framework.run_smooth import get_running_results
+from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.optimization.convergence import \
+    check_convergence, get_new_front, get_reference_point, hypervolume
+from smooth.optimization.dispatch_reuse import \
+    is_cost_only, get_dispatch_key, apply_cost_genes
+from smooth.optimization.reduce_results import reduce_smooth_result
+from smooth.optimization.surrogate import GaussianProcess, select_candidates
 
 # import traceback
 # def tb(e):
@@ -208,6 +351,10 @@ class AttributeVariation:
     :type val_max: number
     :param val_step: step size of component attribute
     :type val_step: number, optional
+    :param cost_only: the attribute only affects the costs and not the dispatch
+        (see :mod:`smooth.optimization.dispatch_reuse`). Defaults to None (detected when
+        the optimization starts)
+    :type cost_only: boolean, optional
     :var num_steps: number of steps if *val_step* is set and not zero
     :type num_steps: int
     :raises: AssertionError when any non-optional parameter is missing or *val_step* is negative
@@ -215,6 +362,7 @@ class AttributeVariation:
 
     def __init__(self, iterable=(), **kwargs):
         self.val_step = None
+        self.cost_only = None
         self.__dict__.update(iterable, **kwargs)
         assert hasattr(self, "comp_name"), "comp_name missing"
         assert hasattr(self, "comp_attribute"), "{}: comp_attribute missing".format(self.comp_name)
@@ -240,6 +388,18 @@ class Individual:
     :var fitness: fitness values depending on objective functions
     :type fitness: tuple
     :var smooth_result: result from `run_smooth`
+    :var reduced_result: reduced values of the smooth result, see *reducers* of
+        :class:`Optimization`
+    :type reduced_result: dict
+    :var low_fidelity_fitness: fitness at each cheap fidelity level the individual was
+        evaluated with, see *fidelity_schedule* of :class:`Optimization`
+    :type low_fidelity_fitness: list of tuples
+    :var pruned_fitness: bound of the fitness when the evaluation was stopped early,
+        see *pruning_interval* of :class:`Optimization`
+    :type pruned_fitness: tuple
+    :var infeasible: reason why the configuration was rejected without simulation,
+        see *feasibility_check* of :class:`Optimization`
+    :type infeasible: string
     """
     class IndividualIterator:
         """Class to iterate over gene values.
@@ -261,6 +421,10 @@ class Individual:
     values = None           # list. Take care when copying.
     fitness = None          # tuple
     smooth_result = None    # result of run_smooth
+    reduced_result = None   # dict of reducer name -> numpy value
+    low_fidelity_fitness = None  # list of fitness tuples of cheap fidelity levels
+    pruned_fitness = None   # fitness bound when the evaluation was stopped early
+    infeasible = None       # reason why the configuration is certainly infeasible
 
     def __init__(self, values):
         self.values = values
@@ -448,7 +612,13 @@ def fitness_function(
         attribute_variation,
         dill_objectives,
         ignore_zero=False,
-        save_results=False):
+        save_results=False,
+        dill_reducers=None,
+        result_store=None,
+        sim_params=None,
+        template_key=None,
+        pruning_front=None,
+        pruning_interval=None):
     """Compute fitness for one individual
         Called async: copies of individual and model given
 
@@ -466,11 +636,64 @@ def fitness_function(
     :type ignore_zero: boolean
     :param save_results: save smooth result in individual?
     :type save_results: boolean
-    :return: index, modified individual with fitness (None if failed)
-        and smooth_result (none if not save_results) set
+    :param dill_reducers: reducers applied to the smooth result, saved in reduced_result
+    :type dill_reducers: dict of reducers pickled with dill
+    :param result_store: directory of the result store the full smooth result is written to
+    :type result_store: string
+    :param sim_params: simulation parameters that replace those of the model,
+        e.g. a shorter horizon for a cheap fidelity level
+    :type sim_params: dict
+    :param template_key: key of the model template of the worker process the components
+        are cloned from (see :mod:`smooth.framework.model_template`).
+        Without template, the components are created from the model
+    :type template_key: string
+    :param pruning_front: pareto front to stop the evaluation early if the individual
+        is dominated by one of its members (see :func:`run_smooth_pruned`)
+    :type pruning_front: list of :class:`Individual`
+    :param pruning_interval: number of intervals between the checks of the pruning front
+    :type pruning_interval: int
+    :return: index, modified individual with fitness (None if failed),
+        smooth_result (none if not save_results) and reduced_result set
     :rtype: tuple(int, :class:`Individual`)
     """
-    # update (copied) oemof model
+    model = apply_genes(model, individual, attribute_variation, ignore_zero, sim_params)
+
+    # Now that the model is updated according to the genes given by the GA, run smooth
+    try:
+        components = clone_components(individual, attribute_variation, ignore_zero, template_key)
+        if pruning_front:
+            smooth_result, individual.pruned_fitness = run_smooth_pruned(
+                model, components, dill.loads(dill_objectives), pruning_front, pruning_interval)
+            if smooth_result is None:
+                # dominated by the pareto front: the fitness remains None
+                return index, individual
+        else:
+            smooth_result = run_smooth(model, components)[0]
+        set_individual_result(
+            individual, smooth_result, dill_objectives, save_results, dill_reducers, result_store)
+
+    except Exception as e:
+        # The smooth run failed.The fitness score remains None.
+        print('Evaluation canceled ({})'.format(str(e)))
+    return index, individual
+
+
+def apply_genes(model, individual, attribute_variation, ignore_zero=False, sim_params=None):
+    """Update the (copied) model according to the genes of an individual.
+
+    :param model: smooth model
+    :type model: dict
+    :param individual: individual with the component attribute values
+    :type individual: :class:`Individual`
+    :param attribute_variation: attribute variations
+    :type attribute_variation: list of :class:`AttributeVariation`
+    :param ignore_zero: ignore components with an attribute value of zero
+    :type ignore_zero: boolean
+    :param sim_params: simulation parameters that replace those of the model
+    :type sim_params: dict
+    :return: updated model
+    :rtype: dict
+    """
     for i, av in enumerate(attribute_variation):
         if ignore_zero and individual[i] == 0:
             # remove component with zero value from model
@@ -478,19 +701,270 @@ def fitness_function(
             model['components'].pop(av.comp_name, None)
         else:
             model['components'][av.comp_name][av.comp_attribute] = individual[i]
+    if sim_params is not None:
+        model = dict(model, sim_params=dict(model['sim_params'], **sim_params))
+    return model
 
-    # Now that the model is updated according to the genes given by the GA, run smooth
+
+def run_smooth_pruned(model, components, objectives, pruning_front, pruning_interval):
+    """Run smooth, but stop as soon as the individual can not enter the pareto front.
+
+    Every *pruning_interval* intervals, the objectives are computed from the annuities of the
+    intervals simulated so far (see
+    :func:`~smooth.framework.run_smooth.get_running_results`). The simulation is stopped
+    if this fitness is dominated by a member of *pruning_front*. This assumes that the
+    fitness can only get worse with the remaining intervals, i.e. that the variable costs
+    and emissions of each interval are not negative and the objectives decrease with the
+    annuities, like the default objectives.
+
+    :param model: smooth model
+    :type model: dict
+    :param components: components of the model or None to create them from the model
+    :type components: list of :class:`~smooth.components.component.Component`
+    :param objectives: objective functions
+    :type objectives: tuple of functions
+    :param pruning_front: fitness of the members of the pareto front
+    :type pruning_front: list of :class:`Individual`
+    :param pruning_interval: number of intervals between two checks
+    :type pruning_interval: int
+    :return: smooth result (None if stopped) and fitness bound when stopped (else None)
+    :rtype: tuple
+    """
+    if components is None:
+        model = convert_legacy_model(model)
+        components = create_component_obj(model, SimulationParameters(model['sim_params']))
+    simulation = iter_smooth(model, components=components)
+    bound = Individual([])
+    while True:
+        try:
+            record = next(simulation)
+        except StopIteration as finished:
+            return finished.value[0], None
+        if (record['i_interval'] + 1) % pruning_interval == 0:
+            bound.fitness = tuple(f(get_running_results(components)) for f in objectives)
+            if any(reference.dominates(bound) for reference in pruning_front):
+                simulation.close()
+                return None, bound.fitness
+
+
+def clone_components(individual, attribute_variation, ignore_zero=False, template_key=None):
+    """Get the components of an individual from a model template of this worker process.
+    Only the components with genes are created again.
+
+    :param individual: individual with the component attribute values
+    :type individual: :class:`Individual`
+    :param attribute_variation: attribute variations
+    :type attribute_variation: list of :class:`AttributeVariation`
+    :param ignore_zero: ignore components with an attribute value of zero
+    :type ignore_zero: boolean
+    :param template_key: key of the model template
+    :type template_key: string
+    :return: components of the individual or None if there is no template
+    :rtype: list of :class:`~smooth.components.component.Component` or None
+    """
+    template = get_model_template(template_key)
+    if template is None:
+        return None
+    return template.clone(*get_component_changes(individual, attribute_variation, ignore_zero))
+
+
+def get_component_changes(individual, attribute_variation, ignore_zero=False):
+    """Get the component attributes changed by the genes of an individual.
+
+    :param individual: individual with the component attribute values
+    :type individual: :class:`Individual`
+    :param attribute_variation: attribute variations
+    :type attribute_variation: list of :class:`AttributeVariation`
+    :param ignore_zero: ignore components with an attribute value of zero
+    :type ignore_zero: boolean
+    :return: changed attribute values by component name and attribute name,
+        names of the removed components
+    :rtype: tuple(dict, set)
+    """
+    changes = {}
+    removed = set()
+    for value, av in zip(individual, attribute_variation):
+        if ignore_zero and value == 0:
+            removed.add(av.comp_name)
+        else:
+            changes.setdefault(av.comp_name, {})[av.comp_attribute] = value
+    return changes, removed
+
+
+def init_worker(time_series_descriptors, templates):
+    """Initialize a worker process of the optimization: attach to the shared time series
+    and set the model templates.
+
+    :param time_series_descriptors: descriptors of the shared time series
+    :type time_series_descriptors: list
+    :param templates: model templates by key
+    :type templates: dict
+    """
+    attach_shared_time_series(time_series_descriptors)
+    set_model_templates(templates)
+
+
+def set_individual_result(
+        individual, smooth_result, dill_objectives,
+        save_results=False, dill_reducers=None, result_store=None):
+    """Compute fitness and reduced result of an individual from its smooth result.
+
+    :param individual: evaluated individual
+    :type individual: :class:`Individual`
+    :param smooth_result: result from run_smooth
+    :type smooth_result: list of :class:`~smooth.components.component.Component`
+    :param dill_objectives: objective functions
+    :type dill_objectives: tuple of lambda-functions pickled with dill
+    :param save_results: save smooth result in individual?
+    :type save_results: boolean
+    :param dill_reducers: reducers applied to the smooth result, saved in reduced_result
+    :type dill_reducers: dict of reducers pickled with dill
+    :param result_store: directory of the result store the full smooth result is written to
+    :type result_store: string
+    """
+    individual.smooth_result = smooth_result if save_results else None
+    # update fitness with given objective functions
+    objectives = dill.loads(dill_objectives)
+    individual.fitness = tuple(f(smooth_result) for f in objectives)
+    # reduce smooth result to compact values
+    if dill_reducers is not None:
+        individual.reduced_result = reduce_smooth_result(
+            smooth_result, dill.loads(dill_reducers))
+    # write full smooth result to disk
+    if result_store is not None:
+        ResultStore(result_store).write(str(individual), smooth_result)
+
+
+def batch_fitness_function(
+        indices, individuals,
+        model,
+        attribute_variation,
+        dill_objectives,
+        ignore_zero=False,
+        save_results=False,
+        dill_reducers=None,
+        result_store=None,
+        sim_params=None,
+        template_key=None):
+    """Compute fitness for a batch of individuals that are simulated in lockstep
+    (see :mod:`smooth.framework.batch_smooth`).
+    If the batch fails, each individual is evaluated on its own,
+    so only the individuals that fail themselves have no fitness.
+
+    :param indices: indices within population
+    :type indices: list of int
+    :param individuals: individuals to evaluate
+    :type individuals: list of :class:`Individual`
+    :return: index and modified individual of each individual of the batch
+    :rtype: list of tuple(int, :class:`Individual`)
+
+    For the other parameters, see :func:`fitness_function`.
+    """
+    models = [
+        apply_genes(copy.deepcopy(model), individual, attribute_variation, ignore_zero, sim_params)
+        for individual in individuals]
     try:
-        smooth_result = run_smooth(model)[0]
-        individual.smooth_result = smooth_result if save_results else None
-        # update fitness with given objective functions
-        objectives = dill.loads(dill_objectives)
-        individual.fitness = tuple(f(smooth_result) for f in objectives)
+        batch_results = run_smooth_batch(models)
+    except Exception as e:
+        print('Batch evaluation canceled ({}), evaluating individually'.format(str(e)))
+        return [
+            fitness_function(
+                index, individual, copy.deepcopy(model), attribute_variation, dill_objectives,
+                ignore_zero, save_results, dill_reducers, result_store, sim_params,
+                template_key)
+            for index, individual in zip(indices, individuals)]
+
+    for individual, (smooth_result, _) in zip(individuals, batch_results):
+        try:
+            set_individual_result(
+                individual, smooth_result, dill_objectives,
+                save_results, dill_reducers, result_store)
+        except Exception as e:
+            print('Evaluation canceled ({})'.format(str(e)))
+    return list(zip(indices, individuals))
+
 
+def dispatch_fitness_function(
+        indices, individuals,
+        model,
+        attribute_variation,
+        dill_objectives,
+        ignore_zero=False,
+        save_results=False,
+        dill_reducers=None,
+        result_store=None,
+        sim_params=None,
+        template_key=None,
+        return_dispatch=False):
+    """Compute fitness for individuals that only differ in cost-only genes
+    (see :mod:`smooth.optimization.dispatch_reuse`).
+    Only the first individual is simulated, the annuities of all individuals are
+    computed from its dispatch. If the simulation fails, each individual is evaluated
+    on its own.
+
+    :param indices: indices within population
+    :type indices: list of int
+    :param individuals: individuals to evaluate
+    :type individuals: list of :class:`Individual`
+    :param return_dispatch: also return the smooth result of the simulated individual
+    :type return_dispatch: boolean
+    :return: index and modified individual of each individual, and the smooth result
+        of the simulation (None if not *return_dispatch* or failed)
+    :rtype: tuple(list of tuple(int, :class:`Individual`), list of components)
+
+    For the other parameters, see :func:`fitness_function`.
+    """
+    this_model = apply_genes(
+        copy.deepcopy(model), individuals[0], attribute_variation, ignore_zero, sim_params)
+    try:
+        components = clone_components(
+            individuals[0], attribute_variation, ignore_zero, template_key)
+        smooth_result = run_smooth(this_model, components)[0]
     except Exception as e:
-        # The smooth run failed.The fitness score remains None.
-        print('Evaluation canceled ({})'.format(str(e)))
-    return index, individual
+        print('Evaluation canceled ({}), evaluating individually'.format(str(e)))
+        return [
+            fitness_function(
+                index, individual, copy.deepcopy(model), attribute_variation, dill_objectives,
+                ignore_zero, save_results, dill_reducers, result_store, sim_params,
+                template_key)
+            for index, individual in zip(indices, individuals)], None
+
+    results = cost_fitness_function(
+        indices, individuals, smooth_result, attribute_variation, dill_objectives,
+        save_results, dill_reducers, result_store)
+    return results, smooth_result if return_dispatch else None
+
+
+def cost_fitness_function(
+        indices, individuals,
+        smooth_result,
+        attribute_variation,
+        dill_objectives,
+        save_results=False,
+        dill_reducers=None,
+        result_store=None):
+    """Compute fitness for individuals from the smooth result of an individual
+    with the same dispatch, without simulating them.
+
+    :param indices: indices within population
+    :type indices: list of int
+    :param individuals: individuals to evaluate
+    :type individuals: list of :class:`Individual`
+    :param smooth_result: result from run_smooth with the same dispatch-relevant genes
+    :type smooth_result: list of :class:`~smooth.components.component.Component`
+    :return: index and modified individual of each individual
+    :rtype: list of tuple(int, :class:`Individual`)
+
+    For the other parameters, see :func:`fitness_function`.
+    """
+    for individual in individuals:
+        try:
+            set_individual_result(
+                individual, apply_cost_genes(smooth_result, individual, attribute_variation),
+                dill_objectives, save_results, dill_reducers, result_store)
+        except Exception as e:
+            print('Evaluation canceled ({})'.format(str(e)))
+    return list(zip(indices, individuals))
 
 
 class PlottingProcess(mp.Process):
@@ -689,10 +1163,119 @@ class Optimization:
         **Warning!** When writing the result to file,
         this may greatly increase the file size. Defaults to False
     :type SAVE_ALL_SMOOTH_RESULTS: boolean, optional
+    :param result_retention: result retention policy of each smooth run
+        (see :mod:`smooth.framework.interval_series`), overwrites the simulation
+        parameter of the model. Defaults to None (keep setting of model)
+    :type result_retention: string, optional
+    :param retained_series: series that are fully kept if *result_retention* is 'selected'.
+        Defaults to None
+    :type retained_series: list, optional
+    :param reducers: reducers executed on each smooth result in the worker process,
+        see :mod:`smooth.optimization.reduce_results`. Defaults to None
+    :type reducers: dict, optional
+    :param result_store: directory of a result store to keep the full smooth results
+        of the pareto-optimal individuals. Defaults to None
+    :type result_store: string, optional
+    :param share_time_series: load the time series of the model once into shared memory
+        for all worker processes. Defaults to True
+    :type share_time_series: boolean, optional
+    :param surrogate: pre-screen children with a surrogate model. Defaults to False
+    :type surrogate: boolean, optional
+    :param surrogate_budget: number of children evaluated per generation when using
+        the surrogate model. Defaults to half of *population_size*
+    :type surrogate_budget: int, optional
+    :param surrogate_min_samples: number of evaluated individuals needed before
+        the surrogate model is used. Defaults to *population_size*
+    :type surrogate_min_samples: int, optional
+    :param surrogate_exploration: weight of the prediction uncertainty
+        when selecting children. Defaults to 1
+    :type surrogate_exploration: float, optional
+    :param fidelity_schedule: simulation parameters of the cheap fidelity levels,
+        from cheapest to most expensive. Defaults to None (only full fidelity)
+    :type fidelity_schedule: list of dicts, optional
+    :param fidelity_margin: relative margin by which an individual has to be dominated
+        to not be promoted to the next fidelity level. Defaults to 0.05
+    :type fidelity_margin: float, optional
+    :param batch_size: number of individuals simulated in lockstep by one worker
+        (see :mod:`smooth.framework.batch_smooth`). Defaults to None (no batches)
+    :type batch_size: int, optional
+    :param reuse_dispatch: simulate individuals that only differ in cost-only genes once
+        (see :mod:`smooth.optimization.dispatch_reuse`). Can not be combined with
+        *batch_size* or *pruning_interval*. Defaults to False
+    :type reuse_dispatch: boolean, optional
+    :param dispatch_cache_size: number of smooth results kept to compute the annuities of
+        later individuals with the same dispatch without simulating them.
+        Defaults to 0 (only individuals evaluated together share a simulation)
+    :type dispatch_cache_size: int, optional
+    :param reuse_components: create the components of the model once and clone them for
+        each evaluation (see :mod:`smooth.framework.model_template`). Defaults to True
+    :type reuse_components: boolean, optional
+    :param pruning_interval: stop the evaluation of a child every *pruning_interval*
+        intervals if it is already dominated by the current pareto front
+        (see :func:`run_smooth_pruned`). Defaults to None (no pruning)
+    :type pruning_interval: int, optional
+    :param feasibility_check: reject individuals whose configuration is certainly infeasible
+        without simulating them (see :mod:`smooth.framework.functions.feasibility`).
+        Defaults to True
+    :type feasibility_check: boolean, optional
+    :param checkpoint_file: path of the file the state of the optimization is saved to
+        (see :func:`resume_optimization`). Defaults to None (no checkpoints)
+    :type checkpoint_file: string, optional
+    :param checkpoint_interval: number of generations between two checkpoints.
+        Defaults to 1
+    :type checkpoint_interval: int, optional
+    :param convergence_window: number of generations over which the stopping criteria
+        are checked. Defaults to 5
+    :type convergence_window: int, optional
+    :param hypervolume_tolerance: stop if the hypervolume of the pareto front changed by less
+        than this fraction in *convergence_window* generations. Defaults to None
+    :type hypervolume_tolerance: float, optional
+    :param front_stability: stop if the pareto front did not change in
+        *convergence_window* generations. Defaults to False
+    :type front_stability: boolean, optional
+    :param min_new_front: stop if less than this number of new individuals entered the
+        pareto front in *convergence_window* generations. Defaults to None
+    :type min_new_front: int, optional
+    :param hypervolume_reference: fixed reference point of the hypervolume (fitness worse
+        than all individuals). Defaults to None (set from the first generation and moved
+        when the front reaches beyond it)
+    :type hypervolume_reference: tuple, optional
+    :param time_budget: maximum time in seconds after which no new generation is started.
+        Defaults to None (no limit)
+    :type time_budget: float, optional
     :var population: current individuals
     :type population: list of Individual
     :var evaluated: keeps track of evaluated individuals to avoid double computation
     :type evaluated: dict with fingerprint of individual->:class:`Individual`
+    :var surrogate_accuracy: mean absolute error of the surrogate prediction
+        for each objective in each generation the surrogate model was used
+    :type surrogate_accuracy: list of dicts with keys 'generation', 'n_evaluated', 'mae'
+    :var progress: pareto front after each generation: hypervolume, string representations
+        and fitness of the individuals on the front and elapsed time in seconds
+    :type progress: list of dicts with keys 'generation', 'hypervolume', 'front', 'fitness',
+        'time'
+    :var reference_point: reference point of the hypervolume in `progress`
+    :type reference_point: tuple
+    :var time_series: time series of the model in shared memory
+    :type time_series: :class:`~smooth.framework.functions.shared_time_series.SharedTimeSeries`
+    :var dispatch_cache: smooth results by fidelity level and dispatch-relevant genes,
+        least recently used first
+    :type dispatch_cache: OrderedDict
+    :var model_templates: model templates by fidelity level (None if creation failed)
+    :type model_templates: dict
+    :var n_infeasible: number of evaluations rejected by the feasibility pre-check
+    :type n_infeasible: int
+    :var config: optimization parameters without the model, saved in checkpoints
+    :type config: dict
+    :var generation: index of the current generation
+    :type generation: int
+    :var result: current pareto front
+    :type result: list of :class:`Individual`
+    :var ascent: state of the gradient ascent with the keys *av_idx*
+        (index of the current attribute variation), *result* and *step*, None before it starts
+    :type ascent: dict
+    :var random_state: state of the random number generator restored from a checkpoint
+    :type random_state: tuple
     :var ax: current figure handle for plotting
     :type ax: pyplot Axes
     :raises: `AttributeError` or `AssertionError` when required argument is missing or wrong
@@ -706,6 +1289,31 @@ class Optimization:
         self.ignore_zero = False
         self.save_intermediate_results = False
         self.SAVE_ALL_SMOOTH_RESULTS = False
+        self.result_retention = None
+        self.retained_series = None
+        self.reducers = None
+        self.result_store = None
+        self.share_time_series = True
+        self.surrogate = False
+        self.surrogate_budget = None
+        self.surrogate_min_samples = None
+        self.surrogate_exploration = 1.0
+        self.fidelity_schedule = None
+        self.fidelity_margin = 0.05
+        self.batch_size = None
+        self.reuse_dispatch = False
+        self.dispatch_cache_size = 0
+        self.reuse_components = True
+        self.pruning_interval = None
+        self.feasibility_check = True
+        self.checkpoint_file = None
+        self.checkpoint_interval = 1
+        self.convergence_window = 5
+        self.hypervolume_tolerance = None
+        self.front_stability = False
+        self.min_new_front = None
+        self.hypervolume_reference = None
+        self.time_budget = None
 
         # objective functions: tuple with lambdas
         # negative sign for minimizing
@@ -719,6 +1327,8 @@ class Optimization:
 
         # set parameters from args
         self.__dict__.update(iterable, **kwargs)
+        self.config = dict(iterable, **kwargs)
+        self.config.pop('model', None)
 
         # how many CPU cores to use
         try:
@@ -735,8 +1345,7 @@ class Optimization:
         except (AssertionError, AttributeError):
             raise AssertionError("No population size given")
 
-        # number of generations to run
-        # TODO run until no more change?
+        # maximum number of generations to run (see stopping criteria)
         try:
             assert(self.n_generation)
         except (AssertionError, AttributeError):
@@ -755,6 +1364,17 @@ class Optimization:
         except (AssertionError, AttributeError):
             raise AssertionError("No model given.")
 
+        # result retention of each smooth run (without changing the given model)
+        if self.result_retention is not None:
+            retention = {'result_retention': self.result_retention}
+            if self.retained_series is not None:
+                retention['retained_series'] = self.retained_series
+            self.model = dict(self.model, sim_params=dict(self.model['sim_params'], **retention))
+
+        # dispatch groups are neither batched nor pruned
+        assert not (self.reuse_dispatch and (self.batch_size or self.pruning_interval)), \
+            "reuse_dispatch can not be combined with batch_size or pruning_interval"
+
         # objectives
         assert len(self.objectives) == 2, "Need exactly two objective functions"
         assert len(self.objectives) == len(
@@ -764,6 +1384,32 @@ class Optimization:
         self.population = []
         self.evaluated = {}
 
+        # time series are loaded into shared memory when the optimization starts
+        self.time_series = SharedTimeSeries()
+
+        # simulated dispatch of individuals, to compute the costs of cost-only genes
+        self.dispatch_cache = OrderedDict()
+
+        # initialised components of the model, cloned for each evaluation
+        self.model_templates = {}
+        self.n_infeasible = 0
+
+        # progress, saved in checkpoints
+        self.generation = 0
+        self.result = []
+        self.ascent = None
+        self.random_state = None
+        self.progress = []
+        self.reference_point = self.hypervolume_reference
+
+        # surrogate model
+        if self.surrogate_budget is None:
+            self.surrogate_budget = max(self.population_size // 2, 1)
+        if self.surrogate_min_samples is None:
+            self.surrogate_min_samples = self.population_size
+        self.surrogate_predictions = {}
+        self.surrogate_accuracy = []
+
         # save intermediate results?
         if self.save_intermediate_results:
             self.last_result_file_name = ""
@@ -796,26 +1442,426 @@ class Optimization:
         self.population[result[0]] = result[1]
         self.evaluated[str(result[1])] = result[1]
 
-    def compute_fitness(self):
+    def set_batch_fitness(self, results):
+        """Async success callback for a batch of individuals
+
+        :param results: result from batch_fitness_function
+        :type results: list of tuple(index, :class:`Individual`)
+        """
+        for result in results:
+            self.set_fitness(result)
+
+    def compute_fitness(self, pruning=False):
         """Compute fitness of every individual in `population` with `n_core` worker threads.
-        Remove invalid individuals from `population`
+        Remove invalid individuals from `population`.
+        With a *fidelity_schedule*, new individuals are evaluated at each fidelity level
+        and only promising ones are evaluated with the full model.
+
+        :param pruning: stop evaluations of individuals dominated by the current pareto front,
+            if *pruning_interval* is set. Defaults to False
+        :type pruning: boolean, optional
+        """
+        candidates = [idx for idx, ind in enumerate(self.population) if ind.fitness is None]
+        for sim_params in self.fidelity_schedule or []:
+            self.evaluate(candidates, sim_params)
+            candidates = self.promote(candidates)
+        self.evaluate(candidates, pruning=pruning)
+
+    def evaluate(self, indices, sim_params=None, pruning=False):
+        """Evaluate individuals of `population` with `n_core` worker threads.
+
+        :param indices: indices of individuals in `population` to evaluate
+        :type indices: list of int
+        :param sim_params: simulation parameters that replace those of the model
+            (cheap fidelity level). Defaults to None (full model)
+        :type sim_params: dict, optional
+        :param pruning: stop evaluations of individuals dominated by the current pareto front
+            (only at full fidelity and if *pruning_interval* is set). Defaults to False
+        :type pruning: boolean, optional
         """
-        # open n_core worker threads
-        pool = mp.Pool(processes=self.n_core)
-        # set objective functions for each worker
+        # open n_core worker threads, attached to the shared time series,
+        # with the model template of this fidelity level
+        template_key = self.get_model_template(sim_params)
+        indices = self.reject_infeasible(indices, template_key)
+        templates = {} if template_key is None else {
+            template_key: self.model_templates[template_key]}
+        pool = mp.Pool(
+            processes=self.n_core,
+            initializer=init_worker,
+            initargs=(self.time_series.descriptors, templates))
+        # set objective functions and reducers for each worker
         dill_objectives = dill.dumps(self.objectives)
-        for idx, ind in enumerate(self.population):
-            if ind.fitness is None:  # not evaluated yet
+        dill_reducers = dill.dumps(self.reducers) if self.reducers is not None else None
+        full_fidelity = sim_params is None
+        args = (self.model, self.attribute_variation,
+                dill_objectives, self.ignore_zero,
+                self.SAVE_ALL_SMOOTH_RESULTS and full_fidelity,
+                dill_reducers if full_fidelity else None,
+                self.get_result_staging() if full_fidelity else None,
+                sim_params, template_key)
+        pruning_front = None
+        if pruning and full_fidelity and self.pruning_interval:
+            pruning_front = self.get_pruning_front()
+        if self.reuse_dispatch and any(av.cost_only for av in self.attribute_variation):
+            # individuals that only differ in cost-only genes share one simulation
+            self.evaluate_dispatch_groups(pool, indices, args, sim_params)
+        elif self.batch_size:
+            # simulate batch_size individuals in lockstep per task
+            for start in range(0, len(indices), self.batch_size):
+                batch = indices[start:start + self.batch_size]
+                pool.apply_async(
+                    batch_fitness_function,
+                    (batch, [self.population[idx] for idx in batch]) + args,
+                    callback=self.set_batch_fitness,
+                    error_callback=self.err_callback
+                )
+        else:
+            for idx in indices:
                 pool.apply_async(
                     fitness_function,
-                    (idx, ind, self.model, self.attribute_variation,
-                        dill_objectives, self.ignore_zero, self.SAVE_ALL_SMOOTH_RESULTS),
+                    (idx, self.population[idx]) + args + (pruning_front, self.pruning_interval),
                     callback=self.set_fitness,
                     error_callback=self.err_callback  # tb
                 )
         pool.close()
         pool.join()
 
+        if pruning_front:
+            n_pruned = sum(
+                self.population[idx].pruned_fitness is not None for idx in indices)
+            print("Pruning: {} of {} evaluations stopped early".format(n_pruned, len(indices)))
+
+    def reject_infeasible(self, indices, template_key=None):
+        """Reject individuals of `population` whose configuration is certainly infeasible
+        (see :mod:`smooth.framework.functions.feasibility`). Their components are cloned
+        from the model template and checked without simulation.
+        The fitness of rejected individuals remains None.
+
+        :param indices: indices of individuals in `population` to evaluate
+        :type indices: list of int
+        :param template_key: key of the model template of the fidelity level
+        :type template_key: string, optional
+        :return: indices of the individuals that may be feasible
+        :rtype: list of int
+        """
+        if not self.feasibility_check or template_key is None or not indices:
+            return indices
+        template = self.model_templates[template_key]
+        feasible = []
+        for idx in indices:
+            ind = self.population[idx]
+            try:
+                components = template.clone(*get_component_changes(
+                    ind, self.attribute_variation, self.ignore_zero))
+                ind.infeasible = check_feasibility(components, self.model['busses'])
+            except Exception:
+                # invalid configuration: the error is reported by the simulation
+                ind.infeasible = None
+            if ind.infeasible is None:
+                feasible.append(idx)
+            else:
+                self.evaluated[str(ind)] = ind
+        n_rejected = len(indices) - len(feasible)
+        self.n_infeasible += n_rejected
+        if n_rejected:
+            print("Feasibility pre-check: {} of {} configurations rejected".format(
+                n_rejected, len(indices)))
+        return feasible
+
+    def get_pruning_front(self):
+        """Get the pareto front of the evaluated individuals of `population`,
+        used to stop the evaluation of dominated individuals early.
+        Only the gene values and fitness are copied.
+
+        :return: members of the pareto front or None if no individual has been evaluated
+        :rtype: list of :class:`Individual`
+        """
+        evaluated = [ind for ind in self.population if ind.fitness is not None]
+        if not evaluated:
+            return None
+        pruning_front = []
+        for idx in fast_non_dominated_sort(evaluated)[0]:
+            reference = Individual(list(evaluated[idx].values))
+            reference.fitness = evaluated[idx].fitness
+            pruning_front.append(reference)
+        return pruning_front
+
+    def evaluate_dispatch_groups(self, pool, indices, args, sim_params=None):
+        """Evaluate individuals grouped by their dispatch-relevant genes
+        (see :mod:`smooth.optimization.dispatch_reuse`). Each group is simulated once
+        in a worker, unless its dispatch is in `dispatch_cache`: then the annuities
+        are computed directly.
+
+        :param pool: worker pool
+        :type pool: multiprocessing.Pool
+        :param indices: indices of individuals in `population` to evaluate
+        :type indices: list of int
+        :param args: arguments of the fitness functions after the individuals
+        :type args: tuple
+        :param sim_params: simulation parameters that replace those of the model
+        :type sim_params: dict, optional
+        """
+        groups = OrderedDict()
+        for idx in indices:
+            key = (repr(sim_params), get_dispatch_key(
+                self.population[idx], self.attribute_variation, self.ignore_zero))
+            groups.setdefault(key, []).append(idx)
+
+        # attribute_variation, dill_objectives, save_results, dill_reducers, result_store
+        cost_args = (args[1], args[2]) + args[4:7]
+        for key, group in groups.items():
+            individuals = [self.population[idx] for idx in group]
+            if key in self.dispatch_cache:
+                # same dispatch simulated before: only compute the annuities
+                self.dispatch_cache.move_to_end(key)
+                self.set_batch_fitness(cost_fitness_function(
+                    group, individuals, self.dispatch_cache[key], *cost_args))
+                continue
+            pool.apply_async(
+                dispatch_fitness_function,
+                (group, individuals) + args + (self.dispatch_cache_size > 0,),
+                callback=lambda result, key=key: self.set_dispatch_fitness(key, result),
+                error_callback=self.err_callback
+            )
+
+    def set_dispatch_fitness(self, key, result):
+        """Async success callback for a group of individuals with the same dispatch.
+        The smooth result is added to `dispatch_cache`.
+
+        :param key: fidelity level and dispatch-relevant genes of the group
+        :type key: tuple
+        :param result: result from dispatch_fitness_function
+        :type result: tuple(list of tuple(index, :class:`Individual`), smooth result)
+        """
+        results, smooth_result = result
+        self.set_batch_fitness(results)
+        if smooth_result is not None:
+            self.dispatch_cache[key] = smooth_result
+            while len(self.dispatch_cache) > self.dispatch_cache_size:
+                self.dispatch_cache.popitem(last=False)
+
+    def get_model_template(self, sim_params=None):
+        """Create the model template of a fidelity level if it does not exist yet
+        (see :mod:`smooth.framework.model_template`).
+
+        :param sim_params: simulation parameters that replace those of the model
+        :type sim_params: dict, optional
+        :return: key of the model template in `model_templates`
+            or None if *reuse_components* is not set or the template could not be created
+        :rtype: string or None
+        """
+        if not self.reuse_components:
+            return None
+        key = repr(sim_params)
+        if key not in self.model_templates:
+            try:
+                self.model_templates[key] = ModelTemplate(self.model, sim_params)
+            except Exception as e:
+                # the error is reported again by each evaluation
+                print('Components not reused: {}'.format(e))
+                self.model_templates[key] = None
+        return key if self.model_templates[key] is not None else None
+
+    def classify_attribute_variations(self):
+        """Detect which attribute variations only affect the costs, if not declared
+        by *cost_only* (see :mod:`smooth.optimization.dispatch_reuse`).
+        """
+        if not self.reuse_dispatch:
+            return
+        for av in self.attribute_variation:
+            if av.cost_only is None:
+                av.cost_only = is_cost_only(self.model, av)
+        cost_only = ['{} - {}'.format(av.comp_name, av.comp_attribute)
+                     for av in self.attribute_variation if av.cost_only]
+        if cost_only:
+            print("Cost-only attribute variations: {}".format(', '.join(cost_only)))
+
+    def promote(self, indices):
+        """Select the individuals evaluated at a cheap fidelity level that are evaluated
+        at the next level. Individuals clearly dominated by another individual
+        (of the population at full fidelity or of *indices*) are not promoted.
+        Their fitness is moved to `low_fidelity_fitness`, so they are removed from
+        the population.
+
+        :param indices: indices of individuals in `population` evaluated at a cheap level
+        :type indices: list of int
+        :return: indices of promoted individuals
+        :rtype: list of int
+        """
+        references = [ind.fitness for idx, ind in enumerate(self.population)
+                      if ind.fitness is not None]
+        promoted = []
+        for idx in indices:
+            ind = self.population[idx]
+            if ind.fitness is None:
+                # evaluation failed
+                continue
+            ind.low_fidelity_fitness = (ind.low_fidelity_fitness or []) + [ind.fitness]
+            # other individual still better in all objectives after applying margin
+            dominated = any(
+                all(r - self.fidelity_margin * abs(r) >= f for r, f in zip(ref, ind.fitness))
+                and any(r > f for r, f in zip(ref, ind.fitness))
+                for ref in references)
+            ind.fitness = None
+            if not dominated:
+                promoted.append(idx)
+        print("Fidelity: promoting {} of {} individuals".format(len(promoted), len(indices)))
+        return promoted
+
+    def load_time_series(self):
+        """Load all time series read by the components of the model into shared memory.
+        Does nothing if *share_time_series* is not set or shared memory is not available.
+        """
+        if not self.share_time_series or not self.time_series.is_available():
+            return
+        try:
+            model = convert_legacy_model(self.model)
+            with self.time_series.recording():
+                create_component_obj(model, SimulationParameters(model['sim_params']))
+        except Exception as e:
+            # the error is reported again by each evaluation
+            print('Time series not shared: {}'.format(e))
+
+    def normalize_genes(self, individuals):
+        """Scale the gene values of individuals to [0, 1] using the attribute variation.
+
+        :param individuals: individuals to scale
+        :type individuals: list of :class:`Individual`
+        :return: scaled gene values, shape (number of individuals, number of genes)
+        :rtype: numpy array
+        """
+        val_min = np.array([av.val_min for av in self.attribute_variation], dtype=float)
+        val_range = np.array(
+            [av.val_max - av.val_min for av in self.attribute_variation], dtype=float)
+        val_range[val_range == 0] = 1
+        return (np.array([ind.values for ind in individuals], dtype=float) - val_min) / val_range
+
+    def screen_children(self, children):
+        """Select the children to evaluate with the surrogate model.
+        All children are kept while there are fewer than *surrogate_min_samples*
+        evaluated individuals. Children not selected are removed from `evaluated`,
+        so they may be generated again later.
+
+        :param children: new individuals of this generation
+        :type children: list of :class:`Individual`
+        :return: children to evaluate
+        :rtype: list of :class:`Individual`
+        """
+        samples = [ind for ind in self.evaluated.values()
+                   if ind is not None and ind.fitness is not None]
+        if len(samples) < self.surrogate_min_samples or len(children) <= self.surrogate_budget:
+            return children
+
+        try:
+            model = GaussianProcess().fit(
+                self.normalize_genes(samples), [ind.fitness for ind in samples])
+        except np.linalg.LinAlgError as e:
+            print("Surrogate model could not be trained, evaluating all children: {}".format(e))
+            return children
+        mean, std = model.predict(self.normalize_genes(children))
+        selected = select_candidates(mean, std, self.surrogate_budget, self.surrogate_exploration)
+
+        for idx, child in enumerate(children):
+            if idx in selected:
+                self.surrogate_predictions[str(child)] = mean[idx]
+            else:
+                del self.evaluated[str(child)]
+        print("Surrogate model: evaluating {} of {} children".format(
+            len(selected), len(children)))
+        return [children[idx] for idx in selected]
+
+    def report_surrogate_accuracy(self, gen):
+        """Compare the surrogate predictions with the fitness of the evaluated children.
+        The mean absolute error of each objective is printed and saved in `surrogate_accuracy`.
+
+        :param gen: current generation
+        :type gen: int
+        """
+        errors = []
+        for fingerprint, prediction in self.surrogate_predictions.items():
+            ind = self.evaluated.get(fingerprint)
+            if ind is not None and ind.fitness is not None:
+                errors.append(np.abs(np.array(ind.fitness) - prediction))
+        self.surrogate_predictions = {}
+        if len(errors) == 0:
+            return
+        mae = tuple(np.mean(errors, axis=0))
+        self.surrogate_accuracy.append({
+            'generation': gen,
+            'n_evaluated': len(errors),
+            'mae': mae,
+        })
+        print("Surrogate mean absolute error: {}".format(dict(zip(self.objective_names, mae))))
+
+    def record_progress(self, gen):
+        """Record the hypervolume and the individuals of the pareto front `result`
+        of a generation in `progress` and print them.
+        Without *hypervolume_reference*, the reference point is set in the first generation
+        and moved if the front reaches beyond it.
+
+        :param gen: index of the generation
+        :type gen: int
+        """
+        fitness = [ind.fitness for ind in self.result]
+        if self.hypervolume_reference is None:
+            reference_point = get_reference_point(
+                fitness if self.progress else [ind.fitness for ind in self.population],
+                self.reference_point)
+            if reference_point != self.reference_point:
+                self.reference_point = reference_point
+                # the values of previous generations can be compared with the new one
+                for record in self.progress:
+                    record['hypervolume'] = hypervolume(record['fitness'], reference_point)
+        self.progress.append({
+            'generation': gen,
+            'hypervolume': hypervolume(fitness, self.reference_point),
+            'front': [str(ind) for ind in self.result],
+            'fitness': fitness,
+            'time': time.time() - self.start_time,
+        })
+        print("Hypervolume: {:.6g} ({} individuals on the front, {} new)".format(
+            self.progress[-1]['hypervolume'], len(self.result),
+            len(get_new_front(self.progress, 1))))
+
+    def check_stop(self):
+        """Check the stopping criteria before a new generation is started.
+
+        :return: reason to stop or None to continue
+        :rtype: string or None
+        """
+        if self.time_budget is not None and time.time() - self.start_time >= self.time_budget:
+            return 'time budget of {} s exhausted'.format(self.time_budget)
+        return check_convergence(
+            self.progress, self.convergence_window, self.hypervolume_tolerance,
+            self.front_stability, self.min_new_front)
+
+    def get_result_staging(self):
+        """Get the directory the worker processes write the full smooth results to.
+
+        :return: staging subdirectory of *result_store* or None if there is no result store
+        :rtype: string or None
+        """
+        if self.result_store is None:
+            return None
+        return os.path.join(self.result_store, 'staging')
+
+    def prune_result_store(self, result):
+        """Move the full smooth results of the individuals of *result* from the staging
+        directory to the result store and remove all other results.
+
+        :param result: individuals whose results are kept (e.g. pareto front)
+        :type result: list of :class:`Individual`
+        """
+        if self.result_store is None:
+            return
+        store = ResultStore(self.result_store)
+        staging = ResultStore(self.get_result_staging())
+        keep = [str(ind) for ind in result]
+        for key in keep:
+            staging.move(key, store)
+        staging.retain([])
+        store.retain(keep)
+
     def save_intermediate_result(self, result):
         """Dump result into pickle file in current working directory.
         Same content as smooth.save_results.
@@ -841,89 +1887,107 @@ class Optimization:
         self.current_result_file_name = new_result_file_name
         print("Save intermediate results in {}".format(new_result_file_name))
 
+    def save_checkpoint(self):
+        """Save the state of the optimization to *checkpoint_file*, if set
+        (see :func:`resume_optimization`). The individuals are saved without smooth results.
+        The file is written to a temporary file first and then renamed, so an
+        interruption while writing does not corrupt an existing checkpoint.
+        """
+        if self.checkpoint_file is None:
+            return
+        # copies of the individuals without smooth result, shared like the originals
+        memo = {None: None}
+
+        def compact(individuals):
+            copies = []
+            for ind in individuals:
+                key = None if ind is None else id(ind)
+                if key not in memo:
+                    memo[key] = copy.copy(ind)
+                    memo[key].values = list(ind.values)
+                    memo[key].smooth_result = None
+                copies.append(memo[key])
+            return copies
+
+        ascent = None
+        if self.ascent is not None:
+            ascent = dict(self.ascent, result=compact(self.ascent['result']))
+        checkpoint = {
+            'config': dill.dumps(self.config),
+            'generation': self.generation,
+            'population': compact(self.population),
+            'evaluated': dict(zip(self.evaluated, compact(self.evaluated.values()))),
+            'result': compact(self.result),
+            'ascent': ascent,
+            'random_state': random.getstate(),
+            'cost_only': [av.cost_only for av in self.attribute_variation],
+            'n_infeasible': self.n_infeasible,
+            'surrogate_accuracy': self.surrogate_accuracy,
+            'progress': self.progress,
+            'reference_point': self.reference_point,
+        }
+        tmp_file_name = self.checkpoint_file + '.tmp'
+        with open(tmp_file_name, 'wb') as checkpoint_file:
+            pickle.dump(checkpoint, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file_name, self.checkpoint_file)
+
+    def load_checkpoint(self, checkpoint):
+        """Restore the state of the optimization from a checkpoint.
+
+        :param checkpoint: checkpoint written by :meth:`save_checkpoint`
+        :type checkpoint: dict
+        """
+        self.generation = checkpoint['generation']
+        self.population = checkpoint['population']
+        self.evaluated = checkpoint['evaluated']
+        self.result = checkpoint['result']
+        self.ascent = checkpoint['ascent']
+        self.random_state = checkpoint['random_state']
+        for av, cost_only in zip(self.attribute_variation, checkpoint['cost_only']):
+            av.cost_only = cost_only
+        self.n_infeasible = checkpoint['n_infeasible']
+        self.surrogate_accuracy = checkpoint['surrogate_accuracy']
+        self.progress = checkpoint['progress']
+        self.reference_point = checkpoint['reference_point']
+
     def gradient_ascent(self, result):
         """Try to fine-tune result(s) with gradient ascent
 
         Attributes are assumed to be independent and varied separately.
         Solutions with the same fitness are ignored.
+        The state is kept in `ascent`, so the ascent can continue from a checkpoint.
 
         :param result: result from GA
         :type result: list of :class:`Individual`
         :return: improved result
         :rtype: list of :class:`Individual`
         """
-        print('\n+++++++ Intermediate result +++++++')
-        for i, v in enumerate(result):
-            print(i, v.values, " -> ", dict(zip(self.objective_names, v.fitness)))
-        print('+++++++++++++++++++++++++++++++++++\n')
-
-        new_result = []
-        # ignore solutions with identical fitness
-        for i in range(len(result)):
-            known_fitness = False
-            for j in range(len(new_result)):
-                known_fitness |= new_result[j].fitness == result[i].fitness
-            if not known_fitness:
-                new_result.append(result[i])
-
+        if self.ascent is None:
+            print('\n+++++++ Intermediate result +++++++')
+            for i, v in enumerate(result):
+                print(i, v.values, " -> ", dict(zip(self.objective_names, v.fitness)))
+            print('+++++++++++++++++++++++++++++++++++\n')
+
+            new_result = []
+            # ignore solutions with identical fitness
+            for i in range(len(result)):
+                known_fitness = False
+                for j in range(len(new_result)):
+                    known_fitness |= new_result[j].fitness == result[i].fitness
+                if not known_fitness:
+                    new_result.append(result[i])
+
+            self.ascent = {'av_idx': 0, 'result': new_result, 'step': None}
+
+        new_result = self.ascent['result']
         num_results = len(new_result)
 
-        for av_idx, av in enumerate(self.attribute_variation):
+        for av_idx in range(self.ascent['av_idx'], len(self.attribute_variation)):
             # iterate attribute variations (assumed to be independent)
-            print("Gradient descending {} / {}".format(av_idx+1, len(self.attribute_variation)))
-            step_size = av.val_step or 1.0  # required for ascent
-            self.population = []
-            for i in range(num_results):
-                # generate two children around parent to get gradient
-                parent = new_result[i]
-                # "below" parent, clip to minimum
-                child1 = Individual([gene for gene in parent])
-                child1[av_idx] = max(parent[av_idx] - step_size, av.val_min)
-                child1_fingerprint = str(child1)
-                # "above" parent, clip to maximum
-                child2 = Individual([gene for gene in parent])
-                child2[av_idx] = min(parent[av_idx] + step_size, av.val_max)
-                child2_fingerprint = str(child2)
-                # add to population. Take evaluated if exists
-                try:
-                    self.population.append(self.evaluated[child1_fingerprint])
-                except KeyError:
-                    self.population.append(child1)
-                try:
-                    self.population.append(self.evaluated[child2_fingerprint])
-                except KeyError:
-                    self.population.append(child2)
-
-            # compute fitness of all new children
-            # Keep invalid to preserve order (match parent to children)
-            self.compute_fitness()
-
-            # take note which direction is best for each individual
-            # may be positive or negative step size or 0 (no fitness improvement)
-            step = [0] * num_results
-            for i in range(num_results):
-                parent = new_result[i]
-                child1 = self.population[2*i]
-                child2 = self.population[2*i+1]
-                # get domination within family
-                if child1.dominates(parent):
-                    if child2.dominates(child1):
-                        # child 2 dominates
-                        step[i] = step_size
-                        new_result[i] = child2
-                    else:
-                        # child 1 dominates
-                        step[i] = -step_size
-                        new_result[i] = child1
-                else:
-                    # child1 does not dominate parent
-                    if child2.dominates(parent):
-                        # child 2 dominates
-                        step[i] = step_size
-                        new_result[i] = child2
-                    else:
-                        # parent is not dominated
-                        step[i] = 0.0
+            av = self.attribute_variation[av_idx]
+            step = self.ascent['step']
+            if step is None:
+                step = self.start_ascent(av_idx, new_result)
 
             # continue gradient ascent of solutions until local optimum reached for all
             while sum(map(abs, step)) != 0.0:
@@ -989,6 +2053,8 @@ class Optimization:
 
                 # update step sizes
                 step = new_step
+                self.ascent['step'] = step
+                self.save_checkpoint()
 
                 # show current result in plot
                 if self.plot_progress and self.plot_process.is_alive():
@@ -998,6 +2064,7 @@ class Optimization:
                     })
 
             # no more changes in any solution for this AV: give status update
+            self.prune_result_store(new_result)
             if self.save_intermediate_results:
                 self.save_intermediate_result(new_result)
 
@@ -1009,9 +2076,84 @@ class Optimization:
                 })
 
             # change next AV
+            self.ascent.update(av_idx=av_idx + 1, step=None)
+            self.save_checkpoint()
 
         return new_result
 
+    def start_ascent(self, av_idx, new_result):
+        """Evaluate two children around each individual of the gradient ascent,
+        varying one attribute, to get the direction of the first step.
+        Improved individuals are replaced in *new_result*.
+
+        :param av_idx: index of the varied attribute variation
+        :type av_idx: int
+        :param new_result: current result of the gradient ascent
+        :type new_result: list of :class:`Individual`
+        :return: step of each individual (negative, positive or 0 if not improved)
+        :rtype: list of float
+        """
+        av = self.attribute_variation[av_idx]
+        print("Gradient descending {} / {}".format(av_idx+1, len(self.attribute_variation)))
+        step_size = av.val_step or 1.0  # required for ascent
+        num_results = len(new_result)
+        self.population = []
+        for i in range(num_results):
+            # generate two children around parent to get gradient
+            parent = new_result[i]
+            # "below" parent, clip to minimum
+            child1 = Individual([gene for gene in parent])
+            child1[av_idx] = max(parent[av_idx] - step_size, av.val_min)
+            child1_fingerprint = str(child1)
+            # "above" parent, clip to maximum
+            child2 = Individual([gene for gene in parent])
+            child2[av_idx] = min(parent[av_idx] + step_size, av.val_max)
+            child2_fingerprint = str(child2)
+            # add to population. Take evaluated if exists
+            try:
+                self.population.append(self.evaluated[child1_fingerprint])
+            except KeyError:
+                self.population.append(child1)
+            try:
+                self.population.append(self.evaluated[child2_fingerprint])
+            except KeyError:
+                self.population.append(child2)
+
+        # compute fitness of all new children
+        # Keep invalid to preserve order (match parent to children)
+        self.compute_fitness()
+
+        # take note which direction is best for each individual
+        # may be positive or negative step size or 0 (no fitness improvement)
+        step = [0] * num_results
+        for i in range(num_results):
+            parent = new_result[i]
+            child1 = self.population[2*i]
+            child2 = self.population[2*i+1]
+            # get domination within family
+            if child1.dominates(parent):
+                if child2.dominates(child1):
+                    # child 2 dominates
+                    step[i] = step_size
+                    new_result[i] = child2
+                else:
+                    # child 1 dominates
+                    step[i] = -step_size
+                    new_result[i] = child1
+            else:
+                # child1 does not dominate parent
+                if child2.dominates(parent):
+                    # child 2 dominates
+                    step[i] = step_size
+                    new_result[i] = child2
+                else:
+                    # parent is not dominated
+                    step[i] = 0.0
+
+        self.ascent['step'] = step
+        self.save_checkpoint()
+        return step
+
     def run(self):
         """Main GA function
 
@@ -1019,18 +2161,38 @@ class Optimization:
         :rtype: list of :class:`Individual`
         """
 
-        random.seed()  # init RNG
+        if self.random_state is None:
+            random.seed()  # init RNG
+        else:
+            random.setstate(self.random_state)  # continue from checkpoint
 
         print('\n+++++++ START GENETIC ALGORITHM +++++++')
         print('The optimization parameters chosen are:')
         print('  population_size: {}'.format(self.population_size))
         print('  n_generation:    {}'.format(self.n_generation))
         print('  n_core:          {}'.format(self.n_core))
+        if self.random_state is not None:
+            print('  resumed at generation {}'.format(self.generation + 1))
         print('+++++++++++++++++++++++++++++++++++++++\n')
 
-        result = []
+        # elapsed time of the generations before a checkpoint is included
+        self.start_time = time.time() - (self.progress[-1]['time'] if self.progress else 0)
+
+        # read all input files once for all workers
+        self.load_time_series()
 
-        for gen in range(self.n_generation):
+        # genes that do not change the dispatch
+        self.classify_attribute_variations()
+
+        first_generation = self.generation
+        for gen in range(first_generation, self.n_generation):
+            self.generation = gen
+            reason = self.check_stop()
+            if reason is not None:
+                print("Stopping after {} generations: {}".format(gen, reason))
+                break
+            if gen > first_generation and gen % self.checkpoint_interval == 0:
+                self.save_checkpoint()
 
             # generate offspring
             children = []
@@ -1075,11 +2237,18 @@ class Optimization:
                 print("Aborting.")
                 break
 
+            # only evaluate the most promising or uncertain children
+            if self.surrogate:
+                children = self.screen_children(children)
+
             # New population generated (parents + children)
             self.population += children
 
             # evaluate generated population
-            self.compute_fitness()
+            self.compute_fitness(pruning=True)
+
+            if self.surrogate:
+                self.report_surrogate_accuracy(gen)
 
             # filter out individuals with invalid fitness values
             self.population = list(
@@ -1109,30 +2278,40 @@ class Optimization:
 
             # save pareto front
             # values/fitness tuples for all non-dominated individuals
-            result = [self.population[i] for i in FNDS[0]]
+            self.result = [self.population[i] for i in FNDS[0]]
 
             # print info of current pareto front
             print("The best front for Generation # {} / {} is".format(
                 gen+1, self.n_generation))
             for i, v in enumerate(FNDS[0]):
                 print(i, self.population[v], self.population[v].fitness)
+            self.record_progress(gen)
             print("\n")
 
+            # only keep full results of pareto front
+            self.prune_result_store(self.result)
+
             # save result to file
             if self.save_intermediate_results:
-                self.save_intermediate_result(result)
+                self.save_intermediate_result(self.result)
 
             # show current pareto front in plot
             if self.plot_progress and self.plot_process.is_alive():
                 self.plot_pipe_tx.send({
                     'title': 'Front for Generation #{}'.format(gen + 1),
-                    'values': result
+                    'values': self.result
                 })
 
             self.population = [self.population[i] for i in pop_idx]
 
             # next generation
 
+        if self.generation < self.n_generation:
+            # GA finished (or aborted)
+            self.generation = self.n_generation
+            self.save_checkpoint()
+
+        result = self.result
         result.sort(key=lambda v: -v.fitness[0])
 
         if self.post_processing:
@@ -1145,6 +2324,9 @@ class Optimization:
 
         for i, v in enumerate(result):
             print(i, v.values, " -> ", dict(zip(self.objective_names, v.fitness)))
+        if self.feasibility_check:
+            print('{} configurations rejected by the feasibility pre-check'.format(
+                self.n_infeasible))
         print('+++++++++++++++++++++++++++++++++++++++++++\n')
 
         if self.plot_progress and self.plot_process.is_alive():
@@ -1158,9 +2340,32 @@ class Optimization:
             if os.path.exists(self.current_result_file_name):
                 os.remove(self.current_result_file_name)
 
+        # free shared time series
+        self.time_series.close()
+
         return result
 
 
+def resume_optimization(checkpoint, model):
+    """Continue an optimization from the checkpoint file saved with *checkpoint_file*.
+    The optimization parameters are taken from the checkpoint.
+
+    :param checkpoint: path of the checkpoint file
+    :type checkpoint: string
+    :param model: the same smooth model that was used for the interrupted optimization
+    :type model: dict or list (legacy)
+    :return: pareto-optimal configurations
+    :rtype: list of :class:`Individual`
+    """
+    with open(checkpoint, 'rb') as checkpoint_file:
+        checkpoint = pickle.load(checkpoint_file)
+    opt_config = dill.loads(checkpoint['config'])
+    opt_config.update({"model": convert_legacy_model(model)})
+    optimization = Optimization(opt_config)
+    optimization.load_checkpoint(checkpoint)
+    return optimization.run()
+
+
 def run_optimization(opt_config, _model):
     """Entry point for genetic algorithm
 
@@ -0,0 +1,149 @@
+"""Surrogate model to pre-screen the children of the genetic algorithm.
+
+Each fitness evaluation is a complete smooth simulation. With *surrogate* set,
+the optimization trains a :class:`GaussianProcess` on the genes and fitness of all
+individuals evaluated so far and predicts the fitness of the new children.
+Only *surrogate_budget* children per generation are evaluated with smooth: those that
+are most promising (optimistic estimate *mean + surrogate_exploration \\* std* on the
+best predicted fronts) and, within a front, those with the most uncertain prediction.
+The mean absolute error of the predictions for the evaluated children is printed
+after each generation and kept in `surrogate_accuracy`.
+"""
+
+import numpy as np
+
+
+class GaussianProcess:
+    """Gaussian process regression with a squared exponential kernel (NumPy only).
+
+    All objectives share the same kernel, so the model is trained once for all of them.
+    Inputs should be scaled to similar ranges (e.g. [0, 1]), outputs are normalized internally.
+
+    :param length_scale: length scale of the kernel.
+        Defaults to the median distance between the training points
+    :type length_scale: float, optional
+    :param noise: noise added to the diagonal of the kernel matrix. Defaults to 1e-6
+    :type noise: float, optional
+    :param max_jitter_tries: number of times the jitter added to the diagonal is increased
+        before the training fails. Defaults to 10
+    :type max_jitter_tries: int, optional
+    """
+
+    def __init__(self, length_scale=None, noise=1e-6, max_jitter_tries=10):
+        self.length_scale = length_scale
+        self.noise = noise
+        self.max_jitter_tries = max_jitter_tries
+
+    def kernel(self, x1, x2):
+        """Squared exponential kernel between two sets of points.
+
+        :param x1: first set of points, shape (n1, d)
+        :type x1: numpy array
+        :param x2: second set of points, shape (n2, d)
+        :type x2: numpy array
+        :return: kernel matrix, shape (n1, n2)
+        :rtype: numpy array
+        """
+        sq_dist = np.sum((x1[:, None, :] - x2[None, :, :]) ** 2, axis=2)
+        return np.exp(-0.5 * sq_dist / self.fitted_length_scale ** 2)
+
+    def fit(self, x, y):
+        """Train the model.
+
+        :param x: inputs, shape (n, d)
+        :type x: array-like
+        :param y: outputs, shape (n, k)
+        :type y: array-like
+        :return: self
+        :raises numpy.linalg.LinAlgError: if the kernel matrix is not positive definite
+            even with the largest jitter (e.g. for NaN values)
+        """
+        self.x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean = y.mean(axis=0)
+        self.y_std = y.std(axis=0)
+        self.y_std[self.y_std == 0] = 1
+
+        self.fitted_length_scale = self.length_scale
+        if self.fitted_length_scale is None:
+            dist = np.sqrt(np.sum((self.x[:, None, :] - self.x[None, :, :]) ** 2, axis=2))
+            dist = dist[dist > 0]
+            self.fitted_length_scale = np.median(dist) if len(dist) else 1.0
+
+        k = self.kernel(self.x, self.x) + self.noise * np.eye(len(self.x))
+        # add jitter until kernel matrix is numerically positive definite
+        jitter = 0
+        for i_try in range(self.max_jitter_tries + 1):
+            try:
+                self.chol = np.linalg.cholesky(k + jitter * np.eye(len(self.x)))
+                break
+            except np.linalg.LinAlgError:
+                if i_try == self.max_jitter_tries:
+                    raise
+                jitter = max(10 * jitter, 1e-8)
+        y_norm = (y - self.y_mean) / self.y_std
+        self.alpha = np.linalg.solve(self.chol.T, np.linalg.solve(self.chol, y_norm))
+        return self
+
+    def predict(self, x):
+        """Predict outputs for new inputs.
+
+        :param x: inputs, shape (m, d)
+        :type x: array-like
+        :return: predicted mean and standard deviation, each of shape (m, k)
+        :rtype: tuple of numpy arrays
+        """
+        x = np.asarray(x, dtype=float)
+        k = self.kernel(x, self.x)
+        mean = k.dot(self.alpha) * self.y_std + self.y_mean
+        v = np.linalg.solve(self.chol, k.T)
+        var = np.maximum(1 - np.sum(v ** 2, axis=0), 0)
+        std = np.sqrt(var)[:, None] * self.y_std
+        return mean, std
+
+
+def dominates(a, b):
+    """Check if fitness *a* dominates fitness *b* (all objectives maximized).
+
+    :param a: first fitness
+    :type a: numpy array
+    :param b: second fitness
+    :type b: numpy array
+    :rtype: boolean
+    """
+    return np.all(a >= b) and np.any(a > b)
+
+
+def select_candidates(mean, std, budget, exploration=1.0):
+    """Select the most promising and uncertain candidates.
+
+    Candidates are sorted into non-dominated fronts by their optimistic
+    estimate *mean + exploration \\* std*. Fronts are taken in order until
+    the budget is reached; within a front, the most uncertain candidates come first.
+
+    :param mean: predicted fitness, shape (n, k)
+    :type mean: numpy array
+    :param std: standard deviation of prediction, shape (n, k)
+    :type std: numpy array
+    :param budget: maximum number of candidates to select
+    :type budget: int
+    :param exploration: weight of the uncertainty. Defaults to 1
+    :type exploration: float, optional
+    :return: indices of selected candidates
+    :rtype: list of int
+    """
+    optimistic = mean + exploration * std
+    # uncertainty relative to the largest uncertainty of each objective
+    max_std = std.max(axis=0)
+    max_std[max_std == 0] = 1
+    uncertainty = np.sum(std / max_std, axis=1)
+
+    selected = []
+    remaining = list(range(len(mean)))
+    while remaining and len(selected) < budget:
+        front = [i for i in remaining
+                 if not any(dominates(optimistic[j], optimistic[i]) for j in remaining)]
+        front.sort(key=lambda i: -uncertainty[i])
+        selected += front[:budget - len(selected)]
+        remaining = [i for i in remaining if i not in front]
+    return selected
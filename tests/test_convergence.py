@@ -0,0 +1,52 @@
+from smooth.optimization.convergence import \
+    check_convergence, get_new_front, get_reference_point, hypervolume
+
+import pytest
+
+
+def test_hypervolume():
+    assert hypervolume([], (0, 0)) == 0
+    assert hypervolume([(2, 1)], (0, 0)) == 2
+    # overlapping rectangles are counted once
+    assert hypervolume([(2, 1), (1, 2)], (0, 0)) == 3
+    assert hypervolume([(1, 2), (2, 1), (1, 1)], (0, 0)) == 3
+    # points not better than the reference do not contribute
+    assert hypervolume([(2, 1), (-1, 5)], (0, 0)) == 2
+    assert hypervolume([(-1, -1)], (-3, -2)) == pytest.approx(2)
+
+
+def test_get_reference_point():
+    fitness = [(-1, -10), (-3, -2)]
+    assert get_reference_point(fitness) == pytest.approx((-3.2, -10.8))
+    # kept if worse than all fitness values, otherwise moved
+    assert get_reference_point(fitness, (-5, -11)) == (-5, -11)
+    assert get_reference_point(fitness + [(-6, 0)], (-5, -11)) == pytest.approx((-6.5, -11))
+    # no spread
+    assert get_reference_point([(0, 2)]) == pytest.approx((-0.1, 1.8))
+
+
+def test_check_convergence():
+    progress = [
+        {'hypervolume': 1.0, 'front': ['a']},
+        {'hypervolume': 2.0, 'front': ['a', 'b']},
+        {'hypervolume': 2.001, 'front': ['a', 'c']},
+        {'hypervolume': 2.001, 'front': ['a', 'c']},
+    ]
+    # the hypervolume decreases if individuals of the front are not selected
+    assert check_convergence(progress[:2] + [{'hypervolume': 1.0, 'front': ['a']}], 1, 0.1) \
+        is None
+    assert get_new_front(progress[:1], 2) == {'a'}
+    assert get_new_front(progress, 2) == {'c'}
+
+    # not enough generations
+    assert check_convergence(progress, 4, 1, True, 10) is None
+    # hypervolume
+    assert check_convergence(progress, 2, 1e-2) is not None
+    assert check_convergence(progress, 2, 1e-4) is None
+    assert check_convergence(progress, 3, 1e-2) is None
+    # front stability
+    assert check_convergence(progress, 1, front_stability=True) is not None
+    assert check_convergence(progress, 2, front_stability=True) is None
+    # new individuals on the front
+    assert check_convergence(progress, 2, min_new_front=2) is not None
+    assert check_convergence(progress, 2, min_new_front=1) is None
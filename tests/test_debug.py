@@ -0,0 +1,83 @@
+from smooth.framework.functions import debug
+from smooth.framework.functions.debug import DebugSnapshots
+from smooth.framework.functions.lp_solver import solve_model
+from smooth.framework.exceptions import SolverNonOptimalError
+from smooth.framework.run_smooth import run_smooth
+
+import oemof.solph as solph
+import pandas as pd
+import os
+import pytest
+
+
+def get_model(demand):
+    es = solph.EnergySystem(timeindex=pd.date_range('1/1/2019', periods=1, freq='H'))
+    bel = solph.Bus(label='bel')
+    es.add(bel, solph.Source(
+        label='grid', outputs={bel: solph.Flow(nominal_value=10, variable_costs=1)}))
+    es.add(solph.Sink(label='demand', inputs={bel: solph.Flow(nominal_value=demand, fix=[1])}))
+    es.add(solph.components.GenericStorage(
+        label='battery', inputs={bel: solph.Flow()}, outputs={bel: solph.Flow()},
+        nominal_storage_capacity=10, initial_storage_level=0.5, min_storage_level=0.2))
+    return solph.Model(es)
+
+
+def test_debug_snapshots():
+    debug_snapshots = DebugSnapshots(size=2)
+    failed_model = get_model(30)
+    assert solve_model(failed_model)[1] == 'infeasible'
+    with pytest.raises(TypeError):
+        debug_snapshots.get_df_debug(failed_model)
+
+    for demand in [5, 6, 7]:
+        model_to_solve = get_model(demand)
+        assert solve_model(model_to_solve) == ('ok', 'optimal')
+        debug_snapshots.add(model_to_solve, solph.processing.results(model_to_solve))
+    # only the latest snapshots are kept
+    assert len(debug_snapshots.snapshots) == 2
+
+    df_debug = debug_snapshots.get_df_debug(failed_model)
+    last = df_debug[df_debug['variable_name'] != 'next'].set_index(['from', 'to', 'variable_name'])
+    assert last.loc[('bel', 'demand', 'flow')].tolist() == [True, 7, 7, 7]
+    assert last.loc[('grid', 'bel', 'flow')].tolist() == [False, 0, 7, 10]
+    assert last.loc[('battery', None, 'storage_content')].tolist()[1:] == [2, 5, 10]
+    assert (df_debug['variable_name'] == 'next').any()
+
+
+def test_show_debug_on_failure(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(debug, 'plot_smooth_results', lambda components: None)
+    test_path = os.path.join(os.path.dirname(__file__), 'test_timeseries')
+    # the battery without grid runs empty in the third interval
+    model = {
+        'busses': ['bel'],
+        'components': {
+            'demand': {
+                'component': 'energy_demand_from_csv',
+                'bus_in': 'bel',
+                'csv_filename': 'test_csv.csv',
+                'path': test_path,
+                'nominal_value': 100,
+            },
+            'battery': {
+                'component': 'battery',
+                'bus_in_and_out': 'bel',
+                'battery_capacity': 250,
+                'soc_init': 1,
+                'soc_min': 0,
+                'efficiency_discharge': 1,
+            },
+        },
+        'sim_params': {'n_intervals': 4, 'interval_time': 60},
+    }
+    with pytest.raises(SolverNonOptimalError):
+        run_smooth(model)
+    df_debug = pd.read_csv('debugDataframe.csv')
+    assert 'storage_content' in df_debug['variable_name'].tolist()
+    os.remove('debugDataframe.csv')
+
+    # failure in the first interval: no successful interval to compare against
+    model['components']['battery']['soc_init'] = 0.1
+    with pytest.raises(SolverNonOptimalError):
+        run_smooth(model)
+    assert not os.path.exists('debugDataframe.csv')
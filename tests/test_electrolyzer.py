@@ -1,5 +1,6 @@
 from smooth.components.component_electrolyzer import Electrolyzer
 from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.functions.piecewise import PiecewiseTransformer
 import oemof.solph as solph
 
 
@@ -23,7 +24,7 @@ class TestBasic:
             "bus1": solph.Bus(label="bus1"),
             "bus2": solph.Bus(label="bus2")
         }, oemof_model)
-        assert type(component) == solph.custom.PiecewiseLinearTransformer
+        assert type(component) == PiecewiseTransformer
         assert len(component.inputs) == 1
         assert len(component.outputs) == 1
 
@@ -1,5 +1,6 @@
 from smooth.components.component_electrolyzer_waste_heat import ElectrolyzerWasteHeat
 from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.functions.piecewise import MultiOutputPiecewiseTransformer
 import oemof.solph as solph
 
 import pytest
@@ -36,11 +37,9 @@ class TestBasic:
             "bus2": solph.Bus(label="bus2"),
             "bus3": solph.Bus(label="bus3")
         }, oemof_model)
-        assert ely.model_h2 is not None and ely.model_th is not None
-
-        assert type(ely.model_th) == solph.custom.PiecewiseLinearTransformer
-        assert len(ely.model_th.inputs) == 1
-        assert len(ely.model_th.outputs) == 1
+        assert type(ely.model) == MultiOutputPiecewiseTransformer
+        assert len(ely.model.inputs) == 1
+        assert len(ely.model.outputs) == 2
 
     def test_update_non_linear_behaviour(self):
         ely = ElectrolyzerWasteHeat({"bus_th": None, "sim_params": self.sim_params})
@@ -59,7 +58,6 @@ class TestBasic:
             assert temp[i] == int(points["temperature"][i])
             assert h2[i] == int(points["h2_produced"][i] * 1000)
             assert energy[i] == int(points["energy"][i] / 1000)
-            assert points["energy_halved"][i] == points["energy"][i] / 2
             assert points["thermal_energy"][i] == 0
 
 
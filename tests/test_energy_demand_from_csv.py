@@ -22,6 +22,13 @@ class TestBasic:
                                       "nominal_value": 2})
         assert demand.nominal_value == 2
 
+        # resample hourly data to four hours
+        demand = EnergyDemandFromCsv({"csv_filename": "test_csv.csv", "path": test_path,
+                                      "csv_interval_time": 60,
+                                      "sim_params": SimulationParameters({"interval_time": 240})})
+        assert len(demand.data) == 168 // 4
+        assert demand.data.iloc[0, 0] == 4
+
         # todo: raise error if "None" is passed as csv_filename variable
         # todo: assert file is csv type
 
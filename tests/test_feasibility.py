@@ -0,0 +1,104 @@
+from smooth.framework.functions.feasibility import FlowBounds, check_feasibility
+from smooth.framework.functions.functions import create_component_obj
+from smooth.framework.run_smooth import run_smooth
+from smooth.framework.simulation_parameters import SimulationParameters
+
+import copy
+import os
+import pytest
+
+
+test_path = os.path.join(os.path.dirname(__file__), 'test_timeseries')
+model = {
+    'busses': ['bel'],
+    'components': {
+        'grid': {
+            'component': 'supply',
+            'bus_out': 'bel',
+            'output_max': 50,
+        },
+        'demand': {
+            'component': 'energy_demand_from_csv',
+            'bus_in': 'bel',
+            'csv_filename': 'test_csv.csv',
+            'path': test_path,
+            'nominal_value': 100,
+        },
+        'battery': {
+            'component': 'battery',
+            'bus_in_and_out': 'bel',
+            'battery_capacity': 1000,
+            'soc_init': 0.5,
+            'soc_min': 0.1,
+        },
+    },
+    'sim_params': {'n_intervals': 7, 'interval_time': 60, 'show_debug_flag': False},
+}
+
+
+def check_model(model):
+    sim_params = SimulationParameters(model['sim_params'])
+    components = create_component_obj(copy.deepcopy(model), sim_params)
+    return check_feasibility(components, model['busses'])
+
+
+def test_flow_bounds():
+    sim_params = SimulationParameters(model['sim_params'])
+    grid, demand, battery = create_component_obj(copy.deepcopy(model), sim_params)
+    assert grid.get_flow_bounds()['bel'].flow_max == 50
+    assert list(demand.get_flow_bounds()['bel'].flow_min) == [-100] * 7
+    bounds = battery.get_flow_bounds()['bel']
+    assert (bounds.flow_min, bounds.flow_max) == (-1000, 1000)
+    assert bounds.energy_max == pytest.approx(400 * 0.95)
+    assert bounds.energy_min == pytest.approx(-500 / 0.95)
+
+
+def test_check_feasibility():
+    # the battery covers the missing 50 W for 7 hours (350 Wh of 380 Wh)
+    assert check_model(model) is None
+    assert run_smooth(copy.deepcopy(model))[1] == 'ok'
+
+    # but not for 8 hours
+    long_model = copy.deepcopy(model)
+    long_model['sim_params']['n_intervals'] = 8
+    message = check_model(long_model)
+    assert message.startswith('Bus bel: maximum energy')
+    assert 'interval 8' in message
+
+    # without battery, the demand exceeds the supply in the first interval
+    small_model = copy.deepcopy(model)
+    del small_model['components']['battery']
+    assert 'maximum flow' in check_model(small_model)
+    assert 'interval 1' in check_model(small_model)
+
+    # a source with a fixed output needs a sink
+    source_model = copy.deepcopy(small_model)
+    source_model['components']['demand'].update(
+        component='energy_source_from_csv', bus_out='bel')
+    del source_model['components']['demand']['bus_in']
+    assert 'minimum flow' in check_model(source_model)
+    source_model['components']['excess'] = {'component': 'sink', 'bus_in': 'bel'}
+    assert check_model(source_model) is None
+
+    # busses connected to components without bounds are not checked
+    converter_model = copy.deepcopy(small_model)
+    converter_model['busses'].append('bel2')
+    converter_model['components']['converter'] = {
+        'component': 'power_converter', 'bus_input': 'bel2', 'bus_output': 'bel'}
+    assert check_model(converter_model) is None
+
+    # bounds as numbers and arrays, with tolerance
+    sim_params = SimulationParameters({'n_intervals': 2})
+
+    class Dummy:
+        def __init__(self, bounds):
+            self.sim_params = sim_params
+            self.bounds = bounds
+
+        def get_flow_bounds(self):
+            return {'b': self.bounds}
+
+    assert check_feasibility([
+        Dummy(FlowBounds(0, 1)), Dummy(FlowBounds(-1, [-1, -1 - 1e-9]))], ['b']) is None
+    assert check_feasibility([
+        Dummy(FlowBounds(0, 1)), Dummy(FlowBounds(-1, [-1, -1.1]))], ['b']) is not None
@@ -1,6 +1,8 @@
 from smooth.components.component_fuel_cell_chp import FuelCellChp
 from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.functions.piecewise import MultiOutputPiecewiseTransformer
 import oemof.solph as solph
+import pytest
 
 
 # todo: figure out how to do tests for get_el_energy_by_h2 and get_th_energy_by_h2
@@ -42,6 +44,19 @@ class TestBasic:
         for i in range(len(h2_cons_th)):
             assert h2_cons_th[i] == fc_chp.bp_h2_consumed_th[i]
 
+    def test_legacy_flows(self):
+        # flows of the former electric node are renamed
+        with pytest.warns(FutureWarning):
+            fc_chp = FuelCellChp({
+                "sim_params": self.sim_params, "name": "fc", "variable_emissions": 1,
+                "dependency_flow_emissions": ("fc_electric", "bel")})
+        assert fc_chp.dependency_flow_emissions == ("fc", "bel")
+        # the former nodes received half of the input each
+        with pytest.raises(ValueError):
+            FuelCellChp({
+                "sim_params": self.sim_params, "name": "fc", "variable_costs": 1,
+                "dependency_flow_costs": ("bh2", "fc_thermal")})
+
     def test_add_to_oemof_model(self):
         fc_chp = FuelCellChp({
             "bus_h2": "bus1",
@@ -59,11 +74,6 @@ class TestBasic:
             "bus2": solph.Bus(label="bus2"),
             "bus3": solph.Bus(label="bus3")
         }, oemof_model)
-        assert fc_chp.model_el is not None and fc_chp.model_th is not None
-
-        assert type(fc_chp.model_el) == solph.custom.PiecewiseLinearTransformer
-        assert type(fc_chp.model_th) == solph.custom.PiecewiseLinearTransformer
-        assert len(fc_chp.model_el.inputs) == 1
-        assert len(fc_chp.model_el.outputs) == 1
-        assert len(fc_chp.model_th.inputs) == 1
-        assert len(fc_chp.model_th.outputs) == 1
+        assert type(fc_chp.model) == MultiOutputPiecewiseTransformer
+        assert len(fc_chp.model.inputs) == 1
+        assert len(fc_chp.model.outputs) == 2
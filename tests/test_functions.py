@@ -2,6 +2,8 @@ import smooth.framework.functions.functions as func
 from smooth.framework.simulation_parameters import SimulationParameters
 
 import os
+import pandas as pd
+import pytest
 
 
 def test_read_data_file():
@@ -16,6 +18,29 @@ def test_read_data_file():
         assert data[data.columns[0]][idx] == 1
 
 
+def test_resample_data():
+    data = pd.DataFrame({'foo': [1, 2, 3, 4, 5, 6, 7]})
+    # same resolution
+    assert func.resample_data(data, None, 60) is data
+    assert func.resample_data(data, 60, 60) is data
+
+    # coarser: mean or sum of two rows, incomplete last interval is dropped
+    assert list(func.resample_data(data, 60, 120)['foo']) == [1.5, 3.5, 5.5]
+    assert list(func.resample_data(data, 60, 120, 'sum')['foo']) == [3, 7, 11]
+
+    # finer: values are kept or split
+    assert list(func.resample_data(data, 60, 30)['foo'][:4]) == [1, 1, 2, 2]
+    assert list(func.resample_data(data, 60, 30, 'sum')['foo'][:4]) == [0.5, 0.5, 1, 1]
+
+    # not a multiple
+    resampled = func.resample_data(data, 60, 90, 'sum')
+    assert list(resampled['foo']) == pytest.approx([2, 4, 6.5, 8.5])
+    assert resampled['foo'].sum() == pytest.approx(data['foo'][:6].sum())
+
+    with pytest.raises(ValueError):
+        func.resample_data(data, 60, 120, 'foo')
+
+
 def test_create_component_obj():
     # dummy sim_params
     sim_params = SimulationParameters({})
@@ -1,5 +1,6 @@
 from smooth.components.component_gas_engine_chp_biogas import GasEngineChpBiogas
 from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.functions.piecewise import MultiOutputPiecewiseTransformer
 import oemof.solph as solph
 import pytest
 
@@ -38,11 +39,6 @@ class TestBasic:
             "bus2": solph.Bus(label="bus2"),
             "bus3": solph.Bus(label="bus3")
         }, oemof_model)
-        assert comp.model_el is not None and comp.model_th is not None
-
-        assert type(comp.model_el) == solph.custom.PiecewiseLinearTransformer
-        assert type(comp.model_th) == solph.custom.PiecewiseLinearTransformer
-        assert len(comp.model_el.inputs) == 1
-        assert len(comp.model_el.outputs) == 1
-        assert len(comp.model_th.inputs) == 1
-        assert len(comp.model_th.outputs) == 1
+        assert type(comp.model) == MultiOutputPiecewiseTransformer
+        assert len(comp.model.inputs) == 1
+        assert len(comp.model.outputs) == 2
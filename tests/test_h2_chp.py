@@ -1,5 +1,6 @@
 from smooth.components.component_h2_chp import H2Chp
 from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.functions.piecewise import MultiOutputPiecewiseTransformer
 import oemof.solph as solph
 
 
@@ -26,12 +27,8 @@ class TestBasic:
             "bus2": solph.Bus(label="bus2"),
             "bus3": solph.Bus(label="bus3")
         }, oemof_model)
-        assert h2_chp.model_el is not None and h2_chp.model_th is not None
+        assert type(h2_chp.model) == MultiOutputPiecewiseTransformer
+        assert len(h2_chp.model.inputs) == 1
+        assert len(h2_chp.model.outputs) == 2
 
-        assert len(oemof_model.entities) == 2
-        assert type(h2_chp.model_el) == solph.custom.PiecewiseLinearTransformer
-        assert type(h2_chp.model_th) == solph.custom.PiecewiseLinearTransformer
-        assert len(h2_chp.model_el.inputs) == 1
-        assert len(h2_chp.model_el.outputs) == 1
-        assert len(h2_chp.model_th.inputs) == 1
-        assert len(h2_chp.model_th.outputs) == 1
+        assert len(oemof_model.entities) == 1
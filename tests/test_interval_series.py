@@ -0,0 +1,80 @@
+from smooth.framework.interval_series import \
+    RunningSeries, DownsampledSeries, new_interval_series, get_series_total
+from smooth.framework.simulation_parameters import SimulationParameters
+
+import pytest
+
+
+def test_running_series():
+    series = RunningSeries(0)
+    assert len(series) == 0
+    assert series[0] == 0
+    assert get_series_total(series) == 0
+
+    series[0] = 2
+    series[1] = 5
+    assert series[1] == 5
+    assert series[-1] == 5
+    assert list(series) == [5]
+    # older values are not kept
+    with pytest.raises(IndexError):
+        series[0]
+    # not yet written
+    assert series[2] == 0
+
+    # overwrite value of current interval
+    series[1] = 3
+    assert series.total == 5
+    assert series.n_values == 2
+    assert series.min == 2
+    assert get_series_total(series) == 5
+
+    # None values are skipped
+    series[2] = None
+    assert series.total == 5
+    assert series.n_values == 2
+
+
+def test_downsampled_series():
+    series = DownsampledSeries(2)
+    for i_interval, value in enumerate([1, 3, 5, None, 4]):
+        series[i_interval] = value
+    assert series.total == 13
+    assert len(series) == 3
+    assert list(series) == [2, 5, 4]
+    # overwrite value of current interval
+    series[4] = 6
+    assert list(series) == [2, 5, 6]
+    assert get_series_total(series) == 15
+
+
+def test_new_interval_series():
+    sim_params = SimulationParameters({'n_intervals': 3})
+    series = new_interval_series(sim_params, 'comp', 'foo', 0)
+    assert series == [0, 0, 0]
+    series[1] = 4
+    assert get_series_total(series) == 4
+
+    sim_params = SimulationParameters({'n_intervals': 3, 'result_retention': 'aggregates'})
+    series = new_interval_series(sim_params, 'comp', 'foo')
+    assert isinstance(series, RunningSeries)
+    assert series[0] is None
+
+    sim_params = SimulationParameters({
+        'n_intervals': 3,
+        'result_retention': 'selected',
+        'retained_series': ['comp', ('other', 'foo')],
+    })
+    assert isinstance(new_interval_series(sim_params, 'comp', 'bar'), list)
+    assert isinstance(new_interval_series(sim_params, 'other', 'foo'), list)
+    assert isinstance(new_interval_series(sim_params, 'other', 'bar'), RunningSeries)
+
+    sim_params = SimulationParameters({
+        'n_intervals': 3,
+        'result_retention': 'downsampled',
+        'downsample_factor': 2,
+    })
+    assert new_interval_series(sim_params, 'comp', 'foo').factor == 2
+
+    with pytest.raises(ValueError):
+        SimulationParameters({'result_retention': 'foo'})
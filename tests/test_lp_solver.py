@@ -0,0 +1,86 @@
+from smooth.framework.functions.lp_solver import \
+    is_linear_program, get_lp_matrices, solve_model, prepare_solver_threads
+from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.components.component_fuel_cell_chp import FuelCellChp
+
+import oemof.solph as solph
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pyomo.opt.solver.shellcmd import SystemCallSolver
+import pandas as pd
+import pytest
+
+
+def get_model(demand=10, supply_max=100):
+    es = solph.EnergySystem(timeindex=pd.date_range('1/1/2019', periods=1, freq='H'))
+    bel = solph.Bus(label='bel')
+    es.add(bel)
+    es.add(solph.Source(
+        label='cheap', outputs={bel: solph.Flow(nominal_value=4, variable_costs=1)}))
+    es.add(solph.Source(
+        label='expensive',
+        outputs={bel: solph.Flow(nominal_value=supply_max, variable_costs=5)}))
+    es.add(solph.Sink(
+        label='demand', inputs={bel: solph.Flow(nominal_value=demand, fix=[1])}))
+    return solph.Model(es)
+
+
+def test_get_lp_matrices():
+    matrices = get_lp_matrices(get_model())
+    # the demand flow is fixed, so it is a constant of the bus balance
+    n_variables = len(matrices['variables'])
+    assert n_variables == 2
+    assert matrices['A_eq'].shape == (1, n_variables)
+    assert list(matrices['b_eq']) == [10]
+    assert sorted(matrices['c']) == [1, 5]
+
+
+def test_solve_model():
+    for solver in ['cbc', 'highs']:
+        model = get_model()
+        assert solve_model(model, solver) == ('ok', 'optimal')
+        flows = solph.views.node(solph.processing.results(model), 'bel')['sequences']
+        assert flows[(('cheap', 'bel'), 'flow')][0] == pytest.approx(4)
+        assert flows[(('expensive', 'bel'), 'flow')][0] == pytest.approx(6)
+
+    # infeasible: demand can not be supplied
+    assert solve_model(get_model(supply_max=1), 'highs')[1] == 'infeasible'
+
+    with pytest.raises(ValueError):
+        solve_model(get_model(), 'foo')
+    with pytest.raises(ValueError):
+        SimulationParameters({'solver': 'foo'})
+
+
+def test_is_linear_program():
+    assert is_linear_program(get_model())
+
+    # piecewise linear transformer needs binary variables
+    es = solph.EnergySystem(timeindex=pd.date_range('1/1/2019', periods=1, freq='H'))
+    busses = {name: solph.Bus(label=name) for name in ['bh2', 'bel', 'bth']}
+    es.add(*busses.values())
+    fc_chp = FuelCellChp({
+        'sim_params': SimulationParameters({}),
+        'bus_h2': 'bh2', 'bus_el': 'bel', 'bus_th': 'bth'})
+    fc_chp.add_to_oemof_model(busses, es)
+    assert not is_linear_program(solph.Model(es))
+
+
+def test_solve_cbc_in_threads(monkeypatch):
+    # both CBC processes have to run at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=30)
+    execute_command = SystemCallSolver._execute_command
+
+    def wait_and_execute(solver, command):
+        barrier.wait()
+        return execute_command(solver, command)
+    monkeypatch.setattr(SystemCallSolver, '_execute_command', wait_and_execute)
+
+    prepare_solver_threads()
+    models = [get_model(demand) for demand in [10, 20]]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        statuses = list(executor.map(solve_model, models))
+    assert statuses == [('ok', 'optimal')] * 2
+    for model, demand in zip(models, [10, 20]):
+        flows = solph.views.node(solph.processing.results(model), 'bel')['sequences']
+        assert flows[(('expensive', 'bel'), 'flow')][0] == pytest.approx(demand - 4)
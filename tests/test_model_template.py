@@ -0,0 +1,86 @@
+from smooth.framework.model_template import \
+    ModelTemplate, get_model_template, set_model_templates
+from smooth.framework.run_smooth import run_smooth
+
+import copy
+import os
+import pytest
+
+
+test_path = os.path.join(os.path.dirname(__file__), 'test_timeseries')
+model = {
+    'busses': ['bel'],
+    'components': {
+        'grid': {
+            'component': 'supply',
+            'bus_out': 'bel',
+            'variable_costs': 2e-3,
+            'dependency_flow_costs': ('grid', 'bel'),
+        },
+        'demand': {
+            'component': 'energy_demand_from_csv',
+            'bus_in': 'bel',
+            'csv_filename': 'test_csv.csv',
+            'path': test_path,
+            'nominal_value': 100,
+        },
+        'battery': {
+            'component': 'battery',
+            'bus_in_and_out': 'bel',
+            'battery_capacity': 1000,
+            'soc_init': 0.5,
+            'life_time': 10,
+            'capex': {
+                'key': 'spec',
+                'fitting_value': 100,
+                'dependant_value': 'battery_capacity',
+            },
+        },
+    },
+    'sim_params': {'n_intervals': 3, 'interval_time': 60, 'show_debug_flag': False},
+}
+
+
+def test_clone():
+    template = ModelTemplate(model)
+    components = template.clone({'battery': {'battery_capacity': 500}})
+    assert [c.name for c in components] == ['grid', 'demand', 'battery']
+    grid, demand, battery = components
+    # the changed component is created again, the others are copies sharing their data
+    assert battery.battery_capacity == 500
+    assert template.components[2].battery_capacity == 1000
+    assert demand is not template.components[1]
+    assert demand.data is template.components[1].data
+    # the components of a clone share their own simulation parameters
+    assert grid.sim_params is battery.sim_params is demand.sim_params
+    assert grid.sim_params is not template.sim_params
+
+    # same results as a simulation of the changed model
+    changed_model = copy.deepcopy(model)
+    changed_model['components']['battery']['battery_capacity'] = 500
+    expected = run_smooth(changed_model)[0]
+    result = run_smooth(copy.deepcopy(model), components)[0]
+    for this_comp, expected_comp in zip(result, expected):
+        assert this_comp.flows == expected_comp.flows
+        assert this_comp.results['annuity_total'] == pytest.approx(
+            expected_comp.results['annuity_total'])
+    # the template is not changed by the simulation
+    assert not hasattr(template.sim_params, 'i_interval')
+    assert template.components[0].results == {}
+    assert 'annuity_total' not in template.clone()[0].results
+
+    # removed component, changed simulation parameters
+    components = ModelTemplate(model, {'n_intervals': 2}).clone(removed={'battery'})
+    assert [c.name for c in components] == ['grid', 'demand']
+    assert components[0].sim_params.n_intervals == 2
+
+
+def test_model_templates():
+    template = ModelTemplate(model)
+    set_model_templates({'key': template})
+    try:
+        assert get_model_template('key') is template
+        assert get_model_template(None) is None
+    finally:
+        set_model_templates({})
+    assert get_model_template('key') is None
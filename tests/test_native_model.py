@@ -0,0 +1,210 @@
+from smooth.framework.run_smooth import run_smooth
+from smooth.framework.native_model import NativeModel, supports_native_model
+from smooth.framework.functions.functions import create_component_obj
+from smooth.framework.simulation_parameters import SimulationParameters
+
+import copy
+import pandas as pd
+import os
+import pytest
+
+
+test_path = os.path.join(os.path.dirname(__file__), 'test_timeseries')
+
+# Linear model with all kinds of nodes: sources, sinks, transformers and storages.
+# Costs are chosen so that each interval has a unique optimal solution.
+model = {
+    'busses': ['bgrid', 'bdc', 'bel', 'bth', 'bh2_lp', 'bh2_hp', 'bbg', 'bch4'],
+    'components': {
+        'grid': {
+            'component': 'supply',
+            'bus_out': 'bgrid',
+            'variable_costs': 0.2,
+            'dependency_flow_costs': ('grid', 'bgrid'),
+        },
+        'grid_gate': {
+            'component': 'gate',
+            'bus_in': 'bgrid',
+            'bus_out': 'bel',
+            'max_input': 1000,
+        },
+        'pv': {
+            'component': 'energy_source_from_csv',
+            'bus_out': 'bdc',
+            'csv_filename': 'test_csv.csv',
+            'path': test_path,
+            'nominal_value': 50,
+        },
+        'inverter': {
+            'component': 'power_converter',
+            'bus_input': 'bdc',
+            'bus_output': 'bel',
+        },
+        'battery': {
+            'component': 'battery',
+            'bus_in_and_out': 'bel',
+            'battery_capacity': 100,
+            'soc_init': 0.8,
+            'vac_in': 0.1,
+            'vac_out': -0.05,
+        },
+        'heater': {
+            'component': 'electric_heater',
+            'bus_el': 'bel',
+            'bus_th': 'bth',
+        },
+        'heat_demand': {
+            'component': 'energy_demand_from_csv',
+            'bus_in': 'bth',
+            'csv_filename': 'test_csv.csv',
+            'path': test_path,
+            'nominal_value': 80,
+        },
+        'h2_grid': {
+            'component': 'supply',
+            'bus_out': 'bh2_lp',
+            'variable_costs': 5,
+            'dependency_flow_costs': ('h2_grid', 'bh2_lp'),
+        },
+        'compressor': {
+            'component': 'compressor_h2',
+            'bus_h2_in': 'bh2_lp',
+            'bus_h2_out': 'bh2_hp',
+            'bus_el': 'bel',
+            'fs_component_name': ['h2_storage', None],
+            'fs_attribute_name': ['pressure', 700],
+        },
+        'h2_storage': {
+            'component': 'storage_h2',
+            'bus_in': 'bh2_lp',
+            'bus_out': 'bh2_lp',
+            'p_max': 450,
+            'storage_capacity': 20,
+            'vac_in': 0.02,
+            'vac_out': 0.01,
+        },
+        'h2_demand': {
+            'component': 'energy_demand_from_csv',
+            'bus_in': 'bh2_hp',
+            'csv_filename': 'test_csv.csv',
+            'path': test_path,
+            'nominal_value': 1,
+        },
+        'biogas': {
+            'component': 'supply',
+            'bus_out': 'bbg',
+            'variable_costs': 0.1,
+            'dependency_flow_costs': ('biogas', 'bbg'),
+        },
+        'upgrading': {
+            'component': 'biogas_converter',
+            'bg_in': 'bbg',
+            'bg_out': 'bch4',
+        },
+        'ch4_demand': {
+            'component': 'energy_demand_from_csv',
+            'bus_in': 'bch4',
+            'csv_filename': 'test_csv.csv',
+            'path': test_path,
+            'nominal_value': 10,
+        },
+    },
+    'sim_params': {
+        'n_intervals': 5,
+        'interval_time': 60,
+        'show_debug_flag': False,
+        'print_progress': False,
+    },
+}
+
+
+def simulate(this_model, native_model):
+    this_model = copy.deepcopy(this_model)
+    this_model['sim_params']['native_model'] = native_model
+    components, status = run_smooth(this_model)
+    assert status == 'ok'
+    return components
+
+
+def assert_same_results(oemof_components, native_components):
+    # CBC writes its solution with limited precision
+    for oemof_comp, native_comp in zip(oemof_components, native_components):
+        assert oemof_comp.flows.keys() == native_comp.flows.keys()
+        for flow in oemof_comp.flows:
+            assert native_comp.flows[flow] == pytest.approx(
+                oemof_comp.flows[flow], rel=1e-6, abs=1e-5), (oemof_comp.name, flow)
+        assert oemof_comp.states.keys() == native_comp.states.keys()
+        for state in oemof_comp.states:
+            assert native_comp.states[state] == pytest.approx(
+                oemof_comp.states[state], rel=1e-6, abs=1e-5), (oemof_comp.name, state)
+        for result in ['annuity_total', 'annual_total_emissions']:
+            assert native_comp.results[result] == pytest.approx(
+                oemof_comp.results[result], rel=1e-6, abs=1e-5), (oemof_comp.name, result)
+
+
+def test_supports_native_model():
+    sim_params = SimulationParameters({})
+    components = create_component_obj(copy.deepcopy(model), sim_params)
+    assert supports_native_model(components)
+
+    unsupported_model = copy.deepcopy(model)
+    unsupported_model['components']['fuel_cell'] = {
+        'component': 'fuel_cell_chp',
+        'bus_h2': 'bh2_hp',
+        'bus_el': 'bel',
+        'bus_th': 'bth',
+    }
+    components = create_component_obj(unsupported_model, sim_params)
+    assert not supports_native_model(components)
+
+
+def test_native_model_equivalence():
+    assert_same_results(simulate(model, False), simulate(model, True))
+
+
+def test_native_model_battery():
+    # storage with losses and efficiencies, where the grid has to fill the gap
+    battery_model = copy.deepcopy(model)
+    battery_model['components']['battery'].update({
+        'battery_capacity': 50,
+        'loss_rate': 0.01,
+        'efficiency_charge': 0.9,
+        'efficiency_discharge': 0.8,
+    })
+    assert_same_results(simulate(battery_model, False), simulate(battery_model, True))
+
+
+def test_native_model_fallback():
+    # the fuel cell is not linear, so the whole model is simulated with oemof
+    fallback_model = copy.deepcopy(model)
+    fallback_model['components']['fuel_cell'] = {
+        'component': 'fuel_cell_chp',
+        'bus_h2': 'bh2_hp',
+        'bus_el': 'bel',
+        'bus_th': 'bth',
+    }
+    fallback_model['sim_params']['n_intervals'] = 2
+    assert_same_results(simulate(fallback_model, False), simulate(fallback_model, True))
+
+
+def test_native_model_update():
+    native_model = NativeModel(['bel'], 30)
+    native_model.add_flow('grid', 'bel', variable_costs=2)
+    native_model.add_flow('bel', 'demand', nominal_value=10, fix=1)
+    assert native_model.solve() == ('ok', 'optimal')
+    matrix = native_model.matrix
+    results = native_model.get_results(pd.date_range('2020-01-01', periods=1, freq='30min'))
+    assert results['grid', 'bel']['sequences']['flow'][0] == pytest.approx(10)
+    assert native_model.costs == [1, 0]
+
+    # new values of an existing flow update the matrix in place
+    native_model.add_flow('bel', 'demand', nominal_value=20, fix=0.5)
+    native_model.add_flow('grid', 'bel', variable_costs=4)
+    assert native_model.solve() == ('ok', 'optimal')
+    assert native_model.matrix is matrix
+    assert native_model.values[native_model.columns['grid', 'bel']] == pytest.approx(10)
+    assert native_model.costs == [2, 0]
+
+    # infeasible interval: demand exceeds the bounded supply
+    native_model.add_flow('grid', 'bel', nominal_value=5)
+    assert native_model.solve() == ('warning', 'infeasible')
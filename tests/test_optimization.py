@@ -1,8 +1,67 @@
+import copy
+import dill
+import os
 import smooth.optimization.run_optimization as opt
 
+import numpy as np
 import pytest
 
 
+test_path = os.path.join(os.path.dirname(__file__), "test_timeseries")
+
+
+def get_grid_model(n_intervals):
+    # grid supplying the demand of the test time series
+    return {
+        "busses": ["bel"],
+        "components": {
+            "grid": {
+                "component": "supply",
+                "bus_out": "bel",
+                "variable_costs": 2e-3,
+                "dependency_flow_costs": ("grid", "bel"),
+            },
+            "demand": {
+                "component": "energy_demand_from_csv",
+                "bus_in": "bel",
+                "csv_filename": "test_csv.csv",
+                "path": test_path,
+                "nominal_value": 100,
+            },
+        },
+        "sim_params": {
+            "n_intervals": n_intervals, "interval_time": 60, "show_debug_flag": False},
+    }
+
+
+def get_battery_model(n_intervals):
+    model = get_grid_model(n_intervals)
+    model["components"]["battery"] = {
+        "component": "battery",
+        "bus_in_and_out": "bel",
+        "battery_capacity": 1000,
+        "soc_init": 0.5,
+    }
+    return model
+
+
+def get_two_grid_model(n_intervals):
+    # cheap grid with emissions and expensive green grid without: two objectives
+    model = get_grid_model(n_intervals)
+    model["components"]["grid"].update({
+        "variable_costs": 1e-3,
+        "variable_emissions": 1,
+        "dependency_flow_emissions": ("grid", "bel"),
+    })
+    model["components"]["green_grid"] = {
+        "component": "supply",
+        "bus_out": "bel",
+        "variable_costs": 3e-3,
+        "dependency_flow_costs": ("green_grid", "bel"),
+    }
+    return model
+
+
 class TestAV:
     # AttributeVariation
     def test_av(self):
@@ -243,3 +302,380 @@ class TestGA:
         })
         # smooth error: no result
         assert len(o.run()) == 0
+
+    def test_result_retention(self):
+        model = {"components": {}, "sim_params": {}}
+        o = opt.Optimization({
+            "population_size": 10,
+            "n_generation": 1,
+            "attribute_variation": [self.av_dict],
+            "model": model,
+            "result_retention": "selected",
+            "retained_series": ["foo"],
+        })
+        # simulation parameters of each evaluation
+        assert o.model["sim_params"]["result_retention"] == "selected"
+        assert o.model["sim_params"]["retained_series"] == ["foo"]
+        # the given model is not changed
+        assert model == {"components": {}, "sim_params": {}}
+
+    def test_prune_result_store(self, tmp_path):
+        o = opt.Optimization({
+            "population_size": 10,
+            "n_generation": 1,
+            "attribute_variation": [self.av_dict],
+            "model": {"components": {}, "sim_params": {}},
+            "result_store": str(tmp_path),
+        })
+        store = opt.ResultStore(str(tmp_path))
+        staging = opt.ResultStore(o.get_result_staging())
+        front = [opt.Individual([1]), opt.Individual([2])]
+        # results of a previous front and of the current generation
+        for ind in front[:1] + [opt.Individual([3])]:
+            store.write(str(ind), [])
+        for ind in front[1:] + [opt.Individual([4])]:
+            staging.write(str(ind), [])
+        o.prune_result_store(front)
+        assert sorted(store.keys()) == sorted(str(ind) for ind in front)
+        assert staging.keys() == []
+
+    def test_surrogate(self, monkeypatch):
+        o = opt.Optimization({
+            "population_size": 4,
+            "n_generation": 1,
+            "attribute_variation": [self.av_dict],
+            "model": {"components": {}, "sim_params": {}},
+            "surrogate": True,
+            "surrogate_budget": 2,
+        })
+        children = [opt.Individual([v]) for v in [1, 5, 9]]
+        for child in children:
+            o.evaluated[str(child)] = None
+        # not enough samples
+        assert o.screen_children(children) == children
+
+        for v in [0, 2, 4, 6, 8, 10]:
+            ind = opt.Individual([v])
+            ind.fitness = (v, -v)
+            o.evaluated[str(ind)] = ind
+        selected = o.screen_children(children)
+        assert len(selected) == 2
+        # children not selected may be generated again
+        assert len(o.evaluated) == 6 + 2
+
+        for child in selected:
+            child.fitness = (child[0], -child[0])
+            o.evaluated[str(child)] = child
+        o.report_surrogate_accuracy(0)
+        assert o.surrogate_accuracy[0]["n_evaluated"] == 2
+        assert o.surrogate_accuracy[0]["mae"][0] < 1
+
+        # all children are evaluated if the surrogate model can not be trained
+        def fail(*args):
+            raise np.linalg.LinAlgError
+        monkeypatch.setattr(opt.GaussianProcess, 'fit', fail)
+        assert o.screen_children(children) == children
+
+    def test_promote(self):
+        o = opt.Optimization({
+            "population_size": 4,
+            "n_generation": 1,
+            "attribute_variation": [self.av_dict],
+            "model": {"components": {}, "sim_params": {}},
+            "fidelity_schedule": [{"n_intervals": 10}],
+            "fidelity_margin": 0.1,
+        })
+        fitness = [(-10, -10), (-5, -20), (-10.5, -10.5), (-20, -20), None]
+        o.population = [opt.Individual([i]) for i in range(len(fitness))]
+        for ind, f in zip(o.population, fitness):
+            ind.fitness = f
+        # first individual has been evaluated at full fidelity
+        promoted = o.promote([1, 2, 3, 4])
+        # 2 is dominated only within margin, 3 clearly dominated, 4 failed
+        assert promoted == [1, 2]
+        assert o.population[3].fitness is None
+        assert o.population[3].low_fidelity_fitness == [(-20, -20)]
+        assert o.population[0].fitness == (-10, -10)
+
+    def test_batch_fitness(self):
+        model = get_battery_model(3)
+        av = [opt.AttributeVariation({
+            "comp_name": "battery",
+            "comp_attribute": "battery_capacity",
+            "val_min": 100,
+            "val_max": 1000,
+        })]
+        objectives = dill.dumps((lambda x: -sum(c.results["annuity_total"] for c in x),))
+        individuals = [opt.Individual([v]) for v in [1000, 500, 100]]
+        results = opt.batch_fitness_function(
+            [3, 4, 5], copy.deepcopy(individuals), model, av, objectives)
+        assert [idx for idx, _ in results] == [3, 4, 5]
+        for ind, (_, batch_ind) in zip(individuals, results):
+            _, ind = opt.fitness_function(0, ind, copy.deepcopy(model), av, objectives)
+            assert batch_ind.fitness == pytest.approx(ind.fitness)
+
+        # batch fails: individuals are evaluated one by one
+        individuals = [opt.Individual([v]) for v in [1000, 0]]
+        results = opt.batch_fitness_function([0, 1], individuals, model, av, objectives)
+        assert results[0][1].fitness is not None
+        assert results[1][1].fitness is None
+
+    def test_dispatch_reuse(self):
+        model = get_battery_model(3)
+        model["components"]["battery"].update({
+            "life_time": 10,
+            "capex": {
+                "key": "spec",
+                "fitting_value": 100,
+                "dependant_value": "battery_capacity",
+            },
+        })
+        av = [opt.AttributeVariation({
+            "comp_name": "battery",
+            "comp_attribute": "battery_capacity",
+            "val_min": 100,
+            "val_max": 1000,
+        }), opt.AttributeVariation({
+            "comp_name": "battery",
+            "comp_attribute": "life_time",
+            "val_min": 5,
+            "val_max": 20,
+        })]
+        # the life time only affects the costs
+        assert not opt.is_cost_only(model, av[0])
+        assert opt.is_cost_only(model, av[1])
+        for this_av in av:
+            this_av.cost_only = opt.is_cost_only(model, this_av)
+        assert opt.get_dispatch_key(opt.Individual([100, 5]), av) == (100, None)
+        assert opt.get_dispatch_key(opt.Individual([100, 0]), av, ignore_zero=True) == (100, 0)
+
+        objectives = dill.dumps((lambda x: -sum(c.results["annuity_total"] for c in x),))
+        individuals = [opt.Individual([500, v]) for v in [5, 10, 20]]
+        results, smooth_result = opt.dispatch_fitness_function(
+            [3, 4, 5], copy.deepcopy(individuals), model, av, objectives,
+            return_dispatch=True)
+        assert [idx for idx, _ in results] == [3, 4, 5]
+        for ind, (_, reused_ind) in zip(individuals, results):
+            _, ind = opt.fitness_function(0, ind, copy.deepcopy(model), av, objectives)
+            assert reused_ind.fitness == pytest.approx(ind.fitness)
+        # a longer life time is cheaper
+        assert results[0][1].fitness < results[2][1].fitness
+
+        # costs computed from a cached dispatch
+        individuals = [opt.Individual([500, 8])]
+        _, reused_ind = opt.cost_fitness_function(
+            [0], copy.deepcopy(individuals), smooth_result, av, objectives)[0]
+        _, ind = opt.fitness_function(0, individuals[0], copy.deepcopy(model), av, objectives)
+        assert reused_ind.fitness == pytest.approx(ind.fitness)
+        # the cached dispatch is not changed
+        assert smooth_result[2].life_time == 5
+
+        # dispatch groups are neither batched nor pruned
+        for option in [{"batch_size": 2}, {"pruning_interval": 1}]:
+            with pytest.raises(AssertionError):
+                opt.Optimization(dict({
+                    "population_size": 1,
+                    "n_generation": 1,
+                    "attribute_variation": [vars(this_av) for this_av in av],
+                    "model": model,
+                    "reuse_dispatch": True,
+                }, **option))
+
+    def test_clone_components(self):
+        model = get_grid_model(3)
+        av = [{
+            "comp_name": "demand",
+            "comp_attribute": "nominal_value",
+            "val_min": 0,
+            "val_max": 100,
+        }]
+        objectives = dill.dumps((lambda x: -sum(c.results["annuity_total"] for c in x),))
+        o = opt.Optimization({
+            "population_size": 1,
+            "n_generation": 1,
+            "attribute_variation": av,
+            "model": model,
+        })
+        key = o.get_model_template()
+        assert opt.clone_components(opt.Individual([50]), o.attribute_variation) is None
+
+        opt.set_model_templates(o.model_templates)
+        try:
+            components = opt.clone_components(
+                opt.Individual([0]), o.attribute_variation, True, key)
+            assert [c.name for c in components] == ["grid"]
+            for value in [50, 100]:
+                _, ind = opt.fitness_function(
+                    0, opt.Individual([value]), copy.deepcopy(model),
+                    o.attribute_variation, objectives, template_key=key)
+                _, expected = opt.fitness_function(
+                    0, opt.Individual([value]), copy.deepcopy(model),
+                    o.attribute_variation, objectives)
+                assert ind.fitness == pytest.approx(expected.fitness)
+        finally:
+            opt.set_model_templates({})
+
+        # no template without reusing components
+        o.reuse_components = False
+        assert o.get_model_template({"n_intervals": 2}) is None
+
+    def test_pruning(self):
+        model = get_grid_model(4)
+        objectives = (lambda x: -sum(c.results["annuity_total"] for c in x), lambda x: 0)
+        expected = opt.run_smooth(copy.deepcopy(model))[0]
+        fitness = objectives[0](expected)
+        assert fitness < 0
+
+        # front member with lower costs: stopped at the first check
+        reference = opt.Individual([])
+        reference.fitness = (fitness / 10, 1)
+        smooth_result, bound = opt.run_smooth_pruned(
+            copy.deepcopy(model), None, objectives, [reference], 2)
+        assert smooth_result is None
+        assert fitness < bound[0] < 0
+
+        # front member with higher costs: complete simulation
+        reference.fitness = (fitness * 2, 1)
+        smooth_result, bound = opt.run_smooth_pruned(
+            copy.deepcopy(model), None, objectives, [reference], 2)
+        assert bound is None
+        assert objectives[0](smooth_result) == pytest.approx(fitness)
+
+        # fitness function keeps the bound, but no fitness
+        reference.fitness = (fitness / 10, 1)
+        _, ind = opt.fitness_function(
+            0, opt.Individual([]), copy.deepcopy(model), [], dill.dumps(objectives),
+            pruning_front=[reference], pruning_interval=1)
+        assert ind.fitness is None
+        assert ind.pruned_fitness[0] > fitness
+
+        # pareto front of the evaluated individuals
+        o = opt.Optimization({
+            "population_size": 1,
+            "n_generation": 1,
+            "attribute_variation": [self.av_dict],
+            "model": model,
+            "pruning_interval": 2,
+        })
+        o.population = [opt.Individual([v]) for v in range(4)]
+        for ind, fitness in zip(o.population, [(1, 1), (0, 2), (0, 0), None]):
+            ind.fitness = fitness
+        front = o.get_pruning_front()
+        assert sorted(ind.fitness for ind in front) == [(0, 2), (1, 1)]
+
+    def test_feasibility_check(self, capsys):
+        model = get_grid_model(3)
+        o = opt.Optimization({
+            "population_size": 3,
+            "n_generation": 1,
+            "n_core": 1,
+            "attribute_variation": [{
+                "comp_name": "grid",
+                "comp_attribute": "output_max",
+                "val_min": 0,
+                "val_max": 200,
+            }],
+            "model": model,
+        })
+        o.population = [opt.Individual([v]) for v in [50, 150, 200]]
+        o.compute_fitness()
+        assert "Feasibility pre-check: 1 of 3 configurations rejected" in capsys.readouterr().out
+        assert o.n_infeasible == 1
+        assert o.population[0].fitness is None
+        assert o.population[0].infeasible.startswith("Bus bel")
+        assert "[50]" in o.evaluated
+        assert o.population[1].fitness is not None
+        assert o.population[1].infeasible is None
+
+        # nothing rejected: no output of the pre-check
+        o.population = [opt.Individual([120])]
+        o.compute_fitness()
+        assert "Feasibility" not in capsys.readouterr().out
+
+        # without pre-check, the infeasible individual is simulated and fails
+        o.feasibility_check = False
+        o.population = [opt.Individual([50])]
+        o.compute_fitness()
+        assert o.population[0].fitness is None
+        assert o.population[0].infeasible is None
+        assert o.n_infeasible == 1
+
+    def test_resume_optimization(self, tmp_path, monkeypatch):
+        model = get_two_grid_model(2)
+        config = {
+            "population_size": 4,
+            "n_generation": 3,
+            "n_core": 1,
+            "post_processing": True,
+            "attribute_variation": [{
+                "comp_name": name,
+                "comp_attribute": "output_max",
+                "val_min": 0,
+                "val_max": 120,
+                "val_step": 10,
+            } for name in ["grid", "green_grid"]],
+            "checkpoint_file": str(tmp_path / "ga_checkpoint.pickle"),
+        }
+
+        # keep a copy of each checkpoint
+        checkpoints = []
+        save_checkpoint = opt.Optimization.save_checkpoint
+
+        def save_and_copy(optimization):
+            save_checkpoint(optimization)
+            checkpoints.append(tmp_path / "checkpoint_{}.pickle".format(len(checkpoints)))
+            os.replace(optimization.checkpoint_file, str(checkpoints[-1]))
+        monkeypatch.setattr(opt.Optimization, "save_checkpoint", save_and_copy)
+
+        expected = opt.Optimization(dict(config, model=copy.deepcopy(model))).run()
+        expected = [(ind.values, ind.fitness) for ind in expected]
+        assert expected
+
+        # checkpoints before generation 2 and 3, after the GA and in the gradient ascent
+        states = []
+        for file_name in checkpoints:
+            with open(str(file_name), "rb") as checkpoint_file:
+                states.append(opt.pickle.load(checkpoint_file))
+        assert [s["generation"] for s in states[:3]] == [1, 2, 3]
+        assert states[2]["ascent"] is None and states[3]["ascent"]["step"] is not None
+        assert states[-1]["ascent"]["av_idx"] == 2
+        assert all(ind.smooth_result is None for ind in states[0]["evaluated"].values() if ind)
+
+        monkeypatch.setattr(opt.Optimization, "save_checkpoint", save_checkpoint)
+        for file_name in checkpoints[0:4] + checkpoints[-1:]:
+            result = opt.resume_optimization(str(file_name), copy.deepcopy(model))
+            assert [(ind.values, ind.fitness) for ind in result] == expected
+
+    def test_stopping_criteria(self, monkeypatch):
+        model = get_two_grid_model(2)
+        config = {
+            "population_size": 4,
+            "n_generation": 50,
+            "n_core": 1,
+            "attribute_variation": [{
+                "comp_name": name,
+                "comp_attribute": "output_max",
+                "val_min": 0,
+                "val_max": 120,
+                "val_step": 20,
+            } for name in ["grid", "green_grid"]],
+            "model": model,
+            "convergence_window": 2,
+            "hypervolume_tolerance": 1e-6,
+        }
+        # reproducible run
+        opt.random.seed(2)
+        monkeypatch.setattr(opt.random, "seed", lambda: None)
+        o = opt.Optimization(config)
+        result = o.run()
+        assert 2 < len(o.progress) < 50
+        assert set(o.progress[-1]["front"]) == {str(ind) for ind in result}
+        assert o.progress[-1]["hypervolume"] == pytest.approx(o.progress[-3]["hypervolume"])
+        assert all(f > r for fitness in o.progress[0]["fitness"]
+                   for f, r in zip(fitness, o.reference_point))
+        assert all(record["hypervolume"] > 0 for record in o.progress)
+
+        # no generation after the time budget
+        o = opt.Optimization(dict(config, time_budget=0))
+        assert o.run() == []
+        assert o.progress == []
@@ -1,5 +1,6 @@
 from smooth.components.component_pem_electrolyzer import PemElectrolyzer
 from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.functions.piecewise import MultiOutputPiecewiseTransformer
 import oemof.solph as solph
 
 
@@ -28,11 +29,6 @@ class TestBasic:
             "bus2": solph.Bus(label="bus2"),
             "bus3": solph.Bus(label="bus3")
         }, oemof_model)
-        assert comp.model_h2 is not None and comp.model_th is not None
-
-        assert type(comp.model_h2) == solph.custom.PiecewiseLinearTransformer
-        assert type(comp.model_th) == solph.custom.PiecewiseLinearTransformer
-        assert len(comp.model_h2.inputs) == 1
-        assert len(comp.model_h2.outputs) == 1
-        assert len(comp.model_th.inputs) == 1
-        assert len(comp.model_th.outputs) == 1
+        assert type(comp.model) == MultiOutputPiecewiseTransformer
+        assert len(comp.model.inputs) == 1
+        assert len(comp.model.outputs) == 2
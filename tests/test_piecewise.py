@@ -0,0 +1,139 @@
+from smooth.framework.functions.piecewise import \
+    PiecewiseTransformer, MultiOutputPiecewiseTransformer, is_concave, get_pw_repn, \
+    merge_breakpoints
+from smooth.framework.functions.lp_solver import is_linear_program, solve_model
+
+import numpy as np
+import oemof.solph as solph
+import pandas as pd
+import pytest
+
+POINTS = [0, 10, 20, 30, 40]
+CONCAVE = [0, 8, 14, 18, 20]
+CONVEX = [0, 2, 6, 12, 20]
+
+
+def get_model(curves, demand):
+    # one supply, transformer and demand per curve
+    es = solph.EnergySystem(timeindex=pd.date_range('1/1/2019', periods=1, freq='H'))
+    bel = solph.Bus(label='bel')
+    es.add(bel, solph.Source(
+        label='grid', outputs={bel: solph.Flow(variable_costs=1)}))
+    for i_curve, (values, pw_repn) in enumerate(curves):
+        bh2 = solph.Bus(label='bh2_{}'.format(i_curve))
+        es.add(bh2, solph.Sink(
+            label='demand_{}'.format(i_curve),
+            inputs={bh2: solph.Flow(nominal_value=demand, fix=[1])}))
+        es.add(PiecewiseTransformer(
+            label='ely_{}'.format(i_curve),
+            inputs={bel: solph.Flow(nominal_value=max(POINTS))},
+            outputs={bh2: solph.Flow()},
+            in_breakpoints=POINTS,
+            conversion_function=lambda x, values=values: values[POINTS.index(x)],
+            pw_repn=pw_repn))
+    return solph.Model(es)
+
+
+def test_is_concave():
+    assert is_concave(POINTS, CONCAVE)
+    assert not is_concave(POINTS, CONVEX)
+    # linear curves are concave
+    assert is_concave(POINTS, POINTS)
+    # steps are not supported
+    assert not is_concave([0, 10, 10, 20], [0, 5, 6, 8])
+
+
+def test_get_pw_repn():
+    assert get_pw_repn('auto', POINTS, CONCAVE) == 'LP'
+    assert get_pw_repn('auto', POINTS, CONVEX) == 'CC'
+    assert get_pw_repn('DCC', POINTS, CONCAVE) == 'DCC'
+    assert get_pw_repn('LOG', POINTS, CONVEX) == 'LOG'
+    with pytest.raises(ValueError):
+        get_pw_repn('LP', POINTS, CONVEX)
+    with pytest.raises(ValueError):
+        get_pw_repn('LOG', POINTS[:4], CONVEX[:4])
+    with pytest.raises(ValueError):
+        get_pw_repn('SOS2', POINTS, CONVEX)
+
+
+def test_piecewise_transformer():
+    # input to produce the demand of 16, interpolated between two breakpoints
+    expected_input = {'concave': 25, 'convex': 35}
+    for pw_repn in ['CC', 'auto', 'LP', 'DCC', 'LOG', 'MC']:
+        curves = [(CONCAVE, pw_repn)]
+        if pw_repn != 'LP':
+            curves.append((CONVEX, pw_repn))
+        model = get_model(curves, demand=16)
+        assert is_linear_program(model) == (pw_repn == 'LP')
+        assert solve_model(model) == ('ok', 'optimal')
+        results = solph.processing.results(model)
+        for i_curve, curve in enumerate(['concave', 'convex'][:len(curves)]):
+            flows = solph.views.node(results, 'ely_{}'.format(i_curve))['sequences']
+            assert flows[(('bel', 'ely_{}'.format(i_curve)), 'flow')][0] == pytest.approx(
+                expected_input[curve]), (pw_repn, curve)
+
+
+def test_piecewise_transformer_mixed():
+    # different representations in one model, the linear program is solved in-process
+    model = get_model([(CONCAVE, 'LP'), (CONVEX, 'DCC'), (CONCAVE, 'CC')], demand=8)
+    assert solve_model(model, 'highs') == ('ok', 'optimal')
+    grid = solph.views.node(solph.processing.results(model), 'grid')['sequences']
+    assert grid[(('grid', 'bel'), 'flow')][0] == pytest.approx(10 + 20 + 2 / 0.6 + 10)
+
+    model = get_model([(CONCAVE, 'LP')], demand=8)
+    assert is_linear_program(model)
+    assert solve_model(model, 'highs') == ('ok', 'optimal')
+
+
+def get_multi_output_model(pw_repn, curves, demand):
+    # one transformer with an output per curve, the first output has a fixed demand
+    es = solph.EnergySystem(timeindex=pd.date_range('1/1/2019', periods=1, freq='H'))
+    bel = solph.Bus(label='bel')
+    es.add(bel, solph.Source(
+        label='grid', outputs={bel: solph.Flow(variable_costs=1)}))
+    busses = [solph.Bus(label='bus_{}'.format(i_curve)) for i_curve in range(len(curves))]
+    es.add(*busses)
+    es.add(solph.Sink(label='demand', inputs={
+        busses[0]: solph.Flow(nominal_value=demand, fix=[1])}))
+    for bus in busses[1:]:
+        es.add(solph.Sink(label='excess_{}'.format(bus.label), inputs={bus: solph.Flow()}))
+    es.add(MultiOutputPiecewiseTransformer(
+        label='chp',
+        inputs={bel: solph.Flow(nominal_value=max(POINTS))},
+        outputs={bus: solph.Flow() for bus in busses},
+        in_breakpoints=merge_breakpoints(*[points for points, _ in curves]),
+        conversion_functions={
+            bus: lambda x, curve=curve: np.interp(x, *curve)
+            for bus, curve in zip(busses, curves)},
+        pw_repn=pw_repn))
+    return solph.Model(es)
+
+
+def test_merge_breakpoints():
+    assert merge_breakpoints(POINTS, [0, 25, 40]) == [0, 10, 20, 25, 30, 40]
+    # only the range covered by all curves
+    assert merge_breakpoints(POINTS, [5, 25, 35]) == [5, 10, 20, 25, 30, 35]
+
+
+def test_multi_output_piecewise_transformer():
+    # both outputs are on their curves for the same input
+    curves = [(POINTS, CONCAVE), ([0, 20, 40], [0, 2, 20])]
+    for pw_repn in ['CC', 'DCC', 'auto']:
+        model = get_multi_output_model(pw_repn, curves, demand=16)
+        assert not is_linear_program(model)
+        assert solve_model(model) == ('ok', 'optimal')
+        flows = solph.views.node(solph.processing.results(model), 'chp')['sequences']
+        assert flows[(('bel', 'chp'), 'flow')][0] == pytest.approx(25), pw_repn
+        assert flows[(('chp', 'bus_1'), 'flow')][0] == pytest.approx(6.5), pw_repn
+
+    # concave curves only: linear program
+    model = get_multi_output_model('auto', [(POINTS, CONCAVE), (POINTS, POINTS)], demand=16)
+    assert is_linear_program(model)
+    assert solve_model(model, 'highs') == ('ok', 'optimal')
+    flows = solph.views.node(solph.processing.results(model), 'chp')['sequences']
+    assert flows[(('bel', 'chp'), 'flow')][0] == pytest.approx(25)
+
+    with pytest.raises(ValueError):
+        get_multi_output_model('LOG', curves, demand=16)
+    with pytest.raises(ValueError):
+        get_multi_output_model('LP', curves, demand=16)
@@ -0,0 +1,61 @@
+from smooth.optimization.reduce_results import reduce_series, apply_reducer, reduce_smooth_result
+from smooth.framework.interval_series import RunningSeries, DownsampledSeries
+
+import pytest
+
+
+class FakeComponent:
+    def __init__(self, name):
+        self.name = name
+        self.flows = {('grid', 'bel'): [1, 2, None, 5]}
+        self.states = {'soc': RunningSeries()}
+        self.results = {'variable_costs': [0.5, 1, 1.5, 2], 'annuity_total': 3}
+        for i_interval, value in enumerate([0.2, 0.8, 0.4]):
+            self.states['soc'][i_interval] = value
+
+
+def test_reduce_series():
+    assert reduce_series([1, None, 3], 'sum') == 4
+    assert reduce_series([1, None, 3], 'mean') == 2
+    assert reduce_series([1, None, 3], 'max') == 3
+    assert list(reduce_series([1, 2], 'series')) == [1, 2]
+
+    series = RunningSeries()
+    for i_interval, value in enumerate([4, 1, 7]):
+        series[i_interval] = value
+    assert reduce_series(series, 'sum') == 12
+    assert reduce_series(series, 'mean') == 4
+    assert reduce_series(series, 'min') == 1
+    # full series is not kept
+    with pytest.raises(ValueError):
+        reduce_series(series, 'series')
+
+    series = DownsampledSeries(2)
+    for i_interval, value in enumerate([4, 2, 7]):
+        series[i_interval] = value
+    assert list(reduce_series(series, 'series')) == [3, 7]
+
+    with pytest.raises(ValueError):
+        reduce_series([1], 'foo')
+
+
+def test_reduce_smooth_result():
+    smooth_result = [FakeComponent('grid')]
+    reducers = {
+        'custom': lambda x: len(x),
+        'energy': {'component': 'grid', 'flow': ('grid', 'bel'), 'reduce': 'sum'},
+        'max_soc': {'component': 'grid', 'state': 'soc', 'reduce': 'max'},
+        'costs': {'component': 'grid', 'result': 'variable_costs', 'reduce': 'series'},
+        'annuity': {'component': 'grid', 'result': 'annuity_total'},
+    }
+    reduced = reduce_smooth_result(smooth_result, reducers)
+    assert reduced['custom'] == 1
+    assert reduced['energy'] == 8
+    assert reduced['max_soc'] == 0.8
+    assert list(reduced['costs']) == [0.5, 1, 1.5, 2]
+    assert reduced['annuity'] == 3
+
+    with pytest.raises(ValueError):
+        apply_reducer(smooth_result, {'component': 'foo', 'state': 'soc'})
+    with pytest.raises(ValueError):
+        apply_reducer(smooth_result, {'component': 'grid'})
@@ -0,0 +1,73 @@
+from smooth.framework.functions.representative_periods import aggregate_model, cluster_periods
+from smooth.framework.interval_series import RunningSeries, get_series_total
+from smooth.framework.run_smooth import run_smooth
+
+import copy
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def test_cluster_periods():
+    features = np.array([[0, 0], [10, 10], [0, 1], [10, 11], [0, 0]], dtype=float)
+    representatives, weights = cluster_periods(features, 2)
+    assert list(representatives) in ([0, 1], [0, 3], [1, 4], [3, 4])
+    assert sorted(weights) == [2, 3]
+    # more periods requested than available, identical periods are combined
+    representatives, weights = cluster_periods(features, 10)
+    assert len(representatives) == 4
+    assert sum(weights) == 5
+
+
+def test_get_series_total_weights():
+    assert get_series_total([1, 2, 3], [2, 1, 0]) == 4
+    with pytest.raises(ValueError):
+        get_series_total(RunningSeries(), [1])
+
+
+def test_aggregate_model(tmp_path):
+    # 3 days: two days with high demand at noon, one day with constant demand
+    day_a = [10] * 10 + [100] * 4 + [10] * 10
+    day_b = [30] * 24
+    pd.DataFrame({'demand': day_a * 2 + day_b}).to_csv(tmp_path / 'demand.csv', index=False)
+    model = {
+        'busses': ['bel'],
+        'components': {
+            'grid': {
+                'component': 'supply',
+                'bus_out': 'bel',
+                'variable_costs': 2e-3,
+                'dependency_flow_costs': ('grid', 'bel'),
+                'variable_emissions': 0.5,
+                'dependency_flow_emissions': ('grid', 'bel'),
+            },
+            'demand': {
+                'component': 'energy_demand_from_csv',
+                'bus_in': 'bel',
+                'csv_filename': 'demand.csv',
+                'path': str(tmp_path),
+                'column_title': 'demand',
+            },
+        },
+        'sim_params': {
+            'n_intervals': 24 * 3,
+            'interval_time': 60,
+            'show_debug_flag': False,
+        },
+    }
+
+    aggregated_model = aggregate_model(model, 2, directory=str(tmp_path / 'periods'))
+    assert aggregated_model['sim_params']['n_intervals'] == 48
+    assert sorted(set(aggregated_model['sim_params']['interval_weights'])) == [1, 2]
+    # original model is not changed
+    assert model['sim_params']['n_intervals'] == 24 * 3
+
+    full_result = run_smooth(copy.deepcopy(model))[0]
+    aggregated_result = run_smooth(aggregated_model)[0]
+    for key in ['annuity_total', 'annual_total_emissions']:
+        assert aggregated_result[0].results[key] == pytest.approx(full_result[0].results[key])
+
+    # less than one period
+    model['sim_params']['n_intervals'] = 12
+    with pytest.raises(ValueError):
+        aggregate_model(model, 2)
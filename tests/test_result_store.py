@@ -0,0 +1,42 @@
+from smooth.framework.functions.result_store import ResultStore
+from smooth.framework.simulation_parameters import SimulationParameters
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+class FakeComponent:
+    def __init__(self, name):
+        self.name = name
+        self.sim_params = SimulationParameters({'n_intervals': 3})
+        self.flows = {('grid', 'bel'): [1, None, 3]}
+        self.states = {}
+        self.results = {'variable_costs': [0, 1, 2], 'annuity_total': 4}
+
+
+def test_result_store(tmp_path):
+    store = ResultStore(str(tmp_path / 'store'))
+    assert store.keys() == []
+    assert 'foo' not in store
+    with pytest.raises(KeyError):
+        store.read('foo')
+
+    store.write('foo', [FakeComponent('grid')])
+    assert 'foo' in store
+    assert store.keys() == ['foo']
+
+    result = store.read('foo')
+    assert result.shape == (3, 2)
+    assert isinstance(result.index, pd.DatetimeIndex)
+    assert result.index[0] == pd.Timestamp('2019-01-01 00:00')
+    flow = result[('grid', 'flows', 'grid->bel')]
+    assert flow[0] == 1 and np.isnan(flow[1])
+    # scalar results are not stored
+    assert list(result['grid']['results'].columns) == ['variable_costs']
+
+    # entries are found when the store is opened again
+    assert ResultStore(str(tmp_path / 'store')).keys() == ['foo']
+
+    store.remove('foo')
+    assert store.keys() == []
@@ -0,0 +1,111 @@
+from smooth.framework.run_scenarios import \
+    run_scenarios_in_threads, run_scenarios, create_scenarios
+from smooth.framework.functions.result_store import ResultStore
+from smooth.framework.run_smooth import run_smooth
+
+import copy
+import os
+import pytest
+
+
+def get_model(capacity):
+    return {
+        'busses': ['bel'],
+        'components': [
+            {
+                'name': 'grid',
+                'component': 'supply',
+                'bus_out': 'bel',
+                'variable_costs': 2e-3,
+                'dependency_flow_costs': ('grid', 'bel'),
+            },
+            {
+                'name': 'demand',
+                'component': 'energy_demand_from_csv',
+                'bus_in': 'bel',
+                'csv_filename': 'test_csv.csv',
+                'path': os.path.join(os.path.dirname(__file__), 'test_timeseries'),
+                'nominal_value': 100,
+            },
+            {
+                'name': 'battery',
+                'component': 'battery',
+                'bus_in_and_out': 'bel',
+                'battery_capacity': capacity,
+                'soc_init': 0.5,
+            },
+        ],
+        'sim_params': {'n_intervals': 4, 'interval_time': 60, 'show_debug_flag': False},
+    }
+
+
+def test_run_scenarios_in_threads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    models = [get_model(capacity) for capacity in [10, 100, 1000, 10000] * 2]
+    original_models = copy.deepcopy(models)
+    results = run_scenarios_in_threads(models, n_threads=4)
+    # the models are not changed
+    assert models == original_models
+
+    assert len(results) == len(models)
+    for model, (components, status) in zip(models, results):
+        expected_components, expected_status = run_smooth(model)
+        assert status == expected_status
+        for this_comp, expected_comp in zip(components, expected_components):
+            assert this_comp.flows == expected_comp.flows
+            assert this_comp.results['annuity_total'] == pytest.approx(
+                expected_comp.results['annuity_total'])
+    # no files are written to the current directory
+    assert os.listdir(str(tmp_path)) == []
+
+    # the error of a failed simulation is raised
+    models[1]['components'][2]['component'] = 'Battery'
+    with pytest.raises(ValueError):
+        run_scenarios_in_threads(models, n_threads=4)
+
+
+def test_create_scenarios():
+    base_model = get_model(10)
+    models = create_scenarios(base_model, {
+        'small': {},
+        'large': {'components': {'battery': {'battery_capacity': 1000}},
+                  'sim_params': {'n_intervals': 2}},
+    })
+    assert list(models) == ['small', 'large']
+    assert models['small']['components']['battery']['battery_capacity'] == 10
+    assert models['large']['components']['battery']['battery_capacity'] == 1000
+    assert models['large']['components']['battery']['soc_init'] == 0.5
+    assert models['large']['sim_params'] == {
+        'n_intervals': 2, 'interval_time': 60, 'show_debug_flag': False}
+    # the base model is not changed
+    assert base_model == get_model(10)
+
+
+def test_run_scenarios(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    models = create_scenarios(get_model(10), {
+        'capacity_{}'.format(capacity): {'components': {'battery': {'battery_capacity': capacity}}}
+        for capacity in [10, 100, 1000]})
+    models['invalid'] = create_scenarios(get_model(10), {
+        'invalid': {'components': {'battery': {'component': 'Battery'}}}})['invalid']
+    summary = run_scenarios(models, n_core=2, result_store='store', print_progress=False)
+    assert list(summary) == list(models)
+    assert summary['invalid']['status'] is None
+    assert summary['invalid']['error'].startswith('ValueError')
+
+    store = ResultStore('store')
+    assert sorted(store.keys()) == ['capacity_10', 'capacity_100', 'capacity_1000']
+    for name in store.keys():
+        assert summary[name]['status'] == 'ok'
+        assert summary[name]['error'] is None
+        expected = run_smooth(models[name])[0]
+        results = store.read(name)
+        assert results[('battery', 'states', 'soc')].tolist() == pytest.approx(
+            expected[2].states['soc'])
+
+    # components are returned without result store
+    summary = run_scenarios([get_model(10)], n_core=1, print_progress=False)
+    assert summary['0']['components'][2].name == 'battery'
+    # timeout after the first interval
+    summary = run_scenarios([get_model(10)], n_core=1, timeout=0, print_progress=False)
+    assert summary['0']['error'].startswith('TimeoutError')
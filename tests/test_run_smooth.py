@@ -0,0 +1,180 @@
+from smooth.framework.run_smooth import run_smooth, iter_smooth, resume_smooth, is_stateless
+from smooth.framework.batch_smooth import run_smooth_batch
+from smooth.framework.functions.functions import create_component_obj
+from smooth.framework.simulation_parameters import SimulationParameters
+from smooth.framework.interval_series import RunningSeries
+
+import copy
+import os
+import pytest
+
+
+test_path = os.path.join(os.path.dirname(__file__), 'test_timeseries')
+
+model = {
+    'busses': ['bel'],
+    'components': {
+        'grid': {
+            'component': 'supply',
+            'bus_out': 'bel',
+            'variable_costs': 2e-3,
+            'dependency_flow_costs': ('grid', 'bel'),
+            'variable_emissions': 0.5,
+            'dependency_flow_emissions': ('grid', 'bel'),
+        },
+        'demand': {
+            'component': 'energy_demand_from_csv',
+            'bus_in': 'bel',
+            'csv_filename': 'test_csv.csv',
+            'path': test_path,
+            'nominal_value': 100,
+        },
+        'battery': {
+            'component': 'battery',
+            'bus_in_and_out': 'bel',
+            'battery_capacity': 1000,
+            'soc_init': 0.5,
+            'vac_in': 1,
+            'vac_out': -1,
+        },
+    },
+    'sim_params': {
+        'n_intervals': 4,
+        'interval_time': 60,
+        'show_debug_flag': False,
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def tmp_cwd(tmp_path, monkeypatch):
+    # checkpoints and lp files are written to the current directory
+    monkeypatch.chdir(tmp_path)
+
+
+def test_iter_smooth():
+    records = list(iter_smooth(copy.deepcopy(model)))
+    assert len(records) == 4
+    for i_interval, record in enumerate(records):
+        assert record['i_interval'] == i_interval
+        assert record['status'] == 'ok'
+        assert record['flows']['demand'][('bel', 'demand')] == 100
+        assert record['costs']['grid'].keys() == {
+            'variable_costs', 'art_costs', 'variable_emissions'}
+        assert 'soc' in record['states']['battery']
+    # the battery is discharged first
+    assert records[0]['flows']['grid'][('grid', 'bel')] == 0
+
+    # return value of generator is the same as run_smooth
+    simulation = iter_smooth(copy.deepcopy(model))
+    with pytest.raises(StopIteration) as finished:
+        while True:
+            next(simulation)
+    components, status = finished.value.value
+    assert status == 'ok'
+    assert len(components) == 3
+    # no lp file by default
+    assert not os.listdir('.')
+
+    lp_model = copy.deepcopy(model)
+    lp_model['sim_params']['lp_file'] = 'first_interval.lp'
+    list(iter_smooth(lp_model))
+    assert os.listdir('.') == ['first_interval.lp']
+
+
+def test_iter_smooth_without_history():
+    full_components = run_smooth(copy.deepcopy(model))[0]
+
+    records = []
+    simulation = iter_smooth(copy.deepcopy(model), keep_history=False)
+    try:
+        while True:
+            records.append(next(simulation))
+    except StopIteration as finished:
+        components = finished.value[0]
+
+    for full_comp, comp in zip(full_components, components):
+        assert isinstance(comp.results['variable_costs'], RunningSeries)
+        for flow_name, flow in comp.flows.items():
+            assert isinstance(flow, RunningSeries)
+            # records contain the values of all intervals
+            assert [r['flows'][comp.name][flow_name] for r in records] \
+                == full_comp.flows[flow_name]
+        for key in ['annuity_total', 'annual_total_emissions']:
+            assert comp.results[key] == pytest.approx(full_comp.results[key])
+
+
+def test_resume_smooth():
+    full_components = run_smooth(copy.deepcopy(model))[0]
+
+    checkpoint_model = copy.deepcopy(model)
+    checkpoint_model['sim_params']['checkpoint_interval'] = 2
+    # interrupt simulation after third interval: checkpoint after second interval
+    simulation = iter_smooth(copy.deepcopy(checkpoint_model))
+    for _ in range(3):
+        next(simulation)
+    simulation.close()
+    assert os.path.exists('smooth_checkpoint.pickle')
+
+    components = resume_smooth(copy.deepcopy(checkpoint_model))[0]
+    for full_comp, comp in zip(full_components, components):
+        assert comp.flows == full_comp.flows
+        assert comp.states == full_comp.states
+        assert comp.results == pytest.approx(full_comp.results)
+
+    # checkpoint does not match model
+    checkpoint_model['sim_params']['n_intervals'] = 5
+    with pytest.raises(ValueError):
+        resume_smooth(copy.deepcopy(checkpoint_model))
+
+
+def test_parallel_intervals():
+    # model with battery has states
+    components = create_component_obj(copy.deepcopy(model), SimulationParameters({}))
+    assert not is_stateless(components)
+
+    stateless_model = copy.deepcopy(model)
+    del stateless_model['components']['battery']
+    stateless_model['sim_params']['n_intervals'] = 5
+    components = create_component_obj(copy.deepcopy(stateless_model), SimulationParameters({}))
+    assert is_stateless(components)
+
+    sequential_components = run_smooth(copy.deepcopy(stateless_model))[0]
+    stateless_model['sim_params']['parallel_intervals'] = 2
+    records = list(iter_smooth(copy.deepcopy(stateless_model)))
+    assert [r['i_interval'] for r in records] == list(range(5))
+    parallel_components, status = run_smooth(copy.deepcopy(stateless_model))
+    assert status == 'ok'
+    for seq_comp, par_comp in zip(sequential_components, parallel_components):
+        assert par_comp.flows == seq_comp.flows
+        assert par_comp.results == pytest.approx(seq_comp.results)
+
+    # the workers simulate the given components, not the model
+    components = create_component_obj(
+        copy.deepcopy(stateless_model), SimulationParameters(stateless_model['sim_params']))
+    components[1].nominal_value = 50
+    parallel_components = run_smooth(copy.deepcopy(stateless_model), components)[0]
+    assert parallel_components[1].flows[('bel', 'demand')] == [50] * 5
+
+
+def test_run_smooth_batch():
+    models = []
+    for capacity in [1000, 300, 50]:
+        this_model = copy.deepcopy(model)
+        this_model['components']['battery']['battery_capacity'] = capacity
+        models.append(this_model)
+
+    batch_results = run_smooth_batch(copy.deepcopy(models))
+    assert len(batch_results) == 3
+    for this_model, (batch_components, status) in zip(models, batch_results):
+        assert status == 'ok'
+        components = run_smooth(copy.deepcopy(this_model))[0]
+        for comp, batch_comp in zip(components, batch_components):
+            assert batch_comp.flows == comp.flows
+            assert batch_comp.states == comp.states
+            assert batch_comp.results == pytest.approx(comp.results)
+
+    # models need the same time steps
+    models[1]['sim_params']['n_intervals'] = 3
+    with pytest.raises(ValueError):
+        run_smooth_batch(models)
@@ -0,0 +1,31 @@
+from smooth.framework.functions.functions import read_data_file
+from smooth.framework.functions.shared_time_series import \
+    SharedTimeSeries, get_shared_time_series, attached_time_series
+
+import os
+import pytest
+
+
+test_path = os.path.join(os.path.dirname(__file__), 'test_timeseries')
+
+
+@pytest.mark.skipif(not SharedTimeSeries.is_available(), reason="needs shared memory")
+def test_shared_time_series():
+    file_path = os.path.join(test_path, 'test_csv.csv')
+    data = read_data_file(test_path, 'test_csv.csv', ',', 0)
+    # not recorded
+    assert get_shared_time_series(file_path, ',', 0) is None
+
+    shared = SharedTimeSeries()
+    with shared.recording():
+        read_data_file(test_path, 'test_csv.csv', ',', 0)
+    assert len(shared.descriptors) == 1
+    try:
+        shared_data = read_data_file(test_path, 'test_csv.csv', ',', 0)
+        assert shared_data.equals(data)
+        # data is not copied and may not be changed
+        assert not shared_data.iloc[:, 0].values.flags.writeable
+    finally:
+        shared.close()
+    assert len(attached_time_series) == 0
+    assert get_shared_time_series(file_path, ',', 0) is None
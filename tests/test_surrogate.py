@@ -0,0 +1,47 @@
+from smooth.optimization.surrogate import GaussianProcess, select_candidates
+
+import numpy as np
+import pytest
+
+
+def test_gaussian_process():
+    x = np.linspace(0, 1, 10)[:, None]
+    y = np.hstack([np.sin(3 * x), 100 * x])
+    model = GaussianProcess().fit(x, y)
+
+    # interpolates training points
+    mean, std = model.predict(x)
+    assert mean == pytest.approx(y, abs=1e-2)
+    assert np.all(std < 1e-3 * model.y_std)
+
+    # smooth function between training points
+    x_new = np.array([[0.25], [0.55]])
+    mean, std = model.predict(x_new)
+    assert mean[:, 0] == pytest.approx(np.sin(3 * x_new[:, 0]), abs=1e-2)
+    assert mean[:, 1] == pytest.approx(100 * x_new[:, 0], abs=1)
+
+    # uncertainty grows away from training points
+    assert model.predict([[3]])[1][0, 0] > std[0, 0]
+
+    # constant output and duplicate inputs
+    mean, std = GaussianProcess().fit([[0], [0], [1]], [[1], [1], [1]]).predict([[0.5]])
+    assert mean[0, 0] == pytest.approx(1)
+
+    # singular kernel matrix without noise and jitter
+    with pytest.raises(np.linalg.LinAlgError):
+        GaussianProcess(noise=0, max_jitter_tries=0).fit([[0], [0]], [[1], [2]])
+    GaussianProcess(noise=0).fit([[0], [0]], [[1], [2]])
+
+
+def test_select_candidates():
+    mean = np.array([[0, 0], [2, 2], [1, 3], [1, 1]], dtype=float)
+    std = np.zeros((4, 2))
+    # first front: 1 and 2
+    assert sorted(select_candidates(mean, std, 2)) == [1, 2]
+    assert sorted(select_candidates(mean, std, 3)) == [1, 2, 3]
+    assert len(select_candidates(mean, std, 10)) == 4
+
+    # uncertain candidate is promising
+    std[0] = 5
+    assert 0 in select_candidates(mean, std, 2)
+    assert 0 not in select_candidates(mean, std, 2, exploration=0)
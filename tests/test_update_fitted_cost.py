@@ -0,0 +1,124 @@
+from smooth.framework.functions.update_fitted_cost import \
+    CostCurve, VariableCostCurve, compile_cost_curve
+from smooth.framework.functions.update_annuities import get_fix_annuities
+from smooth.components.component_electrolyzer import Electrolyzer
+from smooth.framework.simulation_parameters import SimulationParameters
+
+import copy
+import numpy as np
+import pytest
+
+VARIABLE_CAPEX = {
+    'key': 'variable',
+    'var_dict_dependency': 'power_max',
+    'var_dicts': [
+        {
+            'low_threshold': 0,
+            'high_threshold': 10,
+            'key': 'free',
+            'fitting_value': [2, 3],
+            'dependant_value': 'power_max',
+        },
+        {
+            'low_threshold': 10,
+            'high_threshold': 50,
+            'key': ['spec', 'poly'],
+            'fitting_value': [10, ['cost', 1]],
+            'dependant_value': ['power_max', 'life_time'],
+        },
+        {
+            'low_threshold': 100,
+            'high_threshold': float('inf'),
+            'key': 'spec',
+            'fitting_value': 5,
+            'dependant_value': 'power_max',
+        },
+    ],
+}
+
+
+def test_cost_curve():
+    assert compile_cost_curve({}, 'comp', 'CAPEX/OPEX') is None
+    curve = compile_cost_curve(
+        {'key': 'fix', 'fitting_value': None, 'dependant_value': None, 'cost': 200},
+        'comp', 'CAPEX/OPEX')
+    assert curve({}) == 200
+
+    curve = CostCurve({'key': 'exp', 'fitting_value': [750, 0.5],
+                       'dependant_value': 'x'}, 'comp', 'CAPEX/OPEX')
+    assert curve({'x': 2}) == pytest.approx(750 * np.exp(1))
+
+    # the cost of the first key is used in the second one
+    fitting_dict = {
+        'key': ['free', 'poly'],
+        'fitting_value': [[2, 0.5], ['cost', 3]],
+        'dependant_value': ['x', 'y'],
+    }
+    curve = CostCurve(fitting_dict, 'comp', 'CAPEX/OPEX')
+    assert curve.dependencies == ('x', 'y')
+    assert curve({'x': 4, 'y': 5}) == pytest.approx(4 + 3 * 5)
+    assert curve({'x': 9, 'y': 5}) == pytest.approx(6 + 3 * 5)
+    sizes = np.array([4, 9, 16])
+    assert curve({'x': sizes, 'y': 5}) == pytest.approx([19, 21, 23])
+    # the dict is not modified
+    assert fitting_dict['fitting_value'] == [[2, 0.5], ['cost', 3]]
+    assert 'cost' not in fitting_dict
+
+    with pytest.raises(ValueError):
+        CostCurve({'key': 'foo', 'fitting_value': 1, 'dependant_value': 'x'},
+                  'comp', 'CAPEX/OPEX')
+    with pytest.raises(ValueError):
+        CostCurve({'key': 'free', 'fitting_value': [1, 2, 3], 'dependant_value': 'x'},
+                  'comp', 'CAPEX/OPEX')
+
+
+def test_variable_cost_curve():
+    curve = compile_cost_curve(VARIABLE_CAPEX, 'comp', 'CAPEX/OPEX')
+    assert isinstance(curve, VariableCostCurve)
+    assert curve.dependencies == ('power_max', 'life_time')
+    assert curve({'power_max': 2, 'life_time': 20}) == 16
+    assert curve({'power_max': 10, 'life_time': 20}) == 120
+    assert curve({'power_max': 200, 'life_time': 20}) == 1000
+    sizes = [0, 2, 10, 20, 100, 200]
+    assert curve({'power_max': np.array(sizes), 'life_time': 20}) == pytest.approx(
+        [0, 16, 120, 220, 500, 1000])
+
+    # no curve between the thresholds
+    with pytest.raises(AssertionError):
+        curve({'power_max': 60, 'life_time': 20})
+    with pytest.raises(AssertionError):
+        curve({'power_max': np.array([2, 60]), 'life_time': 20})
+
+    overlapping = copy.deepcopy(VARIABLE_CAPEX)
+    overlapping['var_dicts'][0]['high_threshold'] = 20
+    with pytest.raises(AssertionError):
+        VariableCostCurve(overlapping, 'comp', 'CAPEX/OPEX')
+
+
+def test_get_fix_annuities():
+    ely = Electrolyzer({
+        'name': 'ely',
+        'bus_el': 'bel',
+        'bus_h2': 'bh2',
+        'power_max': 20,
+        'life_time': 20,
+        'capex': VARIABLE_CAPEX,
+        'opex': {'key': 'spec', 'fitting_value': 0.1, 'dependant_value': 'capex'},
+        'fix_emissions': {'key': 'spec', 'fitting_value': 2, 'dependant_value': 'power_max'},
+        'sim_params': SimulationParameters({}),
+    })
+    model_capex = copy.deepcopy(VARIABLE_CAPEX)
+    ely.check_validity()
+    annuities = get_fix_annuities(ely)
+    assert annuities['annuity_opex'] == pytest.approx(22)
+    assert annuities['annual_fix_emissions'] == pytest.approx(2)
+    assert annuities['annual_op_emissions'] == 0
+
+    # a sweep of sizes in one call gives the same annuities as each size on its own
+    sizes = np.array([2, 20, 200])
+    sweep = get_fix_annuities(ely, power_max=sizes)
+    for i_size, size in enumerate(sizes):
+        ely.power_max = size
+        for key, value in get_fix_annuities(ely).items():
+            assert np.broadcast_to(sweep[key], sizes.shape)[i_size] == pytest.approx(value)
+    assert ely.capex == model_capex